@@ -0,0 +1,12 @@
+"""
+Offline micro-benchmarks for the divination API.
+
+Run individual benchmarks from the backend directory, e.g.::
+
+    python -m benchmarks.bench_lookup
+
+or the whole engine suite, with a JSON baseline and regression check::
+
+    python -m benchmarks.suite --save
+    python -m benchmarks.suite --compare
+"""
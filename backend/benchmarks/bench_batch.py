@@ -0,0 +1,74 @@
+"""
+Benchmark: readings per second, batch endpoint vs one request per reading.
+
+Runs the application in-process (ASGI through ``TestClient``, no network)
+and compares
+
+- ``single``: N ``POST /api/divination`` requests
+- ``batch``: one ``POST /api/divination/batch`` with N questions
+- ``batch ndjson``: the same batch streamed as NDJSON
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.bench_batch
+"""
+
+import os
+import time
+from typing import Any, Callable, Dict, List
+
+os.environ.setdefault("DeepSeek_API_KEY", "benchmark")
+os.environ.setdefault("DATA_RELOAD_INTERVAL", "0")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from main import app  # noqa: E402
+
+
+def _best_seconds(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=(100, 1000, 10000), repeat: int = 3) -> List[Dict[str, Any]]:
+    """
+    Measure readings per second of every strategy.
+
+    Args:
+        sizes: Readings per measurement (N)
+        repeat: Repeats per measurement (best is kept)
+
+    Returns:
+        One row per N with readings/s of every strategy
+    """
+    rows = []
+    with TestClient(app) as client:
+        def single(n: int) -> None:
+            for i in range(n):
+                client.post("/api/divination", json={"question": f"问题{i}"}).raise_for_status()
+
+        def batch(n: int, fmt: str) -> None:
+            questions = [f"问题{i}" for i in range(n)]
+            client.post(f"/api/divination/batch?format={fmt}",
+                        json={"questions": questions}).raise_for_status()
+
+        for n in sizes:
+            # 单次请求很慢，按 1000 次计时后折算
+            single_n = min(n, 1000)
+            row = {"n": n, "single": single_n / _best_seconds(lambda: single(single_n), 1)}
+            row["batch"] = n / _best_seconds(lambda: batch(n, "json"), repeat)
+            row["batch ndjson"] = n / _best_seconds(lambda: batch(n, "ndjson"), repeat)
+            rows.append(row)
+    return rows
+
+
+if __name__ == "__main__":
+    rows = run()
+    print(f"{'N':>6} {'single/s':>10} {'batch/s':>12} {'ndjson/s':>12} {'speed-up':>9}")
+    for row in rows:
+        print(f"{row['n']:>6} {row['single']:>10.0f} {row['batch']:>12.0f} "
+              f"{row['batch ndjson']:>12.0f} {row['batch'] / row['single']:>8.0f}×")
@@ -0,0 +1,116 @@
+"""
+Micro-benchmark: CPU time and allocations of one coin-cast reading.
+
+Compares the work a ``/divination`` request does before the reading is
+spliced into the response:
+
+- ``models``: 18 ``random.choice`` coin throws, six ``Line`` models, code
+  and mask folded from the models, ``model_dump()`` of every line for the
+  response and the najia parameters derived line by line (the previous path)
+- ``cast``: one ``getrandbits`` call resolved into a 12-bit cast by table
+  lookup, lookups keyed by the integer and the lines' JSON taken from a
+  24-entry table (the current path)
+
+Both strategies look up the same hexagram readings. Reports µs per reading
+(best of 5 ``timeit`` repeats), the heap blocks/bytes a reading keeps
+alive and the peak heap growth while one reading is built (``tracemalloc``).
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.bench_casting
+"""
+
+import random
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from models.schemas import Line
+from utils.casting import cast_coins, cast_lines_json, cast_to_najia_params
+from utils.catalogue_cache import encode_json
+from utils.divination_logic import (
+    get_changed_from_cast, get_reading_from_cast, is_changing_line, line_type_to_binary,
+    lines_to_changing_mask, lines_to_code, throw_coins
+)
+from utils.hexagram_data import hexagram_manager
+
+
+def _models_reading() -> tuple:
+    lines: List[Line] = []
+    for position in range(1, 7):
+        _, line_type, _ = throw_coins()
+        lines.append(Line(
+            position=position,
+            type='yang' if line_type_to_binary(line_type) == '1' else 'yin',
+            changing=is_changing_line(line_type),
+        ))
+    code = lines_to_code(lines)
+    mask = lines_to_changing_mask(lines)
+    original = hexagram_manager.get_reading(code, mask)
+    changed = hexagram_manager.get_reading(code ^ mask) if mask else None
+    lines_json = encode_json([line.model_dump() for line in lines])
+    params = [(1 if line.changing else 3) if line.type == 'yang' else (4 if line.changing else 2)
+              for line in lines]
+    return original, changed, lines_json, params
+
+
+def _cast_reading() -> tuple:
+    cast = cast_coins()
+    return (get_reading_from_cast(cast), get_changed_from_cast(cast),
+            cast_lines_json(cast), cast_to_najia_params(cast))
+
+
+STRATEGIES: Dict[str, Callable[[], tuple]] = {
+    "models": _models_reading,
+    "cast": _cast_reading,
+}
+
+
+def _allocations(func: Callable[[], tuple], readings: int) -> Dict[str, float]:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        kept = [func() for _ in range(readings)]
+        after = tracemalloc.take_snapshot()
+        peak = 0
+        for _ in range(readings):
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            func()
+            peak += tracemalloc.get_traced_memory()[1] - current
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+    del kept
+    return {"blocks": blocks / readings, "bytes": size / readings, "peak": peak / readings}
+
+
+def run(number: int = 5000, readings: int = 2000) -> List[Dict[str, Any]]:
+    """
+    Measure time and allocations per reading for every strategy.
+
+    Args:
+        number: Readings per timing repeat
+        readings: Readings kept alive while counting allocations
+
+    Returns:
+        One row per strategy with µs, retained blocks/bytes and peak bytes per reading
+    """
+    hexagram_manager.load_all()
+    rows = []
+    for name, func in STRATEGIES.items():
+        random.seed(0)
+        func()
+        us = min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+        rows.append({"strategy": name, "us": us, **_allocations(func, readings)})
+    return rows
+
+
+if __name__ == "__main__":
+    rows = run()
+    print(f"{'strategy':<10} {'µs/reading':>11} {'blocks':>8} {'bytes':>8} {'peak bytes':>11}")
+    for row in rows:
+        print(f"{row['strategy']:<10} {row['us']:>11.2f} {row['blocks']:>8.1f} "
+              f"{row['bytes']:>8.0f} {row['peak']:>11.0f}")
@@ -0,0 +1,104 @@
+"""
+Benchmark: resident heap of a loaded corpus, eager vs lazily hydrated.
+
+Each mode runs in a fresh interpreter that loads both languages into the
+app's process-wide ``hexagram_manager`` and reports the Python heap
+(tracemalloc) the corpora hold afterwards:
+
+- ``eager``: every section hydrated and kept, as every process held the
+  corpus before hydration became lazy
+- ``lazy``: summaries only, right after load
+- ``lazy+catalogue``: after serving random hexagram bodies through
+  ``corpus.catalogue``, as the catalogue routes do
+- ``lazy+readings``: after a burst of random readings built by the
+  divination routes' ``_reading_body`` (catalogue fragments, interpretation
+  templates and the bounded reading cache, whose encoded bodies are also
+  reported on their own)
+
+Memory-mapped bundle pages live in the OS page cache, shared by all worker
+processes, and are not part of these numbers.
+
+Usage (from the backend directory, after ``python build_corpus_bundle.py``)::
+
+    python -m benchmarks.bench_corpus_memory
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+_CHILD = """
+import gc, json, os, random, tracemalloc
+from datetime import datetime
+os.environ.setdefault("DeepSeek_API_KEY", "benchmark")
+
+from routers.divination import _reading_body
+from utils.corpus_bundle import SECTION_FIELDS
+from utils.hexagram_data import LANGUAGE_DATA_FILES, hexagram_manager
+
+def heap():
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+mode, requests, rng = {mode!r}, {requests}, random.Random({seed})
+languages = tuple(LANGUAGE_DATA_FILES)
+tracemalloc.start()
+before = heap()
+if mode == "eager":
+    hexagram_manager.section_cache_size = None
+hexagram_manager.load_all()
+
+if mode == "eager":
+    for language in languages:
+        for hexagram in hexagram_manager.get_all_hexagrams(language):
+            for field in SECTION_FIELDS:
+                getattr(hexagram, field)
+elif mode == "lazy+catalogue":
+    for _ in range(requests):
+        hexagram_manager.get_corpus(rng.choice(languages)).catalogue.hexagram(rng.randint(1, 64))
+elif mode == "lazy+readings":
+    now = datetime(2024, 6, 1, 10, 30)
+    for i in range(requests):
+        _reading_body(rng.getrandbits(12), f"问题{{i}}", rng.choice(languages), False, None, now)
+
+cached = sum(hexagram_manager.get_corpus(language).reading_cache.info()["bytes"] for language in languages)
+print(json.dumps({{"heap": heap() - before, "readings": cached}}))
+"""
+
+MODES = ("eager", "lazy", "lazy+catalogue", "lazy+readings")
+
+
+def _measure(mode: str, requests: int, seed: int = 7) -> Dict[str, int]:
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD.format(mode=mode, requests=requests, seed=seed)],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(requests: int = 2000) -> Dict[str, Dict[str, float]]:
+    """
+    Measure the corpus heap in each mode.
+
+    Args:
+        requests: Catalogue requests or readings issued in the ``lazy+`` modes
+
+    Returns:
+        Mapping of mode to resident heap and cached reading bodies in KB
+    """
+    return {
+        mode: {name: size / 1024 for name, size in _measure(mode, requests).items()}
+        for mode in MODES
+    }
+
+
+if __name__ == "__main__":
+    results = run()
+    print(f"{'mode':<15} {'heap KB':>10} {'readings KB':>12} {'rest KB':>10}")
+    for mode, sizes in results.items():
+        print(f"{mode:<15} {sizes['heap']:>10.0f} {sizes['readings']:>12.0f} "
+              f"{sizes['heap'] - sizes['readings']:>10.0f}")
@@ -0,0 +1,74 @@
+"""
+Benchmark: najia latency with and without the 时辰 GanZhi cache.
+
+- ``off``: ``ganzhi_cache`` disabled, the four pillars and 旬空 are computed
+  on every call (``compute_daily``)
+- ``on``: the pillars of each 时辰 are computed once and then served from
+  ``ganzhi_cache`` (the current path)
+
+Readings are cast every few minutes over one day, the way live requests
+arrive, so almost every lookup after the first of a 时辰 is a hit. Both
+``NajiaOracle._daily`` alone and a full ``compile`` are measured; the
+cache statistics of the ``on`` run are printed at the end.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.bench_ganzhi_cache
+"""
+
+import itertools
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from utils.najia_oracle import NajiaOracle, ganzhi_cache
+
+PARAMS = [3, 1, 2, 4, 1, 2]
+
+
+def run(number: int = 2000) -> List[Dict[str, Any]]:
+    """
+    Measure µs per call with the cache off and on.
+
+    Args:
+        number: Calls per measurement
+
+    Returns:
+        One row per operation with µs for off and on, plus the cache info
+    """
+    start = datetime(2024, 6, 1)
+    dates = [start + timedelta(minutes=3 * i) for i in range(number)]
+    oracle = NajiaOracle()
+    operations: Dict[str, Callable[[datetime], Any]] = {
+        "_daily": oracle._daily,
+        "compile": lambda date: NajiaOracle().compile(params=PARAMS, date=date).get_najia_result(),
+    }
+
+    def timed(func: Callable[[datetime], Any]) -> float:
+        cycle = itertools.cycle(dates)
+        begin = time.perf_counter()
+        for _ in range(number):
+            func(next(cycle))
+        return (time.perf_counter() - begin) / number * 1e6
+
+    rows = []
+    try:
+        for name, func in operations.items():
+            ganzhi_cache.enabled = False
+            off = timed(func)
+            ganzhi_cache.enabled = True
+            ganzhi_cache.clear()
+            on = timed(func)
+            rows.append({"operation": name, "off": off, "on": on})
+    finally:
+        ganzhi_cache.enabled = True
+    rows[-1]["cache"] = ganzhi_cache.info()
+    return rows
+
+
+if __name__ == "__main__":
+    rows = run()
+    print(f"{'operation':<10} {'off µs':>9} {'on µs':>9} {'speed-up':>9}")
+    for row in rows:
+        print(f"{row['operation']:<10} {row['off']:>9.1f} {row['on']:>9.1f} {row['off'] / row['on']:>8.1f}×")
+    print(rows[-1]["cache"])
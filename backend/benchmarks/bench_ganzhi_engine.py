@@ -0,0 +1,62 @@
+"""
+Micro-benchmark: the four pillars and 旬空 of a moment.
+
+- ``lunar``: ``lunar_python`` (``Solar`` -> ``Lunar`` -> ``getBaZi``), the
+  previous path of ``NajiaOracle._daily``
+- ``native``: integer sexagenary arithmetic on the shipped 节 table
+  (``utils.ganzhi.daily``, the current path)
+
+Before timing, ``verify_against_lunar`` checks that both agree on every
+hour of 2024 and around every 节 of that year. Moments are random over
+1900-2100.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.bench_ganzhi_engine
+"""
+
+import itertools
+import random
+import time
+import timeit
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+from utils import ganzhi
+from utils.najia_oracle import lunar_daily
+
+
+def run(number: int = 2000) -> Dict[str, Any]:
+    """
+    Measure µs per call of both engines.
+
+    Args:
+        number: Calls per timing repeat
+
+    Returns:
+        µs per call of both engines, the number of verified moments and
+        the one-off table load time
+    """
+    start = time.perf_counter()
+    ganzhi.jieqi_table.cache_clear()
+    ganzhi.jieqi_table()
+    load_ms = (time.perf_counter() - start) * 1000
+    checked = ganzhi.verify_against_lunar(datetime(2024, 1, 1), datetime(2025, 1, 1))
+
+    rng = random.Random(0)
+    first = datetime(1900, 1, 1)
+    span = int((datetime(2101, 1, 1) - first).total_seconds())
+    dates = [first + timedelta(seconds=rng.randrange(span)) for _ in range(number)]
+
+    def timed(func) -> float:
+        cycle = itertools.cycle(dates)
+        return min(timeit.repeat(lambda: func(next(cycle)), number=number, repeat=3)) / number * 1e6
+
+    return {"lunar": timed(lunar_daily), "native": timed(ganzhi.daily), "verified": checked, "load_ms": load_ms}
+
+
+if __name__ == "__main__":
+    row = run()
+    print(f"verified {row['verified']} moments against lunar_python; table load {row['load_ms']:.2f} ms")
+    print(f"{'lunar µs':>10} {'native µs':>10} {'speed-up':>9}")
+    print(f"{row['lunar']:>10.1f} {row['native']:>10.2f} {row['lunar'] / row['native']:>8.0f}×")
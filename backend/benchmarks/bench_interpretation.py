@@ -0,0 +1,79 @@
+"""
+Micro-benchmark: rendering the interpretation text of a reading.
+
+- ``probing``: every hexagram field probed and formatted on each call
+  (``compile_fragments`` per reading, the work the previous
+  ``generate_interpretation`` did inline)
+- ``fragments``: ``generate_interpretation`` joining the question, the
+  corpus' precompiled fragments and the changing lines (the current path)
+
+Readings cycle through all 4096 casts so both changed and unchanged
+readings are measured. Also reports the one-off cost of compiling the
+fragments of a corpus.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.bench_interpretation
+"""
+
+import itertools
+import time
+import timeit
+from typing import Any, Dict, List
+
+from utils.casting import cast_lines
+from utils.divination_logic import generate_interpretation, get_changed_from_cast, get_reading_from_cast
+from utils.hexagram_data import hexagram_manager
+from utils.interpretation_templates import InterpretationTemplates, compile_fragments, render_interpretation
+
+
+def run(number: int = 4096) -> List[Dict[str, Any]]:
+    """
+    Measure µs per interpretation of both strategies in every language.
+
+    Args:
+        number: Readings per timing repeat
+
+    Returns:
+        One row per language with µs per reading and the compile time
+    """
+    rows = []
+    for language in ("zh", "en"):
+        corpus = hexagram_manager.get_corpus(language)
+        readings = [
+            (get_reading_from_cast(cast, language), get_changed_from_cast(cast, language), cast_lines(cast))
+            for cast in range(4096)
+        ]
+
+        probing_readings = itertools.cycle(readings)
+        fragments_readings = itertools.cycle(readings)
+
+        def probing():
+            original, changed, lines = next(probing_readings)
+            return render_interpretation(
+                "问题", compile_fragments(original),
+                compile_fragments(changed) if changed else None, lines
+            )
+
+        def fragments():
+            original, changed, lines = next(fragments_readings)
+            return generate_interpretation("问题", original, changed, lines)
+
+        start = time.perf_counter()
+        InterpretationTemplates(corpus)
+        compile_ms = (time.perf_counter() - start) * 1000
+        corpus.interpretations
+        rows.append({
+            "language": language,
+            "probing": min(timeit.repeat(probing, number=number, repeat=5)) / number * 1e6,
+            "fragments": min(timeit.repeat(fragments, number=number, repeat=5)) / number * 1e6,
+            "compile_ms": compile_ms,
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    print(f"{'lang':<5} {'probing µs':>11} {'fragments µs':>13} {'speed-up':>9} {'compile ms':>11}")
+    for row in run():
+        print(f"{row['language']:<5} {row['probing']:>11.2f} {row['fragments']:>13.2f} "
+              f"{row['probing'] / row['fragments']:>8.1f}× {row['compile_ms']:>11.2f}")
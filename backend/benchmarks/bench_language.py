@@ -0,0 +1,78 @@
+"""
+Micro-benchmark: alternating zh/en readings.
+
+Compares the previous behaviour, where switching language dropped the cache
+and re-read and re-validated the JSON corpus, with the resident per-language
+corpora selected per request.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.bench_language
+"""
+
+import random
+import time
+from typing import Optional
+
+from utils.hexagram_data import HexagramDataManager, normalize_language
+
+
+class _ReloadingManager(HexagramDataManager):
+    """Reference manager reproducing the old reload-on-language-switch cache."""
+    
+    def __init__(self):
+        super().__init__()
+        self._loaded_language: Optional[str] = None
+    
+    def get_corpus(self, language: Optional[str] = None):
+        language = normalize_language(language)
+        if language != self._loaded_language:
+            self._corpora = {language: self._load_corpus(language)}
+            self._loaded_language = language
+        return self._corpora[language]
+
+
+def _time_readings(manager: HexagramDataManager, readings: int, seed: int = 7) -> float:
+    """Run alternating zh/en readings (two lookups each) and return seconds."""
+    rng = random.Random(seed)
+    languages = ("zh", "en")
+    start = time.perf_counter()
+    for i in range(readings):
+        language = languages[i % 2]
+        code = rng.getrandbits(6)
+        manager.get_hexagram_by_code(code, language)
+        manager.get_hexagram_by_code(code ^ rng.getrandbits(6), language)
+    return time.perf_counter() - start
+
+
+def run(readings: int = 200) -> dict:
+    """
+    Time alternating-language readings with and without resident corpora.
+    
+    Args:
+        readings: Number of readings, alternating between zh and en
+        
+    Returns:
+        Dictionary with per-reading cost in microseconds and the speedup
+    """
+    reloading = _ReloadingManager()
+    resident = HexagramDataManager()
+    resident.load_all()
+    
+    reload_seconds = _time_readings(reloading, readings)
+    resident_seconds = _time_readings(resident, readings)
+    
+    return {
+        "readings": readings,
+        "reload_us_per_reading": reload_seconds / readings * 1e6,
+        "resident_us_per_reading": resident_seconds / readings * 1e6,
+        "speedup": reload_seconds / resident_seconds if resident_seconds else float("inf"),
+    }
+
+
+if __name__ == "__main__":
+    result = run()
+    print(f"readings (zh/en alternating): {result['readings']}")
+    print(f"reload on switch:  {result['reload_us_per_reading']:.1f} us/reading")
+    print(f"resident corpora:  {result['resident_us_per_reading']:.1f} us/reading")
+    print(f"speedup:           {result['speedup']:.0f}x")
@@ -0,0 +1,88 @@
+"""
+Micro-benchmark: per-reading hexagram lookup cost.
+
+Compares the previous linear scan over the cached hexagrams (string trigram
+comparison) with the 64-slot code table built by ``HexagramDataManager``.
+A reading performs two lookups: the original and the changed hexagram.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.bench_lookup
+"""
+
+import random
+import timeit
+from typing import List, Optional, Tuple
+
+from models.schemas import Hexagram
+from utils.hexagram_data import HexagramDataManager, code_to_trigrams
+
+
+def _linear_scan_lookup(hexagrams: List[Hexagram], upper_trigram: str,
+                        lower_trigram: str) -> Optional[Hexagram]:
+    """Reference implementation of the lookup before the code table existed."""
+    for hexagram in hexagrams:
+        if (hexagram.upperTrigram == upper_trigram and
+                hexagram.lowerTrigram == lower_trigram):
+            return hexagram
+    return None
+
+
+def _sample_readings(count: int, seed: int = 42) -> List[Tuple[int, int]]:
+    """Generate (original_code, changed_code) pairs for random readings."""
+    rng = random.Random(seed)
+    readings = []
+    for _ in range(count):
+        code = rng.getrandbits(6)
+        mask = rng.getrandbits(6)
+        readings.append((code, code ^ mask))
+    return readings
+
+
+def run(readings: int = 10000, repeat: int = 5) -> dict:
+    """
+    Time per-reading lookup cost with the linear scan and the code table.
+    
+    Args:
+        readings: Number of readings per timing run
+        repeat: Number of timing runs (the best one is reported)
+        
+    Returns:
+        Dictionary with per-reading cost in nanoseconds and the speedup
+    """
+    manager = HexagramDataManager()
+    hexagrams = manager.get_all_hexagrams()
+    samples = _sample_readings(readings)
+    trigram_samples = [
+        (code_to_trigrams(original), code_to_trigrams(changed))
+        for original, changed in samples
+    ]
+    
+    def linear() -> None:
+        for (ou, ol), (cu, cl) in trigram_samples:
+            _linear_scan_lookup(hexagrams, ou, ol)
+            _linear_scan_lookup(hexagrams, cu, cl)
+    
+    def table() -> None:
+        lookup = manager.get_hexagram_by_code
+        for original, changed in samples:
+            lookup(original)
+            lookup(changed)
+    
+    linear_best = min(timeit.repeat(linear, number=1, repeat=repeat))
+    table_best = min(timeit.repeat(table, number=1, repeat=repeat))
+    
+    return {
+        "readings": readings,
+        "linear_ns_per_reading": linear_best / readings * 1e9,
+        "table_ns_per_reading": table_best / readings * 1e9,
+        "speedup": linear_best / table_best if table_best else float("inf"),
+    }
+
+
+if __name__ == "__main__":
+    result = run()
+    print(f"readings:           {result['readings']}")
+    print(f"linear scan:        {result['linear_ns_per_reading']:.0f} ns/reading")
+    print(f"code table:         {result['table_ns_per_reading']:.0f} ns/reading")
+    print(f"speedup:            {result['speedup']:.1f}x")
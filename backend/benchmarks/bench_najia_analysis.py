@@ -0,0 +1,69 @@
+"""
+Micro-benchmark: the najia 旺衰 / 生克 / 动变 analysis.
+
+- ``analyze``: ``analyze_chart`` on its own, over all 4096 charts with the
+  月建 and 日辰 varying
+- ``describe``: rendering an analysis to text (``describe_line`` for the
+  six lines, ``describe_shi_ying``, ``describe_yongshen``)
+- ``interpretation``: the full ``generate_najia_interpretation`` with the
+  chart, which includes both
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.bench_najia_analysis
+"""
+
+import itertools
+import timeit
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from utils.divination_logic import generate_najia_interpretation
+from utils.ganzhi import LiuQin
+from utils.najia_analysis import analyze_chart, describe_line, describe_shi_ying, describe_yongshen
+from utils.najia_oracle import NajiaChart, NajiaOracle
+
+_LUNAR = {'xkong': '戌亥', 'gz': {'year': '甲辰', 'month': '己巳', 'day': '甲子', 'hour': '己巳'}}
+
+
+def _describe(analysis: Any) -> List[str]:
+    parts = [describe_line(line) for line in reversed(analysis.lines)]
+    parts.append(describe_shi_ying(analysis))
+    parts.extend(describe_yongshen(analysis))
+    return parts
+
+
+def run(number: int = 4096) -> List[Dict[str, float]]:
+    """
+    Measure µs per call of the analysis, its text and the interpretation.
+
+    Args:
+        number: Calls per timing repeat
+
+    Returns:
+        One row per operation with µs per call
+    """
+    charts = [(NajiaChart(index & 63, index >> 6, 0), index % 12, index % 60) for index in range(4096)]
+    analyses = [analyze_chart(chart, month, day, LiuQin.QICAI) for chart, month, day in charts]
+    date = datetime(2024, 6, 1, 10, 30)
+    readings = []
+    for params in itertools.islice(itertools.product((1, 2, 3, 4), repeat=6), 0, 4096, 4):
+        oracle = NajiaOracle().compile(params=list(params), date=date, lunar=_LUNAR)
+        readings.append((oracle.get_najia_result(), oracle.chart))
+
+    def timed(items: List[Any], func: Callable[[Any], object]) -> float:
+        cycle = itertools.cycle(items)
+        return min(timeit.repeat(lambda: func(next(cycle)), number=number, repeat=5)) / number * 1e6
+
+    return [
+        {"operation": "analyze", "µs": timed(charts, lambda c: analyze_chart(c[0], c[1], c[2], LiuQin.QICAI))},
+        {"operation": "describe", "µs": timed(analyses, _describe)},
+        {"operation": "interpretation",
+         "µs": timed(readings, lambda r: generate_najia_interpretation(r[0], "求财如何", r[1]))},
+    ]
+
+
+if __name__ == "__main__":
+    print(f"{'operation':<15} {'µs':>8}")
+    for row in run():
+        print(f"{row['operation']:<15} {row['µs']:>8.2f}")
@@ -0,0 +1,77 @@
+"""
+Benchmark: many najia charts, one request each vs one batch request.
+
+- ``single``: one ``POST /api/divination/najia`` per chart with manual line
+  values; the chart, calendar and interpretation are built on the event loop
+- ``batch``: one ``POST /api/divination/najia/batch`` streaming NDJSON; the
+  calendar is looked up once per 时辰 and charting runs off the loop, in a
+  thread or, for large batches, on the process pool
+
+Runs the application in-process (ASGI through ``TestClient``, no network).
+The batch is measured twice so the one-off start of the pool workers is
+reported separately.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.bench_najia_batch
+"""
+
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+os.environ.setdefault("DeepSeek_API_KEY", "benchmark")
+os.environ.setdefault("DATA_RELOAD_INTERVAL", "0")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from main import app  # noqa: E402
+
+
+def run(number: int = 2000) -> Dict[str, Any]:
+    """
+    Measure charts per second of single and batch requests.
+
+    Args:
+        number: Charts per measurement
+
+    Returns:
+        Charts/s of single requests, of the first (cold) batch and of a
+        second batch
+    """
+    rng = random.Random(0)
+    start = datetime(2024, 6, 1, 8)
+    items = [
+        {
+            "params": [rng.randint(1, 4) for _ in range(6)],
+            "date": (start + timedelta(minutes=rng.randrange(12 * 60))).isoformat(),
+            "question": f"事业{i}",
+        }
+        for i in range(number)
+    ]
+    with TestClient(app) as client:
+        begin = time.perf_counter()
+        for item in items:
+            lines = [{1: 7, 2: 8, 3: 9, 4: 6}[p] for p in item["params"]]
+            client.post("/api/divination/najia",
+                        json={"question": item["question"], "hexagram_data": {"lines": lines}}).raise_for_status()
+        single = number / (time.perf_counter() - begin)
+
+        def batch() -> float:
+            begin = time.perf_counter()
+            response = client.post("/api/divination/najia/batch", json={"items": items})
+            response.raise_for_status()
+            assert response.text.count("\n") == number
+            return number / (time.perf_counter() - begin)
+
+        cold = batch()
+        warm = batch()
+    return {"single": single, "cold": cold, "batch": warm, "cpus": os.cpu_count()}
+
+
+if __name__ == "__main__":
+    row = run()
+    print(f"{'single/s':>9} {'batch/s':>9} {'speed-up':>9} {'cold batch/s':>13}  ({row['cpus']} CPUs)")
+    print(f"{row['single']:>9.0f} {row['batch']:>9.0f} {row['batch'] / row['single']:>8.1f}× {row['cold']:>13.0f}")
@@ -0,0 +1,87 @@
+"""
+Micro-benchmark: string-coded vs integer-coded najia charts.
+
+- ``compile``: ``NajiaOracle.compile`` followed by ``get_najia_result``.
+  ``strings`` stores the string tables (``_static_table``) and the 六神 list
+  in the oracle, the previous path; ``codes`` stores a ``NajiaChart``
+  (hexagram code, moving-line mask, 六神 offset) and renders strings only
+  in ``get_najia_result``.
+- ``interpretation``: ``generate_najia_interpretation`` from the result
+  dict alone (``strings``) and with the chart (``codes``), where the chart
+  section is cached per chart and 用神 / 动爻 are decided on the codes.
+
+Before timing, both paths are checked to give identical results for every
+one of the 4096 parameter combinations. The calendar is fixed, so the four
+pillars do not dominate.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.bench_najia_core
+"""
+
+import itertools
+import timeit
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from utils.divination_logic import generate_najia_interpretation
+from utils.najia_oracle import NajiaOracle, get_god6
+
+_LUNAR = {'xkong': '戌亥', 'gz': {'year': '甲辰', 'month': '己巳', 'day': '甲子', 'hour': '己巳'}}
+_DATE = datetime(2024, 6, 1, 10, 30)
+_QUESTION = "求财如何"
+
+
+def _compile_strings(params: List[int]) -> Dict[str, Any]:
+    """The previous compile: string tables and the 六神 list kept in ``data``."""
+    oracle = NajiaOracle()
+    oracle.data = {
+        'params': params, 'gender': '', 'title': '', 'guaci': False, 'date': _DATE, 'lunar': _LUNAR,
+        'god6': get_god6(_LUNAR['gz']['day']), **oracle._static_table(params),
+    }
+    return oracle.get_najia_result()
+
+
+def _compile_codes(params: List[int]) -> Dict[str, Any]:
+    return NajiaOracle().compile(params=params, date=_DATE, lunar=_LUNAR).get_najia_result()
+
+
+def run(number: int = 4096) -> List[Dict[str, float]]:
+    """
+    Measure µs per call of both paths over all parameter combinations.
+
+    Args:
+        number: Calls per timing repeat
+
+    Returns:
+        One row per operation with µs for strings and codes
+    """
+    params = [list(p) for p in itertools.product((1, 2, 3, 4), repeat=6)]
+    readings = []
+    for p in params:
+        oracle = NajiaOracle().compile(params=p, date=_DATE, lunar=_LUNAR)
+        result = oracle.get_najia_result()
+        assert result == _compile_strings(p), p
+        text = generate_najia_interpretation(result, _QUESTION)
+        assert generate_najia_interpretation(result, _QUESTION, oracle.chart) == text, p
+        readings.append((result, oracle.chart))
+
+    def timed(items: List[Any], func: Callable[[Any], object]) -> float:
+        cycle = itertools.cycle(items)
+        return min(timeit.repeat(lambda: func(next(cycle)), number=number, repeat=5)) / number * 1e6
+
+    return [
+        {"operation": "compile", "strings": timed(params, _compile_strings), "codes": timed(params, _compile_codes)},
+        {
+            "operation": "interpretation",
+            "strings": timed(readings, lambda r: generate_najia_interpretation(r[0], _QUESTION)),
+            "codes": timed(readings, lambda r: generate_najia_interpretation(r[0], _QUESTION, r[1])),
+        },
+    ]
+
+
+if __name__ == "__main__":
+    print(f"{'operation':<15} {'strings µs':>11} {'codes µs':>9} {'speed-up':>9}")
+    for row in run():
+        print(f"{row['operation']:<15} {row['strings']:>11.2f} {row['codes']:>9.2f} "
+              f"{row['strings'] / row['codes']:>8.1f}×")
@@ -0,0 +1,65 @@
+"""
+Micro-benchmark: the date-independent part of ``NajiaOracle.compile``.
+
+- ``rules``: 世应, 卦宫, 纳甲, 六亲, 伏神 and 变卦 derived from the string
+  rules on every call (``_static_rules``, the previous path)
+- ``table``: lookups in the precomputed 64-hexagram / 4096-transformation
+  tables (``_static_table``, the current path)
+
+Before timing, ``verify_tables`` checks that both agree for every one of
+the 4096 parameter combinations. Also reports a full ``compile`` with a
+fixed ``_daily`` result, so the calendar computation does not dominate.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.bench_najia_table
+"""
+
+import itertools
+import timeit
+from datetime import datetime
+from typing import Callable, Dict, List
+from unittest import mock
+
+from utils import najia_oracle
+from utils.najia_oracle import NajiaOracle, verify_tables
+
+_LUNAR = {'xkong': '戌亥', 'gz': {'year': '甲辰', 'month': '己巳', 'day': '甲子', 'hour': '己巳'}}
+
+
+def run(number: int = 4096) -> List[Dict[str, float]]:
+    """
+    Measure µs per call of both paths over all parameter combinations.
+
+    Args:
+        number: Calls per timing repeat
+
+    Returns:
+        One row per operation with µs for rules and table
+    """
+    verify_tables()
+    oracle = NajiaOracle()
+    params = [list(p) for p in itertools.product((1, 2, 3, 4), repeat=6)]
+    date = datetime(2024, 6, 1, 10, 30)
+
+    def timed(func: Callable[[List[int]], object]) -> float:
+        cycle = itertools.cycle(params)
+        return min(timeit.repeat(lambda: func(next(cycle)), number=number, repeat=5)) / number * 1e6
+
+    def compile_reading(p: List[int]) -> object:
+        return NajiaOracle().compile(params=p, date=date).get_najia_result()
+
+    rows = [{"operation": "static", "rules": timed(oracle._static_rules), "table": timed(oracle._static_table)}]
+    with mock.patch.object(NajiaOracle, "_daily", return_value=_LUNAR):
+        table = timed(compile_reading)
+        # 关闭查表，compile 全部按口诀计算
+        with mock.patch.object(najia_oracle, "_is_table_params", return_value=False):
+            rules = timed(compile_reading)
+    rows.append({"operation": "compile", "rules": rules, "table": table})
+    return rows
+
+
+if __name__ == "__main__":
+    print(f"{'operation':<10} {'rules µs':>9} {'table µs':>9} {'speed-up':>9}")
+    for row in run():
+        print(f"{row['operation']:<10} {row['rules']:>9.2f} {row['table']:>9.2f} {row['rules'] / row['table']:>8.1f}×")
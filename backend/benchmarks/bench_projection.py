@@ -0,0 +1,127 @@
+"""
+Micro-benchmark: payload size and latency of field projections.
+
+For the common ``fields=`` / ``exclude=`` projections, compares
+
+- ``fragments``: joining the catalogue's pre-serialized field fragments
+  (what the routes do)
+- ``serialize``: dumping the hexagram, dropping fields and encoding the
+  rest (what a projection without fragments would cost)
+
+for a single hexagram, the 64-hexagram list and a divination reading with
+changing lines.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.bench_projection
+"""
+
+import timeit
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.casting import cast_to_lines, pack_cast
+from utils.catalogue_cache import PROJECTABLE_FIELDS, encode_json, projection_mask
+from utils.hexagram_data import hexagram_manager
+from utils.reading_view import build_divination_body
+
+
+PROJECTIONS: Dict[str, Optional[int]] = {
+    "full": None,
+    "fields=name,symbol,kingWen": projection_mask("name,symbol,kingWen"),
+    "fields=number,name,chineseName": projection_mask("number,name,chineseName"),
+    "exclude=lines,interpretations": projection_mask(exclude="lines,interpretations"),
+}
+
+# 乾卦初爻、五爻为变爻（老阳），变卦为鼎卦方向的典型读数
+_CODE = 0b111111
+_CHANGING = 0b010001
+
+
+def _filtered(data: Dict[str, Any], mask: Optional[int]) -> Dict[str, Any]:
+    if mask is None:
+        return data
+    return {field: data[field] for i, field in enumerate(PROJECTABLE_FIELDS)
+            if mask >> i & 1 and field in data}
+
+
+def _reading_inputs():
+    original = hexagram_manager.get_reading(_CODE, _CHANGING)
+    changed = hexagram_manager.get_reading(_CODE ^ _CHANGING)
+    return original, changed, pack_cast(_CODE, _CHANGING)
+
+
+def _cases(mask: Optional[int]) -> Dict[str, Dict[str, Callable[[], bytes]]]:
+    catalogue = hexagram_manager.get_catalogue()
+    corpus = hexagram_manager.get_corpus()
+    numbers = [h.number for h in corpus.hexagrams]
+    original, changed, cast = _reading_inputs()
+    timestamp = datetime(2024, 1, 1)
+
+    def serialize_reading() -> bytes:
+        return encode_json({
+            'originalHexagram': _filtered(original.to_dict(), mask),
+            'changedHexagram': _filtered(changed.to_dict(), mask),
+            'lines': [line.model_dump() for line in cast_to_lines(cast)],
+            'question': "q",
+            'timestamp': timestamp.isoformat(),
+            'interpretation': "",
+        })
+
+    return {
+        "hexagram": {
+            # 单卦投影不缓存，每次请求都重新拼接
+            "fragments": lambda: catalogue.fragments(corpus.by_number[1]).project(mask),
+            "serialize": lambda: encode_json(_filtered(corpus.payload(1), mask)),
+        },
+        "list(64)": {
+            "fragments": lambda: catalogue.hexagram_list(numbers, mask),
+            "serialize": lambda: encode_json({
+                "hexagrams": [_filtered(corpus.payload(number), mask) for number in numbers],
+                "total": len(numbers),
+            }),
+        },
+        "divination": {
+            "fragments": lambda: build_divination_body(
+                original, changed, cast, "q", timestamp, "", catalogue, mask
+            ),
+            "serialize": serialize_reading,
+        },
+    }
+
+
+def _time_us(func: Callable[[], bytes], number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def run(number: int = 200) -> List[Dict[str, Any]]:
+    """
+    Measure payload size and latency of every projection.
+
+    Args:
+        number: Calls per timing repeat
+
+    Returns:
+        One row per (target, projection) with bytes and µs per strategy
+    """
+    hexagram_manager.load_all()
+    rows = []
+    for projection, mask in PROJECTIONS.items():
+        for target, strategies in _cases(mask).items():
+            bodies = {name: func() for name, func in strategies.items()}
+            assert bodies["fragments"] == bodies["serialize"], (target, projection)
+            rows.append({
+                "target": target,
+                "projection": projection,
+                "bytes": len(bodies["fragments"]),
+                **{f"{name}_us": _time_us(func, number) for name, func in strategies.items()},
+            })
+    return rows
+
+
+if __name__ == "__main__":
+    rows = run()
+    print(f"{'target':<12} {'projection':<32} {'bytes':>8} {'fragments µs':>13} {'serialize µs':>13}")
+    for row in rows:
+        print(f"{row['target']:<12} {row['projection']:<32} {row['bytes']:>8} "
+              f"{row['fragments_us']:>13.1f} {row['serialize_us']:>13.1f}")
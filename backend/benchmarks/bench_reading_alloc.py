@@ -0,0 +1,152 @@
+"""
+Micro-benchmark: allocations per reading with tracemalloc.
+
+Compares three ways of producing the original and changed hexagram of a
+reading and serializing them:
+
+- ``legacy``: the previous code, building new ``Line`` models and writing
+  them onto the cached ``Hexagram`` (unsafe under concurrency)
+- ``deepcopy``: the naive fix, deep-copying the cached hexagram first
+- ``view``: read-only ``HexagramReading`` views over the cache
+
+``legacy`` and ``deepcopy`` run against fully materialized ``Hexagram``
+models, as the corpus was held before hydration became lazy.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.bench_reading_alloc
+"""
+
+import random
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from models.schemas import Hexagram, Line
+from utils.divination_logic import (
+    data_manager,
+    get_changed_hexagram,
+    get_hexagram_from_lines,
+    lines_to_changing_mask,
+    lines_to_code,
+)
+
+
+# 六爻编码 -> 完整 Hexagram 模型，由 run() 填充
+_EAGER: List[Optional[Hexagram]] = []
+
+
+def _random_lines(rng: random.Random) -> List[Line]:
+    lines = []
+    for position in range(1, 7):
+        value = rng.choice((6, 7, 7, 7, 8, 8, 8, 9))
+        lines.append(Line(position=position, type='yang' if value in (7, 9) else 'yin',
+                          changing=value in (6, 9)))
+    return lines
+
+
+def _merge_lines(hexagram: Hexagram, lines: List[Line]) -> List[Line]:
+    """The per-reading line merge performed by the previous implementation."""
+    return [
+        Line(
+            position=line.position,
+            type=line.type,
+            changing=line.changing,
+            text=hexagram.lines[i].text,
+            explanation=hexagram.lines[i].explanation,
+            image=hexagram.lines[i].image,
+            interpretations=hexagram.lines[i].interpretations,
+        )
+        for i, line in enumerate(lines)
+    ]
+
+
+def _changed_lines(lines: List[Line]) -> List[Line]:
+    return [
+        Line(position=line.position,
+             type=('yin' if line.type == 'yang' else 'yang') if line.changing else line.type)
+        for line in lines
+    ]
+
+
+def _legacy(lines: List[Line]) -> list:
+    results = []
+    for reading_lines in (lines, _changed_lines(lines)):
+        hexagram = _EAGER[lines_to_code(reading_lines)]
+        hexagram.lines = _merge_lines(hexagram, reading_lines)
+        results.append((hexagram.lines, hexagram.model_dump()))
+    return results
+
+
+def _deepcopy(lines: List[Line]) -> list:
+    results = []
+    for reading_lines in (lines, _changed_lines(lines)):
+        cached = _EAGER[lines_to_code(reading_lines)]
+        hexagram = cached.model_copy(deep=True)
+        hexagram.lines = _merge_lines(hexagram, reading_lines)
+        results.append((hexagram, hexagram.model_dump()))
+    return results
+
+
+def _view(lines: List[Line]) -> list:
+    original = get_hexagram_from_lines(lines)
+    results = [(original, original.to_dict())]
+    if lines_to_changing_mask(lines):
+        changed = get_changed_hexagram(lines)
+        results.append((changed, changed.to_dict()))
+    return results
+
+
+def _measure(func: Callable[[List[Line]], list], samples: List[List[Line]]) -> Dict[str, float]:
+    """
+    Run ``func`` over all samples, keeping every result alive, and report the
+    memory blocks and bytes allocated per reading.
+    """
+    kept = []
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for lines in samples:
+        kept.append(func(lines))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    
+    stats = after.compare_to(before, 'filename')
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+    del kept
+    return {
+        "blocks_per_reading": blocks / len(samples),
+        "bytes_per_reading": size / len(samples),
+    }
+
+
+def run(readings: int = 500, seed: int = 3) -> Dict[str, Dict[str, float]]:
+    """
+    Measure allocation cost per reading for each strategy.
+    
+    Args:
+        readings: Number of random readings per strategy
+        seed: Seed for the random line generator
+        
+    Returns:
+        Mapping of strategy name to allocated blocks and bytes per reading
+    """
+    rng = random.Random(seed)
+    samples = [_random_lines(rng) for _ in range(readings)]
+    data_manager.load_all()
+    _EAGER[:] = [h.to_model() if h is not None else None
+                 for h in data_manager.get_corpus().by_code]
+    for lines in samples[:10]:
+        _view(lines)  # warm up lazy payload caches
+    
+    results = {}
+    for name, func in (("view", _view), ("deepcopy", _deepcopy), ("legacy", _legacy)):
+        results[name] = _measure(func, samples)
+    _EAGER.clear()
+    return results
+
+
+if __name__ == "__main__":
+    results = run()
+    print(f"{'strategy':<10} {'blocks/reading':>15} {'bytes/reading':>15}")
+    for name, stats in results.items():
+        print(f"{name:<10} {stats['blocks_per_reading']:>15.0f} {stats['bytes_per_reading']:>15.0f}")
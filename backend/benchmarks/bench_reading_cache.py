@@ -0,0 +1,92 @@
+"""
+Benchmark: ``POST /api/divination/manual`` with and without the reading cache.
+
+Runs the application in-process (ASGI through ``TestClient``, no network)
+and measures requests per second for
+
+- ``miss``: the corpus' reading cache is cleared before every request, so
+  the hexagrams, interpretation and body are built each time
+- ``hit``: the same line values requested again, the body is spliced from
+  the cache
+
+each with and without ``include_najia``. Questions differ on every request.
+The body alone (``_reading_body``, without the HTTP stack) is timed the
+same way.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.bench_reading_cache
+"""
+
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+os.environ.setdefault("DeepSeek_API_KEY", "benchmark")
+os.environ.setdefault("DATA_RELOAD_INTERVAL", "0")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from main import app  # noqa: E402
+from routers.divination import _reading_body  # noqa: E402
+from utils.casting import cast_from_values  # noqa: E402
+from utils.hexagram_data import hexagram_manager  # noqa: E402
+
+LINES = [9, 7, 8, 6, 7, 8]
+
+
+def run(number: int = 500) -> List[Dict[str, Any]]:
+    """
+    Measure requests per second on cache misses and hits.
+
+    Args:
+        number: Requests per measurement
+
+    Returns:
+        One row per najia setting with requests/s of misses and hits and
+        µs per body
+    """
+    cast = cast_from_values(LINES)
+    rows = []
+    with TestClient(app) as client:
+        cache = hexagram_manager.get_corpus().reading_cache
+
+        def measure(params: Dict[str, str], clear: bool) -> float:
+            start = time.perf_counter()
+            for i in range(number):
+                if clear:
+                    cache.clear()
+                client.post("/api/divination/manual", params=params,
+                            json={"question": f"问题{i}", "lines": LINES}).raise_for_status()
+            return number / (time.perf_counter() - start)
+
+        def body_us(najia: bool, clear: bool) -> float:
+            start = time.perf_counter()
+            for i in range(number):
+                if clear:
+                    cache.clear()
+                _reading_body(cast, f"问题{i}", None, najia, None, datetime.now())
+            return (time.perf_counter() - start) / number * 1e6
+
+        for najia in (False, True):
+            params = {"include_najia": "true"} if najia else {}
+            measure(params, False)
+            rows.append({
+                "najia": najia,
+                "miss": measure(params, True),
+                "hit": measure(params, False),
+                "miss µs": body_us(najia, True),
+                "hit µs": body_us(najia, False),
+            })
+        rows[-1]["cache"] = cache.info()
+    return rows
+
+
+if __name__ == "__main__":
+    rows = run()
+    print(f"{'najia':<6} {'miss/s':>9} {'hit/s':>9} {'speed-up':>9} {'body miss µs':>13} {'body hit µs':>12}")
+    for row in rows:
+        print(f"{str(row['najia']):<6} {row['miss']:>9.0f} {row['hit']:>9.0f} {row['hit'] / row['miss']:>8.1f}× "
+              f"{row['miss µs']:>13.1f} {row['hit µs']:>12.1f}")
+    print(rows[-1]["cache"])
@@ -0,0 +1,73 @@
+"""
+Micro-benchmark: casting throughput of every random generator.
+
+Single readings (what ``/divination`` does per request):
+
+- ``global``: ``cast_coins()`` on the module-level ``random`` state (the
+  previous behaviour, shared by every request)
+- ``seeded``: a fresh seed and ``SplitMix64`` per reading
+- ``seeded replay``: a seed that was cast before
+- ``secure``: ``secrets.SystemRandom``
+- ``yarrow secure``: the yarrow-stalk engine on ``secrets.SystemRandom``
+
+Batches (what ``/divination/batch`` does), 10000 readings from one
+generator of each kind (a Mersenne Twister for ``seeded``), plus the
+yarrow-stalk engine on the module-level generator.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.bench_rng
+"""
+
+import timeit
+from typing import Callable, Dict, List
+
+from utils.casting import cast_coins, cast_coins_batch
+from utils.casting_engines import get_engine
+from utils.rng import cast_reading, cast_readings
+
+BATCH = 10000
+
+
+def _per_second(func: Callable[[], object], number: int, readings: int = 1) -> float:
+    return readings * number / min(timeit.repeat(func, number=number, repeat=5))
+
+
+def run(number: int = 20000) -> List[Dict[str, object]]:
+    """
+    Measure readings per second of every generator.
+
+    Args:
+        number: Single readings per timing repeat
+
+    Returns:
+        One row per (kind, generator) with readings/s
+    """
+    replay_seed = cast_reading("seeded")[1]
+
+    singles = {
+        "global": cast_coins,
+        "seeded": lambda: cast_reading("seeded"),
+        "seeded replay": lambda: cast_reading("seeded", replay_seed),
+        "secure": lambda: cast_reading("secure"),
+        "yarrow secure": lambda: cast_reading("secure", method="yarrow"),
+    }
+    batches = {
+        "global": lambda: cast_coins_batch(BATCH),
+        "seeded": lambda: cast_readings(BATCH, "seeded"),
+        "secure": lambda: cast_readings(BATCH, "secure"),
+        "yarrow global": lambda: get_engine("yarrow").cast_batch(BATCH),
+    }
+    rows = []
+    for name, func in singles.items():
+        rows.append({"kind": "single", "generator": name, "per_s": _per_second(func, number)})
+    for name, func in batches.items():
+        rows.append({"kind": f"batch({BATCH})", "generator": name,
+                     "per_s": _per_second(func, 20, BATCH)})
+    return rows
+
+
+if __name__ == "__main__":
+    print(f"{'kind':<12} {'generator':<14} {'readings/s':>12}")
+    for row in run():
+        print(f"{row['kind']:<12} {row['generator']:<14} {row['per_s']:>12,.0f}")
@@ -0,0 +1,80 @@
+"""
+Micro-benchmark: full-text hexagram search cost.
+
+Compares a linear scan that folds and searches every text of every hexagram
+per query with the character n-gram index built by ``HexagramSearchIndex``.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.bench_search
+"""
+
+import timeit
+from typing import Any, Dict, List
+
+from utils.hexagram_data import HexagramDataManager
+from utils.search_index import extract_texts
+from utils.zh_fold import fold_text
+
+
+QUERIES = {
+    "zh": ["乾", "潜龙勿用", "風澤", "君子 以", "利涉大川", "不存在的词"],
+    "en": ["dragon", "the creative", "great river", "noble person", "nonexistent"],
+}
+
+
+def _linear_search(payloads: List[Dict[str, Any]], query: str) -> List[int]:
+    """Reference implementation: fold and scan every text on every query."""
+    terms = fold_text(query).split()
+    matches = []
+    for doc, payload in enumerate(payloads):
+        texts = [text for _, text in extract_texts(payload)]
+        folded = "\x00".join(fold_text(text) for text in texts)
+        if all(term in folded for term in terms):
+            matches.append(doc)
+    return matches
+
+
+def run(repeat: int = 5, number: int = 20) -> dict:
+    """
+    Time per-query search cost with a linear scan and the n-gram index.
+    
+    Args:
+        repeat: Number of timing runs (the best one is reported)
+        number: Passes over the query set per timing run
+        
+    Returns:
+        Dictionary with per-query cost in microseconds per language
+    """
+    manager = HexagramDataManager()
+    result = {}
+    for language, queries in QUERIES.items():
+        corpus = manager.get_corpus(language)
+        payloads = [h.model_dump() for h in corpus.hexagrams]
+        index = corpus.search_index
+        
+        def linear() -> None:
+            for query in queries:
+                _linear_search(payloads, query)
+        
+        def indexed() -> None:
+            for query in queries:
+                index.search(query)
+        
+        calls = len(queries) * number
+        linear_best = min(timeit.repeat(linear, number=number, repeat=repeat))
+        indexed_best = min(timeit.repeat(indexed, number=number, repeat=repeat))
+        result[language] = {
+            "linear_us_per_query": linear_best / calls * 1e6,
+            "index_us_per_query": indexed_best / calls * 1e6,
+            "speedup": linear_best / indexed_best if indexed_best else float("inf"),
+        }
+    return result
+
+
+if __name__ == "__main__":
+    for language, stats in run().items():
+        print(f"[{language}]")
+        print(f"  linear scan:      {stats['linear_us_per_query']:.1f} us/query")
+        print(f"  n-gram index:     {stats['index_us_per_query']:.1f} us/query")
+        print(f"  speedup:          {stats['speedup']:.0f}x")
@@ -0,0 +1,71 @@
+"""
+Benchmark: corpus cold start from JSON vs compiled bundle.
+
+Each measurement runs in a fresh interpreter that builds one manager and
+loads both languages, as the app's process-wide registry does at startup. Reports load time and the RSS growth caused by loading.
+
+Usage (from the backend directory, after ``python build_corpus_bundle.py``)::
+
+    python -m benchmarks.bench_startup
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+_CHILD = """
+import json, time
+
+def rss_kb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+from utils.hexagram_data import HexagramDataManager
+before = rss_kb()
+start = time.perf_counter()
+manager = HexagramDataManager(use_bundle={use_bundle})
+manager.load_all()
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "rss_kb": rss_kb() - before}}))
+"""
+
+
+def _measure(use_bundle: bool, runs: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _CHILD.format(use_bundle=use_bundle)],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        "ms": min(s["seconds"] for s in samples) * 1e3,
+        "rss_kb": min(s["rss_kb"] for s in samples),
+    }
+
+
+def run(runs: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Measure cold-start cost with and without compiled bundles.
+    
+    Args:
+        runs: Fresh interpreters per mode (best run is reported)
+        
+    Returns:
+        Mapping of mode to load time (ms) and RSS growth (KB)
+    """
+    return {"json": _measure(False, runs), "bundle": _measure(True, runs)}
+
+
+if __name__ == "__main__":
+    results = run()
+    print(f"{'mode':<8} {'load ms':>10} {'rss KB':>10}")
+    for mode, stats in results.items():
+        print(f"{mode:<8} {stats['ms']:>10.1f} {stats['rss_kb']:>10.0f}")
@@ -0,0 +1,148 @@
+"""
+Benchmark: memory per worker, pre-fork vs ``uvicorn --workers``.
+
+Starts the API with 1, 4 and 8 workers in both modes, warms every worker
+with a few requests, then reads ``/proc/<pid>/smaps_rollup`` of each worker:
+
+* ``rss``  - resident pages, shared ones counted in full
+* ``pss``  - resident pages with shared ones divided among their users
+* ``private`` - pages only this worker uses (what each extra worker costs)
+
+Linux only. Usage (from the backend directory)::
+
+    python -m benchmarks.bench_workers
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+WARM_PATHS = (
+    "/api/hexagrams",
+    "/api/hexagrams/1",
+    "/api/hexagrams/search?q=龍",
+    "/api/hexagrams/trigram/111/000",
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _children(pid: int) -> List[int]:
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except FileNotFoundError:
+        return []
+
+
+def _cmdline(pid: int) -> str:
+    with open(f"/proc/{pid}/cmdline", "rb") as f:
+        return f.read().replace(b"\0", b" ").decode(errors="replace")
+
+
+def _memory_kb(pid: int) -> Dict[str, int]:
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": values.get("Rss", 0),
+        "pss": values.get("Pss", 0),
+        "private": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0),
+    }
+
+
+def _workers(server: subprocess.Popen, mode: str, count: int) -> List[int]:
+    children = _children(server.pid)
+    if mode == "uvicorn":
+        if count == 1:
+            # uvicorn 只有一个工作进程时直接在主进程中运行
+            return [server.pid]
+        # multiprocessing spawn 会额外启动 resource tracker，只统计真正的工作进程
+        return [pid for pid in children if "spawn_main" in _cmdline(pid)]
+    return children
+
+
+def _wait_ready(port: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def _measure(mode: str, workers: int) -> Dict[str, float]:
+    port = _free_port()
+    if mode == "prefork":
+        command = [sys.executable, "serve_prefork.py", "--host", "127.0.0.1",
+                   "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    else:
+        command = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+                   "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    env = dict(os.environ, DATA_RELOAD_INTERVAL="0")
+    env.setdefault("DeepSeek_API_KEY", "benchmark")
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_ready(port)
+        deadline = time.monotonic() + 60
+        while len(_workers(server, mode, workers)) < workers:
+            if time.monotonic() > deadline:
+                raise RuntimeError("workers did not start")
+            time.sleep(0.2)
+        # 每个路径请求多次，使请求大概率分散到所有工作进程
+        for _ in range(workers * 4):
+            for path in WARM_PATHS:
+                url = f"http://127.0.0.1:{port}{urllib.parse.quote(path, safe='/?=')}"
+                urllib.request.urlopen(url, timeout=10).read()
+        time.sleep(0.5)
+        samples = [_memory_kb(pid) for pid in _workers(server, mode, workers)]
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return {key: sum(s[key] for s in samples) / len(samples) / 1024
+            for key in ("rss", "pss", "private")}
+
+
+def run(worker_counts=(1, 4, 8)) -> Dict[str, Dict[int, Dict[str, float]]]:
+    """
+    Measure per-worker memory in both modes.
+
+    Args:
+        worker_counts: Worker counts to test
+
+    Returns:
+        Mapping of mode to worker count to mean MB per worker
+    """
+    return {mode: {count: _measure(mode, count) for count in worker_counts}
+            for mode in ("uvicorn", "prefork")}
+
+
+def main() -> None:
+    results = run()
+    print(f"{'mode':<10}{'workers':>8}{'rss MB':>10}{'pss MB':>10}{'private MB':>12}")
+    for mode, by_count in results.items():
+        for count, memory in by_count.items():
+            print(f"{mode:<10}{count:>8}{memory['rss']:>10.1f}{memory['pss']:>10.1f}"
+                  f"{memory['private']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+Benchmark suite of the divination and najia engines, with a JSON baseline.
+
+Every case is timed in samples of a calibrated number of calls (about
+``SAMPLE_SECONDS`` each) and reports operations per second and the p50/p99
+time per operation over the samples. Allocations are measured separately
+with ``tracemalloc``: the peak heap growth while one operation runs and the
+heap it leaves behind (caches filled, leaks).
+
+Everything runs in-process and offline; no server is needed.
+
+Usage (from the backend directory)::
+
+    python -m benchmarks.suite                       # run and print
+    python -m benchmarks.suite --save                # also write benchmarks/baseline.json
+    python -m benchmarks.suite --compare             # compare with benchmarks/baseline.json
+    python -m benchmarks.suite --only najia_compile,najia_daily --compare --threshold 0.2
+
+``--compare`` exits with status 1 if any case is slower (ops/s or p50) or
+allocates more (peak bytes) than the baseline by more than the threshold.
+Baselines are machine specific and are not committed.
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from models.schemas import DivinationResult, Hexagram
+from utils.casting import cast_lines, cast_to_lines
+from utils.divination_logic import (
+    generate_interpretation,
+    generate_najia_interpretation,
+    generate_six_lines,
+    get_changed_from_cast,
+    get_changed_hexagram,
+    get_hexagram_from_lines,
+    get_reading_from_cast,
+    throw_coins,
+)
+from utils.hexagram_data import HexagramDataManager, hexagram_manager
+from utils.najia_analysis import analyze_chart
+from utils.najia_oracle import NajiaChart, NajiaOracle, compute_daily
+
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.10
+# 每个样本的目标时长与样本数；样本内调用次数按单次耗时校准
+SAMPLE_SECONDS = 0.002
+DEFAULT_SAMPLES = 200
+ALLOCATION_OPS = 50
+
+
+class BenchCase(NamedTuple):
+    """
+    One benchmarked operation.
+    """
+    name: str
+    description: str
+    # 无参数可调用对象，由 setup 构造（setup 的开销不计入）
+    setup: Callable[[], Callable[[], Any]]
+
+
+def _six_lines_inputs() -> List[list]:
+    random.seed(0)
+    return [generate_six_lines() for _ in range(256)]
+
+
+def _cycle(items: List[Any], func: Callable[[Any], Any]) -> Callable[[], Any]:
+    """Call ``func`` on the items in turn, so cases see varied inputs."""
+    state = {"i": 0}
+
+    def call() -> Any:
+        i = state["i"]
+        state["i"] = (i + 1) % len(items)
+        return func(items[i])
+    return call
+
+
+def _interpretation_case() -> Callable[[], Any]:
+    readings = []
+    for lines in _six_lines_inputs():
+        readings.append((get_hexagram_from_lines(lines), get_changed_hexagram(lines), lines))
+    return _cycle(readings, lambda r: generate_interpretation("问题", r[0], r[1], r[2]))
+
+
+def _najia_params() -> List[List[int]]:
+    rng = random.Random(0)
+    return [[rng.choice((1, 2, 2, 2, 1, 1, 3, 4)) for _ in range(6)] for _ in range(256)]
+
+
+def _najia_compile_case() -> Callable[[], Any]:
+    date = datetime(2024, 6, 1, 10, 30)
+    return _cycle(_najia_params(), lambda params: NajiaOracle().compile(params=params, date=date))
+
+
+def _najia_interpretation_case() -> Callable[[], Any]:
+    date = datetime(2024, 6, 1, 10, 30)
+    oracles = [NajiaOracle().compile(params=params, date=date) for params in _najia_params()]
+    readings = [(oracle.get_najia_result(), oracle.chart) for oracle in oracles]
+    return _cycle(readings, lambda r: generate_najia_interpretation(r[0], "求财如何", r[1]))
+
+
+def _najia_analysis_case() -> Callable[[], Any]:
+    charts = [(NajiaChart(index & 63, index >> 6, 0), index % 12, index % 60) for index in range(0, 4096, 16)]
+    return _cycle(charts, lambda c: analyze_chart(c[0], c[1], c[2]))
+
+
+def _najia_daily_case() -> Callable[[], Any]:
+    rng = random.Random(0)
+    dates = [datetime(rng.randrange(1950, 2050), rng.randrange(1, 13), rng.randrange(1, 29),
+                      rng.randrange(24), rng.randrange(60)) for _ in range(256)]
+    return _cycle(dates, compute_daily)
+
+
+def _najia_daily_cached_case() -> Callable[[], Any]:
+    oracle = NajiaOracle()
+    # 同一天内每分钟起卦，绝大多数命中时辰缓存
+    dates = [datetime(2024, 6, 1, minute // 60, minute % 60) for minute in range(0, 24 * 60, 7)]
+    return _cycle(dates, oracle._daily)
+
+
+def _manager_load_case(use_bundle: bool) -> Callable[[], Callable[[], Any]]:
+    def setup() -> Callable[[], Any]:
+        return lambda: HexagramDataManager(use_bundle=use_bundle).get_corpus("zh")
+    return setup
+
+
+def _serialization_case() -> Callable[[], Any]:
+    results = []
+    for cast in range(0, 4096, 64):
+        original, changed = get_reading_from_cast(cast), get_changed_from_cast(cast)
+        results.append(DivinationResult(
+            originalHexagram=Hexagram.model_validate(original.to_dict()),
+            changedHexagram=Hexagram.model_validate(changed.to_dict()) if changed else None,
+            lines=cast_to_lines(cast),
+            question="问题",
+            timestamp=datetime(2024, 6, 1, 10, 30),
+            interpretation=generate_interpretation("问题", original, changed, cast_lines(cast)),
+        ))
+    return _cycle(results, lambda result: result.model_dump_json())
+
+
+CASES: List[BenchCase] = [
+    BenchCase("throw_coins", "三枚硬币掷一爻", lambda: throw_coins),
+    BenchCase("generate_six_lines", "六爻 Line 模型", lambda: generate_six_lines),
+    BenchCase("get_hexagram_from_lines", "六爻 -> 本卦",
+              lambda: _cycle(_six_lines_inputs(), get_hexagram_from_lines)),
+    BenchCase("get_changed_hexagram", "六爻 -> 变卦",
+              lambda: _cycle(_six_lines_inputs(), get_changed_hexagram)),
+    BenchCase("generate_interpretation", "传统解读文本", _interpretation_case),
+    BenchCase("najia_compile", "NajiaOracle.compile 纳甲排盘", _najia_compile_case),
+    BenchCase("najia_interpretation", "generate_najia_interpretation 纳甲解读文本", _najia_interpretation_case),
+    BenchCase("najia_analysis", "analyze_chart 旺衰生克动变分析", _najia_analysis_case),
+    BenchCase("najia_daily", "compute_daily 四柱与旬空（不经缓存）", _najia_daily_case),
+    BenchCase("najia_daily_cached", "NajiaOracle._daily 经时辰缓存", _najia_daily_cached_case),
+    BenchCase("manager_load_bundle", "HexagramDataManager 从编译包加载中文语料", _manager_load_case(True)),
+    BenchCase("manager_load_json", "HexagramDataManager 从 JSON 加载中文语料", _manager_load_case(False)),
+    BenchCase("divination_result_json", "DivinationResult.model_dump_json()", _serialization_case),
+]
+
+
+def _calibrate(func: Callable[[], Any]) -> int:
+    """Number of calls that take about ``SAMPLE_SECONDS``."""
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= SAMPLE_SECONDS or calls >= 1 << 20:
+            return max(1, int(calls * SAMPLE_SECONDS / elapsed)) if elapsed else calls
+        calls *= 2
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _allocations(func: Callable[[], Any], ops: int) -> Dict[str, float]:
+    """Mean peak heap growth per call and heap retained per call (bytes)."""
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        peak = 0
+        for _ in range(ops):
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            func()
+            peak += tracemalloc.get_traced_memory()[1] - current
+        retained = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    return {"peak_bytes": peak / ops, "retained_bytes": retained / ops}
+
+
+def run_case(case: BenchCase, samples: int = DEFAULT_SAMPLES) -> Dict[str, Any]:
+    """
+    Benchmark one case.
+
+    Args:
+        case: Case to run
+        samples: Number of timed samples
+
+    Returns:
+        ops/s, p50/p99/mean µs per operation and allocation statistics
+    """
+    func = case.setup()
+    func()
+    calls = _calibrate(func)
+    per_op: List[float] = []
+    total_time = 0.0
+    for _ in range(samples):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        elapsed = time.perf_counter() - start
+        total_time += elapsed
+        per_op.append(elapsed / calls * 1e6)
+    per_op.sort()
+    return {
+        "description": case.description,
+        "ops_per_sec": samples * calls / total_time,
+        "p50_us": _percentile(per_op, 0.50),
+        "p99_us": _percentile(per_op, 0.99),
+        "mean_us": statistics.fmean(per_op),
+        "calls_per_sample": calls,
+        "samples": samples,
+        **_allocations(func, min(ALLOCATION_OPS, samples * calls)),
+    }
+
+
+def run(only: Optional[List[str]] = None, samples: int = DEFAULT_SAMPLES) -> Dict[str, Any]:
+    """
+    Run the suite.
+
+    Args:
+        only: Names of the cases to run (all if None)
+        samples: Number of timed samples per case
+
+    Returns:
+        Report with the environment and one entry per case
+
+    Raises:
+        ValueError: If a case name is unknown
+    """
+    names = [case.name for case in CASES]
+    unknown = [name for name in only or [] if name not in names]
+    if unknown:
+        raise ValueError(f"未知的基准用例: {', '.join(unknown)}；可选值: {', '.join(names)}")
+    hexagram_manager.load_all()
+    results = {}
+    for case in CASES:
+        if only and case.name not in only:
+            continue
+        results[case.name] = run_case(case, samples)
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Compare a report with a baseline.
+
+    Args:
+        report: Report from ``run``
+        baseline: Earlier report
+        threshold: Relative change tolerated (0.10 = 10 %)
+
+    Returns:
+        One message per regression (empty if none)
+    """
+    regressions = []
+    for name, result in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        checks = (
+            ("ops/s", base["ops_per_sec"] / result["ops_per_sec"] - 1),
+            ("p50", result["p50_us"] / base["p50_us"] - 1 if base["p50_us"] else 0.0),
+            ("peak bytes", (result["peak_bytes"] - base["peak_bytes"]) / max(base["peak_bytes"], 1024)),
+        )
+        for metric, change in checks:
+            if change > threshold:
+                regressions.append(f"{name}: {metric} {change:+.0%} worse than baseline")
+    return regressions
+
+
+def _print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    print(f"{'case':<26} {'ops/s':>12} {'p50 µs':>10} {'p99 µs':>10} {'peak B':>10} {'kept B':>9} {'vs base':>8}")
+    for name, result in report["results"].items():
+        base = (baseline or {}).get("results", {}).get(name)
+        delta = f"{result['ops_per_sec'] / base['ops_per_sec'] - 1:+.0%}" if base else ""
+        print(f"{name:<26} {result['ops_per_sec']:>12,.0f} {result['p50_us']:>10.2f} {result['p99_us']:>10.2f} "
+              f"{result['peak_bytes']:>10.0f} {result['retained_bytes']:>9.0f} {delta:>8}")
+
+
+def main(argv=None) -> int:
+    """
+    Run the suite from the command line.
+
+    Returns:
+        Exit status: 1 if ``--compare`` found a regression
+    """
+    parser = argparse.ArgumentParser(description="Benchmark suite of the divination and najia engines")
+    parser.add_argument("--only", help="Comma separated case names: " + ", ".join(case.name for case in CASES))
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="Timed samples per case")
+    parser.add_argument("--save", nargs="?", const=str(DEFAULT_BASELINE), metavar="FILE",
+                        help="Write the report as the new baseline")
+    parser.add_argument("--compare", nargs="?", const=str(DEFAULT_BASELINE), metavar="FILE",
+                        help="Compare with a baseline and fail on regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Tolerated relative regression for --compare (default 0.10)")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(Path(args.compare).read_text(encoding="utf-8")) if args.compare else None
+    only = [name.strip() for name in args.only.split(",") if name.strip()] if args.only else None
+    try:
+        report = run(only, args.samples)
+    except ValueError as e:
+        parser.error(str(e))
+    _print_report(report, baseline)
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"baseline written to {args.save}")
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print(f"no regression beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
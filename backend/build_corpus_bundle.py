@@ -0,0 +1,27 @@
+"""
+Compile the hexagram JSON corpora into binary bundles.
+
+Run this after editing the JSON data files (for example with
+enhance_hexagrams_data.py). Managers load a bundle only while its source
+hash matches the JSON file, so a stale bundle is never used.
+
+Usage:
+    python build_corpus_bundle.py
+"""
+
+from utils.corpus_bundle import bundle_path_for
+from utils.hexagram_data import HexagramDataManager, LANGUAGE_DATA_FILES
+
+
+def main() -> None:
+    """
+    Compile the bundles of every supported language.
+    """
+    manager = HexagramDataManager()
+    for language in LANGUAGE_DATA_FILES:
+        corpus = manager.compile_bundle(language)
+        print(f"✅ {language}: {len(corpus.hexagrams)} 卦 -> {bundle_path_for(corpus.data_file).name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Generate the 节 (solar term) boundary table of the GanZhi calendar.
+
+The table ships with the code (utils/jieqi_1900_2100.bin), so the four
+pillars are computed without lunar_python at run time. Regenerating it
+requires lunar_python and is only needed to change the covered years.
+
+Usage:
+    python build_jieqi_table.py
+"""
+
+from utils.ganzhi import (
+    JIEQI_FIRST_YEAR,
+    JIEQI_LAST_YEAR,
+    JIEQI_TABLE_FILE,
+    decode_jieqi_table,
+    encode_jieqi_table,
+    lunar_jieqi_moments,
+)
+
+
+def main() -> None:
+    """
+    Write the table for ``JIEQI_FIRST_YEAR`` to ``JIEQI_LAST_YEAR``.
+    """
+    moments = lunar_jieqi_moments(JIEQI_FIRST_YEAR, JIEQI_LAST_YEAR)
+    data = encode_jieqi_table(JIEQI_FIRST_YEAR, moments)
+    decode_jieqi_table(data)
+    JIEQI_TABLE_FILE.write_bytes(data)
+    print(f"✅ {JIEQI_FIRST_YEAR}-{JIEQI_LAST_YEAR}: {len(moments)} 节 -> {JIEQI_TABLE_FILE.name} ({len(data)} B)")
+
+
+if __name__ == "__main__":
+    main()
@@ -33,6 +33,13 @@ class Settings(BaseSettings):
     
     # Data Settings
     hexagram_data_file: str = "hexagrams_complete.json"
+    data_reload_interval: float = 2.0  # 数据文件轮询间隔（秒），0 表示关闭热重载
+    
+    # Najia Settings
+    najia_batch_workers: int = 0  # 批量纳甲排盘的进程池大小，0 表示 CPU 核数
+    
+    # Admin Settings
+    admin_token: Optional[str] = None  # 管理接口写操作所需的 X-Admin-Token 请求头，未设置时写操作禁用
     
     # Security Settings
     secret_key: Optional[str] = None
@@ -5,6 +5,7 @@ This FastAPI application provides endpoints for:
 - Performing divination readings
 - Querying hexagram information
 - Managing hexagram data
+- Simulating the statistics of the casting methods
 
 The application is structured with:
 - Models: Pydantic schemas for data validation
@@ -17,7 +18,29 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import uvicorn
 
-from routers import divination_router, hexagrams_router
+from config import settings
+from routers import admin_router, divination_router, hexagrams_router, statistics_router
+from utils.corpus_reload import CorpusWatcher
+from utils.hexagram_data import hexagram_manager
+from utils.najia_batch import shutdown_pool
+
+
+def load_corpora() -> None:
+    """
+    Load every corpus into the process-wide registry and warm the search
+    index and the interpretation fragments.
+    
+    Called by the lifespan of every worker; in pre-fork mode
+    (``serve_prefork.py``) the master calls it before forking, so the
+    workers find everything loaded and share the pages copy-on-write.
+    """
+    # 中英文语料常驻内存，按请求选择语言，无需切换时重新加载；已加载时为空操作
+    hexagram_manager.load_all()
+    # 预先建立全文检索索引与解读片段，避免首个请求承担构建的开销
+    for language in ("zh", "en"):
+        corpus = hexagram_manager.get_corpus(language)
+        corpus.search_index
+        corpus.interpretations
 
 
 @asynccontextmanager
@@ -30,11 +53,22 @@ async def lifespan(app: FastAPI):
     # Startup
     print("🚀 易经占卜 API 启动中...")
     print("📚 加载卦象数据...")
+    load_corpora()
+    
+    # 监视数据文件，修改后在后台重建语料并原子替换
+    watcher = CorpusWatcher(
+        {"corpus": hexagram_manager},
+        interval=settings.data_reload_interval
+    )
+    watcher.start()
+    app.state.corpus_watcher = watcher
     
     yield
     
     # Shutdown  
     print("🛑 易经占卜 API 关闭中...")
+    watcher.stop()
+    shutdown_pool()
 
 
 # Initialize FastAPI application
@@ -89,6 +123,8 @@ app.add_middleware(
 # Include routers
 app.include_router(divination_router)
 app.include_router(hexagrams_router)
+app.include_router(admin_router)
+app.include_router(statistics_router)
 
 
 @app.get("/", tags=["root"])
@@ -108,6 +144,7 @@ async def root() -> dict[str, str | dict[str, str]]:
         "endpoints": {
             "divination": "/api/divination",
             "hexagrams": "/api/hexagrams",
+            "statistics": "/api/statistics/simulate",
             "help": "/api/divination/help"
         }
     }
@@ -133,8 +170,9 @@ if __name__ == "__main__":
     """
     Run the application directly with uvicorn.
     
-    For production, use:
-    uvicorn main:app --host 0.0.0.0 --port 8000 --workers 4
+    For production, use the pre-fork server, which loads the corpus once
+    and shares it copy-on-write between the workers:
+    python serve_prefork.py --host 0.0.0.0 --port 8000 --workers 4
     """
     import sys
     import os
@@ -3,7 +3,7 @@ Pydantic schemas for data validation and serialization.
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, Literal, Dict, Any, List
+from typing import Optional, Literal, Dict, Any, List, Annotated
 from datetime import datetime
 
 
@@ -187,6 +187,9 @@ class DivinationResult(BaseModel):
     question: str = Field(..., description="Original question")
     timestamp: datetime = Field(..., description="Divination timestamp")
     interpretation: str = Field(..., description="Complete interpretation")
+    method: Optional[str] = Field(None, description="Casting method: coins, yarrow, plum_time or plum_number (absent for manual readings)")
+    rng: Optional[str] = Field(None, description="Random generator of the cast: seeded or secure (null for plum blossom methods)")
+    seed: Optional[int] = Field(None, description="Seed that replays the cast (seeded generator only)")
 
 
 class HexagramResponse(BaseModel):
@@ -197,6 +200,169 @@ class HexagramResponse(BaseModel):
     total: int = Field(..., description="Total number of hexagrams")
 
 
+class HexagramSearchHit(BaseModel):
+    """
+    One ranked full-text search result.
+    """
+    number: int = Field(..., ge=1, le=64, description="Hexagram number")
+    name: str = Field(..., description="Hexagram name")
+    chineseName: str = Field(..., description="Chinese name of the hexagram")
+    score: int = Field(..., description="Relevance score")
+    field: str = Field(..., description="Field of the best match, e.g. kingWen.text or lines.3")
+    snippet: str = Field(..., description="Text around the match, highlighted with <mark>")
+
+
+class HexagramSearchResponse(BaseModel):
+    """
+    Response model for full-text hexagram search.
+    """
+    query: str = Field(..., description="Search query")
+    hits: list[HexagramSearchHit] = Field(..., description="Ranked search results")
+    total: int = Field(..., description="Total number of matching hexagrams")
+
+
+class HexagramRef(BaseModel):
+    """
+    Short reference to a related hexagram.
+    """
+    number: int = Field(..., ge=1, le=64, description="Hexagram number")
+    name: str = Field(..., description="Hexagram name")
+    chineseName: str = Field(..., description="Chinese name of the hexagram")
+    symbol: str = Field(default="", description="Unicode symbol")
+
+
+class HexagramLineChange(BaseModel):
+    """
+    The hexagram reached when a single line changes.
+    """
+    line: int = Field(..., ge=1, le=6, description="Changing line position from bottom to top")
+    hexagram: Optional[HexagramRef] = Field(None, description="Changed hexagram")
+
+
+class HexagramRelations(BaseModel):
+    """
+    Response model for the related hexagrams of a hexagram.
+    """
+    hexagram: HexagramRef = Field(..., description="The hexagram itself")
+    nuclear: Optional[HexagramRef] = Field(None, description="互卦: lines 2-4 below, lines 3-5 above")
+    inverse: Optional[HexagramRef] = Field(None, description="综卦: the hexagram turned upside down")
+    opposite: Optional[HexagramRef] = Field(None, description="错卦: every line flipped")
+    lineChanges: list[HexagramLineChange] = Field(..., description="Changed hexagram for each single changing line")
+
+
+class HexagramOutcome(BaseModel):
+    """
+    The changed hexagram for one set of changing lines.
+    """
+    mask: int = Field(..., ge=0, le=63, description="Changing-line mask, bit i set when line i+1 changes")
+    changingLines: list[int] = Field(..., description="Changing line positions from bottom to top")
+    hexagram: Optional[HexagramRef] = Field(None, description="Changed hexagram (the hexagram itself for mask 0)")
+
+
+class HexagramOutcomesResponse(BaseModel):
+    """
+    Response model for all 64 changing-line outcomes of a hexagram.
+    """
+    hexagram: HexagramRef = Field(..., description="The hexagram itself")
+    outcomes: list[HexagramOutcome] = Field(..., description="One outcome per changing-line mask, ordered by mask")
+    total: int = Field(..., description="Number of outcomes (always 64)")
+
+
+class BatchDivinationRequest(BaseModel):
+    """
+    Request model for casting many readings at once.
+    """
+    questions: Optional[list[Annotated[str, Field(max_length=500)]]] = Field(
+        None, max_length=10000, description="One reading per question"
+    )
+    count: Optional[int] = Field(None, ge=1, le=10000, description="Number of anonymous readings when no questions are given")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "questions": ["我的事业发展如何？", "这次考试结果如何？"]
+            }
+        }
+    }
+
+
+class BatchDivinationReading(BaseModel):
+    """
+    Compact result of one batch reading.
+    """
+    question: Optional[str] = Field(None, description="Question of the reading (omitted for anonymous casts)")
+    lines: list[int] = Field(..., min_length=6, max_length=6, description="Line values from bottom to top: 6=老阴, 7=少阳, 8=少阴, 9=老阳")
+    hexagram: Optional[HexagramRef] = Field(None, description="Primary hexagram")
+    changingLines: list[int] = Field(..., description="Changing line positions from bottom to top")
+    changedHexagram: Optional[HexagramRef] = Field(None, description="Changed hexagram (null without changing lines)")
+
+
+class BatchDivinationResponse(BaseModel):
+    """
+    Response model for batch divination.
+    """
+    readings: list[BatchDivinationReading] = Field(..., description="Readings in request order")
+    total: int = Field(..., description="Number of readings")
+    rng: str = Field(..., description="Random generator of the casts: seeded or secure")
+    seed: Optional[int] = Field(None, description="Seed that replays the batch (seeded generator only)")
+
+
+class NajiaBatchItem(BaseModel):
+    """
+    One chart of a batch najia request.
+    """
+    params: list[Annotated[int, Field(ge=1, le=4)]] = Field(
+        ..., min_length=6, max_length=6,
+        description="Lines from bottom to top: 1=少阳, 2=少阴, 3=老阳, 4=老阴"
+    )
+    date: Optional[datetime] = Field(None, description="Moment of the reading (defaults to the time of the request)")
+    question: str = Field("", max_length=500, description="Question of the reading")
+
+
+class NajiaBatchRequest(BaseModel):
+    """
+    Request model for charting many najia readings at once.
+    """
+    items: list[NajiaBatchItem] = Field(..., min_length=1, max_length=10000, description="Charts in request order")
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "items": [
+                    {"params": [3, 1, 2, 4, 1, 2], "date": "2024-06-01T10:30:00", "question": "事业发展如何？"},
+                    {"params": [1, 1, 1, 2, 2, 2], "question": "这次考试结果如何？"}
+                ]
+            }
+        }
+    }
+
+
+class SimulationHistogram(BaseModel):
+    """
+    Observed vs theoretical distribution of one quantity in a simulation.
+    """
+    bins: list[int | str] = Field(..., description="Bin labels, e.g. line values, hexagram numbers or palace names")
+    observed: list[int] = Field(..., description="Observed count per bin")
+    expected: list[float] = Field(..., description="Expected count per bin under the method's exact probabilities")
+    chiSquare: float = Field(..., description="Pearson chi-square statistic")
+    dof: int = Field(..., description="Degrees of freedom")
+    pValue: float = Field(..., description="Probability of a statistic at least this large if the method is correct")
+
+
+class SimulationResult(BaseModel):
+    """
+    Response model for a Monte Carlo simulation of a casting method.
+    """
+    method: str = Field(..., description="Casting method")
+    casts: int = Field(..., description="Number of simulated readings")
+    seed: int = Field(..., description="Seed that reproduces the simulation")
+    elapsedMs: float = Field(..., description="Sampling time in milliseconds")
+    castsPerSecond: Optional[float] = Field(None, description="Sampling throughput")
+    histograms: Dict[str, SimulationHistogram] = Field(
+        ..., description="lineValues, changingLines, hexagram, changedHexagram, palace and palaceType"
+    )
+
+
 class NajiaDivinationRequest(BaseModel):
     """纳甲起卦请求"""
     question: str = Field(..., min_length=1, max_length=500, description="占卜问题")
@@ -3,10 +3,14 @@ Routers package for the divination API.
 Contains all API route definitions.
 """
 
+from .admin import router as admin_router
 from .divination import router as divination_router
 from .hexagrams import router as hexagrams_router
+from .statistics import router as statistics_router
 
 __all__ = [
+    "admin_router",
     "divination_router",
-    "hexagrams_router"
+    "hexagrams_router",
+    "statistics_router"
 ]
@@ -0,0 +1,85 @@
+"""
+Admin router - corpus status and reload.
+"""
+
+import secrets
+
+from fastapi import APIRouter, Header, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, Optional
+
+from config import settings
+from utils.najia_oracle import ganzhi_cache
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+def _get_watcher(request: Request):
+    """
+    Get the corpus watcher created by the application lifespan.
+    """
+    watcher = getattr(request.app.state, "corpus_watcher", None)
+    if watcher is None:
+        raise HTTPException(status_code=503, detail="卦象数据尚未加载")
+    return watcher
+
+
+@router.get("/corpus")
+async def get_corpus_status(request: Request) -> Dict[str, Any]:
+    """
+    Report the loaded corpus of every language.
+    
+    Returns:
+        dict: Generation, sha256 of the data file, source (bundle/json),
+        load time and section/reading cache statistics per manager and language
+    """
+    watcher = _get_watcher(request)
+    return {
+        "reloadInterval": watcher.interval,
+        "corpora": watcher.status()
+    }
+
+
+@router.get("/ganzhi-cache")
+async def get_ganzhi_cache_status() -> Dict[str, Any]:
+    """
+    Report the 时辰 cache of the najia four pillars.
+    
+    Returns:
+        dict: Size, hits, misses, hit rate, evictions and background prefetches
+    """
+    return ganzhi_cache.info()
+
+
+@router.post("/corpus/reload")
+async def reload_corpus(
+    request: Request,
+    force: bool = False,
+    x_admin_token: Optional[str] = Header(None)
+) -> Dict[str, Any]:
+    """
+    Check the data files now and reload changed corpora.
+    
+    Args:
+        force: Reload every language even if its files look unchanged
+        x_admin_token: Must match the configured admin token
+        
+    Returns:
+        dict: Replaced languages per manager and the new corpus status
+        
+    Raises:
+        HTTPException: 403 if no admin token is configured or the header does not match it
+    """
+    # 未配置管理令牌时不开放重新加载：每次重新加载都会清空语料上的各级缓存
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="未配置管理令牌，重新加载已禁用")
+    if not secrets.compare_digest(x_admin_token or "", settings.admin_token):
+        raise HTTPException(status_code=403, detail="管理令牌无效")
+    
+    watcher = _get_watcher(request)
+    # 重新加载会读取并校验数据文件，放到线程池中执行，避免阻塞事件循环
+    reloaded = await run_in_threadpool(watcher.poll, force)
+    return {
+        "reloaded": reloaded,
+        "corpora": watcher.status()
+    }
@@ -2,23 +2,38 @@
 Divination router - handles divination requests and results.
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import List, Dict, Any, Tuple
 from datetime import datetime
 from pydantic import BaseModel
 
 from models.schemas import (
-    DivinationRequest, ManualDivinationRequest, DivinationResult, Line, Hexagram
+    DivinationRequest, ManualDivinationRequest, DivinationResult,
+    BatchDivinationRequest, BatchDivinationResponse, NajiaBatchRequest
 )
+from utils.casting import cast_from_values, cast_lines, cast_to_najia_params
 from utils.divination_logic import (
-    generate_six_lines,
-    get_hexagram_from_lines,
-    get_changed_hexagram,
+    get_reading_from_cast,
+    get_changed_from_cast,
     generate_interpretation,
     generate_najia_divination,
-    generate_najia_interpretation
+    question_topics
 )
+from utils.catalogue_cache import encode_json, projection_mask
+from utils.hexagram_data import hexagram_manager
+from utils.najia_batch import plan_najia_batch, stream_najia_batch
+from utils.interpretation_templates import QUESTION_PREFIX
+from utils.najia_oracle import ganzhi_hour_key
+from utils.reading_cache import CachedReading
+from utils.reading_view import (
+    HexagramReading, build_batch_body, encode_reading_head, iter_batch_readings, splice_divination_body
+)
+from utils.casting_engines import CASTING_ENGINES, DEFAULT_METHOD, get_engine
+from utils.rng import DEFAULT_RNG, MAX_SEED, cast_reading, cast_readings
 from utils.deepseek_ai import get_ai_interpretation, chat_with_ai
+from config import settings
 from typing import Optional
 
 router = APIRouter(prefix="/api", tags=["divination"])
@@ -35,67 +50,135 @@ class AIConversationResponse(BaseModel):
     timestamp: datetime
 
 
-@router.post("/divination", response_model=DivinationResult)
-async def perform_divination(
-    request: DivinationRequest, 
-    language: Optional[str] = Query("zh", description="Language code: zh for Chinese, en for English"),
-    include_najia: Optional[bool] = Query(False, description="Whether to include traditional najia analysis")
-) -> DivinationResult:
+def _projection(fields: Optional[str], exclude: Optional[str]) -> Optional[int]:
     """
-    Perform a divination reading based on the provided question.
+    Parse the ``fields`` / ``exclude`` query parameters.
     
     Args:
-        request: DivinationRequest containing the question
-        language: Language code for response (zh/en)
-        include_najia: Whether to include traditional najia six-line analysis
+        fields: Comma separated Hexagram fields to keep
+        exclude: Comma separated Hexagram fields to drop
         
     Returns:
-        DivinationResult: Complete divination result with hexagrams and interpretation
+        Field mask, or None for full hexagrams
         
     Raises:
-        HTTPException: If the question is empty or invalid
+        HTTPException: If a field name is unknown
     """
-    if not request.question.strip():
-        raise HTTPException(status_code=400, detail="问题不能为空")
-    
     try:
-        # Set language for data manager
-        from utils.divination_logic import set_language
-        set_language(language)
+        return projection_mask(fields, exclude)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _cast(
+    rng: str,
+    seed: Optional[int],
+    method: Optional[str] = DEFAULT_METHOD,
+    numbers: Optional[str] = None,
+    when: Optional[datetime] = None
+) -> Tuple[int, Optional[str], Optional[int]]:
+    """
+    Cast one reading with the method and generator selected by the request.
+    
+    Args:
+        rng: Generator mode (seeded or secure)
+        seed: Seed to replay (seeded mode only)
+        method: Casting engine name (coins by default)
+        numbers: Comma separated numbers for number based methods
+        when: Moment of the casting for time based methods
         
-        # Generate six lines using coin toss simulation
-        lines: List[Line] = generate_six_lines()
+    Returns:
+        (12-bit cast, rng, seed); rng and seed are None for methods that do
+        not use a random generator, seed is None in secure mode
         
-        # Get the primary hexagram from the lines
-        original_hexagram: Hexagram = get_hexagram_from_lines(lines)
+    Raises:
+        HTTPException: 400 if the method is unknown or its inputs are invalid,
+            or a seed is given in secure mode; 503 if the method needs an
+            optional dependency that is not installed
+    """
+    try:
+        engine = get_engine(method)
+        if engine.uses_rng:
+            cast, seed = cast_reading(rng, seed, engine.name)
+            return cast, rng, seed
+        if seed is not None:
+            raise ValueError(f"起卦方法 {engine.name} 不使用随机数，不能指定种子")
+        try:
+            values = [int(n) for n in numbers.split(",")] if numbers else None
+        except ValueError:
+            raise ValueError(f"无效的起卦数字: {numbers}")
+        return engine.cast(when=when, numbers=values), None, None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        # 时间起卦缺少 lunar_python 等服务端依赖，不是请求本身的错误
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+def _reading_body(
+    cast: int,
+    question: str,
+    language: Optional[str],
+    include_najia: bool,
+    mask: Optional[int],
+    now: datetime,
+    method: Optional[str] = None,
+    rng: Optional[str] = None,
+    seed: Optional[int] = None
+) -> bytes:
+    """
+    Encode the ``DivinationResult`` body of a cast, through the corpus' reading cache.
+    
+    Everything but the question and the timestamp depends only on the
+    cast, the projection and, with najia analysis, the 时辰 and the 用神
+    topics of the question, so bodies are cached under that key and the
+    question and timestamp are spliced in per request.
+    
+    Args:
+        cast: 12-bit cast
+        question: The question asked
+        language: Language code (None for the request language)
+        include_najia: Whether to append the najia interpretation
+        mask: Field projection of both hexagrams (None for every field)
+        now: Moment of the reading (the najia GanZhi are taken from it)
+        method: Casting method (None for manual readings, which omit method/rng/seed)
+        rng: Random generator of the cast
+        seed: Seed that replays the cast
         
-        # Get the changed hexagram if there are changing lines
-        changed_hexagram: Hexagram | None = get_changed_hexagram(lines)
+    Returns:
+        JSON bytes ready for a ``Response``
+    """
+    corpus = hexagram_manager.get_corpus(language)
+    key: Optional[Tuple] = (cast, mask)
+    if include_najia:
+        hour = ganzhi_hour_key(now)
+        # 时辰内交节时四柱不唯一，不缓存
+        key = (cast, mask, hour, question_topics(question)) if hour is not None else None
+    
+    reading = corpus.reading_cache.get(key) if key is not None else None
+    if reading is None:
+        # Get the primary and changed hexagrams of the cast
+        original_hexagram: HexagramReading = get_reading_from_cast(cast, corpus.language)
+        changed_hexagram: HexagramReading | None = get_changed_from_cast(cast, corpus.language)
         
-        # Generate detailed interpretation using traditional method
+        # Generate detailed interpretation using traditional method; the
+        # question line is spliced in per request
         interpretation: str = generate_interpretation(
-            request.question,
+            "",
             original_hexagram,
             changed_hexagram,
-            lines
-        )
+            cast_lines(cast)
+        )[len(QUESTION_PREFIX):]
         
         # Add najia analysis if requested
         if include_najia:
             try:
-                # Convert lines to najia format
-                najia_params = []
-                for line in lines:
-                    if line.type == 'yang':
-                        najia_params.append(1 if line.changing else 3)  # 老阳:1, 少阳:3                    else:
-                        najia_params.append(4 if line.changing else 2)  # 老阴:4, 少阴:2
-                
                 # Generate najia analysis
                 najia_result = generate_najia_divination(
-                    params=najia_params,
-                    question=request.question,
-                    title=request.question,
-                    date=datetime.now()
+                    params=cast_to_najia_params(cast),
+                    question=question,
+                    title=question,
+                    date=now
                 )
                 
                 # Add najia interpretation to the main interpretation
@@ -106,15 +189,75 @@ async def perform_divination(
             except Exception as najia_error:
                 # If najia analysis fails, continue with regular divination
                 print(f"Najia analysis error: {najia_error}")
+                # 缺少纳甲分析的结果不缓存，以免同一时辰的后续请求都拿到残缺解读
+                key = None
         
-        return DivinationResult(
-            originalHexagram=original_hexagram,
-            changedHexagram=changed_hexagram,
-            lines=lines,
-            question=request.question,
-            timestamp=datetime.now(),
-            interpretation=interpretation
+        # 由缓存的预序列化片段拼接响应，只编码本次占卜特有的部分
+        reading = CachedReading(
+            encode_reading_head(original_hexagram, changed_hexagram, cast, corpus.catalogue, mask),
+            encode_json(interpretation)[1:-1]
+        )
+        if key is not None:
+            corpus.reading_cache.put(key, reading)
+    
+    return splice_divination_body(reading, question, datetime.now(), method, rng, seed)
+
+
+# NDJSON 流式响应每次写出的读数条数
+_NDJSON_CHUNK = 1000
+
+_RNG_DESCRIPTION = "Random generator: seeded (replayable, the seed is returned) or secure (operating system CSPRNG)"
+_SEED_DESCRIPTION = "Seed returned by a previous seeded reading, to replay it exactly"
+_METHOD_DESCRIPTION = f"Casting method: {', '.join(CASTING_ENGINES)}"
+_NUMBERS_DESCRIPTION = "Two comma separated positive numbers for method=plum_number, e.g. 3,8"
+
+
+@router.post("/divination", response_model=DivinationResult)
+async def perform_divination(
+    request: DivinationRequest, 
+    language: Optional[str] = Query("zh", description="Language code: zh for Chinese, en for English"),
+    include_najia: Optional[bool] = Query(False, description="Whether to include traditional najia analysis"),
+    fields: Optional[str] = Query(None, description="Comma separated fields of the returned hexagrams, e.g. name,symbol,kingWen"),
+    exclude: Optional[str] = Query(None, description="Comma separated fields left out of the returned hexagrams, e.g. lines,interpretations"),
+    rng: Optional[str] = Query(DEFAULT_RNG, pattern="^(seeded|secure)$", description=_RNG_DESCRIPTION),
+    seed: Optional[int] = Query(None, ge=0, le=MAX_SEED, description=_SEED_DESCRIPTION),
+    method: Optional[str] = Query(DEFAULT_METHOD, description=_METHOD_DESCRIPTION),
+    numbers: Optional[str] = Query(None, description=_NUMBERS_DESCRIPTION)
+) -> Response:
+    """
+    Perform a divination reading based on the provided question.
+    
+    Args:
+        request: DivinationRequest containing the question
+        language: Language code for response (zh/en)
+        include_najia: Whether to include traditional najia six-line analysis
+        fields: Fields of originalHexagram/changedHexagram to return (optional, default all)
+        exclude: Fields of originalHexagram/changedHexagram to leave out (optional)
+        rng: Random generator of the cast (seeded or secure)
+        seed: Seed of a previous seeded reading to replay (optional)
+        method: Casting method (coins, yarrow, plum_time, plum_number)
+        numbers: Numbers for plum_number casting
+        
+    Returns:
+        DivinationResult: Complete divination result with hexagrams and interpretation
+        
+    Raises:
+        HTTPException: If the question is empty or invalid
+    """
+    if not request.question.strip():
+        raise HTTPException(status_code=400, detail="问题不能为空")
+    
+    mask = _projection(fields, exclude)
+    now = datetime.now()
+    # Cast six lines with the selected method as a 12-bit integer
+    cast, rng, seed = _cast(rng, seed, method, numbers, now)
+    try:
+        # 同一起卦值、投影与纳甲时辰的响应取自缓存，只拼接问题与时间
+        body = _reading_body(
+            cast, request.question, language, include_najia, mask, now,
+            method or DEFAULT_METHOD, rng, seed
         )
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"占卜过程中发生错误: {str(e)}")
@@ -155,7 +298,7 @@ async def get_divination_help() -> dict:
         ],
         "features": {
             "basic_divination": [
-                "自动起卦（三枚铜钱法模拟）",
+                "自动起卦（三钱法、蓍草法、梅花易数时间/数字起卦）",
                 "手动输入爻象",
                 "传统易经解卦",
                 "变卦分析",
@@ -174,7 +317,9 @@ async def get_divination_help() -> dict:
             ]
         },
         "api_parameters": {
-            "include_najia": "布尔值，是否包含纳甲分析。默认false，设为true时会在解释中添加传统纳甲六爻理论分析"
+            "include_najia": "布尔值，是否包含纳甲分析。默认false，设为true时会在解释中添加传统纳甲六爻理论分析",
+            "method": "起卦方法：" + "；".join(engine.description for engine in CASTING_ENGINES.values()),
+            "rng": "随机数生成器：seeded（默认，返回种子，可用 seed 参数重放）或 secure（系统安全随机数，不可重放）"
         },
         "line_values": {
             "6": "老阴（变爻）",
@@ -195,14 +340,18 @@ async def get_divination_help() -> dict:
 @router.post("/divination/manual", response_model=DivinationResult)
 async def perform_manual_divination(
     request: ManualDivinationRequest,
-    include_najia: Optional[bool] = Query(False, description="Whether to include traditional najia analysis")
-) -> DivinationResult:
+    include_najia: Optional[bool] = Query(False, description="Whether to include traditional najia analysis"),
+    fields: Optional[str] = Query(None, description="Comma separated fields of the returned hexagrams, e.g. name,symbol,kingWen"),
+    exclude: Optional[str] = Query(None, description="Comma separated fields left out of the returned hexagrams, e.g. lines,interpretations")
+) -> Response:
     """
     Perform a divination reading with manually provided lines.
     
     Args:
         request: ManualDivinationRequest containing question, lines, and optional birth date
         include_najia: Whether to include traditional najia six-line analysis
+        fields: Fields of originalHexagram/changedHexagram to return (optional, default all)
+        exclude: Fields of originalHexagram/changedHexagram to leave out (optional)
         
     Returns:
         DivinationResult: Complete divination result with hexagrams and interpretation
@@ -226,78 +375,81 @@ async def perform_manual_divination(
                 detail=f"第{i+1}爻的值无效: {line_value}。有效值为: 6(老阴), 7(少阳), 8(少阴), 9(老阳)"
             )
     
+    mask = _projection(fields, exclude)
     try:
-        # Convert numeric line values to Line objects
-        lines: List[Line] = []
-        for position, line_value in enumerate(request.lines, 1):
-            line_type = 'yang' if line_value in [7, 9] else 'yin'
-            changing = line_value in [6, 9]  # 老阴和老阳为变爻
-            
-            line = Line(
-                position=position,
-                type=line_type,
-                changing=changing,
-                text="",
-                explanation=""
-            )
-            lines.append(line)
+        # Pack the line values (6/7/8/9) into a 12-bit cast
+        cast = cast_from_values(request.lines)
         
-        # Get the primary hexagram from the lines
-        original_hexagram: Hexagram = get_hexagram_from_lines(lines)
+        # 同一组爻值的响应取自缓存，只拼接问题与时间
+        body = _reading_body(cast, request.question, None, include_najia, mask, datetime.now())
+        return Response(content=body, media_type="application/json")
         
-        # Get the changed hexagram if there are changing lines
-        changed_hexagram: Hexagram | None = get_changed_hexagram(lines)
-        
-        # Generate detailed interpretation using traditional method
-        interpretation: str = generate_interpretation(
-            request.question,
-            original_hexagram,
-            changed_hexagram,
-            lines
-        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"手动占卜过程中发生错误: {str(e)}")
+
+
+@router.post("/divination/batch", response_model=BatchDivinationResponse)
+async def perform_batch_divination(
+    request: BatchDivinationRequest,
+    language: Optional[str] = Query("zh", description="Language code: zh for Chinese, en for English"),
+    format: Optional[str] = Query("json", pattern="^(json|ndjson)$", description="json for one document, ndjson to stream one reading per line"),
+    rng: Optional[str] = Query(DEFAULT_RNG, pattern="^(seeded|secure)$", description=_RNG_DESCRIPTION),
+    seed: Optional[int] = Query(None, ge=0, le=MAX_SEED, description=_SEED_DESCRIPTION)
+) -> Response:
+    """
+    Cast many readings in one request.
+    
+    All coins are drawn from one random call and every reading is resolved
+    by table lookup; results are compact (line values and hexagram
+    references) and carry no interpretation.
+    
+    Args:
+        request: BatchDivinationRequest with the questions, or a count of anonymous casts
+        language: Language code for response (zh/en)
+        format: Response format, json (default) or ndjson
+        rng: Random generator of the casts (seeded or secure)
+        seed: Seed of a previous seeded batch to replay (same count required)
         
-        # Add najia analysis if requested
-        if include_najia:
-            try:
-                # Convert request.lines directly to najia format
-                najia_params = []
-                for line_value in request.lines:
-                    if line_value == 6:  # 老阴
-                        najia_params.append(4)
-                    elif line_value == 7:  # 少阳
-                        najia_params.append(3)
-                    elif line_value == 8:  # 少阴
-                        najia_params.append(2)
-                    elif line_value == 9:  # 老阳
-                        najia_params.append(1)
-                  # Generate najia analysis
-                najia_result = generate_najia_divination(
-                    params=najia_params,
-                    question=request.question,
-                    title=request.question,
-                    date=datetime.now()
-                )
-                
-                # Add najia interpretation to the main interpretation
-                najia_interpretation = najia_result['najia_interpretation'] if najia_result else ''
-                if najia_interpretation:
-                    interpretation += f"\n\n{najia_interpretation}"
-                
-            except Exception as najia_error:
-                # If najia analysis fails, continue with regular divination
-                print(f"Najia analysis error: {najia_error}")
+    Returns:
+        BatchDivinationResponse, or one BatchDivinationReading per line for
+        ndjson (generator and seed in the X-Divination-Rng / X-Divination-Seed headers)
         
-        return DivinationResult(
-            originalHexagram=original_hexagram,
-            changedHexagram=changed_hexagram,
-            lines=lines,
-            question=request.question,
-            timestamp=datetime.now(),
-            interpretation=interpretation
-        )
+    Raises:
+        HTTPException: If neither questions nor count is given, they disagree,
+            or a seed is given in secure mode
+    """
+    questions = request.questions
+    if questions is not None:
+        if request.count is not None and request.count != len(questions):
+            raise HTTPException(status_code=400, detail=f"count 与问题数量不一致：{request.count} != {len(questions)}")
+        count = len(questions)
+    elif request.count is not None:
+        count = request.count
+    else:
+        raise HTTPException(status_code=400, detail="必须提供 questions 或 count")
+    
+    try:
+        casts, seed = cast_readings(count, rng, seed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    catalogue = hexagram_manager.get_catalogue(language)
+    
+    if format == "ndjson":
+        def _chunks():
+            readings = iter_batch_readings(casts, questions, catalogue)
+            while True:
+                chunk = [reading for _, reading in zip(range(_NDJSON_CHUNK), readings)]
+                if not chunk:
+                    break
+                yield b"\n".join(chunk) + b"\n"
         
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"手动占卜过程中发生错误: {str(e)}")
+        headers = {"X-Divination-Rng": rng}
+        if seed is not None:
+            headers["X-Divination-Seed"] = str(seed)
+        return StreamingResponse(_chunks(), media_type="application/x-ndjson", headers=headers)
+    
+    return Response(content=build_batch_body(casts, questions, catalogue, rng, seed),
+                    media_type="application/json")
 
 
 @router.post("/divination/ai-chat", response_model=AIConversationResponse)
@@ -339,53 +491,59 @@ class NajiaRequest(BaseModel):
     hexagram_data: Optional[Dict[str, Any]] = None
 
 @router.post("/divination/najia")
-async def najia_divination(request: NajiaRequest):
+async def najia_divination(
+    request: NajiaRequest,
+    rng: Optional[str] = Query(DEFAULT_RNG, pattern="^(seeded|secure)$", description=_RNG_DESCRIPTION),
+    seed: Optional[int] = Query(None, ge=0, le=MAX_SEED, description=_SEED_DESCRIPTION),
+    method: Optional[str] = Query(DEFAULT_METHOD, description=_METHOD_DESCRIPTION),
+    numbers: Optional[str] = Query(None, description=_NUMBERS_DESCRIPTION)
+):
     """
     专门的纳甲六爻占卜端点
     
     Args:
         request: 包含问题和可选卦象数据的请求
+        rng: 自动起卦使用的随机数生成器（seeded 或 secure）
+        seed: 重放之前 seeded 起卦的种子（可选）
+        method: 自动起卦的方法（coins、yarrow、plum_time、plum_number）
+        numbers: plum_number 数字起卦使用的两个数
         
     Returns:
         Dict: 纳甲六爻分析结果
     """
+    now = datetime.now()
+    manual = bool(request.hexagram_data and "lines" in request.hexagram_data)
+    if manual:
+        method, rng, seed = None, None, None
+    else:
+        # 按所选方法自动起卦
+        method = method or DEFAULT_METHOD
+        cast, rng, seed = _cast(rng, seed, method, numbers, now)
     try:
         # 如果提供了卦象数据，使用它；否则自动生成
-        if request.hexagram_data and "lines" in request.hexagram_data:
+        if manual:
             lines_data = request.hexagram_data["lines"]
-            # 将数字转换为najia格式
-            najia_params = []
-            for line_value in lines_data:
-                if line_value == 6:  # 老阴（变爻）
-                    najia_params.append(4)
-                elif line_value == 7:  # 少阳
-                    najia_params.append(3)
-                elif line_value == 8:  # 少阴
-                    najia_params.append(2)
-                elif line_value == 9:  # 老阳（变爻）
-                    najia_params.append(1)
-                else:
-                    # 默认处理
-                    najia_params.append(line_value % 4 + 1)
+            # 将爻值（6=老阴, 7=少阳, 8=少阴, 9=老阳）转换为najia格式
+            try:
+                najia_params = cast_to_najia_params(cast_from_values(lines_data))
+            except ValueError:
+                # 含无效爻值时交由排盘逻辑按 1-4 取模处理
+                najia_params = [line_value % 4 + 1 for line_value in lines_data]
         else:
-            # 自动生成六爻
-            lines = generate_six_lines()
-            najia_params = []
-            for line in lines:
-                if line.type == "yin":
-                    najia_params.append(4 if line.changing else 2)  # 老阴:4, 少阴:2
-                else:
-                    najia_params.append(1 if line.changing else 3)  # 老阳:1, 少阳:3        # 生成纳甲分析
+            najia_params = cast_to_najia_params(cast)
+        
+        # 生成纳甲分析
         najia_result = generate_najia_divination(
             params=najia_params,
             question=request.question,
             title=request.question,
-            date=datetime.now()
+            date=now
         )
           
         # 生成详细解释
         if najia_result:
-            najia_interpretation = generate_najia_interpretation(najia_result['najia_result'], request.question)
+            # 纳甲解释已随排盘生成，问题相同
+            najia_interpretation = najia_result['najia_interpretation']
             
             # 解析卦名，确保前端显示正确的卦象
             original_hexagram = najia_result['najia_result'].get('original_hexagram', {})
@@ -419,7 +577,10 @@ async def najia_divination(request: NajiaRequest):
                 },
                 "traditional_interpretation": najia_interpretation,
                 "timestamp": datetime.now().isoformat(),
-                "method": "manual" if request.hexagram_data else "auto"
+                "method": "manual" if request.hexagram_data else "auto",
+                "casting_method": method,
+                "rng": rng,
+                "seed": seed
             }
         else:
             raise HTTPException(status_code=500, detail="纳甲分析生成失败")
@@ -428,27 +589,63 @@ async def najia_divination(request: NajiaRequest):
         raise HTTPException(status_code=500, detail=f"纳甲占卜服务出错: {str(e)}")
 
 
+@router.post("/divination/najia/batch")
+async def najia_batch_divination(request: NajiaBatchRequest) -> StreamingResponse:
+    """
+    批量纳甲六爻排盘，按 NDJSON 逐行返回
+    
+    同一时辰的条目共用一次干支计算；排盘与编码在事件循环之外进行，
+    大批量时分发到进程池。
+    
+    Args:
+        request: 各条目的摇卦参数、起卦时间（默认请求时间）与问题
+        
+    Returns:
+        StreamingResponse: 按请求顺序每行一条结果（index、question、date、
+        najia 排盘与 interpretation 纳甲解释）
+        
+    Raises:
+        HTTPException: 起卦时间无法计算干支时
+    """
+    now = datetime.now()
+    items = [(item.params, item.date or now, item.question) for item in request.items]
+    try:
+        # 上万条目的干支查询也不应占用事件循环
+        tasks = await run_in_threadpool(plan_najia_batch, items)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"起卦时间无效: {str(e)}")
+    return StreamingResponse(stream_najia_batch(tasks, settings.najia_batch_workers),
+                             media_type="application/x-ndjson")
+
+
 @router.post("/divination/consult")
-async def basic_consult(request: DivinationRequest):
+async def basic_consult(
+    request: DivinationRequest,
+    rng: Optional[str] = Query(DEFAULT_RNG, pattern="^(seeded|secure)$", description=_RNG_DESCRIPTION),
+    seed: Optional[int] = Query(None, ge=0, le=MAX_SEED, description=_SEED_DESCRIPTION)
+):
     """
     基础占卜咨询端点（兼容性）
     
     Args:
         request: 占卜请求
+        rng: 起卦使用的随机数生成器（seeded 或 secure）
+        seed: 重放之前 seeded 起卦的种子（可选）
         
     Returns:
         Dict: 基础占卜结果
     """
+    # 生成六爻
+    cast, rng, seed = _cast(rng, seed)
     try:
-        # 生成六爻
-        lines = generate_six_lines()
-          # 获取卦象
-        hexagram = get_hexagram_from_lines(lines)
+        lines = cast_lines(cast)
+        # 获取卦象
+        hexagram = get_reading_from_cast(cast)
         if not hexagram:
             raise HTTPException(status_code=500, detail="无法识别卦象")
         
         # 获取变卦
-        changed_hexagram = get_changed_hexagram(lines)
+        changed_hexagram = get_changed_from_cast(cast)
         
         # 生成解释
         interpretation = generate_interpretation(
@@ -464,7 +661,9 @@ async def basic_consult(request: DivinationRequest):
             "hexagram_number": hexagram.number if hexagram else 0,
             "interpretation": interpretation,            "lines": [{"position": i+1, "type": line.type, "changing": line.changing} 
                      for i, line in enumerate(lines)],
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now().isoformat(),
+            "rng": rng,
+            "seed": seed
         }
         
     except Exception as e:
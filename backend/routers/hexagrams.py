@@ -2,56 +2,188 @@
 Hexagrams router - handles hexagram information queries.
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from typing import List, Optional, Tuple
 
-from models.schemas import Hexagram, HexagramResponse
-from utils.hexagram_data import HexagramDataManager
+from models.schemas import (
+    Hexagram, HexagramOutcomesResponse, HexagramRelations, HexagramResponse,
+    HexagramSearchHit, HexagramSearchResponse
+)
+from utils.catalogue_cache import etag_matches, projection_mask
+from utils.hexagram_data import hexagram_manager, trigrams_to_code
 
 router = APIRouter(prefix="/api", tags=["hexagrams"])
 
-# Initialize data manager
-data_manager = HexagramDataManager()
+# Shared process-wide corpus registry
+data_manager = hexagram_manager
+
+
+def _projection(fields: Optional[str], exclude: Optional[str]) -> Optional[int]:
+    """
+    Parse the ``fields`` / ``exclude`` query parameters.
+    
+    Args:
+        fields: Comma separated Hexagram fields to keep
+        exclude: Comma separated Hexagram fields to drop
+        
+    Returns:
+        Field mask, or None for the full hexagram
+        
+    Raises:
+        HTTPException: If a field name is unknown
+    """
+    try:
+        return projection_mask(fields, exclude)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _cached_response(entry: Tuple[bytes, str], if_none_match: Optional[str]) -> Response:
+    """
+    Serve a pre-serialized catalogue body, or 304 if the client's copy is current.
+    
+    Args:
+        entry: (body, etag) from the catalogue cache
+        if_none_match: Value of the If-None-Match request header
+        
+    Returns:
+        Response carrying the body and its ETag
+    """
+    body, etag = entry
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/hexagrams", response_model=HexagramResponse)
 async def get_all_hexagrams(
     limit: Optional[int] = Query(None, ge=1, le=64, description="Maximum number of hexagrams to return"),
-    offset: Optional[int] = Query(0, ge=0, description="Number of hexagrams to skip")
-) -> HexagramResponse:
+    offset: Optional[int] = Query(0, ge=0, description="Number of hexagrams to skip"),
+    fields: Optional[str] = Query(None, description="Comma separated hexagram fields to return, e.g. name,symbol,kingWen"),
+    exclude: Optional[str] = Query(None, description="Comma separated hexagram fields to leave out, e.g. lines,interpretations"),
+    language: Optional[str] = Query("zh", description="Language code: zh for Chinese, en for English"),
+    if_none_match: Optional[str] = Header(None)
+) -> Response:
     """
     Get all hexagrams or a subset with pagination.
     
     Args:
         limit: Maximum number of hexagrams to return (optional)
         offset: Number of hexagrams to skip for pagination
+        fields: Hexagram fields to return (optional, default all)
+        exclude: Hexagram fields to leave out (optional)
+        language: Language code (zh/en)
+        if_none_match: ETag the client already holds
+        
+    Returns:
+        HexagramResponse: List of hexagrams with total count (pre-serialized)
+    """
+    mask = _projection(fields, exclude)
+    try:
+        # 分页结果由预先序列化的单卦片段拼接而成，按ETag支持304
+        catalogue = data_manager.get_catalogue(language)
+        return _cached_response(catalogue.page(offset or 0, limit, mask), if_none_match)
         
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"获取卦象数据失败: {str(e)}")
+
+
+@router.get("/hexagrams/random", response_model=Hexagram)
+async def get_random_hexagram(
+    fields: Optional[str] = Query(None, description="Comma separated hexagram fields to return, e.g. name,symbol,kingWen"),
+    exclude: Optional[str] = Query(None, description="Comma separated hexagram fields to leave out, e.g. lines,interpretations"),
+    language: Optional[str] = Query("zh", description="Language code: zh for Chinese, en for English"),
+    if_none_match: Optional[str] = Header(None)
+) -> Response:
+    """
+    Get a random hexagram for inspiration or study.
+    
+    Declared before ``/hexagrams/{hexagram_id}`` so that "random" is not
+    parsed as a hexagram number.
+    
+    Args:
+        fields: Hexagram fields to return (optional, default all)
+        exclude: Hexagram fields to leave out (optional)
+        language: Language code (zh/en)
+        if_none_match: ETag the client already holds
+    
     Returns:
-        HexagramResponse: List of hexagrams with total count
+        Hexagram: A randomly selected hexagram
     """
+    mask = _projection(fields, exclude)
     try:
-        hexagrams = data_manager.get_all_hexagrams()
-        total = len(hexagrams)
+        hexagram = data_manager.get_random_hexagram(language)
+        return _cached_response(
+            data_manager.get_catalogue(language).hexagram(hexagram.number, mask),
+            if_none_match
+        )
         
-        # Apply pagination if specified
-        if limit is not None:
-            hexagrams = hexagrams[offset:offset + limit]
-        elif offset > 0:
-            hexagrams = hexagrams[offset:]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"获取随机卦象失败: {str(e)}")
+
+
+@router.get("/hexagrams/search", response_model=HexagramSearchResponse)
+async def search_hexagrams(
+    q: str = Query(..., min_length=1, max_length=100, description="Search text; whitespace separated terms must all match"),
+    limit: int = Query(10, ge=1, le=64, description="Maximum number of results to return"),
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
+    language: Optional[str] = Query("zh", description="Language code: zh for Chinese, en for English")
+) -> HexagramSearchResponse:
+    """
+    Full-text search over names, judgments, images, lines and interpretations.
+    
+    Declared before ``/hexagrams/{hexagram_id}`` so that "search" is not
+    parsed as a hexagram number.
+    
+    Args:
+        q: Search text (Traditional and Simplified Chinese are matched alike)
+        limit: Maximum number of results to return
+        offset: Number of results to skip for pagination
+        language: Language code (zh/en)
         
-        return HexagramResponse(hexagrams=hexagrams, total=total)
+    Returns:
+        HexagramSearchResponse: Ranked hits with highlighted snippets
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="搜索关键词不能为空")
+    
+    try:
+        total, hits = data_manager.search(q, limit, offset, language)
+        results = []
+        for hit in hits:
+            hexagram = data_manager.get_hexagram_by_number(hit.number, language)
+            results.append(HexagramSearchHit(
+                number=hit.number,
+                name=hexagram.name,
+                chineseName=hexagram.chineseName,
+                score=hit.score,
+                field=hit.field,
+                snippet=hit.snippet
+            ))
+        return HexagramSearchResponse(query=q, hits=results, total=total)
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"获取卦象数据失败: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"搜索卦象失败: {str(e)}")
 
 
 @router.get("/hexagrams/{hexagram_id}", response_model=Hexagram)
-async def get_hexagram(hexagram_id: int) -> Hexagram:
+async def get_hexagram(
+    hexagram_id: int,
+    fields: Optional[str] = Query(None, description="Comma separated hexagram fields to return, e.g. name,symbol,kingWen"),
+    exclude: Optional[str] = Query(None, description="Comma separated hexagram fields to leave out, e.g. lines,interpretations"),
+    language: Optional[str] = Query("zh", description="Language code: zh for Chinese, en for English"),
+    if_none_match: Optional[str] = Header(None)
+) -> Response:
     """
     Get a specific hexagram by its ID (number).
     
     Args:
         hexagram_id: Hexagram number (1-64)
+        fields: Hexagram fields to return (optional, default all)
+        exclude: Hexagram fields to leave out (optional)
+        language: Language code (zh/en)
+        if_none_match: ETag the client already holds
         
     Returns:
         Hexagram: The requested hexagram
@@ -62,12 +194,13 @@ async def get_hexagram(hexagram_id: int) -> Hexagram:
     if hexagram_id < 1 or hexagram_id > 64:
         raise HTTPException(status_code=400, detail="卦象编号必须在1-64之间")
     
+    mask = _projection(fields, exclude)
     try:
-        hexagram = data_manager.get_hexagram_by_number(hexagram_id)
-        if hexagram is None:
+        entry = data_manager.get_catalogue(language).hexagram(hexagram_id, mask)
+        if entry is None:
             raise HTTPException(status_code=404, detail=f"未找到编号为 {hexagram_id} 的卦象")
         
-        return hexagram
+        return _cached_response(entry, if_none_match)
         
     except HTTPException:
         raise
@@ -75,13 +208,21 @@ async def get_hexagram(hexagram_id: int) -> Hexagram:
         raise HTTPException(status_code=500, detail=f"获取卦象失败: {str(e)}")
 
 
-@router.get("/hexagrams/search/{name}")
-async def search_hexagrams_by_name(name: str) -> HexagramResponse:
+@router.get("/hexagrams/search/{name}", response_model=HexagramResponse)
+async def search_hexagrams_by_name(
+    name: str,
+    fields: Optional[str] = Query(None, description="Comma separated hexagram fields to return, e.g. name,symbol,kingWen"),
+    exclude: Optional[str] = Query(None, description="Comma separated hexagram fields to leave out, e.g. lines,interpretations"),
+    language: Optional[str] = Query("zh", description="Language code: zh for Chinese, en for English")
+) -> Response:
     """
     Search hexagrams by Chinese or English name.
     
     Args:
         name: Name to search for (partial match supported)
+        fields: Hexagram fields to return (optional, default all)
+        exclude: Hexagram fields to leave out (optional)
+        language: Language code (zh/en)
         
     Returns:
         HexagramResponse: List of matching hexagrams
@@ -89,22 +230,35 @@ async def search_hexagrams_by_name(name: str) -> HexagramResponse:
     if not name.strip():
         raise HTTPException(status_code=400, detail="搜索关键词不能为空")
     
+    mask = _projection(fields, exclude)
     try:
-        hexagrams = data_manager.search_hexagrams_by_name(name.strip())
-        return HexagramResponse(hexagrams=hexagrams, total=len(hexagrams))
+        hexagrams = data_manager.search_hexagrams_by_name(name.strip(), language)
+        body = data_manager.get_catalogue(language).hexagram_list([h.number for h in hexagrams], mask)
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"搜索卦象失败: {str(e)}")
 
 
-@router.get("/hexagrams/trigram/{upper_trigram}/{lower_trigram}")
-async def get_hexagram_by_trigrams(upper_trigram: str, lower_trigram: str) -> Hexagram:
+@router.get("/hexagrams/trigram/{upper_trigram}/{lower_trigram}", response_model=Hexagram)
+async def get_hexagram_by_trigrams(
+    upper_trigram: str,
+    lower_trigram: str,
+    fields: Optional[str] = Query(None, description="Comma separated hexagram fields to return, e.g. name,symbol,kingWen"),
+    exclude: Optional[str] = Query(None, description="Comma separated hexagram fields to leave out, e.g. lines,interpretations"),
+    language: Optional[str] = Query("zh", description="Language code: zh for Chinese, en for English"),
+    if_none_match: Optional[str] = Header(None)
+) -> Response:
     """
     Get hexagram by upper and lower trigram combinations.
     
     Args:
         upper_trigram: Upper trigram in binary format (e.g., "111")
         lower_trigram: Lower trigram in binary format (e.g., "000")
+        fields: Hexagram fields to return (optional, default all)
+        exclude: Hexagram fields to leave out (optional)
+        language: Language code (zh/en)
+        if_none_match: ETag the client already holds
         
     Returns:
         Hexagram: The matching hexagram
@@ -119,15 +273,17 @@ async def get_hexagram_by_trigrams(upper_trigram: str, lower_trigram: str) -> He
     if not (len(lower_trigram) == 3 and all(c in '01' for c in lower_trigram)):
         raise HTTPException(status_code=400, detail="下卦格式错误，应为3位二进制字符串")
     
+    mask = _projection(fields, exclude)
     try:
-        hexagram = data_manager.get_hexagram_by_trigrams(upper_trigram, lower_trigram)
-        if hexagram is None:
+        code = trigrams_to_code(upper_trigram, lower_trigram)
+        entry = data_manager.get_catalogue(language).hexagram_by_code(code, mask)
+        if entry is None:
             raise HTTPException(
                 status_code=404, 
                 detail=f"未找到上卦为{upper_trigram}，下卦为{lower_trigram}的卦象"
             )
         
-        return hexagram
+        return _cached_response(entry, if_none_match)
         
     except HTTPException:
         raise
@@ -135,17 +291,77 @@ async def get_hexagram_by_trigrams(upper_trigram: str, lower_trigram: str) -> He
         raise HTTPException(status_code=500, detail=f"查询卦象失败: {str(e)}")
 
 
-@router.get("/hexagrams/random")
-async def get_random_hexagram() -> Hexagram:
+@router.get("/hexagrams/{hexagram_id}/relations", response_model=HexagramRelations)
+async def get_hexagram_relations(
+    hexagram_id: int,
+    language: Optional[str] = Query("zh", description="Language code: zh for Chinese, en for English"),
+    if_none_match: Optional[str] = Header(None)
+) -> Response:
     """
-    Get a random hexagram for inspiration or study.
+    Get the nuclear (互卦), inverse (综卦) and opposite (错卦) hexagrams and the
+    hexagram each single changing line leads to.
     
+    Declared after ``/hexagrams/search/{name}`` so that
+    ``/hexagrams/search/relations`` remains a name search.
+    
+    Args:
+        hexagram_id: Hexagram number (1-64)
+        language: Language code (zh/en)
+        if_none_match: ETag the client already holds
+        
     Returns:
-        Hexagram: A randomly selected hexagram
+        HexagramRelations: Related hexagrams, answered from precomputed tables
+        
+    Raises:
+        HTTPException: If hexagram is not found
     """
+    if hexagram_id < 1 or hexagram_id > 64:
+        raise HTTPException(status_code=400, detail="卦象编号必须在1-64之间")
+    
     try:
-        hexagram = data_manager.get_random_hexagram()
-        return hexagram
+        entry = data_manager.get_catalogue(language).relations(hexagram_id)
+        if entry is None:
+            raise HTTPException(status_code=404, detail=f"未找到编号为 {hexagram_id} 的卦象")
+        
+        return _cached_response(entry, if_none_match)
         
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"获取随机卦象失败: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"获取相关卦象失败: {str(e)}")
+
+
+@router.get("/hexagrams/{hexagram_id}/outcomes", response_model=HexagramOutcomesResponse)
+async def get_hexagram_outcomes(
+    hexagram_id: int,
+    language: Optional[str] = Query("zh", description="Language code: zh for Chinese, en for English"),
+    if_none_match: Optional[str] = Header(None)
+) -> Response:
+    """
+    Get the changed hexagram (之卦) for all 64 combinations of changing lines.
+    
+    Args:
+        hexagram_id: Hexagram number (1-64)
+        language: Language code (zh/en)
+        if_none_match: ETag the client already holds
+        
+    Returns:
+        HexagramOutcomesResponse: 64 outcomes ordered by changing-line mask
+        
+    Raises:
+        HTTPException: If hexagram is not found
+    """
+    if hexagram_id < 1 or hexagram_id > 64:
+        raise HTTPException(status_code=400, detail="卦象编号必须在1-64之间")
+    
+    try:
+        entry = data_manager.get_catalogue(language).outcomes(hexagram_id)
+        if entry is None:
+            raise HTTPException(status_code=404, detail=f"未找到编号为 {hexagram_id} 的卦象")
+        
+        return _cached_response(entry, if_none_match)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"获取变卦结果失败: {str(e)}")
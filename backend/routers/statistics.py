@@ -0,0 +1,45 @@
+"""
+Statistics router - Monte Carlo simulation of the casting methods.
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, Optional
+
+from models.schemas import SimulationResult
+from utils.casting_engines import DEFAULT_METHOD
+from utils.rng import MAX_SEED
+from utils.simulation import DEFAULT_CASTS, MAX_CASTS, simulate
+
+router = APIRouter(prefix="/api/statistics", tags=["statistics"])
+
+
+@router.get("/simulate", response_model=SimulationResult)
+async def simulate_casting(
+    method: Optional[str] = Query(DEFAULT_METHOD, description="Casting method to simulate: coins or yarrow"),
+    casts: int = Query(DEFAULT_CASTS, ge=1, le=MAX_CASTS, description="Number of readings to cast"),
+    seed: Optional[int] = Query(None, ge=0, le=MAX_SEED, description="Seed to reproduce a previous simulation")
+) -> Dict[str, Any]:
+    """
+    Cast many readings with a method and test their distributions.
+    
+    Args:
+        method: Random casting method (coins, yarrow)
+        casts: Number of readings
+        seed: Seed of the simulation (optional, returned in the result)
+        
+    Returns:
+        SimulationResult: Histograms of line values, changing-line counts,
+        hexagrams, changed hexagrams, palaces and palace types with
+        chi-square tests against the method's exact probabilities
+        
+    Raises:
+        HTTPException: If the method cannot be simulated, or NumPy is missing
+    """
+    try:
+        # 1e7 次模拟约需数百毫秒，放到线程池中执行，避免阻塞事件循环
+        return await run_in_threadpool(simulate, method, casts, seed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
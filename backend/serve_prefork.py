@@ -0,0 +1,172 @@
+"""
+Pre-fork server for the I Ching Divination API.
+
+The master process imports the application, loads every hexagram corpus
+into the process-wide registry and freezes the garbage collector
+(``gc.freeze()``) before forking the workers. The loaded corpus, the search
+index and the interpretation fragments (see ``main.load_corpora``) therefore
+live in pages the workers share copy-on-write instead of one private copy
+per worker, as with ``uvicorn --workers`` (which starts every worker from
+scratch). Catalogue bodies are not warmed: each worker encodes the
+hexagrams it serves on demand into its own bounded cache.
+
+The master only supervises: it forwards SIGINT/SIGTERM to the workers and
+replaces a worker that exits unexpectedly. Every worker runs the normal
+application lifespan, which finds the corpus already loaded and starts its
+own data file watcher.
+
+Usage (from the backend directory)::
+
+    python serve_prefork.py --workers 4 --port 8000
+
+Platforms without ``os.fork`` (Windows) fall back to a single process.
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict
+
+import uvicorn
+
+from config import settings
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    """
+    Create the listening socket shared by all workers.
+
+    Args:
+        host: Interface to bind
+        port: TCP port
+
+    Returns:
+        Bound, listening socket
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, sock: socket.socket, log_level: str) -> None:
+    """
+    Serve requests in a forked worker until it is told to stop.
+
+    Args:
+        app: ASGI application imported by the master
+        sock: Listening socket inherited from the master
+        log_level: Uvicorn log level
+    """
+    # 恢复默认信号处理，由 uvicorn 安装自己的优雅退出处理
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    config = uvicorn.Config(app, log_level=log_level, access_log=False)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _spawn(app, sock: socket.socket, log_level: str) -> int:
+    """
+    Fork one worker.
+
+    Returns:
+        Process ID of the worker (only in the master)
+    """
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(app, sock, log_level)
+        except BaseException:
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def serve(host: str, port: int, workers: int, log_level: str = "info") -> None:
+    """
+    Load the corpus once, then fork and supervise the workers.
+
+    Args:
+        host: Interface to bind
+        port: TCP port
+        workers: Number of worker processes
+        log_level: Uvicorn log level
+    """
+    from main import app, load_corpora
+
+    if not hasattr(os, "fork"):
+        print("⚠️ 当前平台不支持 fork，以单进程方式运行")
+        uvicorn.run(app, host=host, port=port, log_level=log_level)
+        return
+
+    print(f"📚 主进程加载卦象数据（{workers} 个工作进程共享）...")
+    load_corpora()
+    # 先回收一次，再把存活对象移入永久代：子进程的 GC 不再扫描（也就不再写入）这些对象，
+    # 其所在内存页得以保持写时复制共享
+    gc.collect()
+    gc.freeze()
+
+    sock = _bind(host, port)
+    print(f"🌐 服务地址: http://{host}:{port}")
+
+    children: Dict[int, int] = {}
+    stopping = False
+
+    def _stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+
+    for slot in range(workers):
+        children[_spawn(app, sock, log_level)] = slot
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        slot = children.pop(pid, None)
+        if slot is None or stopping:
+            continue
+        print(f"⚠️ 工作进程 {pid} 意外退出（状态 {status}），重新启动")
+        # 避免启动即崩溃时的忙循环
+        time.sleep(1)
+        if not stopping:
+            children[_spawn(app, sock, log_level)] = slot
+
+    sock.close()
+    print("🛑 易经占卜 API 关闭中...")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Pre-fork server for the I Ching Divination API")
+    parser.add_argument("--host", default=settings.host, help="Interface to bind")
+    parser.add_argument("--port", type=int, default=settings.port, help="TCP port")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    parser.add_argument("--log-level", default="info", help="Uvicorn log level")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    serve(args.host, args.port, args.workers, args.log_level)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,81 @@
+"""
+Run Monte Carlo simulations of the casting methods offline.
+
+Prints, per method, the line value frequencies and the chi-square test of
+every distribution against the method's theoretical line odds (the same
+report as ``GET /api/statistics/simulate``), after checking that the
+method's lookup table reproduces the odds exactly and testing the line
+values drawn by its ``cast_batch``.
+
+Usage:
+    python simulate_casting.py --method yarrow --casts 10000000
+    python simulate_casting.py --method all --seed 42 --json report.json
+"""
+
+import argparse
+import json
+import sys
+
+from utils.casting_engines import CASTING_ENGINES
+from utils.hexagram_data import hexagram_manager
+from utils.simulation import DEFAULT_CASTS, check_cast_batch, check_half_table, simulate
+
+
+def main(argv=None) -> int:
+    """
+    Simulate the selected methods and print their reports.
+
+    Returns:
+        Exit status: 1 if a lookup table is wrong or any test has a p-value
+        below ``--alpha``
+    """
+    random_methods = [name for name, engine in CASTING_ENGINES.items()
+                      if engine.uses_rng and engine.half_table is not None and engine.line_odds is not None]
+    parser = argparse.ArgumentParser(description="Monte Carlo statistics of the casting methods")
+    parser.add_argument("--method", default="all", choices=random_methods + ["all"], help="Casting method")
+    parser.add_argument("--casts", type=int, default=DEFAULT_CASTS * 10, help="Readings per method")
+    parser.add_argument("--seed", type=int, default=None, help="Seed (a fresh one is drawn if omitted)")
+    parser.add_argument("--alpha", type=float, default=0.001, help="Significance level of the checks")
+    parser.add_argument("--json", metavar="FILE", help="Also write the full reports as JSON")
+    args = parser.parse_args(argv)
+
+    hexagram_manager.load_all()
+    methods = random_methods if args.method == "all" else [args.method]
+    reports = []
+    failed = False
+    for method in methods:
+        engine = CASTING_ENGINES[method]
+        try:
+            check_half_table(engine)
+            print(f"\n✅ {method}: 查表与理论爻值概率一致")
+        except ValueError as e:
+            failed = True
+            print(f"\n❌ {e}")
+        statistic, dof, p_value = check_cast_batch(engine, seed=args.seed or 0)
+        failed |= p_value < args.alpha
+        print(f"  {'✅' if p_value >= args.alpha else '❌'} cast_batch 爻值 χ²={statistic:.2f}  "
+              f"自由度={dof} p={p_value:.4f}")
+        report = simulate(method, args.casts, args.seed)
+        reports.append(report)
+        print(f"\n{report['method']}: {report['casts']:,} 卦，种子 {report['seed']}，"
+              f"{report['elapsedMs']:.0f} ms（{report['castsPerSecond']:,.0f} 卦/秒）")
+        lines = report["histograms"]["lineValues"]
+        total = sum(lines["observed"])
+        print("  爻值频率: " + "  ".join(
+            f"{value}: {count / total:.5f} (理论 {expected / total:.5f})"
+            for value, count, expected in zip(lines["bins"], lines["observed"], lines["expected"])
+        ))
+        for name, histogram in report["histograms"].items():
+            ok = histogram["pValue"] >= args.alpha
+            failed |= not ok
+            print(f"  {'✅' if ok else '❌'} {name:<16} χ²={histogram['chiSquare']:10.2f}  "
+                  f"自由度={histogram['dof']:<3} p={histogram['pValue']:.4f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,13 @@
+"""
+Shared pytest setup: run the tests from the backend directory's imports.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# 与 ``python -m`` 从 backend 目录运行时相同的导入路径
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# 测试不访问外部服务
+os.environ.setdefault("DeepSeek_API_KEY", "test")
@@ -0,0 +1,65 @@
+"""
+Tests of the batch divination endpoint.
+"""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from main import app
+from models.schemas import BatchDivinationResponse
+from utils.hexagram_data import hexagram_manager
+
+client = TestClient(app)
+
+
+def _check_reading(reading, language="zh"):
+    values = reading["lines"]
+    assert len(values) == 6 and set(values) <= {6, 7, 8, 9}
+    code = sum(1 << i for i, value in enumerate(values) if value in (7, 9))
+    changed = code ^ sum(1 << i for i, value in enumerate(values) if value in (6, 9))
+    assert reading["hexagram"]["number"] == hexagram_manager.get_hexagram_by_code(code, language).number
+    assert reading["changingLines"] == [i + 1 for i, value in enumerate(values) if value in (6, 9)]
+    if reading["changingLines"]:
+        assert reading["changedHexagram"]["number"] == hexagram_manager.get_hexagram_by_code(changed, language).number
+    else:
+        assert reading["changedHexagram"] is None
+
+
+def test_batch_of_questions():
+    questions = [f"问题{i}" for i in range(200)]
+    response = client.post("/api/divination/batch", json={"questions": questions})
+    assert response.status_code == 200
+    body = response.json()
+    BatchDivinationResponse.model_validate(body)
+    assert body["total"] == 200
+    assert [reading["question"] for reading in body["readings"]] == questions
+    for reading in body["readings"]:
+        _check_reading(reading)
+
+
+def test_anonymous_batch_in_english():
+    body = client.post("/api/divination/batch?language=en", json={"count": 300}).json()
+    assert body["total"] == len(body["readings"]) == 300
+    for reading in body["readings"]:
+        assert reading.get("question") is None
+        _check_reading(reading, "en")
+    # 300 次起卦不会全部相同
+    assert len({tuple(reading["lines"]) for reading in body["readings"]}) > 1
+
+
+def test_ndjson_streams_one_reading_per_line():
+    response = client.post("/api/divination/batch?format=ndjson", json={"count": 2500})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.content.decode("utf-8").splitlines()
+    assert len(lines) == 2500
+    for line in lines:
+        _check_reading(json.loads(line))
+
+
+def test_invalid_batches():
+    assert client.post("/api/divination/batch", json={}).status_code == 400
+    assert client.post("/api/divination/batch", json={"questions": ["a", "b"], "count": 3}).status_code == 400
+    assert client.post("/api/divination/batch", json={"count": 10001}).status_code == 422
+    assert client.post("/api/divination/batch?format=xml", json={"count": 1}).status_code == 422
@@ -0,0 +1,42 @@
+"""
+Tests of the casting methods selected by the divination routes.
+"""
+
+import random
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from utils.casting import najia_params_to_cast
+from utils.casting_engines import get_engine
+from utils.divination_logic import params_to_najia_format
+
+client = TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/api/divination", "/api/divination/najia"])
+def test_plum_time_without_lunar_python(path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "lunar_python", None)
+    response = client.post(path, params={"method": "plum_time"}, json={"question": "问题"})
+    assert response.status_code == 503
+    assert "lunar_python" in response.json()["detail"]
+
+
+def test_invalid_method_inputs():
+    for params in ({"method": "nope"}, {"method": "plum_number", "numbers": "3"},
+                   {"method": "plum_number", "numbers": "a,b"}, {"method": "plum_time", "seed": 1}):
+        assert client.post("/api/divination", params=params, json={"question": "问题"}).status_code == 400
+
+
+@pytest.mark.parametrize("method", ["coins", "yarrow"])
+def test_random_najia_params_use_the_engine(method):
+    params = params_to_najia_format([], random.Random(5), method)
+    assert najia_params_to_cast(params) == get_engine(method).cast(random.Random(5))
+
+
+def test_najia_params_need_a_random_method():
+    with pytest.raises(ValueError):
+        params_to_najia_format([], method="plum_time")
+    assert params_to_najia_format([0, 1, 2, 3, 4, 9]) == [4, 1, 2, 3, 4, 2]
@@ -0,0 +1,84 @@
+"""
+Tests of the pre-serialized catalogue routes and their ETags.
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from utils.catalogue_cache import CatalogueCache, encode_json, etag_matches
+from utils.hexagram_data import hexagram_manager
+
+client = TestClient(app)
+
+
+@pytest.mark.parametrize("path", [
+    "/api/hexagrams", "/api/hexagrams?limit=10&offset=5", "/api/hexagrams/1",
+    "/api/hexagrams/trigram/111/000", "/api/hexagrams?language=en",
+])
+def test_if_none_match_returns_304(path):
+    response = client.get(path)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    cached = client.get(path, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert client.get(path, headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+    assert client.get(path, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_etags_differ_by_resource_and_language():
+    etags = {
+        client.get(path).headers["etag"]
+        for path in ("/api/hexagrams/1", "/api/hexagrams/2", "/api/hexagrams/1?language=en",
+                     "/api/hexagrams", "/api/hexagrams?limit=10")
+    }
+    assert len(etags) == 5
+
+
+def test_pages_join_the_hexagram_bodies():
+    full = client.get("/api/hexagrams").json()
+    assert full["total"] == 64 and len(full["hexagrams"]) == 64
+    page = client.get("/api/hexagrams?limit=10&offset=5").json()
+    assert page == {"hexagrams": full["hexagrams"][5:15], "total": 64}
+    assert client.get("/api/hexagrams?offset=70").json() == {"hexagrams": [], "total": 64}
+    assert client.get("/api/hexagrams/6").json() == full["hexagrams"][5]
+
+
+def test_hexagram_body_is_the_payload():
+    body = client.get("/api/hexagrams/1").content
+    assert json.loads(body)["number"] == 1
+    assert client.get("/api/hexagrams/trigram/111/111").content == body
+
+
+def test_random_is_not_parsed_as_an_id():
+    response = client.get("/api/hexagrams/random")
+    assert response.status_code == 200
+    assert 1 <= response.json()["number"] <= 64
+    assert client.get("/api/hexagrams/65").status_code == 400
+
+
+def test_etag_matches():
+    assert etag_matches("*", '"a"')
+    assert etag_matches('W/"a"', '"a"')
+    assert etag_matches('"b", "a"', '"a"')
+    assert not etag_matches(None, '"a"')
+    assert not etag_matches('"ab"', '"a"')
+
+
+def test_hexagrams_are_encoded_on_demand():
+    corpus = hexagram_manager.get_corpus("zh")
+    catalogue = CatalogueCache(corpus, max_hexagrams=4)
+    assert len(catalogue._fragments) == 0
+    for number in range(1, 11):
+        body, _ = catalogue.hexagram(number)
+        assert body == encode_json(corpus.payload(number))
+    assert list(catalogue._fragments) == [7, 8, 9, 10]
+    page, _ = catalogue.page(0, 64)
+    assert page == corpus.catalogue.page(0, 64)[0]
+    assert len(catalogue._fragments) == 4
@@ -0,0 +1,120 @@
+"""
+Tests of the corpus hot reload and the admin routes.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from config import settings
+from routers.admin import router as admin_router
+from utils.corpus_reload import CorpusWatcher
+from utils.hexagram_data import HexagramDataManager
+
+DATA_FILE = Path(__file__).resolve().parent.parent / "hexagrams_complete_fixed.json"
+
+
+def _write(path: Path, hexagrams) -> None:
+    path.write_text(json.dumps(hexagrams, ensure_ascii=False), encoding="utf-8")
+    # 保证 (mtime, size) 签名变化，不依赖文件系统的时间精度
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "hexagrams.json"
+    shutil.copy(DATA_FILE, path)
+    return path
+
+
+@pytest.fixture
+def manager(data_file):
+    manager = HexagramDataManager(data_file=str(data_file), use_bundle=False)
+    manager.get_corpus("zh")
+    return manager
+
+
+class _NoLock:
+    def __enter__(self):
+        raise AssertionError("resident corpus took the load lock")
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def test_unsupported_language_uses_the_fast_path(manager):
+    corpus = manager.get_corpus("zh")
+    manager._load_lock = _NoLock()
+    assert manager.get_corpus("fr") is corpus
+    assert manager.get_corpus("") is corpus
+
+
+def test_reload_swaps_the_corpus(manager, data_file):
+    old = manager.get_corpus("zh")
+    old_etag = old.catalogue.hexagram(1)[1]
+    hexagrams = json.loads(data_file.read_text(encoding="utf-8"))
+    hexagrams[0]["chineseName"] = "乾卦（新）"
+    _write(data_file, hexagrams)
+
+    assert manager.reload() == ["zh"]
+    new = manager.get_corpus("zh")
+    assert new is not old
+    assert new.generation == old.generation + 1
+    assert new.by_number[1].chineseName == "乾卦（新）"
+    # 持有旧语料的请求仍读到完整的旧数据
+    assert old.by_number[1].chineseName != "乾卦（新）"
+    assert new.catalogue.hexagram(1)[1] != old_etag
+    assert manager.reload() == []
+
+
+def test_touched_file_keeps_the_corpus(manager, data_file):
+    old = manager.get_corpus("zh")
+    stat = data_file.stat()
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+    assert manager.reload() == []
+    assert manager.get_corpus("zh") is old
+
+
+def test_failed_reload_keeps_serving(manager, data_file):
+    old = manager.get_corpus("zh")
+    data_file.write_text('[{"number": 1', encoding="utf-8")
+    os.utime(data_file, ns=(0, old.signature[0][0] + 3_000_000_000))
+    watcher = CorpusWatcher({"test": manager}, interval=0)
+    assert watcher.poll() == {}
+    assert manager.get_corpus("zh") is old
+
+
+@pytest.fixture
+def admin_client(manager, monkeypatch):
+    app = FastAPI()
+    app.include_router(admin_router)
+    app.state.corpus_watcher = CorpusWatcher({"test": manager}, interval=0)
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    return TestClient(app)
+
+
+def test_reload_requires_the_admin_token(admin_client):
+    assert admin_client.post("/api/admin/corpus/reload").status_code == 403
+    assert admin_client.post("/api/admin/corpus/reload",
+                             headers={"X-Admin-Token": "wrong"}).status_code == 403
+    response = admin_client.post("/api/admin/corpus/reload?force=true", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert response.json()["reloaded"] == {"test": ["zh"]}
+
+
+def test_reload_is_disabled_without_an_admin_token(admin_client, monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", None)
+    for headers in ({}, {"X-Admin-Token": ""}, {"X-Admin-Token": "secret"}):
+        assert admin_client.post("/api/admin/corpus/reload?force=true", headers=headers).status_code == 403
+
+
+def test_corpus_status(admin_client):
+    body = admin_client.get("/api/admin/corpus").json()
+    assert body["reloadInterval"] == 0
+    assert [(entry["manager"], entry["language"]) for entry in body["corpora"]] == [("test", "zh")]
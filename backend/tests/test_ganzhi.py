@@ -0,0 +1,50 @@
+"""
+Tests of the table-driven calendar against ``lunar_python``.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.ganzhi import (
+    JIEQI_FIRST_YEAR, JIEQI_LAST_YEAR, JIEQI_TABLE_FILE, daily, decode_jieqi_table,
+    encode_jieqi_table, jieqi_table, xunkong,
+)
+
+lunar_python = pytest.importorskip("lunar_python")
+
+from utils.ganzhi import lunar_jieqi_moments, verify_against_lunar  # noqa: E402
+
+
+def test_shipped_table_matches_lunar_python():
+    assert encode_jieqi_table(JIEQI_FIRST_YEAR, lunar_jieqi_moments()) == JIEQI_TABLE_FILE.read_bytes()
+
+
+@pytest.mark.parametrize("start, end", [
+    (datetime(1900, 1, 1), datetime(1902, 1, 1)),
+    (datetime(2098, 1, 1), datetime(2101, 1, 1)),
+], ids=["first-years", "last-years"])
+def test_range_edges_match_lunar_python(start, end):
+    # 逐小时校验，另含每个节的前一秒与当秒
+    assert verify_against_lunar(start, end) > 0
+
+
+def test_out_of_range_is_rejected():
+    table = jieqi_table()
+    first = datetime(JIEQI_FIRST_YEAR, 1, 1) + timedelta(seconds=table.bounds[0])
+    with pytest.raises(ValueError):
+        daily(first - timedelta(seconds=1))
+    with pytest.raises(ValueError):
+        daily(datetime(JIEQI_LAST_YEAR + 2, 1, 1))
+
+
+def test_corrupt_table_is_rejected():
+    data = bytearray(JIEQI_TABLE_FILE.read_bytes())
+    data[-1] ^= 1
+    with pytest.raises(ValueError):
+        decode_jieqi_table(bytes(data))
+
+
+def test_xunkong():
+    assert xunkong(0) == '戌亥'
+    assert xunkong(59) == '子丑'
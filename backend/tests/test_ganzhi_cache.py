@@ -0,0 +1,108 @@
+"""
+Tests of the per-时辰 GanZhi cache of the najia oracle.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers.admin import router as admin_router
+from utils.najia_oracle import GanZhiCache, compute_daily, shichen_bounds, shichen_index
+
+# 2024-06-05 午时内交芒种
+_JIE_HOUR = datetime(2024, 6, 5, 11, 0)
+
+
+class CountingCompute:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, date):
+        self.calls += 1
+        return compute_daily(date)
+
+
+def test_shichen_bounds():
+    assert shichen_bounds(datetime(2024, 6, 1, 10, 30)) == (datetime(2024, 6, 1, 9), datetime(2024, 6, 1, 11))
+    assert shichen_bounds(datetime(2024, 6, 1, 11, 0)) == (datetime(2024, 6, 1, 11), datetime(2024, 6, 1, 13))
+    # 子时按零点分成两段，日柱在零点更替
+    assert shichen_bounds(datetime(2024, 6, 1, 23, 30)) == (datetime(2024, 6, 1, 23), datetime(2024, 6, 2, 0))
+    assert shichen_bounds(datetime(2024, 6, 2, 0, 30)) == (datetime(2024, 6, 2, 0), datetime(2024, 6, 2, 1))
+    assert [shichen_index(datetime(2024, 6, 1, hour)) for hour in (0, 1, 2, 12, 22, 23)] == [0, 1, 1, 6, 11, 12]
+
+
+def test_cached_daily_is_exact():
+    cache = GanZhiCache(max_entries=1000, prefetch_seconds=0)
+    moment = datetime(2024, 6, 3, 0, 17, 5)
+    while moment < datetime(2024, 6, 7):
+        assert cache.daily(moment) == compute_daily(moment), moment
+        moment += timedelta(minutes=37)
+    assert cache.info()['hits'] > 0
+
+
+def test_one_computation_per_shichen():
+    compute = CountingCompute()
+    cache = GanZhiCache(compute, prefetch_seconds=0)
+    for minute in range(0, 120, 10):
+        cache.daily(datetime(2024, 6, 1, 9) + timedelta(minutes=minute))
+    # 首尾两个时刻
+    assert compute.calls == 2
+    assert cache.info()['hits'] == 11 and cache.info()['misses'] == 1
+
+
+def test_shichen_with_a_jie_is_computed_exactly():
+    compute = CountingCompute()
+    cache = GanZhiCache(compute, prefetch_seconds=0)
+    _, value = cache.slot(_JIE_HOUR)
+    assert value is None
+    before, after = _JIE_HOUR, _JIE_HOUR + timedelta(minutes=119)
+    assert cache.daily(before)['gz']['month'] != cache.daily(after)['gz']['month']
+    assert cache.daily(after) == compute_daily(after)
+
+
+def test_results_are_copies():
+    cache = GanZhiCache(prefetch_seconds=0)
+    moment = datetime(2024, 6, 1, 10, 30)
+    cache.daily(moment)['gz']['day'] = '改动'
+    assert cache.daily(moment) == compute_daily(moment)
+
+
+def test_lru_eviction():
+    cache = GanZhiCache(max_entries=2, prefetch_seconds=0)
+    for hour in (1, 3, 5):
+        cache.daily(datetime(2024, 6, 1, hour))
+    info = cache.info()
+    assert info['size'] == 2 and info['evictions'] == 1
+    cache.clear()
+    assert cache.info()['size'] == 0
+
+
+def test_prefetch_of_the_next_shichen():
+    compute = CountingCompute()
+    cache = GanZhiCache(compute, prefetch_seconds=60)
+    cache.daily(datetime(2024, 6, 1, 10, 59, 30))
+    deadline = time.monotonic() + 5
+    while cache.info()['prefetches'] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.info()['prefetches'] == 1
+    misses = cache.info()['misses']
+    cache.daily(datetime(2024, 6, 1, 11, 0, 1))
+    assert cache.info()['misses'] == misses
+
+
+def test_disabled_cache_computes_every_time():
+    compute = CountingCompute()
+    cache = GanZhiCache(compute, prefetch_seconds=0)
+    cache.enabled = False
+    for _ in range(3):
+        cache.daily(datetime(2024, 6, 1, 10, 30))
+    assert compute.calls == 3 and cache.info()['size'] == 0
+
+
+def test_admin_route():
+    app = FastAPI()
+    app.include_router(admin_router)
+    body = TestClient(app).get("/api/admin/ganzhi-cache").json()
+    assert {'size', 'hits', 'misses', 'hit_rate', 'prefetches'} <= set(body)
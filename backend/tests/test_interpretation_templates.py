@@ -0,0 +1,93 @@
+"""
+Tests of the precompiled interpretation fragments.
+"""
+
+import pytest
+
+from utils.casting import cast_lines
+from utils.divination_logic import generate_interpretation, get_changed_from_cast, get_reading_from_cast
+from utils.hexagram_data import hexagram_manager
+from utils.interpretation_templates import compile_fragments
+
+
+def _description(hexagram):
+    if hasattr(hexagram, 'description') and hexagram.description:
+        return hexagram.description
+    if hasattr(hexagram, 'interpretations') and hexagram.interpretations:
+        if hexagram.interpretations.traditional and hasattr(hexagram.interpretations.traditional, 'description'):
+            return hexagram.interpretations.traditional.description
+        return ""
+    if hasattr(hexagram, 'kingWen') and hexagram.kingWen:
+        return hexagram.kingWen.explanation
+    return ""
+
+
+def _traditional(hexagram):
+    if hasattr(hexagram, 'interpretations') and hexagram.interpretations and hasattr(hexagram.interpretations, 'traditional'):
+        if hasattr(hexagram.interpretations.traditional, 'description'):
+            return hexagram.interpretations.traditional.description
+    return None
+
+
+def _probing_interpretation(question, original, changed, lines):
+    """逐字段探测并格式化的解读，即预编译片段之前的实现"""
+    parts = [f"您的问题是：{question}", ""]
+    parts.append(f"主卦：{original.chineseName}（{original.name}）")
+    parts.append(f"卦象：{original.symbol}")
+    parts.append(f"解释：{_description(original)}")
+    parts.append("")
+    if changed:
+        changing_positions = [line.position for line in lines if line.changing]
+        parts.append(f"变卦：{changed.chineseName}（{changed.name}）")
+        parts.append(f"变爻：第 {', '.join(map(str, changing_positions))} 爻")
+        parts.append(f"变卦解释：{_description(changed)}")
+        parts.append("")
+    parts.append("== 详细解读 ==")
+    if _traditional(original) is not None:
+        parts.append(f"🔮 卦象释义：{_traditional(original)}")
+    for field, label in (('fortune', "💰 总体运势"), ('love', "💕 感情婚姻"),
+                         ('career', "💼 事业工作"), ('health', "🏥 健康状况")):
+        if hasattr(original, field) and getattr(original, field):
+            parts.append(f"{label}：{getattr(original, field)}")
+    changing_lines = [line for line in lines if line.changing]
+    if changing_lines:
+        parts.append("")
+        parts.append("📍 变爻指导：")
+        for line in changing_lines:
+            if hasattr(line, 'explanation') and line.explanation:
+                parts.append(f"  第{line.position}爻：{line.explanation}")
+    parts.append("")
+    if hasattr(original, 'advice') and original.advice:
+        parts.append(f"💡 行动建议：{original.advice}")
+    if changed:
+        parts.append("")
+        parts.append("== 变化趋势 ==")
+        parts.append(f"当前局势正在向【{changed.chineseName}】的方向发展。")
+        if _traditional(changed) is not None:
+            parts.append(f"🔄 变化含义：{_traditional(changed)}")
+        if hasattr(changed, 'fortune') and changed.fortune:
+            parts.append(f"📈 运势走向：{changed.fortune}")
+        if hasattr(changed, 'advice') and changed.advice:
+            parts.append(f"🎯 应对策略：{changed.advice}")
+        parts.append("⏰ 变化提示：变爻显示变化正在发生，需要积极适应新的形势")
+        parts.append("")
+    return "\n".join(parts)
+
+
+@pytest.mark.parametrize("language", ["zh", "en"])
+def test_fragments_render_like_probing(language):
+    for cast in range(4096):
+        original = get_reading_from_cast(cast, language)
+        changed = get_changed_from_cast(cast, language)
+        lines = cast_lines(cast)
+        assert (generate_interpretation("问题", original, changed, lines)
+                == _probing_interpretation("问题", original, changed, lines)), cast
+
+
+@pytest.mark.parametrize("language", ["zh", "en"])
+def test_precompiled_fragments_match_compiled(language):
+    corpus = hexagram_manager.get_corpus(language)
+    for cast in range(0, 4096, 64):
+        reading = get_reading_from_cast(cast, language)
+        assert hexagram_manager.get_interpretation_fragments(reading) == compile_fragments(reading)
+    assert corpus.interpretations is corpus.interpretations
@@ -0,0 +1,130 @@
+"""
+Tests of the batch najia endpoint.
+"""
+
+import asyncio
+import json
+import random
+from datetime import datetime, timedelta
+from itertools import product
+
+from fastapi.testclient import TestClient
+
+from main import app
+from utils.divination_logic import generate_najia_interpretation
+from utils.najia_batch import plan_najia_batch, shutdown_pool, stream_najia_batch
+from utils.najia_oracle import NajiaOracle, compute_daily, ganzhi_cache
+
+client = TestClient(app)
+
+
+def _items(count, seed=1):
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        date = datetime(1950, 1, 1) + timedelta(seconds=rng.randrange(100 * 365 * 86400))
+        items.append(([rng.randint(1, 4) for _ in range(6)], date, f"问题{i}"))
+    # 交节的时辰（2024-02-04 16:27 立春）
+    items.append(([3, 1, 2, 4, 1, 2], datetime(2024, 2, 4, 16, 27, 7), "立春之后"))
+    items.append(([3, 1, 2, 4, 1, 2], datetime(2024, 2, 4, 15, 30), "立春之前"))
+    return items
+
+
+def _expected(index, params, date, question):
+    najia = NajiaOracle().compile(params=params, date=date, title=question).get_najia_result()
+    return json.loads(json.dumps({
+        "index": index,
+        "question": question,
+        "date": date.isoformat(),
+        "najia": najia,
+        "interpretation": generate_najia_interpretation(najia, question),
+    }, ensure_ascii=False))
+
+
+def _lines(body):
+    assert body.endswith(b"\n")
+    return [json.loads(line) for line in body.decode("utf-8").splitlines()]
+
+
+def test_stream_matches_single_charts():
+    items = _items(300)
+    response = client.post("/api/divination/najia/batch", json={"items": [
+        {"params": params, "date": date.isoformat(), "question": question}
+        for params, date, question in items
+    ]})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = _lines(response.content)
+    assert [line["index"] for line in lines] == list(range(len(items)))
+    for line, (params, date, question) in zip(lines, items):
+        assert line == _expected(line["index"], params, date, question)
+
+
+def test_same_shichen_shares_the_calendar():
+    date = datetime(2024, 6, 3, 9, 10)
+    items = [([1, 2, 3, 4, 1, 2], date + timedelta(minutes=i), "") for i in range(10)]
+    (task,) = plan_najia_batch(items)
+    assert len({id(lunar) for *_, lunar in task}) == 1
+
+
+def test_plan_matches_the_calendar_of_each_date():
+    items = _items(500, seed=3)
+    tasks = plan_najia_batch(items)
+    for task in tasks:
+        for index, params, date, question, lunar in task:
+            assert lunar == compute_daily(date)
+
+
+def test_plan_leaves_the_shichen_cache_alone():
+    before = ganzhi_cache.info()
+    plan_najia_batch(_items(500, seed=4))
+    assert ganzhi_cache.info() == before
+
+
+def test_tasks_keep_the_request_order():
+    tasks = plan_najia_batch(_items(100), task_size=7)
+    assert [len(task) for task in tasks] == [7] * 14 + [4]
+    assert [item[0] for task in tasks for item in task] == list(range(102))
+
+
+def test_process_pool_matches_single_charts():
+    # 全部 64 卦的静卦，伏神有两处的卦也在其中
+    items = _items(40, seed=2) + [(list(params), datetime(2024, 6, 3, 9, 10), "") for params in product((1, 2), repeat=6)]
+
+    async def collect():
+        tasks = plan_najia_batch(items, task_size=9)
+        return b"".join([chunk async for chunk in stream_najia_batch(tasks, workers=2, pool_min=1)])
+
+    try:
+        lines = _lines(asyncio.run(collect()))
+    finally:
+        shutdown_pool()
+    assert len(lines) == len(items)
+    for index, (line, (params, date, question)) in enumerate(zip(lines, items)):
+        assert line == _expected(index, params, date, question)
+
+
+def test_fushen_seats_are_in_line_order():
+    for params in product((1, 2), repeat=6):
+        hidden = NajiaOracle().compile(params=list(params), date=datetime(2024, 6, 3)).get_najia_result()['hidden']
+        if hidden:
+            assert hidden['seat'] == sorted(hidden['seat']), params
+
+
+def test_date_defaults_to_the_request_time():
+    before = datetime.now()
+    response = client.post("/api/divination/najia/batch", json={"items": [{"params": [1, 1, 1, 2, 2, 2]}]})
+    after = datetime.now()
+    (line,) = _lines(response.content)
+    assert before <= datetime.fromisoformat(line["date"]) <= after
+    assert line["question"] == ""
+
+
+def test_invalid_batches():
+    assert client.post("/api/divination/najia/batch", json={"items": []}).status_code == 422
+    assert client.post("/api/divination/najia/batch",
+                       json={"items": [{"params": [1, 2, 3, 4, 5, 1]}]}).status_code == 422
+    assert client.post("/api/divination/najia/batch",
+                       json={"items": [{"params": [1, 2, 3]}]}).status_code == 422
+    assert client.post("/api/divination/najia/batch",
+                       json={"items": [{"params": [1] * 6}] * 10001}).status_code == 422
@@ -0,0 +1,97 @@
+"""
+Tests of the najia analysis and the conversion of najia results to the API schema.
+"""
+
+from datetime import datetime
+from itertools import product
+
+from utils import najia_analysis
+from utils.divination_logic import (
+    convert_najia_to_schema, generate_najia_divination_for_api, generate_najia_interpretation
+)
+from utils.najia_analysis import LineState, WangShuai, analyze_result
+from utils.najia_oracle import NajiaOracle
+
+# 甲辰年 庚午月 甲子日，旬空戌亥
+_DATE = datetime(2024, 6, 29, 10, 30)
+
+
+def test_wangshuai_of_the_month():
+    # 寅月：木旺、火相、水休、金囚、土死
+    assert [najia_analysis._wangshuai(2, zhi) for zhi in (2, 6, 0, 8, 4)] == list(WangShuai)
+
+
+def test_kong_mask():
+    assert najia_analysis.KONG_MASK[0] == (1 << 10) | (1 << 11)
+    assert najia_analysis.KONG_MASK[59] == (1 << 0) | (1 << 1)
+
+
+def test_analysis_with_and_without_chart():
+    for params in product((1, 2, 3, 4), repeat=6):
+        oracle = NajiaOracle().compile(params=list(params), date=_DATE)
+        result = oracle.get_najia_result()
+        assert analyze_result(result, oracle.chart) == analyze_result(result), params
+
+
+def test_kong_and_fushen_of_the_lines():
+    # 天风姤：乾宫一世，缺妻财，伏神甲寅木伏于二爻
+    result = generate_najia_divination_for_api("求财如何", _DATE, [8, 7, 7, 7, 7, 7])
+    assert result.ganzhi_time.day_gz == '甲子'
+    assert result.ganzhi_time.xunkong == ['戌', '亥']
+    hexagram = result.original_hexagram
+    assert (hexagram.number, hexagram.name, hexagram.palace, hexagram.wuxing) == (44, '天风姤', '乾', '金')
+    assert (hexagram.shi_yao_pos, hexagram.ying_yao_pos) == (1, 4)
+    assert [line.yao_type for line in hexagram.lines] == ['yin'] + ['yang'] * 5
+    assert [line.shi_yao for line in hexagram.lines] == [True, False, False, False, False, False]
+    assert [line.ying_yao for line in hexagram.lines] == [False, False, False, True, False, False]
+    assert [line.fushen for line in hexagram.lines] == [None, '妻财甲寅木', None, None, None, None]
+    # 二爻辛亥、上爻壬戌落空
+    assert [line.xunkong for line in hexagram.lines] == [False, True, False, False, False, True]
+    assert [line.wuxing for line in hexagram.lines] == ['土', '水', '金', '火', '金', '土']
+
+
+def test_changed_hexagram_info():
+    # 初爻老阳：乾为天变天风姤
+    result = generate_najia_divination_for_api("求财如何", _DATE, [9, 7, 7, 7, 7, 7])
+    original, changed = result.original_hexagram, result.changed_hexagram
+    assert (original.number, original.name, original.palace) == (1, '乾为天', '乾')
+    assert (changed.number, changed.name, changed.palace) == (44, '天风姤', '乾')
+    assert (changed.shi_yao_pos, changed.ying_yao_pos) == (1, 4)
+    assert [line.yao_type for line in changed.lines] == ['yin'] + ['yang'] * 5
+    assert not any(line.changing for line in changed.lines)
+    assert changed.lines[0].najia == '辛丑土' and changed.lines[0].liuqin == '父母'
+    assert [line.liushen for line in changed.lines] == [line.liushen for line in original.lines]
+    # 变卦二爻辛亥、上爻壬戌落空
+    assert [line.xunkong for line in changed.lines] == [False, True, False, False, False, True]
+
+
+def test_static_hexagram_has_no_changed_info():
+    result = generate_najia_divination_for_api("求财如何", _DATE, [7, 8, 7, 8, 7, 8])
+    assert result.changed_hexagram is None
+    assert result.original_hexagram.number == 63
+
+
+def test_convert_keeps_the_detailed_analysis():
+    result = generate_najia_divination_for_api("求财如何", _DATE, [6, 7, 8, 9, 7, 8])
+    again = convert_najia_to_schema(result.detailed_analysis, "求财如何", _DATE)
+    assert again == result
+
+
+def test_month_and_day_states():
+    oracle = NajiaOracle().compile(params=[2, 1, 1, 1, 1, 1], date=_DATE)
+    analysis = analyze_result(oracle.get_najia_result())
+    lines = analysis.lines
+    # 午月：壬午火旺；子日冲午
+    assert lines[3].month == WangShuai.WANG
+    assert lines[3].state & LineState.RI_CHONG
+    # 静爻旺相逢日冲为暗动
+    assert lines[3].state & LineState.AN_DONG
+    assert lines[0].state & LineState.SHI and lines[3].state & LineState.YING
+
+
+def test_interpretation_has_the_analysis():
+    oracle = NajiaOracle().compile(params=[3, 1, 2, 4, 1, 2], date=_DATE)
+    result = oracle.get_najia_result()
+    text = generate_najia_interpretation(result, "求财如何")
+    assert '旺衰分析' in text
+    assert text == generate_najia_interpretation(result, "求财如何", oracle.chart)
@@ -0,0 +1,65 @@
+"""
+Tests of the najia lookup tables and the integer-coded charts.
+"""
+
+import itertools
+import json
+from datetime import datetime
+
+import pytest
+
+from utils import najia_oracle
+from utils.divination_logic import generate_najia_interpretation
+from utils.najia_oracle import NajiaOracle, render_chart, verify_tables, xkong
+
+_LUNAR = {'xkong': '戌亥', 'gz': {'year': '甲辰', 'month': '己巳', 'day': '甲子', 'hour': '己巳'}}
+_DATE = datetime(2024, 6, 1, 10, 30)
+ALL_PARAMS = [list(p) for p in itertools.product((1, 2, 3, 4), repeat=6)]
+
+
+def _compile(params, lunar=_LUNAR):
+    return NajiaOracle().compile(params=params, date=_DATE, title="求财", lunar=lunar)
+
+
+def test_verify_tables():
+    assert verify_tables() == 4096
+
+
+@pytest.mark.parametrize("day", ["甲子", "丁卯", "庚午", "癸亥"])
+def test_table_compile_matches_rules(monkeypatch, day):
+    lunar = {**_LUNAR, 'gz': {**_LUNAR['gz'], 'day': day}}
+    tabled = [json.dumps(_compile(params, lunar).get_najia_result(), ensure_ascii=False) for params in ALL_PARAMS]
+    # 关闭查表，全部按口诀排盘
+    monkeypatch.setattr(najia_oracle, "_is_table_params", lambda params: False)
+    for params, text in zip(ALL_PARAMS, tabled):
+        oracle = _compile(params, lunar)
+        assert oracle.chart is None
+        assert json.dumps(oracle.get_najia_result(), ensure_ascii=False) == text, params
+
+
+def test_rendered_chart_matches_rules_result():
+    for params in ALL_PARAMS:
+        chart = _compile(params).chart
+        rules = NajiaOracle()
+        rules.data = {'god6': najia_oracle.get_god6(_LUNAR['gz']['day']), **rules._static_rules(params)}
+        assert render_chart(chart) == rules._rules_result(), params
+
+
+def test_interpretation_with_chart_is_identical():
+    for params in ALL_PARAMS:
+        oracle = _compile(params)
+        result = oracle.get_najia_result()
+        assert (generate_najia_interpretation(result, "求财如何", oracle.chart)
+                == generate_najia_interpretation(result, "求财如何")), params
+
+
+def test_irregular_params_use_rules():
+    oracle = _compile([1, 2, 3, 4, 1])
+    assert oracle.chart is None
+    assert oracle.get_najia_result()['lines'][0]['position'] == 1
+
+
+def test_xkong():
+    assert xkong('甲子') == '戌亥'
+    assert xkong('甲戌') == '申酉'
+    assert xkong('癸亥') == '子丑'
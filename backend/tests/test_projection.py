@@ -0,0 +1,69 @@
+"""
+Tests of the fields/exclude projection of hexagrams.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from utils.catalogue_cache import PROJECTABLE_FIELDS, projection_mask
+
+client = TestClient(app)
+
+_MANUAL = {"question": "问题", "lines": [7, 9, 8, 6, 7, 8]}
+
+
+def _project(hexagram, fields=None, exclude=None):
+    keep = set(fields.split(",")) if fields else set(PROJECTABLE_FIELDS)
+    keep -= set(exclude.split(",")) if exclude else set()
+    return {key: value for key, value in hexagram.items() if key in keep}
+
+
+def test_projection_mask():
+    assert projection_mask() is None
+    assert projection_mask("name,symbol") == projection_mask(" symbol , name ")
+    assert projection_mask("name,symbol", "symbol") == projection_mask("name")
+    with pytest.raises(ValueError):
+        projection_mask("name,nope")
+    with pytest.raises(ValueError):
+        projection_mask(exclude=",".join(PROJECTABLE_FIELDS))
+
+
+@pytest.mark.parametrize("fields, exclude", [
+    ("name,symbol,kingWen", None),
+    ("lines", None),
+    (None, "lines,interpretations"),
+    ("name,lines,advice", "advice"),
+])
+def test_catalogue_projection(fields, exclude):
+    params = {key: value for key, value in (("fields", fields), ("exclude", exclude)) if value}
+    full = client.get("/api/hexagrams/12").json()
+    assert client.get("/api/hexagrams/12", params=params).json() == _project(full, fields, exclude)
+    page = client.get("/api/hexagrams", params={"limit": 8, "offset": 20}).json()
+    projected = client.get("/api/hexagrams", params={"limit": 8, "offset": 20, **params}).json()
+    assert projected["hexagrams"] == [_project(hexagram, fields, exclude) for hexagram in page["hexagrams"]]
+
+
+def test_projected_etag():
+    full = client.get("/api/hexagrams/3")
+    projected = client.get("/api/hexagrams/3", params={"fields": "name"})
+    assert projected.headers["etag"] != full.headers["etag"]
+    again = client.get("/api/hexagrams/3", params={"fields": "name"},
+                       headers={"If-None-Match": projected.headers["etag"]})
+    assert again.status_code == 304
+
+
+def test_divination_projection():
+    full = client.post("/api/divination/manual", json=_MANUAL).json()
+    projected = client.post("/api/divination/manual", params={"fields": "name,symbol,kingWen"}, json=_MANUAL).json()
+    for key in ("originalHexagram", "changedHexagram"):
+        assert projected[key] == _project(full[key], "name,symbol,kingWen")
+    assert projected["lines"] == full["lines"] and projected["interpretation"] == full["interpretation"]
+    body = client.post("/api/divination", params={"exclude": "lines"}, json={"question": "问题"}).json()
+    assert "lines" not in body["originalHexagram"] and "name" in body["originalHexagram"]
+
+
+def test_unknown_field_is_rejected():
+    assert client.get("/api/hexagrams/1", params={"fields": "nope"}).status_code == 400
+    assert client.get("/api/hexagrams", params={"exclude": "nope"}).status_code == 400
+    assert client.post("/api/divination/manual", params={"fields": "nope"}, json=_MANUAL).status_code == 400
@@ -0,0 +1,134 @@
+"""
+Tests of the whole-response reading cache.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from routers.divination import _reading_body
+from utils.catalogue_cache import projection_mask
+from utils.hexagram_data import hexagram_manager
+from utils.reading_cache import CachedReading, ReadingCache
+
+client = TestClient(app)
+
+_NOW = datetime(2024, 6, 1, 10, 30)
+# 芒种交节（2024-06-05 12:10 前后）所在的午时
+_JIE_HOUR = datetime(2024, 6, 5, 12, 30)
+
+
+def _entry(size: int) -> CachedReading:
+    return CachedReading(b"h" * (size // 2), b"i" * (size - size // 2))
+
+
+def _reading(body: bytes):
+    data = json.loads(body)
+    data.pop("timestamp")
+    return data
+
+
+@pytest.fixture
+def cache():
+    corpus = hexagram_manager.get_corpus("zh")
+    corpus.reading_cache.clear()
+    yield corpus.reading_cache
+    corpus.reading_cache.clear()
+
+
+def test_lru_eviction_by_entries():
+    cache = ReadingCache(max_entries=2)
+    cache.put("a", _entry(10))
+    cache.put("b", _entry(10))
+    assert cache.get("a") is not None
+    cache.put("c", _entry(10))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    info = cache.info()
+    assert (info["size"], info["bytes"], info["evictions"]) == (2, 20, 1)
+    assert (info["hits"], info["misses"]) == (3, 1)
+
+
+def test_lru_eviction_by_bytes():
+    cache = ReadingCache(max_entries=100, max_bytes=100)
+    for key in range(5):
+        cache.put(key, _entry(30))
+    assert cache.info()["size"] == 3 and cache.info()["bytes"] == 90
+    assert cache.get(0) is None and cache.get(1) is None
+    # 单条超过字节上限的读数不缓存
+    cache.put("big", _entry(101))
+    assert cache.get("big") is None and cache.info()["size"] == 3
+    # 同一键重写时替换旧条目
+    cache.put(4, _entry(10))
+    assert cache.info()["bytes"] == 70
+
+
+@pytest.mark.parametrize("include_najia", [False, True])
+def test_hit_is_identical_to_a_fresh_body(cache, include_najia):
+    cast = 0b000101_110010
+    question = '他说"明天"\\再议'
+    fresh = _reading(_reading_body(cast, question, "zh", include_najia, None, _NOW))
+    assert cache.info()["size"] == 1
+    hits = cache.hits
+    hit = _reading(_reading_body(cast, question, "zh", include_najia, None, _NOW))
+    assert cache.hits == hits + 1
+    assert hit == fresh
+    assert hit["question"] == question
+    assert hit["interpretation"].startswith(f"您的问题是：{question}\n")
+
+
+def test_key_includes_cast_and_projection(cache):
+    mask = projection_mask("name,symbol")
+    _reading_body(1, "问题", "zh", False, None, _NOW)
+    _reading_body(1, "另一个问题", "zh", False, None, _NOW)
+    assert cache.info()["size"] == 1
+    _reading_body(1, "问题", "zh", False, mask, _NOW)
+    _reading_body(2, "问题", "zh", False, None, _NOW)
+    assert cache.info()["size"] == 3
+    projected = _reading(_reading_body(1, "问题", "zh", False, mask, _NOW))
+    assert set(projected["originalHexagram"]) == {"name", "symbol"}
+
+
+def test_najia_key_includes_hour_and_topics(cache):
+    _reading_body(7, "求财如何", "zh", True, None, _NOW)
+    # 同一时辰、同样的用神关键词
+    _reading_body(7, "财运怎样", "zh", True, None, _NOW.replace(minute=59))
+    assert cache.info()["size"] == 1
+    _reading_body(7, "工作如何", "zh", True, None, _NOW)
+    _reading_body(7, "求财如何", "zh", True, None, _NOW.replace(hour=13))
+    assert cache.info()["size"] == 3
+
+
+def test_hour_with_a_jie_is_not_cached(cache):
+    _reading_body(7, "求财如何", "zh", True, None, _JIE_HOUR)
+    assert cache.info()["size"] == 0
+    _reading_body(7, "求财如何", "zh", False, None, _JIE_HOUR)
+    assert cache.info()["size"] == 1
+
+
+def test_failed_najia_analysis_is_not_cached(cache, monkeypatch):
+    def fail(**kwargs):
+        raise RuntimeError("排盘失败")
+
+    monkeypatch.setattr("routers.divination.generate_najia_divination", fail)
+    body = _reading(_reading_body(7, "求财如何", "zh", True, None, _NOW))
+    assert "纳甲" not in body["interpretation"]
+    assert cache.info()["size"] == 0
+    monkeypatch.undo()
+    body = _reading(_reading_body(7, "求财如何", "zh", True, None, _NOW))
+    assert "纳甲" in body["interpretation"]
+    assert cache.info()["size"] == 1
+
+
+def test_manual_readings_share_the_cache(cache):
+    request = {"question": "问题", "lines": [7, 7, 7, 6, 7, 7]}
+    hits = cache.hits
+    first = client.post("/api/divination/manual", json=request)
+    assert first.status_code == 200
+    again = client.post("/api/divination/manual", json={**request, "question": "别的问题"})
+    assert cache.hits == hits + 1
+    assert again.json()["question"] == "别的问题"
+    assert again.json()["lines"] == first.json()["lines"]
@@ -0,0 +1,94 @@
+"""
+Tests of the per-request random generators.
+"""
+
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from utils.rng import MAX_SEED, SplitMix64, cast_reading, cast_readings, reading_rng
+
+client = TestClient(app)
+
+
+def _reading(body):
+    return body["lines"], body["originalHexagram"]["number"], (body["changedHexagram"] or {}).get("number")
+
+
+def test_splitmix64_reference_outputs():
+    # SplitMix64 的公开参考输出（种子 0）
+    rng = SplitMix64(0)
+    assert [rng.getrandbits(64) for _ in range(3)] == [
+        0xE220A8397B1DCDAF, 0x6E789E6AA1B965F4, 0x06C45D188009454F,
+    ]
+
+
+def test_splitmix64_bit_widths():
+    words = SplitMix64(12345)
+    first, second = words.getrandbits(64), words.getrandbits(64)
+    assert SplitMix64(12345).getrandbits(18) == first >> 46
+    assert SplitMix64(12345).getrandbits(100) == first | (second >> 28) << 64
+    assert SplitMix64(12345).getrandbits(128) == first | second << 64
+    with pytest.raises(ValueError):
+        SplitMix64(0).getrandbits(-1)
+
+
+def test_splitmix64_is_a_random_generator():
+    rng = SplitMix64(7)
+    assert isinstance(rng, random.Random)
+    state = rng.getstate()
+    values = [rng.random(), rng.randrange(64), rng.choice("乾坤")]
+    rng.setstate(state)
+    assert [rng.random(), rng.randrange(64), rng.choice("乾坤")] == values
+    assert all(0.0 <= SplitMix64(seed).random() < 1.0 for seed in range(1000))
+
+
+@pytest.mark.parametrize("method", ["coins", "yarrow"])
+def test_seeded_reading_replays(method):
+    cast, seed = cast_reading("seeded", method=method)
+    assert 0 <= seed <= MAX_SEED
+    assert cast_reading("seeded", seed, method) == (cast, seed)
+    rng, same = reading_rng("seeded", seed)
+    assert same == seed and isinstance(rng, SplitMix64)
+
+
+def test_seeded_batch_replays():
+    casts, seed = cast_readings(100, "seeded")
+    assert cast_readings(100, "seeded", seed) == (casts, seed)
+
+
+def test_secure_readings_have_no_seed():
+    assert cast_reading("secure")[1] is None
+    assert cast_readings(10, "secure")[1] is None
+    with pytest.raises(ValueError):
+        cast_reading("secure", 1)
+    with pytest.raises(ValueError):
+        cast_reading("seeded", MAX_SEED + 1)
+    with pytest.raises(ValueError):
+        reading_rng("global")
+
+
+def test_divination_route_replays_a_seed():
+    first = client.post("/api/divination", json={"question": "问题"}).json()
+    assert first["rng"] == "seeded"
+    replay = client.post(f"/api/divination?seed={first['seed']}", json={"question": "另一个问题"}).json()
+    assert replay["seed"] == first["seed"]
+    assert _reading(replay) == _reading(first)
+    assert replay["question"] == "另一个问题"
+
+
+def test_secure_route():
+    body = client.post("/api/divination?rng=secure", json={"question": "问题"}).json()
+    assert body["rng"] == "secure" and body["seed"] is None
+    assert client.post("/api/divination?rng=secure&seed=1", json={"question": "问题"}).status_code == 400
+    assert client.post(f"/api/divination?seed={MAX_SEED + 1}", json={"question": "问题"}).status_code == 422
+
+
+def test_batch_route_replays_a_seed():
+    first = client.post("/api/divination/batch", json={"count": 50}).json()
+    replay = client.post(f"/api/divination/batch?seed={first['seed']}", json={"count": 50}).json()
+    assert replay == first
+    stream = client.post(f"/api/divination/batch?seed={first['seed']}&format=ndjson", json={"count": 50})
+    assert stream.headers["x-divination-seed"] == str(first["seed"])
@@ -0,0 +1,87 @@
+"""
+Tests of the inverted full-text index and Traditional/Simplified folding.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from routers.hexagrams import data_manager
+from utils.zh_fold import fold_text
+
+client = TestClient(app)
+
+QUERIES = ["風澤", "风泽", "元亨", "利 貞", "君子", "龍", "不利涉大川", "dragon", "Great", "没有这个词"]
+
+
+def _strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+
+
+def _texts(payload):
+    """可检索的字段：卦名、卦辞、象辞、爻辞、各家解读与运势建议"""
+    for field in ("name", "chineseName", "description", "fortune", "love", "career", "health", "advice",
+                  "kingWen", "image", "interpretations"):
+        yield from _strings(payload.get(field))
+    for line in payload.get("lines") or []:
+        yield from _strings([line.get("text"), line.get("explanation"), line.get("image")])
+
+
+def _scan(corpus, query):
+    """逐卦折叠全部字段后子串匹配，即索引要替代的线性扫描"""
+    terms = fold_text(query).split()
+    matches = set()
+    for hexagram in corpus.hexagrams:
+        folded = [fold_text(text) for text in _texts(hexagram.model_dump())]
+        if all(any(term in text for text in folded) for term in terms):
+            matches.add(hexagram.number)
+    return matches
+
+
+def test_fold_text():
+    assert fold_text("風澤中孚 ABC") == "风泽中孚 abc"
+    assert fold_text("乾為天") == "乾为天"
+    text = "習坎：有孚，維心亨"
+    assert len(fold_text(text)) == len(text)
+
+
+@pytest.mark.parametrize("language", ["zh", "en"])
+@pytest.mark.parametrize("query", QUERIES)
+def test_search_matches_a_linear_scan(language, query):
+    corpus = data_manager.get_corpus(language)
+    total, hits = corpus.search_index.search(query, limit=None)
+    assert total == len(hits)
+    assert {hit.number for hit in hits} == _scan(corpus, query)
+    scores = [hit.score for hit in hits]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_traditional_and_simplified_match_alike():
+    index = data_manager.get_corpus("zh").search_index
+    assert index.search("風澤", limit=None) == index.search("风泽", limit=None)
+    assert index.search("风泽", limit=None)[0] > 0
+
+
+def test_search_route():
+    response = client.get("/api/hexagrams/search", params={"q": "君子", "limit": 2})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["query"] == "君子" and body["total"] > 2 and len(body["hits"]) == 2
+    assert all("<mark>" in hit["snippet"] for hit in body["hits"])
+    offset = client.get("/api/hexagrams/search", params={"q": "君子", "limit": 1, "offset": 1}).json()
+    assert offset["hits"][0] == body["hits"][1]
+    assert client.get("/api/hexagrams/search", params={"q": ""}).status_code == 422
+
+
+def test_name_search_folds():
+    simplified = client.get("/api/hexagrams/search/风泽中孚").json()
+    traditional = client.get("/api/hexagrams/search/風澤中孚").json()
+    assert simplified == traditional
+    assert [h["number"] for h in simplified["hexagrams"]] == [61]
@@ -0,0 +1,129 @@
+"""
+Tests of the casting engines' odds and the Monte Carlo statistics.
+"""
+
+import math
+from fractions import Fraction
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from utils.casting_engines import CASTING_ENGINES, CoinEngine, YarrowEngine
+from utils.simulation import (
+    _chi_square_sf, cast_probabilities, check_cast_batch, check_half_table, chi_square, np, simulate,
+)
+
+RANDOM_ENGINES = [engine for engine in CASTING_ENGINES.values() if engine.line_odds is not None]
+
+needs_numpy = pytest.mark.skipif(np is None, reason="NumPy is not installed")
+
+client = TestClient(app)
+
+
+@pytest.mark.parametrize("statistic, dof, expected", [
+    (3.841458820694124, 1, 0.05),
+    (6.634896601021214, 1, 0.01),
+    (18.307038053275146, 10, 0.05),
+    (124.342, 100, 0.05),
+    (135.807, 100, 0.01),
+])
+def test_chi_square_sf(statistic, dof, expected):
+    assert _chi_square_sf(statistic, dof) == pytest.approx(expected, abs=1e-4)
+
+
+def test_chi_square_sf_two_degrees_of_freedom():
+    # 两个自由度时 Q(1, x/2) = exp(-x/2)
+    for statistic in (0.1, 1.0, 5.0, 30.0):
+        assert _chi_square_sf(statistic, 2) == pytest.approx(math.exp(-statistic / 2))
+
+
+def test_chi_square_skips_empty_bins():
+    statistic, dof, p_value = chi_square([50, 50, 0], [0.5, 0.5, 0.0])
+    assert (statistic, dof, p_value) == (0.0, 1, 1.0)
+
+
+def test_theoretical_line_odds():
+    assert CoinEngine.line_odds == (Fraction(1, 8), Fraction(3, 8), Fraction(3, 8), Fraction(1, 8))
+    assert YarrowEngine.line_odds == (Fraction(1, 16), Fraction(5, 16), Fraction(7, 16), Fraction(3, 16))
+    for engine in RANDOM_ENGINES:
+        assert sum(engine.line_odds) == 1
+
+
+@pytest.mark.parametrize("engine", RANDOM_ENGINES, ids=lambda engine: engine.name)
+def test_half_table_reproduces_line_odds(engine):
+    check_half_table(engine)
+
+
+@pytest.mark.parametrize("engine", RANDOM_ENGINES, ids=lambda engine: engine.name)
+def test_cast_batch_reproduces_line_odds(engine):
+    _, _, p_value = check_cast_batch(engine, casts=50_000, seed=1)
+    assert p_value > 1e-4
+
+
+def test_wrong_half_table_is_detected():
+    class MislabelledCoin(CoinEngine):
+        # 把三钱法的表当作蓍草法的概率，查表与理论不符
+        line_odds = YarrowEngine.line_odds
+
+    with pytest.raises(ValueError):
+        check_half_table(MislabelledCoin())
+
+
+@pytest.mark.parametrize("engine", RANDOM_ENGINES, ids=lambda engine: engine.name)
+def test_cast_probabilities_follow_line_odds(engine):
+    probabilities = cast_probabilities(engine)
+    assert len(probabilities) == 4096
+    assert sum(probabilities) == pytest.approx(1.0)
+    odds = {(False, True): engine.line_odds[0], (True, False): engine.line_odds[1],
+            (False, False): engine.line_odds[2], (True, True): engine.line_odds[3]}
+    # 六爻皆老阳
+    assert probabilities[0b111111_111111] == pytest.approx(float(odds[True, True] ** 6))
+    # 初爻老阴，其余少阴
+    assert probabilities[0b000001_000000] == pytest.approx(float(odds[False, True] * odds[False, False] ** 5))
+
+
+@needs_numpy
+@pytest.mark.parametrize("engine", RANDOM_ENGINES, ids=lambda engine: engine.name)
+def test_simulation_is_reproducible(engine):
+    first = simulate(engine.name, casts=100_000, seed=3)
+    again = simulate(engine.name, casts=100_000, seed=3)
+    for name, histogram in first["histograms"].items():
+        assert histogram["observed"] == again["histograms"][name]["observed"]
+        assert sum(histogram["observed"]) == pytest.approx(sum(histogram["expected"]))
+        assert histogram["pValue"] > 1e-4, name
+    assert first["seed"] == 3 and first["casts"] == 100_000
+
+
+def test_invalid_simulations():
+    with pytest.raises(ValueError):
+        simulate("plum_time", casts=10)
+    with pytest.raises(ValueError):
+        simulate("coins", casts=0)
+
+
+@needs_numpy
+def test_simulate_route():
+    response = client.get("/api/statistics/simulate", params={"method": "yarrow", "casts": 10_000, "seed": 5})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["method"] == "yarrow" and body["seed"] == 5
+    assert set(body["histograms"]) >= {"lineValues", "hexagram", "palace"}
+    assert client.get("/api/statistics/simulate", params={"method": "plum_time"}).status_code == 400
+    assert client.get("/api/statistics/simulate", params={"method": "nope"}).status_code == 400
+
+
+@needs_numpy
+def test_simulation_of_a_wrong_table_fails():
+    class BiasedYarrow(YarrowEngine):
+        name = "biased_yarrow"
+        # 用三钱法的表按蓍草法的概率抽样
+        half_bits = CoinEngine.half_bits
+        half_table = CoinEngine.half_table
+
+    CASTING_ENGINES["biased_yarrow"] = BiasedYarrow()
+    try:
+        report = simulate("biased_yarrow", casts=200_000, seed=7, number_by_code=list(range(1, 65)))
+    finally:
+        del CASTING_ENGINES["biased_yarrow"]
+    assert report["histograms"]["lineValues"]["pValue"] < 1e-6
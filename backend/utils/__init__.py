@@ -3,25 +3,39 @@ Utils package for the divination API.
 Contains utility functions and helper classes.
 """
 
+from .casting import cast_coins, cast_from_values, cast_to_lines
 from .divination_logic import (
     generate_six_lines,
+    get_reading_from_cast,
+    get_changed_from_cast,
     get_hexagram_from_lines,
     get_changed_hexagram,
     generate_interpretation,
     throw_coins,
     line_type_to_binary,
-    is_changing_line
+    is_changing_line,
+    lines_to_code,
+    lines_to_changing_mask
 )
 
 from .hexagram_data import HexagramDataManager
+from .reading_view import HexagramReading
 
 __all__ = [
+    "cast_coins",
+    "cast_from_values",
+    "cast_to_lines",
     "generate_six_lines",
+    "get_reading_from_cast",
+    "get_changed_from_cast",
     "get_hexagram_from_lines",
     "get_changed_hexagram", 
     "generate_interpretation",
     "throw_coins",
     "line_type_to_binary",
     "is_changing_line",
-    "HexagramDataManager"
+    "lines_to_code",
+    "lines_to_changing_mask",
+    "HexagramDataManager",
+    "HexagramReading"
 ]
@@ -0,0 +1,305 @@
+"""
+Compact representation of a cast (the six lines of one reading).
+
+A cast is a 12-bit integer: bits 0-5 are the line code (bit ``i`` set when
+line ``i + 1`` is yang) and bits 6-11 the changing mask (bit ``6 + i`` set
+when line ``i + 1`` changes). Casting, hexagram lookup, the changed hexagram
+and the najia parameters all work on that integer; ``Line`` models are only
+built where a response needs them.
+"""
+
+import random
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from models.schemas import Line
+from .catalogue_cache import encode_json
+
+
+CODE_MASK = 0b111111
+
+
+class CastLine(NamedTuple):
+    """
+    Read-only line of a cast, usable wherever a freshly cast ``Line`` is read.
+    """
+    position: int
+    type: str
+    changing: bool
+    text: str = ""
+    explanation: str = ""
+
+
+def pack_cast(code: int, changing_mask: int = 0) -> int:
+    """
+    Pack a line code and a changing mask into a cast.
+
+    Args:
+        code: 6-bit line code
+        changing_mask: 6-bit changing mask
+
+    Returns:
+        12-bit cast
+    """
+    return (code & CODE_MASK) | (changing_mask & CODE_MASK) << 6
+
+
+def cast_code(cast: int) -> int:
+    """Line code (0-63) of the hexagram a cast shows."""
+    return cast & CODE_MASK
+
+
+def cast_changing_mask(cast: int) -> int:
+    """Changing mask (0-63) of a cast."""
+    return cast >> 6 & CODE_MASK
+
+
+def changed_code(cast: int) -> int:
+    """Line code of the changed hexagram (changing lines flipped)."""
+    return (cast ^ cast >> 6) & CODE_MASK
+
+
+# 三枚铜钱（每枚 1 位随机数，1 为正面）-> (是否阳爻, 是否变爻)
+# 0 正面=老阴(6)，1 正面=少阳(7)，2 正面=少阴(8)，3 正面=老阳(9)
+_HEADS_TO_LINE = ((False, True), (True, False), (False, False), (True, True))
+
+
+def _coin_table() -> Tuple[int, ...]:
+    """9 coin bits (three lines) -> 3 code bits in bits 0-2 and 3 mask bits in bits 6-8."""
+    table = []
+    for bits in range(512):
+        value = 0
+        for i in range(3):
+            yang, changing = _HEADS_TO_LINE[bin(bits >> (3 * i) & 0b111).count("1")]
+            value |= yang << i | changing << (6 + i)
+        table.append(value)
+    return tuple(table)
+
+
+COIN_TABLE = _coin_table()
+# 上三爻用的同一张表，预先左移 3 位
+_COIN_TABLE_HIGH = tuple(value << 3 for value in COIN_TABLE)
+
+
+def cast_coins(rng: Optional[random.Random] = None) -> int:
+    """
+    Cast six lines with the three-coin method.
+
+    All 18 coins come from one ``getrandbits`` call and are resolved by
+    table lookup, three lines at a time.
+
+    Args:
+        rng: Random generator (the module-level generator by default)
+
+    Returns:
+        12-bit cast
+    """
+    bits = (rng or random).getrandbits(18)
+    return COIN_TABLE[bits & 511] | _COIN_TABLE_HIGH[bits >> 9]
+
+
+def cast_coins_batch(count: int, rng: Optional[random.Random] = None) -> List[int]:
+    """
+    Cast many readings with the three-coin method.
+
+    The coins of all readings come from a single ``getrandbits`` call:
+    every reading takes one 32-bit word, of which the low 18 bits are its
+    coins, resolved by the same table lookup as ``cast_coins``.
+
+    Args:
+        count: Number of readings
+        rng: Random generator (the module-level generator by default)
+
+    Returns:
+        ``count`` 12-bit casts
+    """
+    if count <= 0:
+        return []
+    words = memoryview((rng or random).getrandbits(32 * count).to_bytes(4 * count, "little")).cast("I")
+    low, high = COIN_TABLE, _COIN_TABLE_HIGH
+    return [low[word & 511] | high[word >> 9 & 511] for word in words]
+
+
+# 爻值 6/7/8/9 <-> (是否阳爻, 是否变爻)
+_VALUE_TO_LINE = {6: (False, True), 7: (True, False), 8: (False, False), 9: (True, True)}
+_LINE_TO_VALUE = {line: value for value, line in _VALUE_TO_LINE.items()}
+
+
+def cast_from_values(values: Iterable[int]) -> int:
+    """
+    Build a cast from traditional line values.
+
+    Args:
+        values: Six values from the bottom line up: 6=老阴, 7=少阳, 8=少阴, 9=老阳
+
+    Returns:
+        12-bit cast
+
+    Raises:
+        ValueError: If there are not six values or a value is not 6-9
+    """
+    cast = 0
+    count = 0
+    for i, value in enumerate(values):
+        line = _VALUE_TO_LINE.get(value)
+        if line is None or i >= 6:
+            raise ValueError(f"无效的爻值: {value}")
+        cast |= line[0] << i | line[1] << (6 + i)
+        count += 1
+    if count != 6:
+        raise ValueError("必须提供6个爻")
+    return cast
+
+
+def cast_to_values(cast: int) -> List[int]:
+    """
+    Get the traditional line values of a cast.
+
+    Args:
+        cast: 12-bit cast
+
+    Returns:
+        Six values 6-9 from the bottom line up
+    """
+    return [_LINE_TO_VALUE[(bool(cast >> i & 1), bool(cast >> (6 + i) & 1))] for i in range(6)]
+
+
+# 三个爻（位置 i..i+2）的爻值 JSON，按 3 位编码 | 3 位变爻掩码 << 3 索引
+_HALF_VALUES_JSON: Tuple[bytes, ...] = tuple(
+    b",".join(str(_LINE_TO_VALUE[(bool(key >> i & 1), bool(key >> (3 + i) & 1))]).encode()
+              for i in range(3))
+    for key in range(64)
+)
+
+
+def cast_values_json(cast: int) -> bytes:
+    """
+    Encode the traditional line values of a cast like ``cast_to_values``.
+
+    Args:
+        cast: 12-bit cast
+
+    Returns:
+        JSON array bytes, e.g. ``[9,7,8,8,7,6]``
+    """
+    return b"".join((
+        b"[",
+        _HALF_VALUES_JSON[(cast & 0b111) | (cast >> 3 & 0b111000)],
+        b",",
+        _HALF_VALUES_JSON[(cast >> 3 & 0b111) | (cast >> 6 & 0b111000)],
+        b"]",
+    ))
+
+
+def lines_to_cast(lines: Iterable[Line]) -> int:
+    """
+    Build a cast from line models (or any objects with position/type/changing).
+
+    Args:
+        lines: Six lines, positions 1-6
+
+    Returns:
+        12-bit cast
+    """
+    cast = 0
+    for line in lines:
+        shift = line.position - 1
+        if line.type == 'yang':
+            cast |= 1 << shift
+        if line.changing:
+            cast |= 1 << (6 + shift)
+    return cast
+
+
+# 纳甲参数（NajiaOracle.compile 的约定）：1=少阳，2=少阴，3=老阳（动），4=老阴（动）
+# 按 (是否阳爻 | 是否变爻 << 1) 索引
+_NAJIA_PARAMS = (2, 1, 4, 3)
+
+
+def cast_to_najia_params(cast: int) -> List[int]:
+    """
+    Convert a cast to ``NajiaOracle.compile`` parameters.
+
+    Args:
+        cast: 12-bit cast
+
+    Returns:
+        Six codes 1-4 from the bottom line up: 1=少阳, 2=少阴, 3=老阳, 4=老阴
+    """
+    return [_NAJIA_PARAMS[(cast >> i & 1) | (cast >> (6 + i) & 1) << 1] for i in range(6)]
+
+
+def najia_params_to_cast(params: Iterable[int]) -> int:
+    """
+    Build a cast from ``NajiaOracle.compile`` parameters.
+
+    Args:
+        params: Six codes 1-4 (odd codes are yang, 3 and 4 are changing)
+
+    Returns:
+        12-bit cast
+    """
+    cast = 0
+    for i, param in enumerate(params):
+        if i >= 6:
+            break
+        if param % 2:
+            cast |= 1 << i
+        if param > 2:
+            cast |= 1 << (6 + i)
+    return cast
+
+
+# 24 种可能的起卦爻（6 个爻位 × 阴阳 × 动静），按 (位置-1)*4 + 阳 + 动*2 索引
+_CAST_LINES: Tuple[CastLine, ...] = tuple(
+    CastLine(position, 'yang' if kind & 1 else 'yin', bool(kind & 2))
+    for position in range(1, 7) for kind in range(4)
+)
+# 对应的 Line.model_dump() JSON 编码，响应中的 lines 字段直接拼接
+_CAST_LINE_JSON: Tuple[bytes, ...] = tuple(
+    encode_json(Line(position=line.position, type=line.type, changing=line.changing).model_dump())
+    for line in _CAST_LINES
+)
+
+
+def _line_index(cast: int, i: int) -> int:
+    return i * 4 + (cast >> i & 1) + (cast >> (6 + i) & 1) * 2
+
+
+def cast_lines(cast: int) -> Tuple[CastLine, ...]:
+    """
+    Get the six lines of a cast without building models.
+
+    Args:
+        cast: 12-bit cast
+
+    Returns:
+        Shared ``CastLine`` records from the bottom line up
+    """
+    return tuple(_CAST_LINES[_line_index(cast, i)] for i in range(6))
+
+
+def cast_to_lines(cast: int) -> List[Line]:
+    """
+    Build ``Line`` models for a cast (for responses that need models).
+
+    Args:
+        cast: 12-bit cast
+
+    Returns:
+        Six new Line models from the bottom line up
+    """
+    return [Line(position=line.position, type=line.type, changing=line.changing)
+            for line in cast_lines(cast)]
+
+
+def cast_lines_json(cast: int) -> bytes:
+    """
+    Encode the six lines of a cast like ``[line.model_dump() for line in lines]``.
+
+    Args:
+        cast: 12-bit cast
+
+    Returns:
+        JSON array bytes
+    """
+    return b"[" + b",".join(_CAST_LINE_JSON[_line_index(cast, i)] for i in range(6)) + b"]"
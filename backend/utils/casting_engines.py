@@ -0,0 +1,294 @@
+"""
+Casting engines: the methods that turn randomness (or a moment, or numbers)
+into a 12-bit cast.
+
+- ``coins``: three coins per line (6/7/8/9 with odds 1/8, 3/8, 3/8, 1/8)
+- ``yarrow``: yarrow stalks (odds 1/16, 5/16, 7/16, 3/16), drawn through a
+  precomputed alias table
+- ``plum_time``: 梅花易数 time casting from the lunar calendar (year branch,
+  lunar month and day, hour branch)
+- ``plum_number``: 梅花易数 number casting from two numbers and the hour
+
+The random engines resolve every line by table lookup on a few random bits;
+the plum blossom engines are deterministic and ignore the generator. New
+engines are added with ``register_engine``.
+"""
+
+import random
+from datetime import datetime
+from fractions import Fraction
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .casting import COIN_TABLE, cast_coins, cast_coins_batch, pack_cast
+
+
+DEFAULT_METHOD = "coins"
+
+
+class CastingEngine:
+    """
+    Base class of the casting engines.
+    """
+
+    # 方法名，即 ``method=`` 参数的取值
+    name = ""
+    description = ""
+    # 是否由随机数生成器起卦；时间、数字起卦的结果只取决于输入，没有种子可言
+    uses_rng = True
+    # 查表起卦的引擎：三个爻由 half_bits 位均匀随机数查 half_table 得出
+    # （第 0-2 位为爻编码，第 6-8 位为变爻），一卦用两次查表；统计模拟据此向量化
+    half_bits = 0
+    half_table: Optional[Tuple[int, ...]] = None
+    # 随机起卦的理论爻值概率，按爻值 6、7、8、9 排列；统计模拟以此为期望，并校验 half_table
+    line_odds: Optional[Tuple[Fraction, Fraction, Fraction, Fraction]] = None
+
+    def cast(self, rng: Optional[random.Random] = None, when: Optional[datetime] = None,
+             numbers: Optional[Sequence[int]] = None) -> int:
+        """
+        Cast one reading.
+
+        Args:
+            rng: Random generator of the request (random engines)
+            when: Moment of the casting (time based engines, defaults to now)
+            numbers: Numbers given by the asker (number based engines)
+
+        Returns:
+            12-bit cast
+
+        Raises:
+            ValueError: If the engine's inputs are missing or invalid
+        """
+        raise NotImplementedError
+
+    def cast_batch(self, count: int, rng: Optional[random.Random] = None) -> List[int]:
+        """
+        Cast many readings from one generator.
+
+        Args:
+            count: Number of readings
+            rng: Random generator of the request
+
+        Returns:
+            ``count`` 12-bit casts
+        """
+        return [self.cast(rng) for _ in range(count)]
+
+
+class CoinEngine(CastingEngine):
+    """Three-coin method (``utils.casting.cast_coins``)."""
+
+    name = "coins"
+    description = "三钱法：老阴 1/8，少阳 3/8，少阴 3/8，老阳 1/8"
+    half_bits = 9
+    half_table = COIN_TABLE
+    line_odds = (Fraction(1, 8), Fraction(3, 8), Fraction(3, 8), Fraction(1, 8))
+
+    def cast(self, rng=None, when=None, numbers=None) -> int:
+        return cast_coins(rng)
+
+    def cast_batch(self, count: int, rng=None) -> List[int]:
+        return cast_coins_batch(count, rng)
+
+
+def build_alias_table(weights: Sequence[int]) -> Tuple[List[int], List[int], int]:
+    """
+    Build a Walker/Vose alias table for integer weights.
+
+    Column ``i`` keeps outcome ``i`` with probability ``prob[i] / total`` and
+    otherwise yields ``alias[i]``.
+
+    Args:
+        weights: Positive integer weight of each outcome
+
+    Returns:
+        (prob, alias, total) with ``prob`` scaled to integers over ``total``
+    """
+    n = len(weights)
+    total = sum(weights)
+    prob = [w * n for w in weights]
+    alias = list(range(n))
+    small = [i for i, p in enumerate(prob) if p < total]
+    large = [i for i, p in enumerate(prob) if p >= total]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        alias[s] = l
+        prob[l] -= total - prob[s]
+        (small if prob[l] < total else large).append(l)
+    for i in small + large:
+        prob[i] = total
+    return prob, alias, total
+
+
+def alias_lookup(weights: Sequence[int], column_bits: int, accept_bits: int) -> Tuple[int, ...]:
+    """
+    Expand an alias table into a direct lookup over uniform random bits.
+
+    A draw of ``column_bits + accept_bits`` bits picks a column with its
+    high bits and accepts the column's own outcome when its low bits fall
+    below the column's threshold. The thresholds must be exact multiples of
+    ``1 / 2**accept_bits``, so the table reproduces the weights exactly.
+
+    Args:
+        weights: Integer weight of each of the ``2**column_bits`` outcomes
+        column_bits: Bits selecting the column
+        accept_bits: Bits of the acceptance test
+
+    Returns:
+        Outcome index of every draw
+
+    Raises:
+        ValueError: If the weights cannot be sampled exactly with these bits
+    """
+    if len(weights) != 1 << column_bits:
+        raise ValueError("结果数量必须等于列数")
+    prob, alias, total = build_alias_table(weights)
+    scale = 1 << accept_bits
+    if any(p * scale % total for p in prob):
+        raise ValueError("权重无法用给定位数精确抽样")
+    thresholds = [p * scale // total for p in prob]
+    return tuple(
+        column if u < thresholds[column] else alias[column]
+        for column in range(1 << column_bits) for u in range(scale)
+    )
+
+
+# 蓍草法：按 (是否阳爻 | 是否变爻 << 1) 排列的四种爻，即少阴(8)、少阳(7)、老阴(6)、老阳(9)
+_YARROW_WEIGHTS = (7, 5, 1, 3)
+# 每爻 4 位随机数（2 位选列，2 位做接受判定）-> 爻种类
+_YARROW_LINE = alias_lookup(_YARROW_WEIGHTS, 2, 2)
+
+
+def _yarrow_table() -> Tuple[int, ...]:
+    """12 random bits (three lines) -> 3 code bits in bits 0-2 and 3 mask bits in bits 6-8."""
+    table = []
+    for bits in range(4096):
+        value = 0
+        for i in range(3):
+            kind = _YARROW_LINE[bits >> (4 * i) & 0b1111]
+            value |= (kind & 1) << i | (kind >> 1) << (6 + i)
+        table.append(value)
+    return tuple(table)
+
+
+_YARROW_TABLE = _yarrow_table()
+_YARROW_TABLE_HIGH = tuple(value << 3 for value in _YARROW_TABLE)
+
+
+class YarrowEngine(CastingEngine):
+    """Yarrow-stalk method with the traditional uneven odds."""
+
+    name = "yarrow"
+    description = "蓍草法：老阴 1/16，少阳 5/16，少阴 7/16，老阳 3/16"
+    half_bits = 12
+    half_table = _YARROW_TABLE
+    line_odds = (Fraction(1, 16), Fraction(5, 16), Fraction(7, 16), Fraction(3, 16))
+
+    def cast(self, rng=None, when=None, numbers=None) -> int:
+        bits = (rng or random).getrandbits(24)
+        return _YARROW_TABLE[bits & 4095] | _YARROW_TABLE_HIGH[bits >> 12]
+
+    def cast_batch(self, count: int, rng=None) -> List[int]:
+        if count <= 0:
+            return []
+        words = memoryview((rng or random).getrandbits(32 * count).to_bytes(4 * count, "little")).cast("I")
+        low, high = _YARROW_TABLE, _YARROW_TABLE_HIGH
+        return [low[word & 4095] | high[word >> 12 & 4095] for word in words]
+
+
+# 先天八卦数 1-8（乾一兑二离三震四巽五坎六艮七坤八）-> 三爻编码（第 0 位为初爻）
+_XIANTIAN_TRIGRAMS = (None, 0b111, 0b011, 0b101, 0b001, 0b110, 0b010, 0b100, 0b000)
+
+
+def _hour_number(when: datetime) -> int:
+    """Earthly branch number of the hour: 子=1 (23:00-00:59) ... 亥=12."""
+    return (when.hour + 1) // 2 % 12 + 1
+
+
+def plum_cast(upper: int, lower: int, moving: int) -> int:
+    """
+    Build a cast from plum blossom numbers.
+
+    Args:
+        upper: Number of the upper trigram (taken modulo 8, 0 counts as 8)
+        lower: Number of the lower trigram (taken modulo 8, 0 counts as 8)
+        moving: Number of the moving line (taken modulo 6, 0 counts as 6)
+
+    Returns:
+        12-bit cast with exactly one changing line
+    """
+    upper_code = _XIANTIAN_TRIGRAMS[upper % 8 or 8]
+    lower_code = _XIANTIAN_TRIGRAMS[lower % 8 or 8]
+    return pack_cast(lower_code | upper_code << 3, 1 << ((moving % 6 or 6) - 1))
+
+
+class PlumTimeEngine(CastingEngine):
+    """梅花易数 time casting: (year branch + lunar month + lunar day [+ hour branch])."""
+
+    name = "plum_time"
+    description = "梅花易数时间起卦：年支数+农历月+日为上卦，再加时支数为下卦，总数除六取动爻"
+    uses_rng = False
+
+    def cast(self, rng=None, when=None, numbers=None) -> int:
+        try:
+            from lunar_python import Solar
+        except ImportError:
+            raise RuntimeError("时间起卦需要 lunar_python")
+
+        when = when or datetime.now()
+        lunar = Solar.fromYmdHms(when.year, when.month, when.day,
+                                 when.hour, when.minute, when.second).getLunar()
+        # 年支数（子1……亥12）+ 农历月（闰月按本月）+ 农历日
+        base = lunar.getYearZhiIndex() + 1 + abs(lunar.getMonth()) + lunar.getDay()
+        total = base + lunar.getTimeZhiIndex() + 1
+        return plum_cast(base, total, total)
+
+
+class PlumNumberEngine(CastingEngine):
+    """梅花易数 number casting: two numbers and the hour branch."""
+
+    name = "plum_number"
+    description = "梅花易数数字起卦：第一个数为上卦，第二个数为下卦，两数之和加时支数除六取动爻"
+    uses_rng = False
+
+    def cast(self, rng=None, when=None, numbers=None) -> int:
+        if not numbers or len(numbers) != 2 or any(n < 1 for n in numbers):
+            raise ValueError("数字起卦需要提供两个正整数")
+        first, second = numbers
+        when = when or datetime.now()
+        return plum_cast(first, second, first + second + _hour_number(when))
+
+
+CASTING_ENGINES: Dict[str, CastingEngine] = {}
+
+
+def register_engine(engine: CastingEngine) -> None:
+    """
+    Make a casting engine selectable by its name.
+
+    Args:
+        engine: Engine instance (replaces an engine of the same name)
+    """
+    CASTING_ENGINES[engine.name] = engine
+
+
+for _engine in (CoinEngine(), YarrowEngine(), PlumTimeEngine(), PlumNumberEngine()):
+    register_engine(_engine)
+
+
+def get_engine(method: Optional[str] = None) -> CastingEngine:
+    """
+    Get a casting engine by name.
+
+    Args:
+        method: Engine name (the coin method by default)
+
+    Returns:
+        The registered engine
+
+    Raises:
+        ValueError: If no engine has that name
+    """
+    engine = CASTING_ENGINES.get(method or DEFAULT_METHOD)
+    if engine is None:
+        raise ValueError(f"未知的起卦方法: {method}，可选值: {', '.join(CASTING_ENGINES)}")
+    return engine
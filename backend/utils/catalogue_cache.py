@@ -0,0 +1,474 @@
+"""
+Pre-serialized JSON bodies for the hexagram catalogue routes.
+
+The catalogue is immutable for the lifetime of a loaded corpus, so the JSON
+of a hexagram is encoded the first time it is served, kept in a bounded LRU
+cache, and list pages are assembled by joining those bytes. Every body carries a strong ETag derived from the hash of the
+corpus data file, so clients revalidating with ``If-None-Match`` get a 304
+without any serialization work.
+
+The encoded body of a hexagram also records where each top-level field
+(``"name":"乾卦"``) and the per-reading tail of each line start and end, so a
+``fields=``/``exclude=`` projection or a divination reading is assembled by
+joining slices of the same bytes instead of serializing again.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from models.schemas import Hexagram
+from .hexagram_relations import changing_lines
+
+
+# 可投影的顶层字段，按 Hexagram 的字段顺序排列；投影以位掩码表示，第 i 位对应第 i 个字段
+PROJECTABLE_FIELDS: Tuple[str, ...] = tuple(Hexagram.model_fields)
+_FIELD_INDEX: Dict[str, int] = {field: i for i, field in enumerate(PROJECTABLE_FIELDS)}
+_FIELD_BITS: Dict[str, int] = {field: 1 << i for field, i in _FIELD_INDEX.items()}
+ALL_FIELDS_MASK = (1 << len(PROJECTABLE_FIELDS)) - 1
+
+# 关系接口中引用其他卦时给出的字段
+REF_FIELDS: Tuple[str, ...] = ("number", "name", "chineseName", "symbol")
+
+# 每次占卜都会改写的爻字段；其余字段（爻辞、象辞、解释……）原样取自缓存
+LINE_READING_KEYS: Tuple[str, ...] = ("position", "type", "changing")
+
+# 默认缓存的单卦编码数：与分段缓存相当，常用卦直接拼接，其余按需编码
+DEFAULT_FRAGMENT_CACHE_SIZE = 16
+
+
+def encode_json(data: Any) -> bytes:
+    """
+    Encode data exactly like FastAPI's ``JSONResponse``.
+
+    Args:
+        data: JSON-compatible data
+
+    Returns:
+        UTF-8 encoded JSON bytes
+    """
+    return json.dumps(
+        data,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _split_fields(value: Optional[str]) -> List[str]:
+    return [field.strip() for field in (value or "").split(",") if field.strip()]
+
+
+def projection_mask(fields: Optional[str] = None, exclude: Optional[str] = None) -> Optional[int]:
+    """
+    Parse ``fields=`` / ``exclude=`` query values into a field mask.
+
+    Args:
+        fields: Comma separated top-level Hexagram fields to keep (all if empty)
+        exclude: Comma separated top-level Hexagram fields to drop
+
+    Returns:
+        Bit mask over ``PROJECTABLE_FIELDS``, or None when every field is kept
+
+    Raises:
+        ValueError: If a field name is unknown or nothing would be left
+    """
+    keep = _split_fields(fields)
+    drop = _split_fields(exclude)
+    unknown = [field for field in keep + drop if field not in _FIELD_BITS]
+    if unknown:
+        raise ValueError(
+            f"未知字段: {', '.join(unknown)}；可选字段: {', '.join(PROJECTABLE_FIELDS)}"
+        )
+
+    mask = ALL_FIELDS_MASK
+    if keep:
+        mask = 0
+        for field in keep:
+            mask |= _FIELD_BITS[field]
+    for field in drop:
+        mask &= ~_FIELD_BITS[field]
+    if not mask:
+        raise ValueError("投影后没有剩余字段")
+    return None if mask == ALL_FIELDS_MASK else mask
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an ``If-None-Match`` header against an ETag.
+
+    Uses the weak comparison RFC 9110 prescribes for ``If-None-Match``.
+
+    Args:
+        if_none_match: Raw header value (may list several tags or be ``*``)
+        etag: Current strong ETag, including quotes
+
+    Returns:
+        True if the client's cached representation is still current
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class HexagramFragments:
+    """
+    The encoded JSON body of one hexagram and the spans of its parts.
+    """
+
+    __slots__ = ("body", "_view", "_spans", "_line_tails")
+
+    def __init__(self, payload: Dict[str, Any]):
+        """
+        Encode a serialized hexagram.
+
+        Args:
+            payload: ``Hexagram.model_dump()`` output
+        """
+        parts: List[bytes] = []
+        spans: List[Optional[Tuple[int, int]]] = [None] * len(PROJECTABLE_FIELDS)
+        line_tails: List[Optional[Tuple[int, int]]] = []
+        position = 1
+        for field, value in payload.items():
+            if field == "lines":
+                fragment, line_tails = self._encode_lines(value, position)
+            else:
+                # encode_json({k: v}) 去掉外层花括号即为 "k":v 片段，与整体编码逐字节一致
+                fragment = encode_json({field: value})[1:-1]
+            index = _FIELD_INDEX.get(field)
+            if index is not None:
+                spans[index] = (position, position + len(fragment))
+            parts.append(fragment)
+            position += len(fragment) + 1
+
+        self.body = b"{" + b",".join(parts) + b"}"
+        self._view = memoryview(self.body)
+        self._spans = spans
+        self._line_tails = line_tails
+
+    @staticmethod
+    def _encode_lines(lines: List[Dict[str, Any]], offset: int) -> Tuple[bytes, List[Optional[Tuple[int, int]]]]:
+        """Encode the ``lines`` fragment and record where each line's tail starts."""
+        prefix = b'"lines":['
+        encoded = []
+        tails: List[Optional[Tuple[int, int]]] = []
+        position = offset + len(prefix)
+        for line in lines:
+            data = encode_json(line)
+            keys = tuple(line)
+            tail = None
+            # 只有以 position/type/changing 开头的爻才能拆出可复用的尾部
+            if keys[:len(LINE_READING_KEYS)] == LINE_READING_KEYS and len(keys) > len(LINE_READING_KEYS):
+                head = len(encode_json({key: line[key] for key in LINE_READING_KEYS})) - 1
+                tail = (position + head + 1, position + len(data) - 1)
+            encoded.append(data)
+            tails.append(tail)
+            position += len(data) + 1
+        return prefix + b",".join(encoded) + b"]", tails
+
+    def field(self, index: int) -> Optional[memoryview]:
+        """
+        Get the ``"field":value`` fragment of a top-level field.
+
+        Args:
+            index: Position of the field in ``PROJECTABLE_FIELDS``
+
+        Returns:
+            Fragment without surrounding braces, or None if the field is absent
+        """
+        span = self._spans[index]
+        return None if span is None else self._view[span[0]:span[1]]
+
+    def line_tail(self, position: int) -> Optional[memoryview]:
+        """
+        Get the fields of a line that follow position, type and changing.
+
+        Args:
+            position: Line position (1-6)
+
+        Returns:
+            ``"text":...,"changes_to":{...}`` without surrounding braces, or
+            None if the cached line cannot be split
+        """
+        if not 1 <= position <= len(self._line_tails):
+            return None
+        span = self._line_tails[position - 1]
+        return None if span is None else self._view[span[0]:span[1]]
+
+    def project(self, mask: Optional[int]) -> bytes:
+        """
+        Get the body restricted to the fields of a mask.
+
+        Args:
+            mask: Bit mask over ``PROJECTABLE_FIELDS`` (None for every field)
+
+        Returns:
+            Encoded JSON object of the selected fields
+        """
+        if mask is None:
+            return self.body
+        return b"{" + b",".join(self.fields(mask)) + b"}"
+
+    def fields(self, mask: int) -> Iterable[memoryview]:
+        """Yield the fragments of the fields selected by a mask, in schema order."""
+        view = self._view
+        for span in self._spans:
+            if mask & 1 and span is not None:
+                yield view[span[0]:span[1]]
+            mask >>= 1
+
+
+class CatalogueCache:
+    """
+    Serialized catalogue bodies and ETags for one loaded corpus.
+    """
+
+    def __init__(self, corpus: Any, max_pages: int = 256,
+                 max_hexagrams: int = DEFAULT_FRAGMENT_CACHE_SIZE):
+        """
+        Create the catalogue cache of a corpus; hexagrams are encoded on first use.
+
+        Args:
+            corpus: Loaded ``HexagramCorpus``
+            max_pages: Maximum number of list pages kept (oldest evicted first)
+            max_hexagrams: Maximum number of encoded hexagrams kept (oldest evicted first)
+        """
+        self._corpus = corpus
+        self._tag = f"{corpus.version[:16]}-{corpus.language}"
+        self._max_pages = max_pages
+        self._max_hexagrams = max_hexagrams
+        self._pages: "OrderedDict[Tuple[int, int, Optional[int]], Tuple[bytes, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._relations: Dict[int, Tuple[bytes, str]] = {}
+        self._outcomes: Dict[int, Tuple[bytes, str]] = {}
+        # 批量占卜的卦象摘要，按 12 位起卦值索引
+        self._summaries: List[Optional[bytes]] = [None] * 4096
+        # 单卦编码按需生成：编码时会读取全部分段，常驻全部 64 卦会让惰性加载失去意义
+        self._fragments: "OrderedDict[int, HexagramFragments]" = OrderedDict()
+
+    @staticmethod
+    def _mask_tag(mask: Optional[int]) -> str:
+        return "" if mask is None else f"-f{mask:x}"
+
+    def _hexagram_fragments(self, number: int) -> Optional[HexagramFragments]:
+        """Get the fragments of a hexagram number, encoding them on a cache miss."""
+        with self._lock:
+            fragments = self._fragments.get(number)
+            if fragments is not None:
+                self._fragments.move_to_end(number)
+                return fragments
+        hexagram = self._corpus.by_number.get(number)
+        if hexagram is None:
+            return None
+        # 在锁外编码；并发未命中时结果相同，后写入者覆盖即可
+        fragments = HexagramFragments(hexagram.model_dump())
+        with self._lock:
+            self._fragments[number] = fragments
+            self._fragments.move_to_end(number)
+            while len(self._fragments) > self._max_hexagrams:
+                self._fragments.popitem(last=False)
+        return fragments
+
+    def fragments(self, hexagram: Any) -> HexagramFragments:
+        """
+        Get the encoded fragments of a hexagram record.
+
+        Args:
+            hexagram: ``LazyHexagram`` record, normally from this corpus
+
+        Returns:
+            The cached fragments; encoded on the fly for a record of another
+            corpus (e.g. one replaced by a reload during the request)
+        """
+        if self._corpus.by_number.get(hexagram.number) is not hexagram:
+            return HexagramFragments(hexagram.model_dump())
+        return self._hexagram_fragments(hexagram.number)
+
+    def hexagram(self, number: int, mask: Optional[int] = None) -> Optional[Tuple[bytes, str]]:
+        """
+        Get the serialized body and ETag of one hexagram.
+
+        Args:
+            number: Hexagram number (1-64)
+            mask: Field projection from ``projection_mask`` (None for every field)
+
+        Returns:
+            (body, etag) or None if the hexagram does not exist
+        """
+        fragments = self._hexagram_fragments(number)
+        if fragments is None:
+            return None
+        return fragments.project(mask), f'"{self._tag}-h{number}{self._mask_tag(mask)}"'
+
+    def hexagram_by_code(self, code: int, mask: Optional[int] = None) -> Optional[Tuple[bytes, str]]:
+        """
+        Get the serialized body and ETag of the hexagram with a line code.
+
+        Args:
+            code: 6-bit line code (0-63)
+            mask: Field projection from ``projection_mask`` (None for every field)
+
+        Returns:
+            (body, etag) or None if no hexagram has the code
+        """
+        hexagram = self._corpus.by_code[code] if 0 <= code < 64 else None
+        if hexagram is None:
+            return None
+        return self.hexagram(hexagram.number, mask)
+
+    def hexagram_list(self, numbers: List[int], mask: Optional[int] = None) -> bytes:
+        """
+        Get the serialized ``HexagramResponse`` body of selected hexagrams.
+
+        Args:
+            numbers: Hexagram numbers in response order
+            mask: Field projection from ``projection_mask`` (None for every field)
+
+        Returns:
+            Encoded body listing the hexagrams that exist
+        """
+        bodies = [fragments.project(mask)
+                  for fragments in map(self._hexagram_fragments, numbers) if fragments is not None]
+        return self._list_body(bodies, len(bodies))
+
+    @staticmethod
+    def _list_body(bodies: List[bytes], total: int) -> bytes:
+        return b"".join((
+            b'{"hexagrams":[',
+            b",".join(bodies),
+            b'],"total":',
+            str(total).encode("ascii"),
+            b"}",
+        ))
+
+    def page(self, offset: int = 0, limit: Optional[int] = None,
+             mask: Optional[int] = None) -> Tuple[bytes, str]:
+        """
+        Get the serialized ``HexagramResponse`` body of a list page.
+
+        Args:
+            offset: Number of hexagrams to skip
+            limit: Maximum number of hexagrams to return (None for all)
+            mask: Field projection from ``projection_mask`` (None for every field)
+
+        Returns:
+            (body, etag) of the page
+        """
+        hexagrams = self._corpus.hexagrams
+        total = len(hexagrams)
+        start = min(offset, total)
+        end = total if limit is None else min(start + limit, total)
+        key = (start, end, mask)
+
+        cached = self._pages.get(key)
+        if cached is not None:
+            return cached
+
+        body = self._list_body(
+            [self._hexagram_fragments(hexagram.number).project(mask) for hexagram in hexagrams[start:end]], total
+        )
+        entry = (body, f'"{self._tag}-p{start}-{end}{self._mask_tag(mask)}"')
+        with self._lock:
+            self._pages[key] = entry
+            self._pages.move_to_end(key)
+            while len(self._pages) > self._max_pages:
+                self._pages.popitem(last=False)
+        return entry
+
+    def _ref(self, number: int) -> Optional[Dict[str, Any]]:
+        """Short reference to a hexagram (None for 0 or an unknown number)."""
+        hexagram = self._corpus.by_number.get(number)
+        if hexagram is None:
+            return None
+        return {field: getattr(hexagram, field) for field in REF_FIELDS}
+
+    def relations(self, number: int) -> Optional[Tuple[bytes, str]]:
+        """
+        Get the serialized ``HexagramRelations`` body of a hexagram.
+
+        Args:
+            number: Hexagram number (1-64)
+
+        Returns:
+            (body, etag) or None if the hexagram does not exist
+        """
+        cached = self._relations.get(number)
+        if cached is not None or number not in self._corpus.by_number:
+            return cached
+
+        tables = self._corpus.relations
+        data: Dict[str, Any] = {"hexagram": self._ref(number)}
+        for kind, related in tables.related(number).items():
+            data[kind] = self._ref(related)
+        data["lineChanges"] = [
+            {"line": position, "hexagram": self._ref(tables.changed(number, 1 << (position - 1)))}
+            for position in range(1, 7)
+        ]
+        # 同一编号重复构建时结果相同，直接覆盖即可，无需加锁
+        entry = (encode_json(data), f'"{self._tag}-r{number}"')
+        self._relations[number] = entry
+        return entry
+
+    def outcomes(self, number: int) -> Optional[Tuple[bytes, str]]:
+        """
+        Get the serialized ``HexagramOutcomesResponse`` body of a hexagram:
+        the changed hexagram of every one of the 64 changing-line masks.
+
+        Args:
+            number: Hexagram number (1-64)
+
+        Returns:
+            (body, etag) or None if the hexagram does not exist
+        """
+        cached = self._outcomes.get(number)
+        if cached is not None or number not in self._corpus.by_number:
+            return cached
+
+        data = {
+            "hexagram": self._ref(number),
+            "outcomes": [
+                {"mask": mask, "changingLines": changing_lines(mask), "hexagram": self._ref(changed)}
+                for mask, changed in enumerate(self._corpus.relations.outcomes(number))
+            ],
+            "total": 64,
+        }
+        entry = (encode_json(data), f'"{self._tag}-o{number}"')
+        self._outcomes[number] = entry
+        return entry
+
+    def reading_summary(self, cast: int) -> bytes:
+        """
+        Get the serialized hexagram part of a batch divination reading.
+
+        Args:
+            cast: 12-bit cast (line code in bits 0-5, changing mask in bits 6-11)
+
+        Returns:
+            ``"hexagram":…,"changingLines":[…],"changedHexagram":…}`` - the
+            tail of a ``BatchDivinationReading`` object
+        """
+        summary = self._summaries[cast]
+        if summary is not None:
+            return summary
+
+        code, mask = cast & 0b111111, cast >> 6 & 0b111111
+        hexagram = self._corpus.by_code[code]
+        number = hexagram.number if hexagram is not None else 0
+        data = {
+            "hexagram": self._ref(number),
+            "changingLines": changing_lines(mask),
+            "changedHexagram": self._ref(self._corpus.relations.changed(number, mask)) if mask else None,
+        }
+        summary = encode_json(data)[1:]
+        self._summaries[cast] = summary
+        return summary
@@ -0,0 +1,358 @@
+"""
+Compiled binary bundles of the hexagram corpus.
+
+Loading a corpus from JSON means parsing ~0.5 MB of text, patching missing
+trigrams and running full Pydantic validation on 64 hexagrams, in every
+process and for every manager. The build step in this module does that work
+once and stores the validated ``model_dump()`` of every hexagram in a compact
+``marshal`` bundle next to the JSON file:
+
+    header    magic b"ICHB", format version, marshal version, index size
+    source    sha256 of the JSON file plus the schema fingerprint
+    digest    sha256 of everything after the header
+    index     marshal-encoded list of (summary, {field: (offset, length)})
+    sections  one marshal blob per hexagram and heavy field
+
+The summary of a hexagram (``SUMMARY_FIELDS``) is all most requests need and
+is decoded at load. Every other field is a separate section that
+``MappedBundle`` decodes from the memory-mapped file only when it is first
+read, so unused line texts and interpretation schools never reach the heap.
+
+Summary strings and all dict keys are interned before encoding, so repeated
+keys and names are stored and loaded once. A bundle whose source hash no longer matches the JSON file
+(or whose checksum fails) is ignored and the manager falls back to JSON.
+
+Build the bundles from the backend directory with::
+
+    python build_corpus_bundle.py
+"""
+
+import hashlib
+import marshal
+import mmap
+import struct
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.schemas import (
+    ChangeInfo,
+    Hexagram,
+    HexagramInterpretations,
+    Line,
+    LineInterpretations,
+    TextExplanation,
+)
+
+
+BUNDLE_MAGIC = b"ICHB"
+BUNDLE_VERSION = 2
+BUNDLE_SUFFIX = ".bundle"
+
+# 常驻内存的摘要字段；其余字段按需从映射文件中解码
+SUMMARY_FIELDS: Tuple[str, ...] = (
+    "number", "name", "chineseName", "symbol", "upperTrigram", "lowerTrigram", "kingWen",
+)
+SECTION_FIELDS: Tuple[str, ...] = tuple(
+    field for field in Hexagram.model_fields if field not in SUMMARY_FIELDS
+)
+
+# magic(4) + bundle version(2) + marshal version(2) + source sha256(32) + body sha256(32) + index size(4)
+_HEADER = struct.Struct("<4sHH32s32sI")
+
+
+def bundle_path_for(data_file: Path) -> Path:
+    """
+    Get the bundle path that belongs to a JSON data file.
+
+    Args:
+        data_file: Path to the JSON data file
+
+    Returns:
+        Path of the compiled bundle
+    """
+    return Path(data_file).with_suffix(BUNDLE_SUFFIX)
+
+
+@lru_cache(maxsize=1)
+def schema_fingerprint() -> bytes:
+    """
+    Fingerprint of the schema fields a bundle was compiled against.
+
+    Returns:
+        Bytes that change whenever a schema model gains or loses a field
+    """
+    models = (Hexagram, Line, TextExplanation, HexagramInterpretations,
+              LineInterpretations, ChangeInfo)
+    layout = ";".join(
+        f"{model.__name__}:{','.join(model.model_fields)}" for model in models
+    )
+    return layout.encode("utf-8")
+
+
+def source_hash(data_file: Path) -> Optional[bytes]:
+    """
+    Hash a JSON data file together with the schema fingerprint.
+
+    Args:
+        data_file: Path to the JSON data file
+
+    Returns:
+        sha256 digest, or None if the file cannot be read
+    """
+    try:
+        with open(data_file, "rb") as f:
+            content = f.read()
+    except OSError:
+        return None
+    digest = hashlib.sha256(content)
+    digest.update(schema_fingerprint())
+    return digest.digest()
+
+
+def _intern_strings(value: Any, values: bool = True) -> Any:
+    """
+    Recursively intern the dict keys (and, if ``values``, the strings) of a payload.
+
+    Sections only intern their keys: decoding interned values would register
+    every text in the interpreter's intern table, which keeps growing as
+    sections are hydrated and evicted again.
+    """
+    if isinstance(value, str):
+        return sys.intern(value) if values else value
+    if isinstance(value, dict):
+        return {sys.intern(k): _intern_strings(v, values) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_intern_strings(v, values) for v in value]
+    return value
+
+
+def split_payload(payload: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Split a ``Hexagram.model_dump()`` into its summary and heavy sections.
+
+    Args:
+        payload: Serialized hexagram
+
+    Returns:
+        (summary fields, section fields)
+    """
+    summary = {field: payload[field] for field in SUMMARY_FIELDS}
+    sections = {field: payload[field] for field in SECTION_FIELDS}
+    return summary, sections
+
+
+def write_bundle(bundle_path: Path, data_file: Path, payloads: List[Dict[str, Any]]) -> Path:
+    """
+    Compile validated hexagrams into a bundle file.
+
+    Args:
+        bundle_path: Destination of the bundle
+        data_file: JSON file the hexagrams were loaded from
+        payloads: ``Hexagram.model_dump()`` of the validated hexagrams in file order
+
+    Returns:
+        Path of the written bundle
+
+    Raises:
+        FileNotFoundError: If the JSON data file cannot be read
+    """
+    source = source_hash(data_file)
+    if source is None:
+        raise FileNotFoundError(f"无法读取数据文件: {data_file}")
+
+    index = []
+    blobs = []
+    offset = 0
+    for payload in payloads:
+        summary, sections = split_payload(payload)
+        offsets = {}
+        for field, value in sections.items():
+            blob = marshal.dumps(_intern_strings(value, values=False))
+            offsets[field] = (offset, len(blob))
+            blobs.append(blob)
+            offset += len(blob)
+        index.append((_intern_strings(summary), offsets))
+
+    index_blob = marshal.dumps(index)
+    body = index_blob + b"".join(blobs)
+    header = _HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, marshal.version,
+                          source, hashlib.sha256(body).digest(), len(index_blob))
+
+    # 先写临时文件再替换，避免读者看到写了一半的包
+    tmp_path = bundle_path.with_suffix(bundle_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(body)
+    tmp_path.replace(bundle_path)
+    return bundle_path
+
+
+class MappedBundle:
+    """
+    A verified bundle whose sections are decoded from a read-only memory map.
+
+    The mapped pages belong to the OS page cache, so they are shared by
+    every worker process and cost no Python heap until a section is decoded.
+    """
+
+    def __init__(self, mapping: mmap.mmap, index: List[Tuple[Dict[str, Any], Dict[str, Tuple[int, int]]]]):
+        self._mapping = mapping
+        # 偏移量相对于索引之后的分段区
+        self._view = memoryview(mapping)[_HEADER.size:]
+        self._base = _HEADER.unpack_from(mapping)[5]
+        self.summaries: List[Dict[str, Any]] = [summary for summary, _ in index]
+        self._offsets = [offsets for _, offsets in index]
+
+    def __len__(self) -> int:
+        return len(self.summaries)
+
+    def section(self, index: int, field: str) -> Any:
+        """
+        Decode one heavy field of one hexagram.
+
+        Args:
+            index: Position of the hexagram in the bundle
+            field: One of ``SECTION_FIELDS``
+
+        Returns:
+            The field's value as in ``Hexagram.model_dump()``
+        """
+        offset, length = self._offsets[index][field]
+        start = self._base + offset
+        return marshal.loads(self._view[start:start + length])
+
+
+def open_bundle(bundle_path: Path, data_file: Path,
+                source: Optional[bytes] = None) -> Optional[MappedBundle]:
+    """
+    Memory-map a bundle if it is still current and decode its index.
+
+    Args:
+        bundle_path: Path of the bundle
+        data_file: JSON file the bundle must have been compiled from
+        source: Precomputed ``source_hash(data_file)`` (optional)
+
+    Returns:
+        MappedBundle, or None if the bundle is missing, corrupt, from another
+        format version, or stale relative to the JSON file
+    """
+    try:
+        with open(bundle_path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    bundle = _verify(mapping, data_file, source)
+    if bundle is None:
+        mapping.close()
+    return bundle
+
+
+def _verify(mapping: mmap.mmap, data_file: Path,
+            source: Optional[bytes]) -> Optional[MappedBundle]:
+    """Check a mapped bundle's header and checksum and decode its index."""
+    if len(mapping) < _HEADER.size:
+        return None
+    magic, version, marshal_version, source_digest, digest, index_size = _HEADER.unpack_from(mapping)
+    if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION or marshal_version != marshal.version:
+        return None
+    expected = source if source is not None else source_hash(data_file)
+    if expected is None or source_digest != expected:
+        return None
+
+    # 校验和与索引解码只持有临时视图，失败时映射可以立即关闭
+    body = memoryview(mapping)[_HEADER.size:]
+    try:
+        if index_size > len(body) or hashlib.sha256(body).digest() != digest:
+            return None
+        index = marshal.loads(body[:index_size])
+    except (EOFError, ValueError, TypeError):
+        return None
+    finally:
+        body.release()
+    if not isinstance(index, list):
+        return None
+    return MappedBundle(mapping, index)
+
+
+_object_setattr = object.__setattr__
+
+
+def _trusted(model_cls: type, values: Dict[str, Any]) -> Any:
+    """
+    Build a model instance from already validated values.
+
+    This is what ``BaseModel.model_construct`` does once defaults are
+    resolved, without its per-field Python loop: bundle dicts always carry
+    every field, so nothing needs filling in.
+    """
+    instance = model_cls.__new__(model_cls)
+    _object_setattr(instance, "__dict__", values)
+    _object_setattr(instance, "__pydantic_fields_set__", set(values))
+    _object_setattr(instance, "__pydantic_extra__", None)
+    _object_setattr(instance, "__pydantic_private__", None)
+    return instance
+
+
+def _construct_line(data: Dict[str, Any]) -> Line:
+    values = dict(data)
+    values["image"] = _trusted(TextExplanation, data["image"])
+    values["interpretations"] = _trusted(LineInterpretations, data["interpretations"])
+    values["changes_to"] = _trusted(ChangeInfo, data["changes_to"])
+    return _trusted(Line, values)
+
+
+def construct_text(data: Dict[str, Any]) -> TextExplanation:
+    """
+    Build a TextExplanation sharing a pre-validated dict.
+
+    Args:
+        data: ``TextExplanation.model_dump()`` output
+
+    Returns:
+        TextExplanation using ``data`` as its attribute storage
+    """
+    return _trusted(TextExplanation, data)
+
+
+def construct_section(field: str, data: Any) -> Any:
+    """
+    Build the model value of one heavy field from its pre-validated data.
+
+    Args:
+        field: One of ``SECTION_FIELDS``
+        data: The field's value as in ``Hexagram.model_dump()``
+
+    Returns:
+        Model objects for nested fields, ``data`` itself for plain values
+    """
+    if field == "image":
+        return _trusted(TextExplanation, data)
+    if field == "interpretations":
+        return _trusted(HexagramInterpretations, data)
+    if field == "lines":
+        return [_construct_line(line) for line in data]
+    return data
+
+
+def construct_hexagram(data: Dict[str, Any]) -> Hexagram:
+    """
+    Build a Hexagram from a pre-validated bundle dict without validation.
+
+    Leaf models use the bundle's own dicts as their attribute storage, so
+    the hexagram shares its text with ``data`` instead of copying it. The
+    corpus never modifies either.
+
+    Args:
+        data: ``Hexagram.model_dump()`` output stored in a bundle
+
+    Returns:
+        Hexagram sharing its values with ``data``
+    """
+    values = dict(data)
+    values["kingWen"] = construct_text(data["kingWen"])
+    for field in SECTION_FIELDS:
+        values[field] = construct_section(field, data[field])
+    return _trusted(Hexagram, values)
@@ -0,0 +1,116 @@
+"""
+Hot reload of the hexagram corpora.
+
+``CorpusWatcher`` polls the data files of every registered manager (a
+``stat`` per file, no extra dependency) from a background thread. When a
+JSON file or its compiled bundle changes, the manager rebuilds the affected
+corpora off the request path and publishes them with one reference swap,
+so requests see either the old or the new data, never a mix.
+
+Editing tools such as ``enhance_hexagrams_data.py`` can therefore rewrite
+the JSON files while the API is running; run ``build_corpus_bundle.py``
+afterwards to get back to the memory-mapped bundle.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+from .hexagram_data import HexagramDataManager
+
+
+# 默认轮询间隔（秒）；0 表示不启动后台线程
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+class CorpusWatcher:
+    """
+    Polls data files and reloads changed corpora.
+    """
+
+    def __init__(self, managers: Dict[str, HexagramDataManager],
+                 interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Create a watcher.
+
+        Args:
+            managers: Managers to keep current, by display name
+            interval: Seconds between polls (0 disables the background thread)
+        """
+        self.managers = managers
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def poll(self, force: bool = False) -> Dict[str, List[str]]:
+        """
+        Check every manager once and reload what changed.
+
+        A failed reload (for example a JSON file caught half-written) keeps
+        the current corpus and is retried on the next poll.
+
+        Args:
+            force: Reload every loaded language even if unchanged
+
+        Returns:
+            Mapping of manager name to the languages that were replaced
+        """
+        reloaded = {}
+        for name, manager in self.managers.items():
+            try:
+                languages = manager.reload(force=force)
+            except Exception as e:
+                print(f"⚠️ 卦象数据重新加载失败（{name}），继续使用当前数据: {e}")
+                continue
+            if languages:
+                print(f"🔄 卦象数据已重新加载（{name}）: {', '.join(languages)}")
+                reloaded[name] = languages
+        return reloaded
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def start(self) -> None:
+        """
+        Start the background polling thread (no-op if the interval is 0).
+        """
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="corpus-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background polling thread.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 5)
+            self._thread = None
+
+    def status(self) -> List[Dict[str, Any]]:
+        """
+        Describe every loaded corpus.
+
+        Returns:
+            One entry per manager and language with generation, hash, source,
+            load time and cache statistics
+        """
+        entries = []
+        for name, manager in self.managers.items():
+            for language in sorted(manager.loaded_languages()):
+                corpus = manager.get_corpus(language)
+                entries.append({
+                    "manager": name,
+                    "language": language,
+                    "generation": corpus.generation,
+                    "sha256": corpus.version,
+                    "source": corpus.source,
+                    "dataFile": corpus.data_file.name,
+                    "hexagrams": len(corpus.hexagrams),
+                    "loadedAt": corpus.loaded_at.isoformat(),
+                    "sectionCache": corpus.sections.info(),
+                    "readingCache": corpus.reading_cache.info(),
+                })
+        return entries
@@ -3,7 +3,8 @@ Core divination logic for generating hexagrams and interpretations.
 """
 
 import random
-from typing import List, Literal, Tuple, Optional, Dict, Any
+from functools import lru_cache
+from typing import List, Literal, Tuple, Optional, Dict, Any, Sequence, Union
 from datetime import datetime
 
 from models.schemas import (
@@ -11,15 +12,29 @@ from models.schemas import (
     NajiaLineInfo, GanZhiTime, NajiaDivinationRequest
 )
 
-from .hexagram_data import HexagramDataManager
-from .najia_oracle import NajiaOracle
+from .casting import (
+    CastLine, cast_changing_mask, cast_code, cast_coins, cast_from_values, cast_to_lines,
+    cast_to_najia_params, changed_code, lines_to_cast, najia_params_to_cast
+)
+from .casting_engines import DEFAULT_METHOD, get_engine
+from .hexagram_data import hexagram_manager
+from .interpretation_templates import render_interpretation
+from .reading_view import HexagramReading
+from .ganzhi import LIUQIN_INDEX
+from .najia_analysis import (
+    LineState, analyze_result, describe_line, describe_shi_ying, describe_yongshen, fushen_text
+)
+from .najia_oracle import GUA5, GUAS, NAJIA_TABLE, XING5, NajiaChart, NajiaOracle, render_chart, set_shi_yao
 
-# Initialize data manager
-data_manager = HexagramDataManager()
+# Shared process-wide corpus registry
+data_manager = hexagram_manager
 
 def set_language(language: str) -> None:
     """
-    Set the language for the data manager.
+    Set the language for the current request context.
+    
+    Prefer passing ``language`` to the lookup functions explicitly; this
+    only changes the context-local default and never affects other requests.
     
     Args:
         language: Language code ('zh' or 'en')
@@ -29,7 +44,7 @@ def set_language(language: str) -> None:
 LineType = Literal['oldYin', 'youngYang', 'youngYin', 'oldYang']
 
 
-def throw_coins() -> Tuple[List[str], LineType, int]:
+def throw_coins(rng: Optional[random.Random] = None) -> Tuple[List[str], LineType, int]:
     """
     Simulate throwing three coins to determine a line type.
     
@@ -41,6 +56,9 @@ def throw_coins() -> Tuple[List[str], LineType, int]:
       - 8 (HHT, HTH, THH): Young Yin  
       - 9 (HHH): Old Yang (changing)
     
+    Args:
+        rng: Random generator of the request (the module-level generator by default)
+    
     Returns:
         Tuple containing:
         - List of coin results ('heads' or 'tails')
@@ -52,7 +70,7 @@ def throw_coins() -> Tuple[List[str], LineType, int]:
     
     # Throw three coins
     for _ in range(3):
-        coin = random.choice(['heads', 'tails'])
+        coin = (rng or random).choice(['heads', 'tails'])
         coins.append(coin)
         if coin == 'heads':
             heads_count += 1
@@ -104,36 +122,93 @@ def generate_six_lines() -> List[Line]:
     """
     Generate six lines by throwing coins six times.
     
+    Prefer ``cast_coins`` on the hot path; this builds Line models from it.
+    
     Returns:
         List of six Line objects representing the hexagram
     """
-    lines: List[Line] = []
+    return cast_to_lines(cast_coins())
+
+
+def get_reading_from_cast(cast: int, language: Optional[str] = None) -> HexagramReading:
+    """
+    Get the hexagram a cast shows.
     
-    for position in range(1, 7):
-        coins, line_type, line_value = throw_coins()
+    Args:
+        cast: 12-bit cast (line code in bits 0-5, changing mask in bits 6-11)
+        language: Language code ('zh' or 'en'), defaults to the request language
         
-        # Convert to yang/yin representation
-        type_str: Literal['yang', 'yin'] = 'yang' if line_type_to_binary(line_type) == '1' else 'yin'
-        changing = is_changing_line(line_type)
+    Returns:
+        HexagramReading with the cast's changing lines
+    """
+    return data_manager.get_reading(cast_code(cast), cast_changing_mask(cast), language)
+
+
+def get_changed_from_cast(cast: int, language: Optional[str] = None) -> Optional[HexagramReading]:
+    """
+    Get the hexagram a cast changes into.
+    
+    Args:
+        cast: 12-bit cast
+        language: Language code ('zh' or 'en'), defaults to the request language
         
-        lines.append(Line(
-            position=position,
-            type=type_str,
-            changing=changing
-        ))
+    Returns:
+        HexagramReading of the changed hexagram, or None without changing lines
+    """
+    if not cast_changing_mask(cast):
+        return None
+    # 变卦：翻转变爻，变卦中不再有变爻
+    return data_manager.get_reading(changed_code(cast), 0, language)
+
+
+def lines_to_code(lines: List[Line]) -> int:
+    """
+    Convert six lines to the 6-bit line code used for hexagram lookup.
     
-    return lines
+    Args:
+        lines: List of six Line objects
+        
+    Returns:
+        Line code (0-63), bit ``position - 1`` set for each yang line
+    """
+    code = 0
+    for line in lines:
+        if line.type == 'yang':
+            code |= 1 << (line.position - 1)
+    return code
 
 
-def get_hexagram_from_lines(lines: List[Line]) -> Hexagram:
+def lines_to_changing_mask(lines: List[Line]) -> int:
+    """
+    Convert six lines to the 6-bit mask of changing lines.
+    
+    Args:
+        lines: List of six Line objects
+        
+    Returns:
+        Mask (0-63), bit ``position - 1`` set for each changing line
+    """
+    mask = 0
+    for line in lines:
+        if line.changing:
+            mask |= 1 << (line.position - 1)
+    return mask
+
+
+def get_hexagram_from_lines(lines: List[Line], language: Optional[str] = None) -> HexagramReading:
     """
     Get the hexagram corresponding to the given lines.
     
+    The result is a read-only view over the cached hexagram: line types,
+    trigrams and changing flags come from ``lines`` while the texts are
+    shared with the cache, which is never modified.
+    
     Args:
         lines: List of six Line objects (position 1-6, where 1 is bottom, 6 is top)
+        language: Language code ('zh' or 'en'), defaults to the request language
         
     Returns:
-        Hexagram object matching the line pattern
+        HexagramReading matching the line pattern
         
     Raises:
         ValueError: If lines list is invalid
@@ -141,104 +216,28 @@ def get_hexagram_from_lines(lines: List[Line]) -> Hexagram:
     if len(lines) != 6:
         raise ValueError("必须提供6个爻")
     
-    # 确保爻按位置排序（从下到上：1,2,3,4,5,6）
-    sorted_lines = sorted(lines, key=lambda x: x.position)
-      # 转换为二进制：上卦（第4,5,6爻）+ 下卦（第1,2,3爻）
-    # 按照周易传统，所有三卦都从下往上数
-    
-    # 上卦：从第4爻到第6爻（从下往上）
-    upper_trigram = ''.join([
-        '1' if sorted_lines[3].type == 'yang' else '0',  # 第4爻（上卦底部）
-        '1' if sorted_lines[4].type == 'yang' else '0',  # 第5爻（上卦中部）
-        '1' if sorted_lines[5].type == 'yang' else '0'   # 第6爻（上卦顶部）
-    ])
-      # 下卦：从第1爻到第3爻（从下往上）
-    lower_trigram = ''.join([
-        '1' if sorted_lines[0].type == 'yang' else '0',  # 第1爻（下卦底部）
-        '1' if sorted_lines[1].type == 'yang' else '0',  # 第2爻（下卦中部）
-        '1' if sorted_lines[2].type == 'yang' else '0'   # 第3爻（下卦顶部）
-    ])    # Find matching hexagram
-    hexagram = data_manager.get_hexagram_by_trigrams(upper_trigram, lower_trigram)
-    
-    if hexagram is None:
-        # Fallback to first hexagram if not found
-        all_hexagrams = data_manager.get_all_hexagrams()
-        if all_hexagrams:
-            hexagram = all_hexagrams[0]
-        else:
-            raise ValueError("无法找到对应的卦象")
-    
-    # 重要：合并JSON中的爻辞信息到生成的爻线中，保持changing状态和position信息
-    if hexagram.lines and len(hexagram.lines) == 6:
-        # 创建新的爻线列表，保留changing状态但添加爻辞信息
-        enhanced_lines = []
-        for i, generated_line in enumerate(sorted_lines):
-            json_line = hexagram.lines[i]
-            # 创建增强的爻线，保留generated_line的changing状态，但添加JSON中的爻辞
-            enhanced_line = Line(
-                position=generated_line.position,
-                type=generated_line.type,
-                changing=generated_line.changing,
-                text=json_line.text if hasattr(json_line, 'text') else None,
-                explanation=json_line.explanation if hasattr(json_line, 'explanation') else None,
-                image=json_line.image if hasattr(json_line, 'image') else None,
-                interpretations=json_line.interpretations if hasattr(json_line, 'interpretations') else None
-            )
-            enhanced_lines.append(enhanced_line)
-        
-        hexagram.lines = enhanced_lines
-    else:
-        # 如果JSON中没有爻线信息，使用生成的爻线
-        hexagram.lines = sorted_lines
-    
-    # 确保设置三爻信息
-    hexagram.upperTrigram = upper_trigram
-    hexagram.lowerTrigram = lower_trigram
-    
-    return hexagram
+    return get_reading_from_cast(lines_to_cast(lines), language)
 
 
-def get_changed_hexagram(lines: List[Line]) -> Optional[Hexagram]:
+def get_changed_hexagram(lines: List[Line], language: Optional[str] = None) -> Optional[HexagramReading]:
     """
     Generate the changed hexagram if there are changing lines.
     
     Args:
         lines: List of six Line objects from original hexagram
+        language: Language code ('zh' or 'en'), defaults to the request language
         
     Returns:
-        Changed hexagram if changing lines exist, None otherwise
+        Changed hexagram reading if changing lines exist, None otherwise
     """
-    # Check if there are any changing lines
-    has_changing_lines = any(line.changing for line in lines)
-    
-    if not has_changing_lines:
-        return None
-    
-    # Create changed lines by flipping changing lines
-    changed_lines: List[Line] = []
-    for line in lines:
-        if line.changing:
-            # Flip the line type
-            new_type: Literal['yang', 'yin'] = 'yin' if line.type == 'yang' else 'yang'
-        else:
-            new_type = line.type
-        
-        changed_lines.append(Line(
-            position=line.position,
-            type=new_type,
-            changing=False  # Changed lines are no longer changing
-        ))
-      # Get the hexagram using the changed lines - this will properly merge line text data
-    changed_hexagram = get_hexagram_from_lines(changed_lines)
-    
-    return changed_hexagram
+    return get_changed_from_cast(lines_to_cast(lines), language)
 
 
 def generate_interpretation(
     question: str,
-    original_hexagram: Hexagram,
-    changed_hexagram: Optional[Hexagram],
-    lines: List[Line]
+    original_hexagram: Union[Hexagram, HexagramReading],
+    changed_hexagram: Optional[Union[Hexagram, HexagramReading]],
+    lines: Sequence[Union[Line, CastLine]]
 ) -> str:
     """
     Generate a comprehensive interpretation of the divination result.
@@ -247,132 +246,40 @@ def generate_interpretation(
         question: The original question asked
         original_hexagram: The primary hexagram
         changed_hexagram: The changed hexagram (if any)
-        lines: The six lines with changing information
+        lines: The six lines with changing information (models or ``cast_lines``)
         
     Returns:
         Formatted interpretation string
     """
-    interpretation_parts: List[str] = []
-    
-    # Question and basic info
-    interpretation_parts.append(f"您的问题是：{question}")
-    interpretation_parts.append("")
-    
-    # Original hexagram
-    interpretation_parts.append(f"主卦：{original_hexagram.chineseName}（{original_hexagram.name}）")
-    interpretation_parts.append(f"卦象：{original_hexagram.symbol}")
-    
-    # 获取卦象描述（兼容不同数据结构）
-    original_description = ""
-    if hasattr(original_hexagram, 'description') and original_hexagram.description:
-        original_description = original_hexagram.description
-    elif hasattr(original_hexagram, 'interpretations') and original_hexagram.interpretations:
-        if original_hexagram.interpretations.traditional and hasattr(original_hexagram.interpretations.traditional, 'description'):
-            original_description = original_hexagram.interpretations.traditional.description
-    elif hasattr(original_hexagram, 'kingWen') and original_hexagram.kingWen:
-        original_description = original_hexagram.kingWen.explanation
-
-    interpretation_parts.append(f"解释：{original_description}")
-    interpretation_parts.append("")
-    
-    # Changed hexagram if exists
-    if changed_hexagram:
-        changing_positions = [line.position for line in lines if line.changing]
-        interpretation_parts.append(f"变卦：{changed_hexagram.chineseName}（{changed_hexagram.name}）")
-        interpretation_parts.append(f"变爻：第 {', '.join(map(str, changing_positions))} 爻")
-        
-        # 获取变卦描述（兼容不同数据结构）
-        changed_description = ""
-        if hasattr(changed_hexagram, 'description') and changed_hexagram.description:
-            changed_description = changed_hexagram.description
-        elif hasattr(changed_hexagram, 'interpretations') and changed_hexagram.interpretations:
-            if changed_hexagram.interpretations.traditional and hasattr(changed_hexagram.interpretations.traditional, 'description'):
-                changed_description = changed_hexagram.interpretations.traditional.description
-        elif hasattr(changed_hexagram, 'kingWen') and changed_hexagram.kingWen:
-            changed_description = changed_hexagram.kingWen.explanation
-            
-        interpretation_parts.append(f"变卦解释：{changed_description}")
-        interpretation_parts.append("")
-      # Detailed interpretations - 详细解读
-    interpretation_parts.append("== 详细解读 ==")
-    
-    # 卦象基本含义
-    if hasattr(original_hexagram, 'interpretations') and original_hexagram.interpretations and hasattr(original_hexagram.interpretations, 'traditional'):
-        if hasattr(original_hexagram.interpretations.traditional, 'description'):
-            interpretation_parts.append(f"🔮 卦象释义：{original_hexagram.interpretations.traditional.description}")
-    
-    # 运势各方面解读
-    if hasattr(original_hexagram, 'fortune') and original_hexagram.fortune:
-        interpretation_parts.append(f"💰 总体运势：{original_hexagram.fortune}")
-    
-    if hasattr(original_hexagram, 'love') and original_hexagram.love:
-        interpretation_parts.append(f"💕 感情婚姻：{original_hexagram.love}")
-    
-    if hasattr(original_hexagram, 'career') and original_hexagram.career:
-        interpretation_parts.append(f"💼 事业工作：{original_hexagram.career}")
-    
-    if hasattr(original_hexagram, 'health') and original_hexagram.health:
-        interpretation_parts.append(f"🏥 健康状况：{original_hexagram.health}")
-    
-    # 变爻解读
-    changing_lines = [line for line in lines if line.changing]
-    if changing_lines:
-        interpretation_parts.append("")
-        interpretation_parts.append("📍 变爻指导：")
-        for line in changing_lines:
-            if hasattr(line, 'explanation') and line.explanation:
-                interpretation_parts.append(f"  第{line.position}爻：{line.explanation}")
-    
-    # 行动建议
-    interpretation_parts.append("")
-    if hasattr(original_hexagram, 'advice') and original_hexagram.advice:
-        interpretation_parts.append(f"💡 行动建议：{original_hexagram.advice}")
-        
-    # Additional guidance based on changed hexagram
-    if changed_hexagram:
-        interpretation_parts.append("")
-        interpretation_parts.append("== 变化趋势 ==")
-        interpretation_parts.append(f"当前局势正在向【{changed_hexagram.chineseName}】的方向发展。")
-        
-        # 变卦详细解读
-        if hasattr(changed_hexagram, 'interpretations') and changed_hexagram.interpretations and hasattr(changed_hexagram.interpretations, 'traditional'):
-            if hasattr(changed_hexagram.interpretations.traditional, 'description'):
-                interpretation_parts.append(f"🔄 变化含义：{changed_hexagram.interpretations.traditional.description}")
-        
-        # 变卦运势指向
-        if hasattr(changed_hexagram, 'fortune') and changed_hexagram.fortune:
-            interpretation_parts.append(f"📈 运势走向：{changed_hexagram.fortune}")
-            
-        if hasattr(changed_hexagram, 'advice') and changed_hexagram.advice:
-            interpretation_parts.append(f"🎯 应对策略：{changed_hexagram.advice}")
-            
-        # 变化时机提示
-        interpretation_parts.append(f"⏰ 变化提示：变爻显示变化正在发生，需要积极适应新的形势")
-        
-        interpretation_parts.append("")
-    
-    return "\n".join(interpretation_parts)
+    # 卦名、卦辞解释、运势、建议与变化趋势均取自按语料预编译的片段，逐次只拼接问题与变爻
+    return render_interpretation(
+        question,
+        hexagram_manager.get_interpretation_fragments(original_hexagram),
+        hexagram_manager.get_interpretation_fragments(changed_hexagram) if changed_hexagram else None,
+        lines
+    )
 
 
 def generate_najia_divination(params: List[int] = None, question: str = "", 
                             gender: str = "", title: str = "", 
-                            date = None) -> Dict[str, Any]:
+                            date = None, rng: Optional[random.Random] = None) -> Dict[str, Any]:
     """
     生成完整的纳甲六爻排盘
     
     Args:
-        params: 摇卦参数 [1-4] * 6，如果为None则随机生成
+        params: 摇卦参数 [1-4] * 6，如果为None则按三钱法随机生成
         question: 所问问题
         gender: 性别
         title: 测事标题
         date: 起卦时间
+        rng: 本次请求的随机数生成器（默认使用模块级生成器）
         
     Returns:
         完整的纳甲排盘结果
     """
-    # 如果没有提供参数，随机生成
+    # 如果没有提供参数，按三钱法随机起卦
     if params is None:
-        params = [random.randint(1, 4) for _ in range(6)]
+        params = cast_to_najia_params(cast_coins(rng))
     
     # 确保参数格式正确
     if len(params) != 6:
@@ -393,32 +300,27 @@ def generate_najia_divination(params: List[int] = None, question: str = "",
     # 获取纳甲结果
     najia_result = oracle.get_najia_result()
     
-    # 转换为标准爻线格式
+    # 起卦结果按 12 位整数处理：奇数为阳爻，3、4 为动爻
+    cast = najia_params_to_cast(params)
+    
+    # 转换为标准爻线格式，附上纳甲信息
     lines = []
-    for i, param in enumerate(params):
-        line_type = 'yang' if param in [1, 3] else 'yin'
-        changing = param in [3, 4]  # 老阳老阴为动爻
-        
+    for i, line in enumerate(cast_to_lines(cast)):
         # 从纳甲结果获取详细信息
         line_info = najia_result['lines'][i] if i < len(najia_result['lines']) else {}
-        
-        lines.append(Line(
-            position=i + 1,
-            type=line_type,
-            changing=changing,
-            text=f"{line_info.get('najia', '')} {line_info.get('qin6', '')}",
-            explanation=f"六神: {line_info.get('god6', '')}",
-        ))
+        line.text = f"{line_info.get('najia', '')} {line_info.get('qin6', '')}"
+        line.explanation = f"六神: {line_info.get('god6', '')}"
+        lines.append(line)
     
     # 获取原卦和变卦
-    original_hexagram = get_hexagram_from_lines(lines)
-    changed_hexagram = get_changed_hexagram(lines) if any(line.changing for line in lines) else None
+    original_hexagram = get_reading_from_cast(cast)
+    changed_hexagram = get_changed_from_cast(cast)
     
     # 生成传统解释
     traditional_interpretation = generate_interpretation(question, original_hexagram, changed_hexagram, lines)
     
     # 添加纳甲专业解释
-    najia_interpretation = generate_najia_interpretation(najia_result, question)
+    najia_interpretation = generate_najia_interpretation(najia_result, question, oracle.chart)
     
     return {
         'original_hexagram': original_hexagram,
@@ -432,17 +334,37 @@ def generate_najia_divination(params: List[int] = None, question: str = "",
     }
 
 
-def generate_najia_interpretation(najia_result: Dict[str, Any], question: str = "") -> str:
+# 用神规则：(六亲, 问题关键词, 提示)，按顺序取第一条卦中有该六亲且问题含关键词的规则
+_YONGSHEN_RULES: Tuple[Tuple[str, Tuple[str, ...], str], ...] = (
+    ('妻财', ('求财', '钱', '财'), "💡 求财以妻财为用神，观其旺衰动静"),
+    ('官鬼', ('工作', '事业', '官'), "💡 求官以官鬼为用神，观其旺衰动静"),
+    ('子孙', ('健康', '病'), "💡 测病以子孙为用神，子孙发动病愈"),
+    ('父母', ('考试', '学习'), "💡 求学以父母为用神，观其旺衰动静"),
+)
+
+
+def question_topics(question: str) -> int:
     """
-    生成纳甲专业解释
+    Classify a question by the 用神 keywords it contains.
+    
+    Two questions with the same topics get the same najia interpretation
+    for the same cast and moment.
     
     Args:
-        najia_result: 纳甲排盘结果
-        question: 所问问题
+        question: The question asked
         
     Returns:
-        纳甲解释文本
+        Bit mask, bit ``i`` set when the question matches the i-th 用神 rule
     """
+    topics = 0
+    for i, (_, keywords, _) in enumerate(_YONGSHEN_RULES):
+        if any(keyword in question for keyword in keywords):
+            topics |= 1 << i
+    return topics
+
+
+def _najia_chart_lines(najia_result: Dict[str, Any]) -> List[str]:
+    """排盘、六爻、六亲与伏神段落（只取决于卦与日干）"""
     parts = []
     
     # 基本卦象信息
@@ -481,9 +403,9 @@ def generate_najia_interpretation(najia_result: Dict[str, Any], question: str =
     
     # 六亲分析
     parts.append("=== 六亲关系 ===")
-    qin6_list = [line.get('qin6', '') for line in lines]
     qin6_count = {}
-    for qin in qin6_list:
+    for line in lines:
+        qin = line.get('qin6', '')
         if qin:
             qin6_count[qin] = qin6_count.get(qin, 0) + 1
     
@@ -506,8 +428,18 @@ def generate_najia_interpretation(najia_result: Dict[str, Any], question: str =
         parts.append("=== 伏神分析 ===")
         parts.append(f"🫥 伏神卦：{hidden.get('name', '未知卦')}")
         parts.append("📍 缺失六亲通过伏神补充")
-    
-    # 时间信息
+    return parts
+
+
+@lru_cache(maxsize=4096)
+def _najia_chart_text(chart: NajiaChart) -> Tuple[str, ...]:
+    """查表排盘的排盘段落，按整数编码缓存"""
+    return tuple(_najia_chart_lines(render_chart(chart)))
+
+
+def _najia_time_lines(najia_result: Dict[str, Any]) -> List[str]:
+    """四柱与旬空段落"""
+    parts = []
     lunar_info = najia_result.get('lunar_info', {})
     if lunar_info:
         parts.append("")
@@ -517,6 +449,76 @@ def generate_najia_interpretation(najia_result: Dict[str, Any], question: str =
         xkong = lunar_info.get('xkong', '')
         if xkong:
             parts.append(f"🕳️ 旬空：{xkong}")
+    return parts
+
+
+def _najia_analysis_lines(najia_result: Dict[str, Any], chart: Optional[NajiaChart],
+                          yongshen: int) -> Tuple[List[str], List[str]]:
+    """旺衰分析段落与用神要点，排盘或四柱无法解析时均为空"""
+    analysis = analyze_result(najia_result, chart, yongshen)
+    if analysis is None:
+        return [], []
+    parts = ["", "=== 旺衰分析 ==="]
+    parts.extend(describe_line(line) for line in reversed(analysis.lines))
+    parts.append(describe_shi_ying(analysis))
+    return parts, describe_yongshen(analysis)
+
+
+def _najia_yongshen(topics: int) -> int:
+    """问题类别（``question_topics``）对应的用神六亲，未匹配为 -1"""
+    for i, qin in enumerate(_YONGSHEN_QIN):
+        if topics >> i & 1:
+            return qin
+    return -1
+
+
+def _najia_dong_lines(dong_yao: List[int]) -> List[str]:
+    """动爻段落，dong_yao 为发动的爻位（1-6）"""
+    if not dong_yao:
+        return ["🔒 六爻皆静，以本卦论之"]
+    parts = [f"⚡ 动爻：第{dong_yao}爻发动，主变化之应"]
+    if len(dong_yao) == 1:
+        parts.append("📈 一爻动，事有专主")
+    elif len(dong_yao) == 2:
+        parts.append("⚖️ 二爻动，取两爻之应")
+    elif len(dong_yao) >= 3:
+        parts.append("🌀 多爻动，以变卦论之")
+    return parts
+
+
+# 各用神规则的六亲编码，与按变爻掩码预生成的动爻段落
+_YONGSHEN_QIN = tuple(LIUQIN_INDEX[qin] for qin, _, _ in _YONGSHEN_RULES)
+_DONG_LINES = tuple(
+    tuple(_najia_dong_lines([i + 1 for i in range(6) if mask >> i & 1])) for mask in range(64)
+)
+
+
+def generate_najia_interpretation(najia_result: Dict[str, Any], question: str = "",
+                                  chart: Optional[NajiaChart] = None) -> str:
+    """
+    生成纳甲专业解释
+    
+    Args:
+        najia_result: 纳甲排盘结果
+        question: 所问问题
+        chart: 该结果的整数编码排盘（``NajiaOracle.chart``），提供时排盘段落
+            取自缓存，用神与动爻按编码判断
+        
+    Returns:
+        纳甲解释文本
+    """
+    if chart is not None:
+        parts = list(_najia_chart_text(chart))
+    else:
+        parts = _najia_chart_lines(najia_result)
+    
+    # 时间信息
+    parts.extend(_najia_time_lines(najia_result))
+    
+    # 月建、日辰旺衰，动变与伏神，世应
+    topics = question_topics(question)
+    analysis_parts, yongshen_parts = _najia_analysis_lines(najia_result, chart, _najia_yongshen(topics))
+    parts.extend(analysis_parts)
     
     parts.append("")
     
@@ -524,43 +526,54 @@ def generate_najia_interpretation(najia_result: Dict[str, Any], question: str =
     parts.append("=== 占断要点 ===")
     
     # 根据用神分析
-    if '妻财' in qin6_list and ('求财' in question or '钱' in question or '财' in question):
-        parts.append("💡 求财以妻财为用神，观其旺衰动静")
-    elif '官鬼' in qin6_list and ('工作' in question or '事业' in question or '官' in question):
-        parts.append("💡 求官以官鬼为用神，观其旺衰动静")
-    elif '子孙' in qin6_list and ('健康' in question or '病' in question):
-        parts.append("💡 测病以子孙为用神，子孙发动病愈")
-    elif '父母' in qin6_list and ('考试' in question or '学习' in question):
-        parts.append("💡 求学以父母为用神，观其旺衰动静")
+    if chart is not None:
+        qin6_mask = NAJIA_TABLE[chart.code].qin6_mask
+        for i, (qin, _, advice) in enumerate(_YONGSHEN_RULES):
+            if topics >> i & 1 and qin6_mask >> _YONGSHEN_QIN[i] & 1:
+                parts.append(advice)
+                break
+        parts.extend(yongshen_parts)
+        
+        # 动爻分析
+        parts.extend(_DONG_LINES[chart.mask])
+        return "\n".join(parts)
+    
+    lines = najia_result.get('lines', [])
+    qin6_list = [line.get('qin6', '') for line in lines]
+    for qin, keywords, advice in _YONGSHEN_RULES:
+        if qin in qin6_list and any(keyword in question for keyword in keywords):
+            parts.append(advice)
+            break
+    parts.extend(yongshen_parts)
     
     # 动爻分析
-    dong_yao = [i+1 for i, line in enumerate(lines) if line.get('changing')]
-    if dong_yao:
-        parts.append(f"⚡ 动爻：第{dong_yao}爻发动，主变化之应")
-        if len(dong_yao) == 1:
-            parts.append("📈 一爻动，事有专主")
-        elif len(dong_yao) == 2:
-            parts.append("⚖️ 二爻动，取两爻之应")
-        elif len(dong_yao) >= 3:
-            parts.append("🌀 多爻动，以变卦论之")
-    else:
-        parts.append("🔒 六爻皆静，以本卦论之")
+    parts.extend(_najia_dong_lines([i+1 for i, line in enumerate(lines) if line.get('changing')]))
     
     return "\n".join(parts)
 
 
-def params_to_najia_format(params: List[int]) -> List[int]:
+def params_to_najia_format(params: List[int], rng: Optional[random.Random] = None,
+                           method: str = DEFAULT_METHOD) -> List[int]:
     """
     将通用参数转换为纳甲格式
     
     Args:
-        params: 通用摇卦参数
+        params: 通用摇卦参数，为空时按起卦方法随机起卦
+        rng: 本次请求的随机数生成器（默认使用模块级生成器）
+        method: 随机起卦的方法（默认三钱法）
         
     Returns:
         纳甲格式参数 [1-4]
+        
+    Raises:
+        ValueError: 起卦方法未知或不使用随机数时
     """
     if not params:
-        return [random.randint(1, 4) for _ in range(6)]
+        # 经起卦引擎随机起卦，老少阴阳的概率与所选方法一致（而非各占四分之一）
+        engine = get_engine(method)
+        if not engine.uses_rng:
+            raise ValueError(f"起卦方法 {engine.name} 不使用随机数")
+        return cast_to_najia_params(engine.cast(rng))
     
     # 确保所有参数都在1-4范围内
     najia_params = []
@@ -575,6 +588,35 @@ def params_to_najia_format(params: List[int]) -> List[int]:
     return najia_params[:6] if len(najia_params) >= 6 else najia_params + [2] * (6 - len(najia_params))
 
 
+def _najia_hexagram_info(name: str, mark: str, gong: str, shiy: Sequence[int],
+                         lines: List[NajiaLineInfo]) -> NajiaHexagramInfo:
+    """
+    由卦名、卦码、卦宫与世应构建卦象信息
+    
+    Args:
+        name: 卦名
+        mark: 卦码，第 i 位为第 i+1 爻，'1' 为阳
+        gong: 卦宫
+        shiy: (世爻, 应爻)
+        lines: 六爻纳甲信息
+        
+    Returns:
+        NajiaHexagramInfo，卦序按文王卦序
+    """
+    hexagram = None
+    if len(mark) == 6 and set(mark) <= {'0', '1'}:
+        hexagram = hexagram_manager.get_hexagram_by_code(int(mark[::-1], 2), 'zh')
+    return NajiaHexagramInfo(
+        number=hexagram.number if hexagram is not None else 1,
+        name=name,
+        palace=gong,
+        wuxing=XING5[GUA5[GUAS.index(gong)]] if gong in GUAS else '',
+        lines=lines,
+        shi_yao_pos=shiy[0] if len(shiy) > 0 else 1,
+        ying_yao_pos=shiy[1] if len(shiy) > 1 else 4
+    )
+
+
 def convert_najia_to_schema(najia_result: Dict[str, Any], question: str, 
                            divination_time: datetime = None) -> NajiaDivinationResult:
     """
@@ -601,49 +643,66 @@ def convert_najia_to_schema(najia_result: Dict[str, Any], question: str,
         month_gz=gz.get('month', ''),
         day_gz=gz.get('day', ''),
         hour_gz=gz.get('hour', ''),
-        xunkong=lunar_info.get('xkong', '').split(' ') if lunar_info.get('xkong') else []
+        xunkong=list(lunar_info.get('xkong', ''))
     )
     
     # 构建六爻信息
     lines_info = []
     najia_lines = najia_result.get('lines', [])
-    shiy = najia_result.get('shiy', [])
+    original = najia_result.get('original_hexagram', {})
+    mark = original.get('mark', '')
+    shiy = original.get('shiy', [])
+    
+    # 旬空与伏神取自旺衰分析
+    analysis = analyze_result(najia_result)
     
     for i in range(6):
         line_data = najia_lines[i] if i < len(najia_lines) else {}
+        line_analysis = analysis.lines[i] if analysis else None
+        najia = line_data.get('najia', '')
         
         line_info = NajiaLineInfo(
             position=i + 1,
-            yao_type='yang' if line_data.get('yao_type') == '阳' else 'yin',
+            yao_type='yang' if mark[i:i + 1] == '1' else 'yin',
             changing=line_data.get('changing', False),
-            najia=line_data.get('najia', ''),
-            wuxing=line_data.get('wuxing', ''),
+            najia=najia,
+            wuxing=najia[2:],
             liuqin=line_data.get('qin6', ''),
             liushen=line_data.get('god6', ''),
             shi_yao=(i + 1) == shiy[0] if len(shiy) > 0 else False,
             ying_yao=(i + 1) == shiy[1] if len(shiy) > 1 else False,
-            fushen=None,  # TODO: 从hidden信息中提取
-            xunkong=line_data.get('xunkong', False)
+            fushen=fushen_text(line_analysis) if line_analysis else None,
+            xunkong=bool(line_analysis.state & LineState.KONG) if line_analysis else False
         )
         lines_info.append(line_info)
     
     # 构建本卦信息
-    original_hexagram = NajiaHexagramInfo(
-        number=najia_result.get('number', 1),
-        name=najia_result.get('name', ''),
-        palace=najia_result.get('gong', ''),
-        wuxing=najia_result.get('wuxing', ''),
-        lines=lines_info,
-        shi_yao_pos=shiy[0] if len(shiy) > 0 else 1,
-        ying_yao_pos=shiy[1] if len(shiy) > 1 else 4
-    )
+    original_hexagram = _najia_hexagram_info(original.get('name', ''), mark, original.get('gong', ''),
+                                             shiy, lines_info)
     
-    # 构建变卦信息（如果有）
+    # 构建变卦信息（如果有）：变卦六亲按本卦卦宫五行，六神随爻位不变，旬空取起卦日
     changed_hexagram = None
-    bian = najia_result.get('bian')
+    bian = najia_result.get('changed_hexagram')
     if bian:
-        # TODO: 构建变卦的详细信息
-        pass
+        bian_mark = bian.get('mark', '')
+        bian_shiy = set_shi_yao(bian_mark)
+        xkong = lunar_info.get('xkong', '')
+        changed_lines = []
+        for i in range(6):
+            najia = bian['qinx'][i] if i < len(bian.get('qinx', [])) else ''
+            changed_lines.append(NajiaLineInfo(
+                position=i + 1,
+                yao_type='yang' if bian_mark[i:i + 1] == '1' else 'yin',
+                najia=najia,
+                wuxing=najia[2:],
+                liuqin=bian['qin6'][i] if i < len(bian.get('qin6', [])) else '',
+                liushen=lines_info[i].liushen,
+                shi_yao=(i + 1) == bian_shiy[0],
+                ying_yao=(i + 1) == bian_shiy[1],
+                xunkong=bool(najia[1:2]) and najia[1:2] in xkong
+            ))
+        changed_hexagram = _najia_hexagram_info(bian.get('name', ''), bian_mark, bian.get('gong', ''),
+                                                bian_shiy, changed_lines)
     
     return NajiaDivinationResult(
         question=question,
@@ -673,21 +732,11 @@ def generate_najia_divination_for_api(question: str,
     if divination_time is None:
         divination_time = datetime.now()
     
-    # 转换手动输入的爻象到纳甲格式
+    # 转换手动输入的爻象（6=老阴, 7=少阳, 8=少阴, 9=老阳）到纳甲格式 [1-4]
     if manual_lines:
-        # 转换 6=老阴, 7=少阳, 8=少阴, 9=老阳 到纳甲格式 [1-4]
-        params = []
-        for line in manual_lines:
-            if line == 6:  # 老阴
-                params.append(4)
-            elif line == 7:  # 少阳
-                params.append(3)
-            elif line == 8:  # 少阴
-                params.append(2)
-            elif line == 9:  # 老阳
-                params.append(1)
-            else:
-                params.append(2)  # 默认少阴
+        # 无效爻值按少阴(8)处理
+        cast = cast_from_values([line if line in (6, 7, 8, 9) else 8 for line in manual_lines])
+        params = cast_to_najia_params(cast)
     else:
         params = None
     
@@ -0,0 +1,414 @@
+"""
+Integer-coded GanZhi (干支) core and the table-driven calendar.
+
+Stems, branches and the sixty 甲子 are plain indices (甲 = 0, 子 = 0,
+甲子 = 0 ... 癸亥 = 59), the five elements and the six relations are
+``IntEnum`` values, and the relations between them are lookup matrices:
+5×5 生克 of the elements and 12×12 冲/合/刑/害 of the branches. Chinese
+strings are only produced (``JIAZI``, ``WUXING``, ``LIUQIN``) or parsed
+(``GAN_INDEX``, ``ZHI_INDEX``, ``JIAZI_INDEX``) at the edges.
+
+The calendar computes the four pillars and 旬空 of a moment.
+
+The four pillars follow the rules of ``lunar_python``'s ``Lunar.getBaZi()``
+(八字流派 2) and are computed with integer sexagenary arithmetic:
+
+- day: consecutive days count through the sixty 甲子 in order; the day
+  pillar changes at midnight (晚子时 belongs to the same day)
+- hour: the branch is the 时辰, the stem follows from the day stem, where
+  23:00-24:00 already counts as the next day (五鼠遁)
+- month: advances by one at every 节 (小寒, 立春, 惊蛰, ...), to the second
+- year: advances at the moment of 立春
+
+The 节 moments come from a precomputed table (``jieqi_1900_2100.bin``),
+generated from ``lunar_python`` by ``build_jieqi_table.py``:
+
+    header    magic b"JQTB", format version, first year, entry count, crc32
+    entries   uint32 little endian: the first 节 (大雪 of the year before the
+              first year) in seconds since 00:00 of 1 January of that first
+              year, then the seconds from each 节 to the next
+
+Times are naive local times in the same convention as ``lunar_python``
+(Beijing time). Moments outside the table raise ``ValueError``.
+"""
+
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_right
+from datetime import date as date_type, datetime, timedelta
+from enum import IntEnum, IntFlag
+from functools import lru_cache
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+
+JIEQI_TABLE_FILE = Path(__file__).with_name("jieqi_1900_2100.bin")
+JIEQI_MAGIC = b"JQTB"
+JIEQI_VERSION = 1
+JIEQI_FIRST_YEAR = 1900
+JIEQI_LAST_YEAR = 2100
+
+# 每年的十二节（月柱交接），依次为丑月至子月之始
+JIE_NAMES = ('小寒', '立春', '惊蛰', '清明', '立夏', '芒种',
+             '小暑', '立秋', '白露', '寒露', '立冬', '大雪')
+
+GANS = '甲乙丙丁戊己庚辛壬癸'
+ZHIS = '子丑寅卯辰巳午未申酉戌亥'
+# 六十甲子，序号 n 的天干为 n % 10，地支为 n % 12
+JIAZI = tuple(GANS[n % 10] + ZHIS[n % 12] for n in range(60))
+
+GAN_INDEX: Dict[str, int] = {gan: i for i, gan in enumerate(GANS)}
+ZHI_INDEX: Dict[str, int] = {zhi: i for i, zhi in enumerate(ZHIS)}
+JIAZI_INDEX: Dict[str, int] = {gz: n for n, gz in enumerate(JIAZI)}
+
+
+class WuXing(IntEnum):
+    """五行，按相生顺序：木生火、火生土、土生金、金生水、水生木"""
+    MU = 0
+    HUO = 1
+    TU = 2
+    JIN = 3
+    SHUI = 4
+
+
+WUXING = '木火土金水'
+GAN_WUXING = (WuXing.MU, WuXing.MU, WuXing.HUO, WuXing.HUO, WuXing.TU,
+              WuXing.TU, WuXing.JIN, WuXing.JIN, WuXing.SHUI, WuXing.SHUI)
+ZHI_WUXING = (WuXing.SHUI, WuXing.TU, WuXing.MU, WuXing.MU, WuXing.TU, WuXing.HUO,
+              WuXing.HUO, WuXing.TU, WuXing.JIN, WuXing.JIN, WuXing.TU, WuXing.SHUI)
+
+
+class ShengKe(IntEnum):
+    """五行 a 对 b 的生克关系，值为 (b - a) % 5"""
+    BIHE = 0      # 比和
+    SHENG = 1     # a 生 b
+    KE = 2        # a 克 b
+    BEI_KE = 3    # b 克 a
+    BEI_SHENG = 4  # b 生 a
+
+
+# SHENG_KE[a][b]：五行 a 对 b 的生克
+SHENG_KE = tuple(tuple(ShengKe((b - a) % 5) for b in range(5)) for a in range(5))
+
+
+class LiuQin(IntEnum):
+    """六亲（以卦宫五行为我），值为 (卦宫五行 - 爻五行) % 5"""
+    XIONGDI = 0   # 兄弟：同我
+    FUMU = 1      # 父母：生我
+    GUANGUI = 2   # 官鬼：克我
+    QICAI = 3     # 妻财：我克
+    ZISUN = 4     # 子孙：我生
+
+
+LIUQIN = ('兄弟', '父母', '官鬼', '妻财', '子孙')
+LIUQIN_INDEX: Dict[str, int] = {qin: i for i, qin in enumerate(LIUQIN)}
+# LIUQIN_OF[卦宫五行][爻五行]
+LIUQIN_OF = tuple(tuple(LiuQin((palace - element) % 5) for element in range(5)) for palace in range(5))
+
+
+class ZhiRelation(IntFlag):
+    """地支之间的关系"""
+    NONE = 0
+    CHONG = 1     # 六冲
+    HE = 2        # 六合
+    XING = 4      # 刑（a 刑 b）
+    HAI = 8       # 六害
+
+
+# 三刑与子卯相刑（a 刑 b），辰午酉亥自刑
+_XING_PAIRS = ((2, 5), (5, 8), (8, 2), (1, 10), (10, 7), (7, 1), (0, 3), (3, 0),
+               (4, 4), (6, 6), (9, 9), (11, 11))
+
+
+def _zhi_relation(a: int, b: int) -> ZhiRelation:
+    relation = ZhiRelation.NONE
+    if (a - b) % 12 == 6:
+        relation |= ZhiRelation.CHONG
+    if (a + b) % 12 == 1:
+        relation |= ZhiRelation.HE
+    if (a, b) in _XING_PAIRS:
+        relation |= ZhiRelation.XING
+    if (a + b) % 12 == 7:
+        relation |= ZhiRelation.HAI
+    return relation
+
+
+# ZHI_RELATIONS[a][b]：地支 a 对 b 的冲、合、刑、害
+ZHI_RELATIONS = tuple(tuple(_zhi_relation(a, b) for b in range(12)) for a in range(12))
+
+
+def jiazi(gan: int, zhi: int) -> int:
+    """
+    Get the sexagenary index of a stem and a branch.
+
+    Args:
+        gan: Stem index 0-9
+        zhi: Branch index 0-11 of the same parity
+
+    Returns:
+        Index 0-59 into ``JIAZI``
+    """
+    return (6 * gan - 5 * zhi) % 60
+
+# magic(4) + version(2) + first year(2) + entry count(4) + crc32(4)
+_HEADER = struct.Struct("<4sHHII")
+# 首个节（第一年前一年的大雪）所在月柱：丙子（己亥年子月）
+_FIRST_MONTH = 12
+# 公历序数 + 1721425 为当日正午的儒略日数，再减 11 即日柱序号（同 lunar_python）
+_DAY_OFFSET = 1721425 - 11
+_SECONDS_PER_DAY = 86400
+
+
+class JieQiTable(NamedTuple):
+    """
+    Loaded 节 boundaries.
+    """
+    first_year: int
+    # 第 k 个节的时刻，距第一年 1 月 1 日零点的秒数
+    bounds: Tuple[int, ...]
+    # 第一年 1 月 1 日的 proleptic Gregorian 序数
+    epoch: int
+
+    @property
+    def last_year(self) -> int:
+        """Last year fully covered."""
+        return self.first_year + (len(self.bounds) - 2) // 12 - 1
+
+    def seconds(self, date: datetime) -> int:
+        """
+        Seconds from the table epoch to a moment (microseconds dropped).
+
+        Args:
+            date: Naive local time
+
+        Returns:
+            Whole seconds since 00:00 of 1 January of the first year
+        """
+        return ((date.toordinal() - self.epoch) * _SECONDS_PER_DAY
+                + date.hour * 3600 + date.minute * 60 + date.second)
+
+
+def encode_jieqi_table(first_year: int, moments: List[datetime]) -> bytes:
+    """
+    Encode 节 moments in the binary table format.
+
+    Args:
+        first_year: First year covered; ``moments[0]`` is 大雪 of the year before
+        moments: Consecutive 节 moments in ascending order
+
+    Returns:
+        The file content
+    """
+    epoch = datetime(first_year, 1, 1)
+    seconds = [int((moment - epoch).total_seconds()) for moment in moments]
+    if seconds[0] >= 0:
+        raise ValueError("第一个节必须早于首年 1 月 1 日")
+    # 首项按无符号存储为负偏移的补码，其余为相邻两节的间隔
+    entries = array("I", [seconds[0] & 0xFFFFFFFF] + [b - a for a, b in zip(seconds, seconds[1:])])
+    if sys.byteorder == "big":
+        entries.byteswap()
+    payload = entries.tobytes()
+    return _HEADER.pack(JIEQI_MAGIC, JIEQI_VERSION, first_year, len(entries), zlib.crc32(payload)) + payload
+
+
+def decode_jieqi_table(data: bytes) -> JieQiTable:
+    """
+    Decode and validate a binary 节 table.
+
+    Args:
+        data: File content
+
+    Returns:
+        The loaded table
+
+    Raises:
+        ValueError: If the header, size or checksum does not match
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("节气表文件不完整")
+    magic, version, first_year, count, crc = _HEADER.unpack_from(data)
+    payload = data[_HEADER.size:]
+    if magic != JIEQI_MAGIC or version != JIEQI_VERSION:
+        raise ValueError(f"不支持的节气表格式: {magic!r} v{version}")
+    if len(payload) != count * 4 or zlib.crc32(payload) != crc:
+        raise ValueError("节气表校验失败")
+    entries = array("I")
+    entries.frombytes(payload)
+    if sys.byteorder == "big":
+        entries.byteswap()
+    first = entries[0] - (1 << 32)
+    bounds = tuple(accumulate(entries[1:], initial=first))
+    return JieQiTable(first_year, bounds, date_type(first_year, 1, 1).toordinal())
+
+
+@lru_cache(maxsize=1)
+def jieqi_table() -> JieQiTable:
+    """
+    Load the shipped 节 table once per process.
+
+    Returns:
+        The loaded table
+    """
+    return decode_jieqi_table(JIEQI_TABLE_FILE.read_bytes())
+
+
+def xunkong(day: int) -> str:
+    """
+    Get the 旬空 of a day pillar.
+
+    Args:
+        day: Sexagenary index of the day (0 = 甲子)
+
+    Returns:
+        The two empty branches, e.g. ``戌亥`` for the 甲子 旬
+    """
+    first, second = xunkong_zhis(day)
+    return ZHIS[first] + ZHIS[second]
+
+
+def xunkong_zhis(day: int) -> Tuple[int, int]:
+    """
+    Get the 旬空 branches of a day pillar as indices.
+
+    Args:
+        day: Sexagenary index of the day (0 = 甲子)
+
+    Returns:
+        The two empty branches, e.g. ``(10, 11)`` (戌亥) for the 甲子 旬
+    """
+    start = (day - day % 10) % 12
+    return (start + 10) % 12, (start + 11) % 12
+
+
+def four_pillars(date: datetime) -> Tuple[int, int, int, int]:
+    """
+    Compute the sexagenary indices of the four pillars of a moment.
+
+    Args:
+        date: Naive local time
+
+    Returns:
+        (year, month, day, hour) indices into ``JIAZI``
+
+    Raises:
+        ValueError: If the moment lies outside the 节 table
+    """
+    table = jieqi_table()
+    bounds = table.bounds
+    k = bisect_right(bounds, table.seconds(date)) - 1
+    if k < 0 or k >= len(bounds) - 1:
+        raise ValueError(f"超出节气表范围（{table.first_year}-{table.last_year}）: {date}")
+    # 第 k 个节之后：k = 0 为首年前的大雪，其后每年依次为小寒至大雪
+    year = table.first_year + (k - 1) // 12 - (1 if (k - 1) % 12 == 0 else 0)
+    day = (date.toordinal() + _DAY_OFFSET) % 60
+    # 晚子时的时干按次日日干起
+    hour_day = day + 1 if date.hour == 23 else day
+    branch = (date.hour + 1) // 2 % 12
+    stem = (hour_day % 5 * 2 + branch) % 10
+    return (year - 4) % 60, (_FIRST_MONTH + k) % 60, day, jiazi(stem, branch)
+
+
+def daily(date: datetime) -> Dict[str, Any]:
+    """
+    Compute the four pillars and 旬空 of a moment.
+
+    Args:
+        date: Naive local time
+
+    Returns:
+        ``{'xkong': ..., 'gz': {'year', 'month', 'day', 'hour'}}``, the same
+        structure as ``NajiaOracle._daily``
+
+    Raises:
+        ValueError: If the moment lies outside the 节 table
+    """
+    year, month, day, hour = four_pillars(date)
+    return {
+        'xkong': xunkong(day),
+        'gz': {
+            'year': JIAZI[year],
+            'month': JIAZI[month],
+            'day': JIAZI[day],
+            'hour': JIAZI[hour],
+        }
+    }
+
+
+def lunar_jieqi_moments(first_year: int = JIEQI_FIRST_YEAR,
+                        last_year: int = JIEQI_LAST_YEAR) -> List[datetime]:
+    """
+    Collect the 节 moments of a year range from ``lunar_python``.
+
+    Args:
+        first_year: First year covered
+        last_year: Last year covered
+
+    Returns:
+        大雪 of the year before, the twelve 节 of every year, then 小寒 of
+        the year after
+    """
+    from lunar_python import Solar
+
+    wanted = set(JIE_NAMES)
+    moments = set()
+    for year in range(first_year - 1, last_year + 2):
+        for name, solar in Solar.fromYmd(year, 6, 1).getLunar().getJieQiTable().items():
+            if name in wanted:
+                moments.add(datetime(solar.getYear(), solar.getMonth(), solar.getDay(),
+                                     solar.getHour(), solar.getMinute(), solar.getSecond()))
+    start = datetime(first_year, 1, 1)
+    end = datetime(last_year + 1, 1, 1)
+    inside = sorted(m for m in moments if start <= m < end)
+    before = max(m for m in moments if m < start)
+    after = min(m for m in moments if m >= end)
+    if len(inside) != 12 * (last_year - first_year + 1):
+        raise ValueError(f"节的数量不符: {len(inside)}")
+    return [before] + inside + [after]
+
+
+def verify_against_lunar(start: datetime, end: datetime,
+                         step: timedelta = timedelta(hours=1)) -> int:
+    """
+    Compare ``daily`` with ``lunar_python`` at every step of a range.
+
+    Besides the regular steps, the second before and the second of every
+    节 in the range are checked.
+
+    Args:
+        start: First moment checked
+        end: Moments before this are checked
+        step: Distance between checked moments
+
+    Returns:
+        Number of moments checked
+
+    Raises:
+        AssertionError: On the first moment where both disagree
+    """
+    from lunar_python import Solar
+
+    table = jieqi_table()
+    epoch = datetime(table.first_year, 1, 1)
+    moments = []
+    moment = start
+    while moment < end:
+        moments.append(moment)
+        moment += step
+    for bound in table.bounds:
+        jie = epoch + timedelta(seconds=bound)
+        if start <= jie < end:
+            moments += [jie - timedelta(seconds=1), jie]
+    for moment in moments:
+        lunar = Solar.fromYmdHms(moment.year, moment.month, moment.day,
+                                 moment.hour, moment.minute, moment.second).getLunar()
+        bazi = lunar.getBaZi()
+        expected = {
+            'xkong': lunar.getDayXunKong(),
+            'gz': {'year': bazi[0], 'month': bazi[1], 'day': bazi[2], 'hour': bazi[3]},
+        }
+        actual = daily(moment)
+        assert actual == expected, (moment, actual, expected)
+    return len(moments)
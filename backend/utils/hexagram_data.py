@@ -3,55 +3,326 @@ Hexagram data management and access utilities.
 """
 
 import json
+import os
 import random
-from typing import List, Optional, Dict, Any
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 from pathlib import Path
 
 from models.schemas import Hexagram
+from .catalogue_cache import CatalogueCache
+from .corpus_bundle import bundle_path_for, open_bundle, source_hash, split_payload, write_bundle
+from .hexagram_relations import RelationTables
+from .interpretation_templates import InterpretationFragments, InterpretationTemplates, compile_fragments
+from .lazy_hexagram import DEFAULT_SECTION_CACHE_SIZE, LazyHexagram, MemorySections, SectionCache
+from .reading_cache import ReadingCache
+from .reading_view import HexagramReading
+from .search_index import NAME_FIELDS, HexagramSearchIndex, SearchHit
+
+
+# 支持的语言及其数据文件
+DEFAULT_LANGUAGE = "zh"
+LANGUAGE_DATA_FILES: Dict[str, str] = {
+    "zh": "hexagrams_complete_fixed.json",
+    "en": "hexagrams_complete_english.json",
+}
+
+# 请求级语言选择，每个请求（协程/线程上下文）独立，不共享可变状态
+_request_language: ContextVar[str] = ContextVar("hexagram_language", default=DEFAULT_LANGUAGE)
+
+
+def normalize_language(language: Optional[str]) -> str:
+    """
+    Normalize a language code to one of the supported languages.
+    
+    Args:
+        language: Language code ('zh' or 'en'); anything else falls back to Chinese
+        
+    Returns:
+        Supported language code
+    """
+    return language if language in LANGUAGE_DATA_FILES else DEFAULT_LANGUAGE
+
+
+def get_request_language() -> str:
+    """
+    Get the language selected for the current request context.
+    
+    Returns:
+        Language code of the current context
+    """
+    return _request_language.get()
+
+
+@contextmanager
+def use_language(language: Optional[str]) -> Iterator[str]:
+    """
+    Select the language for the duration of a ``with`` block.
+    
+    The selection lives in a context variable, so concurrent requests on
+    other tasks or threads are not affected.
+    
+    Args:
+        language: Language code ('zh' or 'en')
+        
+    Yields:
+        The normalized language code
+    """
+    token = _request_language.set(normalize_language(language))
+    try:
+        yield _request_language.get()
+    finally:
+        _request_language.reset(token)
+
+
+# 三爻字符串（从下往上书写）到3位编码的映射，第1爻为最低位
+TRIGRAM_CODES: Dict[str, int] = {
+    f"{bits & 1}{(bits >> 1) & 1}{(bits >> 2) & 1}": bits for bits in range(8)
+}
+
+
+def trigrams_to_code(upper_trigram: str, lower_trigram: str) -> Optional[int]:
+    """
+    Convert an upper/lower trigram pair to the 6-bit line code.
+    
+    Bit ``i`` of the code is set when line ``i + 1`` (counted from the
+    bottom) is yang, so the lower trigram occupies bits 0-2 and the upper
+    trigram bits 3-5.
+    
+    Args:
+        upper_trigram: Upper trigram in binary format (e.g., "111")
+        lower_trigram: Lower trigram in binary format (e.g., "000")
+        
+    Returns:
+        Line code (0-63), or None if either trigram is malformed
+    """
+    upper = TRIGRAM_CODES.get(upper_trigram)
+    lower = TRIGRAM_CODES.get(lower_trigram)
+    if upper is None or lower is None:
+        return None
+    return (upper << 3) | lower
+
+
+def code_to_trigrams(code: int) -> Tuple[str, str]:
+    """
+    Convert a 6-bit line code back to its (upper, lower) trigram strings.
+    
+    Args:
+        code: Line code (0-63)
+        
+    Returns:
+        Tuple of (upper_trigram, lower_trigram)
+    """
+    bits = f"{code & 0b111111:06b}"[::-1]
+    return bits[3:], bits[:3]
+
+
+
+def _stat_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """
+    Cheap change marker of a file: (mtime in ns, size), or None if missing.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class HexagramCorpus:
+    """
+    Immutable, fully indexed hexagram data for a single language.
+    
+    Only the summary of every hexagram is resident; heavy fields hydrate
+    on first access through the corpus' bounded ``SectionCache``.
+    """
+    
+    def __init__(self, language: str, data_file: Path, summaries: List[Dict[str, Any]],
+                 sections: SectionCache, version: str = "default", source: str = "json",
+                 signature: Tuple = ()):
+        """
+        Build the lookup indexes for a loaded corpus.
+        
+        Args:
+            language: Language code of the corpus
+            data_file: JSON file the corpus was loaded from
+            summaries: Summary fields of the validated hexagrams in file order
+            sections: Cache over the heavy fields of the same hexagrams
+            version: Hex digest of the data file the corpus was built from
+            source: "bundle" or "json", whichever the corpus was loaded from
+            signature: Stat signature of the data files taken before loading
+        """
+        self.language = language
+        self.data_file = data_file
+        self.version = version
+        self.source = source
+        self.signature = signature
+        self.generation = 1
+        self.loaded_at = datetime.now()
+        self.sections = sections
+        self._catalogue: Optional[CatalogueCache] = None
+        self._search_index: Optional[HexagramSearchIndex] = None
+        self._interpretations: Optional[InterpretationTemplates] = None
+        self._reading_cache: Optional[ReadingCache] = None
+        self.hexagrams: List[LazyHexagram] = [
+            LazyHexagram(index, summary, sections) for index, summary in enumerate(summaries)
+        ]
+        self.by_number: Dict[int, LazyHexagram] = {}
+        # 64格查找表，按六爻编码索引；同一编码以先出现者为准
+        self.by_code: List[Optional[LazyHexagram]] = [None] * 64
+        self.code_by_number: Dict[int, int] = {}
+        
+        for hexagram in self.hexagrams:
+            self.by_number.setdefault(hexagram.number, hexagram)
+            code = trigrams_to_code(hexagram.upperTrigram, hexagram.lowerTrigram)
+            if code is None:
+                continue
+            if self.by_code[code] is None:
+                self.by_code[code] = hexagram
+            self.code_by_number.setdefault(hexagram.number, code)
+        
+        # 之卦、互卦、综卦、错卦查找表，加载时一次算好
+        self.relations = RelationTables(
+            self.code_by_number,
+            [h.number if h is not None else None for h in self.by_code]
+        )
+    
+    def payload(self, number: int) -> Dict[str, Any]:
+        """
+        Serialize a hexagram like ``Hexagram.model_dump()``.
+        
+        Args:
+            number: Hexagram number (1-64)
+            
+        Returns:
+            Dictionary sharing its nested values with the corpus
+        """
+        return self.by_number[number].model_dump()
+    
+    def warm_from(self, previous: "HexagramCorpus") -> None:
+        """
+        Build the derived caches that were in use on the corpus this one replaces.
+        
+        Args:
+            previous: Corpus being replaced
+        """
+        self.generation = previous.generation + 1
+        if previous._catalogue is not None:
+            self.catalogue
+        if previous._search_index is not None:
+            self.search_index
+        if previous._interpretations is not None:
+            self.interpretations
+    
+    @property
+    def catalogue(self) -> CatalogueCache:
+        """
+        Pre-serialized catalogue bodies of this corpus, built on first use.
+        """
+        if self._catalogue is None:
+            self._catalogue = CatalogueCache(self)
+        return self._catalogue
+    
+    @property
+    def search_index(self) -> HexagramSearchIndex:
+        """
+        Full-text search index of this corpus, built on first use.
+        """
+        if self._search_index is None:
+            self._search_index = HexagramSearchIndex(
+                [h.number for h in self.hexagrams],
+                [h.model_dump() for h in self.hexagrams],
+                lambda doc, field: self.hexagrams[doc].field_value(field),
+            )
+        return self._search_index
+    
+    @property
+    def interpretations(self) -> InterpretationTemplates:
+        """
+        Precompiled interpretation fragments of this corpus, built on first use.
+        """
+        if self._interpretations is None:
+            self._interpretations = InterpretationTemplates(self)
+        return self._interpretations
+    
+    @property
+    def reading_cache(self) -> ReadingCache:
+        """
+        Encoded divination responses of this corpus, created on first use.
+        """
+        if self._reading_cache is None:
+            self._reading_cache = ReadingCache()
+        return self._reading_cache
 
 
 class HexagramDataManager:
     """
     Manages hexagram data loading, caching, and querying.
-      This class handles all hexagram data operations including:
+    
+    This class handles all hexagram data operations including:
     - Loading data from JSON files
     - Caching for performance
     - Searching and filtering hexagrams
     - Providing fallback data
     - Supporting multiple languages
+    
+    Each language is loaded once into its own resident ``HexagramCorpus``.
+    Queries take an explicit ``language`` argument or fall back to the
+    request-scoped language (see ``use_language``); the manager itself
+    holds no per-request state.
     """
     
-    def __init__(self, data_file: str = None):
+    def __init__(self, data_file: str = None, use_bundle: bool = True,
+                 section_cache_size: Optional[int] = DEFAULT_SECTION_CACHE_SIZE):
         """
         Initialize the data manager.
         
         Args:
             data_file: Path to the hexagram data JSON file (optional, will be determined by language)
+            use_bundle: Whether to load compiled corpus bundles when they are current
+            section_cache_size: Hydrated sections kept per corpus (None for unbounded)
         """
         self.base_dir = Path(__file__).parent.parent  # utils目录的上级目录，即backend目录
-        self.data_file = None  # Will be set based on language
-        self._hexagrams_cache: Optional[List[Hexagram]] = None
-        self._hexagrams_dict: Optional[Dict[int, Hexagram]] = None
-        self._current_language: str = "zh"
-        
-        # Set initial data file based on default language
-        self._update_data_file()
+        self._data_file_override = Path(data_file) if data_file else None
+        self.use_bundle = use_bundle
+        self.section_cache_size = section_cache_size
+        self._corpora: Dict[str, HexagramCorpus] = {}
+        self._load_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+    
+    def get_data_file(self, language: Optional[str] = None) -> Path:
+        """
+        Get the data file path for a language.
         
-    def _update_data_file(self) -> None:
+        Args:
+            language: Language code, defaults to the request language
+            
+        Returns:
+            Path to the JSON data file
         """
-        Update the data file path based on current language.
+        if self._data_file_override is not None:
+            return self._data_file_override
+        return self.base_dir / LANGUAGE_DATA_FILES[self._resolve_language(language)]
+    
+    @staticmethod
+    def _resolve_language(language: Optional[str]) -> str:
         """
-        if self._current_language == "en":
-            filename = "hexagrams_complete_english.json"
-        else:
-            filename = "hexagrams_complete_fixed.json"
-        
-        self.data_file = self.base_dir / filename
+        Resolve an explicit language argument or the request language.
+        """
+        if language is None:
+            return get_request_language()
+        return normalize_language(language)
 
-    def _load_hexagrams_from_file(self) -> List[Dict[str, Any]]:
+    def _load_hexagrams_from_file(self, data_file: Path) -> List[Dict[str, Any]]:
         """
         Load hexagram data from JSON file.
         
+        Args:
+            data_file: Path to the JSON data file
+        
         Returns:
             List of hexagram dictionaries
             
@@ -60,7 +331,7 @@ class HexagramDataManager:
             json.JSONDecodeError: If the file contains invalid JSON
         """
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
+            with open(data_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 
             # Ensure data is a list
@@ -76,7 +347,7 @@ class HexagramDataManager:
             # Return default hexagram data if file not found
             return self._get_default_hexagram_data()
         except json.JSONDecodeError as e:
-            raise json.JSONDecodeError(f"Invalid JSON in {self.data_file}: {e.msg}", e.doc, e.pos)
+            raise json.JSONDecodeError(f"Invalid JSON in {data_file}: {e.msg}", e.doc, e.pos)
     
     def _get_default_hexagram_data(self) -> List[Dict[str, Any]]:
         """
@@ -125,52 +396,53 @@ class HexagramDataManager:
             
         Returns:
             Dictionary with 'upper' and 'lower' trigram strings
-        """        # 传统易经64卦的正确上下卦组合
-        # 使用传统的八卦编码：000=坤(地), 001=震(雷), 010=坎(水), 011=巽(风)
-        # 100=艮(山), 101=离(火), 110=兑(泽), 111=乾(天)
+        """
+        # 传统易经64卦的正确上下卦组合
+        # 三爻均从下往上书写：000=坤(地), 100=震(雷), 010=坎(水), 011=巽(风)
+        # 001=艮(山), 101=离(火), 110=兑(泽), 111=乾(天)
         trigram_mappings = {
             1: {"upper": "111", "lower": "111"},   # 乾为天
             2: {"upper": "000", "lower": "000"},   # 坤为地
-            3: {"upper": "010", "lower": "001"},   # 水雷屯
-            4: {"upper": "100", "lower": "010"},   # 山水蒙
+            3: {"upper": "010", "lower": "100"},   # 水雷屯
+            4: {"upper": "001", "lower": "010"},   # 山水蒙
             5: {"upper": "010", "lower": "111"},   # 水天需
             6: {"upper": "111", "lower": "010"},   # 天水讼
             7: {"upper": "000", "lower": "010"},   # 地水师
             8: {"upper": "010", "lower": "000"},   # 水地比
             9: {"upper": "011", "lower": "111"},   # 风天小畜
-            10: {"upper": "110", "lower": "111"},  # 泽天履
+            10: {"upper": "111", "lower": "110"},  # 天泽履
             11: {"upper": "000", "lower": "111"},  # 地天泰
             12: {"upper": "111", "lower": "000"},  # 天地否
             13: {"upper": "111", "lower": "101"},  # 天火同人
             14: {"upper": "101", "lower": "111"},  # 火天大有
-            15: {"upper": "000", "lower": "100"},  # 地山谦
-            16: {"upper": "001", "lower": "000"},  # 雷地豫
-            17: {"upper": "110", "lower": "001"},  # 泽雷随
-            18: {"upper": "100", "lower": "011"},  # 山风蛊
+            15: {"upper": "000", "lower": "001"},  # 地山谦
+            16: {"upper": "100", "lower": "000"},  # 雷地豫
+            17: {"upper": "110", "lower": "100"},  # 泽雷随
+            18: {"upper": "001", "lower": "011"},  # 山风蛊
             19: {"upper": "000", "lower": "110"},  # 地泽临
             20: {"upper": "011", "lower": "000"},  # 风地观
-            21: {"upper": "101", "lower": "001"},  # 火雷噬嗑
-            22: {"upper": "100", "lower": "101"},  # 山火贲
-            23: {"upper": "100", "lower": "000"},  # 山地剥
-            24: {"upper": "000", "lower": "001"},  # 地雷复
-            25: {"upper": "111", "lower": "001"},  # 天雷无妄
-            26: {"upper": "100", "lower": "111"},  # 山天大畜
-            27: {"upper": "100", "lower": "001"},  # 山雷颐
+            21: {"upper": "101", "lower": "100"},  # 火雷噬嗑
+            22: {"upper": "001", "lower": "101"},  # 山火贲
+            23: {"upper": "001", "lower": "000"},  # 山地剥
+            24: {"upper": "000", "lower": "100"},  # 地雷复
+            25: {"upper": "111", "lower": "100"},  # 天雷无妄
+            26: {"upper": "001", "lower": "111"},  # 山天大畜
+            27: {"upper": "001", "lower": "100"},  # 山雷颐
             28: {"upper": "110", "lower": "011"},  # 泽风大过
             29: {"upper": "010", "lower": "010"},  # 坎为水
             30: {"upper": "101", "lower": "101"},  # 离为火
-            31: {"upper": "110", "lower": "100"},  # 泽山咸
-            32: {"upper": "001", "lower": "011"},  # 雷风恒
-            33: {"upper": "111", "lower": "100"},  # 天山遁
-            34: {"upper": "001", "lower": "111"},  # 雷天大壮
+            31: {"upper": "110", "lower": "001"},  # 泽山咸
+            32: {"upper": "100", "lower": "011"},  # 雷风恒
+            33: {"upper": "111", "lower": "001"},  # 天山遁
+            34: {"upper": "100", "lower": "111"},  # 雷天大壮
             35: {"upper": "101", "lower": "000"},  # 火地晋
             36: {"upper": "000", "lower": "101"},  # 地火明夷
             37: {"upper": "011", "lower": "101"},  # 风火家人
             38: {"upper": "101", "lower": "110"},  # 火泽睽
-            39: {"upper": "010", "lower": "100"},  # 水山蹇
-            40: {"upper": "001", "lower": "010"},  # 雷水解
-            41: {"upper": "100", "lower": "110"},  # 山泽损
-            42: {"upper": "011", "lower": "001"},  # 风雷益
+            39: {"upper": "010", "lower": "001"},  # 水山蹇
+            40: {"upper": "100", "lower": "010"},  # 雷水解
+            41: {"upper": "001", "lower": "110"},  # 山泽损
+            42: {"upper": "011", "lower": "100"},  # 风雷益
             43: {"upper": "110", "lower": "111"},  # 泽天夬
             44: {"upper": "111", "lower": "011"},  # 天风姤
             45: {"upper": "110", "lower": "000"},  # 泽地萃
@@ -179,174 +451,358 @@ class HexagramDataManager:
             48: {"upper": "010", "lower": "011"},  # 水风井
             49: {"upper": "110", "lower": "101"},  # 泽火革
             50: {"upper": "101", "lower": "011"},  # 火风鼎
-            51: {"upper": "001", "lower": "001"},  # 震为雷
-            52: {"upper": "100", "lower": "100"},  # 艮为山
-            53: {"upper": "011", "lower": "100"},  # 风山渐
-            54: {"upper": "001", "lower": "110"},  # 雷泽归妹
-            55: {"upper": "001", "lower": "101"},  # 雷火丰
-            56: {"upper": "101", "lower": "100"},  # 火山旅
+            51: {"upper": "100", "lower": "100"},  # 震为雷
+            52: {"upper": "001", "lower": "001"},  # 艮为山
+            53: {"upper": "011", "lower": "001"},  # 风山渐
+            54: {"upper": "100", "lower": "110"},  # 雷泽归妹
+            55: {"upper": "100", "lower": "101"},  # 雷火丰
+            56: {"upper": "101", "lower": "001"},  # 火山旅
             57: {"upper": "011", "lower": "011"},  # 巽为风
             58: {"upper": "110", "lower": "110"},  # 兑为泽
             59: {"upper": "011", "lower": "010"},  # 风水涣
             60: {"upper": "010", "lower": "110"},  # 水泽节
             61: {"upper": "011", "lower": "110"},  # 风泽中孚
-            62: {"upper": "100", "lower": "001"},  # 山雷小过
+            62: {"upper": "100", "lower": "001"},  # 雷山小过
             63: {"upper": "010", "lower": "101"},  # 水火既济
             64: {"upper": "101", "lower": "010"}   # 火水未济
         }
         
         return trigram_mappings.get(hexagram_number, {"upper": "000", "lower": "000"})
     
-    def _ensure_data_loaded(self) -> None:
+    
+    def _load_corpus(self, language: str, use_bundle: Optional[bool] = None) -> HexagramCorpus:
+        """
+        Load the corpus of one language.
+        
+        A current compiled bundle (see ``utils.corpus_bundle``) is loaded with
+        trusted construction; otherwise the JSON data file is parsed and
+        validated.
+        
+        Args:
+            language: Normalized language code
+            use_bundle: Whether a compiled bundle may be used (defaults to ``self.use_bundle``)
+            
+        Returns:
+            Newly built HexagramCorpus
         """
-        Ensure hexagram data is loaded and cached.
+        data_file = self.get_data_file(language)
+        # 先记录文件状态再读取，读取期间发生的修改会在下一次轮询时被发现
+        signature = self.data_signature(language)
+        digest = source_hash(data_file)
+        version = digest.hex() if digest is not None else "default"
+        
+        if use_bundle is None:
+            use_bundle = self.use_bundle
+        if use_bundle:
+            bundle = open_bundle(bundle_path_for(data_file), data_file, digest)
+            if bundle is not None:
+                sections = SectionCache(bundle, self.section_cache_size)
+                return HexagramCorpus(language, data_file, bundle.summaries, sections,
+                                      version, "bundle", signature)
+        
+        raw_data = self._load_hexagrams_from_file(data_file)
+        
+        # Convert to Hexagram objects
+        hexagrams: List[Hexagram] = []
+        
+        for item in raw_data:
+            try:
+                # 添加兼容处理，处理可能缺失的字段
+                if "upperTrigram" not in item or not item["upperTrigram"]:
+                    hexagram_number = item.get("number", 0)
+                    # 生成默认的八卦编码
+                    if hexagram_number == 1:
+                        item["upperTrigram"] = "111"
+                        item["lowerTrigram"] = "111"
+                    elif hexagram_number == 2:
+                        item["upperTrigram"] = "000"
+                        item["lowerTrigram"] = "000"
+                    else:
+                        # 根据传统易经64卦的正确三元组编码
+                        trigram_map = self._get_correct_trigrams(hexagram_number)
+                        item["upperTrigram"] = trigram_map["upper"]
+                        item["lowerTrigram"] = trigram_map["lower"]
+                
+                # 添加描述字段（如果不存在）
+                if "description" not in item and "interpretations" in item and "traditional" in item["interpretations"]:
+                    if item["interpretations"]["traditional"] and "description" in item["interpretations"]["traditional"]:
+                        item["description"] = item["interpretations"]["traditional"]["description"]
+                elif "description" not in item and "kingWen" in item and "explanation" in item["kingWen"]:
+                    item["description"] = item["kingWen"]["explanation"]
+                
+                hexagrams.append(Hexagram(**item))
+            except Exception as e:
+                print(f"Warning: Skipping invalid hexagram data: {e}")
+                print(f"Problem item: {item}")
+                continue
+        
+        # 没有可用的编译包时，重段已在内存中，只限制模型对象的缓存
+        summaries, section_data = [], []
+        for hexagram in hexagrams:
+            summary, sections = split_payload(hexagram.model_dump())
+            summaries.append(summary)
+            section_data.append(sections)
+        sections = SectionCache(MemorySections(section_data), self.section_cache_size)
+        return HexagramCorpus(language, data_file, summaries, sections, version, "json", signature)
+    
+    def compile_bundle(self, language: Optional[str] = None) -> HexagramCorpus:
         """
-        if self._hexagrams_cache is None:
-            raw_data = self._load_hexagrams_from_file()
+        Validate a language's JSON data and compile it into a bundle.
+        
+        Args:
+            language: Language code, defaults to the request language
             
-            # Convert to Hexagram objects
-            self._hexagrams_cache = []
-            self._hexagrams_dict = {}
+        Returns:
+            The HexagramCorpus validated from JSON
+        """
+        language = self._resolve_language(language)
+        corpus = self._load_corpus(language, use_bundle=False)
+        write_bundle(bundle_path_for(corpus.data_file), corpus.data_file,
+                     [hexagram.model_dump() for hexagram in corpus.hexagrams])
+        return corpus
+    
+    def get_corpus(self, language: Optional[str] = None) -> HexagramCorpus:
+        """
+        Get the resident corpus of a language, loading it on first use.
+        
+        Args:
+            language: Language code, defaults to the request language
             
-            for item in raw_data:
-                try:
-                    # 添加兼容处理，处理可能缺失的字段
-                    if "upperTrigram" not in item or not item["upperTrigram"]:
-                        hexagram_number = item.get("number", 0)
-                        # 生成默认的八卦编码
-                        if hexagram_number == 1:
-                            item["upperTrigram"] = "111"
-                            item["lowerTrigram"] = "111"
-                        elif hexagram_number == 2:
-                            item["upperTrigram"] = "000"
-                            item["lowerTrigram"] = "000"
-                        else:
-                            # 根据传统易经64卦的正确三元组编码
-                            trigram_map = self._get_correct_trigrams(hexagram_number)
-                            item["upperTrigram"] = trigram_map["upper"]
-                            item["lowerTrigram"] = trigram_map["lower"]
-                    
-                    # 添加描述字段（如果不存在）
-                    if "description" not in item and "interpretations" in item and "traditional" in item["interpretations"]:
-                        if item["interpretations"]["traditional"] and "description" in item["interpretations"]["traditional"]:
-                            item["description"] = item["interpretations"]["traditional"]["description"]
-                    elif "description" not in item and "kingWen" in item and "explanation" in item["kingWen"]:
-                        item["description"] = item["kingWen"]["explanation"]
-                    
-                    hexagram = Hexagram(**item)
-                    self._hexagrams_cache.append(hexagram)
-                    self._hexagrams_dict[hexagram.number] = hexagram
-                except Exception as e:
-                    print(f"Warning: Skipping invalid hexagram data: {e}")
-                    print(f"Problem item: {item}")
-                    continue
+        Returns:
+            HexagramCorpus for the language
+        """
+        # 先归一化：不支持的语言直接落到默认语言的快速路径，不必每次争用加载锁
+        language = self._resolve_language(language)
+        corpus = self._corpora.get(language)
+        if corpus is None:
+            with self._load_lock:
+                corpus = self._corpora.get(language)
+                if corpus is None:
+                    corpus = self._load_corpus(language)
+                    # 整体替换字典，读者始终看到完整的语料
+                    self._corpora = {**self._corpora, language: corpus}
+        return corpus
+    
+    def loaded_languages(self) -> List[str]:
+        """
+        Get the languages whose corpus is currently resident.
+        
+        Returns:
+            List of language codes
+        """
+        return list(self._corpora)
+    
+    def load_all(self) -> None:
+        """
+        Load the corpora of all supported languages.
+        """
+        for language in LANGUAGE_DATA_FILES:
+            self.get_corpus(language)
     
-    def get_all_hexagrams(self) -> List[Hexagram]:
+    def get_all_hexagrams(self, language: Optional[str] = None) -> List[LazyHexagram]:
         """
         Get all hexagrams.
         
+        Args:
+            language: Language code, defaults to the request language
+        
         Returns:
-            List of all Hexagram objects
+            List of all LazyHexagram records
         """
-        self._ensure_data_loaded()
-        return self._hexagrams_cache.copy()
+        return self.get_corpus(language).hexagrams.copy()
     
-    def get_hexagram_by_number(self, number: int) -> Optional[Hexagram]:
+    def get_hexagram_by_number(self, number: int, language: Optional[str] = None) -> Optional[LazyHexagram]:
         """
         Get a hexagram by its number.
         
         Args:
             number: Hexagram number (1-64)
+            language: Language code, defaults to the request language
             
         Returns:
-            Hexagram object if found, None otherwise
+            LazyHexagram record if found, None otherwise
         """
-        self._ensure_data_loaded()
-        return self._hexagrams_dict.get(number)
+        return self.get_corpus(language).by_number.get(number)
     
-    def get_hexagram_by_trigrams(self, upper_trigram: str, lower_trigram: str) -> Optional[Hexagram]:
+    def get_hexagram_by_trigrams(self, upper_trigram: str, lower_trigram: str,
+                                 language: Optional[str] = None) -> Optional[LazyHexagram]:
         """
         Get hexagram by upper and lower trigram combinations.
         
         Args:
             upper_trigram: Upper trigram in binary format (e.g., "111")
             lower_trigram: Lower trigram in binary format (e.g., "000")
+            language: Language code, defaults to the request language
             
         Returns:
-            Matching Hexagram object or None
+            Matching LazyHexagram record or None
+        """
+        code = trigrams_to_code(upper_trigram, lower_trigram)
+        if code is None:
+            return None
+        return self.get_hexagram_by_code(code, language)
+    
+    def get_hexagram_by_code(self, code: int, language: Optional[str] = None) -> Optional[LazyHexagram]:
         """
-        self._ensure_data_loaded()
+        Get hexagram by its 6-bit line code.
         
-        for hexagram in self._hexagrams_cache:
-            if (hexagram.upperTrigram == upper_trigram and 
-                hexagram.lowerTrigram == lower_trigram):
-                return hexagram
+        Args:
+            code: Line code (0-63), bit ``i`` set when line ``i + 1`` is yang
+            language: Language code, defaults to the request language
+            
+        Returns:
+            Matching LazyHexagram record or None
+        """
+        if not 0 <= code < 64:
+            return None
+        return self.get_corpus(language).by_code[code]
+    
+    def get_catalogue(self, language: Optional[str] = None) -> CatalogueCache:
+        """
+        Get the pre-serialized catalogue bodies of a language.
         
-        return None
+        Args:
+            language: Language code, defaults to the request language
+            
+        Returns:
+            CatalogueCache of the resident corpus
+        """
+        return self.get_corpus(language).catalogue
     
-    def search_hexagrams_by_name(self, name: str) -> List[Hexagram]:
+    def get_interpretation_fragments(self, hexagram: Any) -> InterpretationFragments:
+        """
+        Get the interpretation fragments of a hexagram.
+        
+        Args:
+            hexagram: Reading or record of a loaded corpus, or any Hexagram-like object
+            
+        Returns:
+            The corpus' precompiled fragments; compiled on the fly for objects
+            outside the loaded corpora (e.g. a record replaced by a reload)
+        """
+        record = hexagram.hexagram if isinstance(hexagram, HexagramReading) else hexagram
+        if isinstance(record, LazyHexagram):
+            for corpus in self._corpora.values():
+                if corpus.by_number.get(record.number) is record:
+                    return corpus.interpretations.fragments(record) or compile_fragments(record)
+        return compile_fragments(hexagram)
+    
+    def get_reading(self, code: int, changing_mask: int = 0,
+                    language: Optional[str] = None) -> HexagramReading:
+        """
+        Get a read-only view of the hexagram for one reading.
+        
+        The view points at the cached hexagram and only overlays the line
+        types and changing flags, so the shared cache is never modified.
+        
+        Args:
+            code: Line code (0-63), bit ``i`` set when line ``i + 1`` is yang
+            changing_mask: 6-bit mask, bit ``i`` set when line ``i + 1`` changes
+            language: Language code, defaults to the request language
+            
+        Returns:
+            HexagramReading for the code
+            
+        Raises:
+            ValueError: If no hexagrams are available
+        """
+        corpus = self.get_corpus(language)
+        hexagram = corpus.by_code[code] if 0 <= code < 64 else None
+        if hexagram is None:
+            # Fallback to first hexagram if not found
+            if not corpus.hexagrams:
+                raise ValueError("无法找到对应的卦象")
+            hexagram = corpus.hexagrams[0]
+        return HexagramReading(hexagram, code, changing_mask)
+    
+    def get_code_by_number(self, number: int, language: Optional[str] = None) -> Optional[int]:
+        """
+        Get the 6-bit line code of a hexagram by its King Wen number.
+        
+        Args:
+            number: Hexagram number (1-64)
+            language: Language code, defaults to the request language
+            
+        Returns:
+            Line code (0-63) or None if the number is unknown
+        """
+        return self.get_corpus(language).code_by_number.get(number)
+    
+    def search_hexagrams_by_name(self, name: str, language: Optional[str] = None) -> List[LazyHexagram]:
         """
         Search hexagrams by Chinese or English name (partial match).
         
+        Matching ignores case and Traditional/Simplified differences.
+        
         Args:
             name: Name to search for
+            language: Language code, defaults to the request language
             
         Returns:
-            List of matching Hexagram objects        """
-        self._ensure_data_loaded()
-        name_lower = name.lower()
-        results = []
-        
-        for hexagram in self._hexagrams_cache:
-            if (name_lower in hexagram.name.lower() or 
-                name in hexagram.chineseName):
-                results.append(hexagram)
+            List of matching LazyHexagram records
+        """
+        corpus = self.get_corpus(language)
+        docs = corpus.search_index.match_docs(name, NAME_FIELDS)
+        return [corpus.hexagrams[doc] for doc in docs]
+    
+    def search(self, query: str, limit: int = 10, offset: int = 0,
+               language: Optional[str] = None) -> Tuple[int, List[SearchHit]]:
+        """
+        Full-text search over names, texts, lines and interpretations.
         
-        return results
+        Args:
+            query: Search text, whitespace separated terms must all match
+            limit: Maximum number of hits to return
+            offset: Number of ranked hits to skip
+            language: Language code, defaults to the request language
+            
+        Returns:
+            (total number of matches, ranked hits of the requested page)
+        """
+        return self.get_corpus(language).search_index.search(query, limit, offset)
     
-    def get_random_hexagram(self) -> Hexagram:
+    def get_random_hexagram(self, language: Optional[str] = None) -> LazyHexagram:
         """
         Get a random hexagram.
         
+        Args:
+            language: Language code, defaults to the request language
+        
         Returns:
-            Random Hexagram object
+            Random LazyHexagram record
             
         Raises:
             ValueError: If no hexagrams are available
         """
-        self._ensure_data_loaded()
+        hexagrams = self.get_corpus(language).hexagrams
         
-        if not self._hexagrams_cache:
+        if not hexagrams:
             raise ValueError("No hexagrams available")
         
-        return random.choice(self._hexagrams_cache)
+        return random.choice(hexagrams)
     
     def set_language(self, language: str) -> None:
         """
-        Set the current language for data retrieval.
+        Set the language for the current request context.
+        
+        Kept for backward compatibility; prefer passing ``language``
+        explicitly or using ``use_language``. The selection is stored in a
+        context variable and never changes what other requests see.
         
         Args:
             language: Language code ('zh' for Chinese, 'en' for English)
         """
-        old_language = self._current_language
-        if language in ['zh', 'en']:
-            self._current_language = language
-        else:
-            self._current_language = 'zh'  # Default to Chinese
-        
-        # If language changed, update data file and clear cache
-        if old_language != self._current_language:
-            self._update_data_file()
-            self._hexagrams_cache = None
-            self._hexagrams_dict = None
+        _request_language.set(normalize_language(language))
     
-    def get_localized_text(self, text_obj: Dict[str, Any], field: str = "text") -> str:
+    def get_localized_text(self, text_obj: Dict[str, Any], field: str = "text",
+                           language: Optional[str] = None) -> str:
         """
         Get localized text from a text object.
         
         Args:
             text_obj: Object containing text in multiple languages
             field: Field name to retrieve ('text', 'explanation', etc.)
+            language: Language code, defaults to the request language
             
         Returns:
             Localized text string
@@ -355,7 +811,7 @@ class HexagramDataManager:
             return ""
             
         # If current language is English and English version exists
-        if self._current_language == "en" and "english" in text_obj:
+        if self._resolve_language(language) == "en" and "english" in text_obj:
             english_obj = text_obj["english"]
             if isinstance(english_obj, dict) and field in english_obj:
                 return english_obj[field]
@@ -368,17 +824,19 @@ class HexagramDataManager:
         
         return ""
     
-    def get_localized_hexagram_name(self, hexagram_data: Dict[str, Any]) -> str:
+    def get_localized_hexagram_name(self, hexagram_data: Dict[str, Any],
+                                    language: Optional[str] = None) -> str:
         """
         Get localized hexagram name.
         
         Args:
             hexagram_data: Hexagram data dictionary
+            language: Language code, defaults to the request language
             
         Returns:
             Localized hexagram name
         """
-        if self._current_language == "en" and "english" in hexagram_data:
+        if self._resolve_language(language) == "en" and "english" in hexagram_data:
             english_obj = hexagram_data["english"]
             if "name" in english_obj:
                 return english_obj["name"]
@@ -386,17 +844,19 @@ class HexagramDataManager:
         # Fall back to Chinese name
         return hexagram_data.get("name", "")
     
-    def get_localized_hexagram_meaning(self, hexagram_data: Dict[str, Any]) -> str:
+    def get_localized_hexagram_meaning(self, hexagram_data: Dict[str, Any],
+                                       language: Optional[str] = None) -> str:
         """
         Get localized hexagram meaning.
         
         Args:
             hexagram_data: Hexagram data dictionary
+            language: Language code, defaults to the request language
             
         Returns:
             Localized hexagram meaning
         """
-        if self._current_language == "en" and "english" in hexagram_data:
+        if self._resolve_language(language) == "en" and "english" in hexagram_data:
             english_obj = hexagram_data["english"]
             if "chineseName" in english_obj:
                 return english_obj["chineseName"]
@@ -404,29 +864,89 @@ class HexagramDataManager:
         # Fall back to Chinese meaning
         return hexagram_data.get("chineseName", "")
     
+    def data_signature(self, language: Optional[str] = None) -> Tuple[Optional[Tuple[int, int]], ...]:
+        """
+        Get the stat signature of a language's JSON file and compiled bundle.
+        
+        Args:
+            language: Language code, defaults to the request language
+            
+        Returns:
+            (JSON signature, bundle signature), each None if the file is missing
+        """
+        data_file = self.get_data_file(language)
+        return _stat_signature(data_file), _stat_signature(bundle_path_for(data_file))
+    
+    def reload(self, force: bool = False) -> List[str]:
+        """
+        Reload the loaded languages whose data files changed.
+        
+        New corpora (and the derived caches that were in use) are built
+        while requests keep reading the current ones, then all of them are
+        published with a single reference swap.
+        
+        Args:
+            force: Reload every loaded language even if its files look unchanged
+            
+        Returns:
+            Languages whose corpus was replaced
+        """
+        with self._reload_lock:
+            replaced: Dict[str, HexagramCorpus] = {}
+            for language, corpus in self._corpora.items():
+                signature = self.data_signature(language)
+                if not force and signature == corpus.signature:
+                    continue
+                if signature[0] is None:
+                    # 数据文件暂时不存在（编辑器正在替换文件），等待下一次轮询
+                    continue
+                
+                new_corpus = self._load_corpus(language)
+                if not force and (new_corpus.version, new_corpus.source) == (corpus.version, corpus.source):
+                    # 文件被触碰但内容未变，保留现有语料及其缓存
+                    corpus.signature = new_corpus.signature
+                    continue
+                new_corpus.warm_from(corpus)
+                replaced[language] = new_corpus
+            
+            if replaced:
+                with self._load_lock:
+                    self._corpora = {**self._corpora, **replaced}
+            return list(replaced)
+    
     def refresh_data(self) -> None:
         """
         Refresh the cached data by reloading from file.
+        
+        Every loaded language is rebuilt before the corpora are replaced,
+        so readers never observe a partially loaded state.
         """
-        self._hexagrams_cache = None
-        self._hexagrams_dict = None
-        self._ensure_data_loaded()
+        if not self._corpora:
+            self.get_corpus()
+            return
+        self.reload(force=True)
 
 
-# Create default manager instance
+# 进程内唯一的语料注册表：所有路由与工具模块共享这一个实例，
+# 预派生（pre-fork）模式下由主进程加载后随 fork 共享给各工作进程
 hexagram_manager = HexagramDataManager()
 
 
-def get_hexagram_by_number(number: int) -> Optional[Hexagram]:
+def get_hexagram_by_number(number: int) -> Optional[LazyHexagram]:
     """Convenience function to get hexagram by number."""
     return hexagram_manager.get_hexagram_by_number(number)
 
 
-def get_hexagram_by_trigrams(upper_trigram: str, lower_trigram: str) -> Optional[Hexagram]:
+def get_hexagram_by_trigrams(upper_trigram: str, lower_trigram: str) -> Optional[LazyHexagram]:
     """Convenience function to get hexagram by trigrams."""
     return hexagram_manager.get_hexagram_by_trigrams(upper_trigram, lower_trigram)
 
 
-def get_all_hexagrams() -> List[Hexagram]:
+def get_hexagram_by_code(code: int) -> Optional[LazyHexagram]:
+    """Convenience function to get hexagram by 6-bit line code."""
+    return hexagram_manager.get_hexagram_by_code(code)
+
+
+def get_all_hexagrams() -> List[LazyHexagram]:
     """Convenience function to get all hexagrams."""
     return hexagram_manager.get_all_hexagrams()
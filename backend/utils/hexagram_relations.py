@@ -0,0 +1,158 @@
+"""
+Precomputed relation tables between the 64 hexagrams.
+
+All relations are functions of the 6-bit line code (bit ``i`` set when line
+``i + 1`` is yang):
+
+- 之卦 (changed): ``code ^ mask`` for a 6-bit changing-line mask
+- 互卦 (nuclear): lines 2-4 as the lower and lines 3-5 as the upper trigram
+- 综卦 (inverse): the hexagram turned upside down (line order reversed)
+- 错卦 (opposite): every line flipped
+
+``RelationTables`` resolves them once per corpus into King Wen numbers, so a
+lookup is a single index into a byte table.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+
+def nuclear_code(code: int) -> int:
+    """
+    Get the line code of the nuclear hexagram (互卦).
+
+    Args:
+        code: 6-bit line code
+
+    Returns:
+        Code whose lower trigram is lines 2-4 and upper trigram lines 3-5
+    """
+    return (code >> 1 & 0b111) | (code >> 2 & 0b111) << 3
+
+
+def inverse_code(code: int) -> int:
+    """
+    Get the line code of the inverse hexagram (综卦).
+
+    Args:
+        code: 6-bit line code
+
+    Returns:
+        Code with the line order reversed
+    """
+    return sum(1 << (5 - i) for i in range(6) if code >> i & 1)
+
+
+def opposite_code(code: int) -> int:
+    """
+    Get the line code of the opposite hexagram (错卦).
+
+    Args:
+        code: 6-bit line code
+
+    Returns:
+        Code with every line flipped
+    """
+    return code ^ 0b111111
+
+
+def changing_lines(mask: int) -> List[int]:
+    """
+    Get the positions of the changing lines of a mask.
+
+    Args:
+        mask: 6-bit changing-line mask
+
+    Returns:
+        Line positions (1-6) from the bottom
+    """
+    return [i + 1 for i in range(6) if mask >> i & 1]
+
+
+# 按六爻编码预先算好的互、综、错卦编码
+NUCLEAR_CODES = bytes(nuclear_code(code) for code in range(64))
+INVERSE_CODES = bytes(inverse_code(code) for code in range(64))
+OPPOSITE_CODES = bytes(opposite_code(code) for code in range(64))
+
+RELATION_KINDS = ("nuclear", "inverse", "opposite")
+
+
+class RelationTables:
+    """
+    Relation tables of one corpus, indexed by King Wen number.
+
+    Every table holds hexagram numbers, with 0 for "no hexagram" (a code the
+    corpus does not cover or a number it does not contain).
+    """
+
+    def __init__(self, code_by_number: Dict[int, int], number_by_code: Sequence[Optional[int]]):
+        """
+        Resolve the code-level relations into hexagram numbers.
+
+        Args:
+            code_by_number: 6-bit line code of each hexagram number
+            number_by_code: Hexagram number of each line code (64 entries, None if missing)
+        """
+        numbers = bytes(number or 0 for number in number_by_code)
+        # 之卦表：第 (编号-1)*64 + 变爻掩码 项为变卦编号，共 64×64 = 4096 项
+        change = bytearray(64 * 64)
+        nuclear = bytearray(65)
+        inverse = bytearray(65)
+        opposite = bytearray(65)
+        for number, code in code_by_number.items():
+            if not 1 <= number <= 64:
+                continue
+            row = (number - 1) * 64
+            for mask in range(64):
+                change[row + mask] = numbers[code ^ mask]
+            nuclear[number] = numbers[NUCLEAR_CODES[code]]
+            inverse[number] = numbers[INVERSE_CODES[code]]
+            opposite[number] = numbers[OPPOSITE_CODES[code]]
+
+        self.change = bytes(change)
+        self.nuclear = bytes(nuclear)
+        self.inverse = bytes(inverse)
+        self.opposite = bytes(opposite)
+
+    def changed(self, number: int, mask: int) -> int:
+        """
+        Get the hexagram a reading changes into.
+
+        Args:
+            number: Hexagram number (1-64)
+            mask: 6-bit changing-line mask
+
+        Returns:
+            Changed hexagram number, or 0 if unknown
+        """
+        if not 1 <= number <= 64:
+            return 0
+        return self.change[(number - 1) * 64 + (mask & 0b111111)]
+
+    def outcomes(self, number: int) -> bytes:
+        """
+        Get the changed hexagram of every changing-line mask.
+
+        Args:
+            number: Hexagram number (1-64)
+
+        Returns:
+            64 hexagram numbers indexed by mask (mask 0 is the hexagram itself)
+        """
+        if not 1 <= number <= 64:
+            return bytes(64)
+        row = (number - 1) * 64
+        return self.change[row:row + 64]
+
+    def related(self, number: int) -> Dict[str, int]:
+        """
+        Get the nuclear, inverse and opposite hexagrams.
+
+        Args:
+            number: Hexagram number (1-64)
+
+        Returns:
+            Mapping of relation kind to hexagram number (0 if unknown)
+        """
+        if not 1 <= number <= 64:
+            return {kind: 0 for kind in RELATION_KINDS}
+        return {kind: getattr(self, kind)[number] for kind in RELATION_KINDS}
@@ -0,0 +1,193 @@
+"""
+Precompiled interpretation fragments.
+
+Everything ``generate_interpretation`` says about a hexagram (names, symbol,
+description, fortune/love/career/health, advice and the trend block of a
+changed hexagram) depends only on the hexagram record, so it is resolved
+once per corpus into ready-made strings. Rendering a reading joins the
+question line, the fragments of the two hexagrams and the texts of the
+changing lines.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+
+# 解读的第一行；其后的内容与问题无关，可按卦缓存
+QUESTION_PREFIX = "您的问题是："
+
+class InterpretationFragments(NamedTuple):
+    """
+    Prebuilt interpretation text of one hexagram.
+
+    Each fragment is one or more lines already joined with ``\\n``.
+    """
+    # 作为主卦：主卦、卦象、解释三行及其后的空行
+    head: str
+    # 作为变卦：变卦名称一行
+    changed_name: str
+    # 作为变卦：变卦解释一行及其后的空行
+    changed_description: str
+    # 作为主卦：详细解读（卦象释义及各方面运势）
+    details: str
+    # 作为主卦：行动建议（没有建议时为空行）
+    advice: str
+    # 作为变卦：变化趋势一节
+    trend: str
+
+
+def describe(hexagram: Any) -> str:
+    """
+    Resolve the description of a hexagram across the supported data layouts.
+
+    Args:
+        hexagram: Hexagram model, record or reading
+
+    Returns:
+        ``description``, else the traditional interpretation, else the
+        King Wen explanation ("" if none is available)
+    """
+    # 获取卦象描述（兼容不同数据结构）
+    if hasattr(hexagram, 'description') and hexagram.description:
+        return hexagram.description
+    elif hasattr(hexagram, 'interpretations') and hexagram.interpretations:
+        if hexagram.interpretations.traditional and hasattr(hexagram.interpretations.traditional, 'description'):
+            return hexagram.interpretations.traditional.description
+    elif hasattr(hexagram, 'kingWen') and hexagram.kingWen:
+        return hexagram.kingWen.explanation
+    return ""
+
+
+def _traditional_description(hexagram: Any) -> Optional[str]:
+    interpretations = getattr(hexagram, 'interpretations', None)
+    if interpretations and hasattr(interpretations, 'traditional'):
+        if hasattr(interpretations.traditional, 'description'):
+            return str(interpretations.traditional.description)
+    return None
+
+
+def compile_fragments(hexagram: Any) -> InterpretationFragments:
+    """
+    Build the interpretation fragments of a hexagram.
+
+    Args:
+        hexagram: Hexagram model, record or reading
+
+    Returns:
+        The hexagram's fragments
+    """
+    description = describe(hexagram)
+    traditional = _traditional_description(hexagram)
+    fortune = getattr(hexagram, 'fortune', None)
+    advice = getattr(hexagram, 'advice', None)
+
+    details = ["== 详细解读 =="]
+    if traditional is not None:
+        details.append(f"🔮 卦象释义：{traditional}")
+    if fortune:
+        details.append(f"💰 总体运势：{fortune}")
+    love = getattr(hexagram, 'love', None)
+    if love:
+        details.append(f"💕 感情婚姻：{love}")
+    career = getattr(hexagram, 'career', None)
+    if career:
+        details.append(f"💼 事业工作：{career}")
+    health = getattr(hexagram, 'health', None)
+    if health:
+        details.append(f"🏥 健康状况：{health}")
+
+    trend = ["", "== 变化趋势 ==", f"当前局势正在向【{hexagram.chineseName}】的方向发展。"]
+    if traditional is not None:
+        trend.append(f"🔄 变化含义：{traditional}")
+    if fortune:
+        trend.append(f"📈 运势走向：{fortune}")
+    if advice:
+        trend.append(f"🎯 应对策略：{advice}")
+    trend.append("⏰ 变化提示：变爻显示变化正在发生，需要积极适应新的形势")
+    trend.append("")
+
+    return InterpretationFragments(
+        head="\n".join((
+            f"主卦：{hexagram.chineseName}（{hexagram.name}）",
+            f"卦象：{hexagram.symbol}",
+            f"解释：{description}",
+            "",
+        )),
+        changed_name=f"变卦：{hexagram.chineseName}（{hexagram.name}）",
+        changed_description=f"变卦解释：{description}\n",
+        details="\n".join(details),
+        advice=f"\n💡 行动建议：{advice}" if advice else "",
+        trend="\n".join(trend),
+    )
+
+
+def render_interpretation(
+    question: str,
+    original: InterpretationFragments,
+    changed: Optional[InterpretationFragments],
+    lines: Sequence[Any]
+) -> str:
+    """
+    Render an interpretation from precompiled fragments.
+
+    Args:
+        question: The original question asked
+        original: Fragments of the primary hexagram
+        changed: Fragments of the changed hexagram (None if no line changes)
+        lines: The six lines with changing information
+
+    Returns:
+        Formatted interpretation string
+    """
+    changing_lines = [line for line in lines if line.changing]
+    parts: List[str] = [f"{QUESTION_PREFIX}{question}", "", original.head]
+    if changed is not None:
+        parts.append(changed.changed_name)
+        parts.append(f"变爻：第 {', '.join(str(line.position) for line in changing_lines)} 爻")
+        parts.append(changed.changed_description)
+    parts.append(original.details)
+
+    # 变爻解读：爻辞解释随每次起卦而不同，只有这部分逐次生成
+    if changing_lines:
+        parts.append("")
+        parts.append("📍 变爻指导：")
+        for line in changing_lines:
+            if hasattr(line, 'explanation') and line.explanation:
+                parts.append(f"  第{line.position}爻：{line.explanation}")
+
+    parts.append(original.advice)
+    if changed is not None:
+        parts.append(changed.trend)
+    return "\n".join(parts)
+
+
+class InterpretationTemplates:
+    """
+    Interpretation fragments of every hexagram of one loaded corpus.
+    """
+
+    def __init__(self, corpus: Any):
+        """
+        Compile the fragments of every hexagram of a corpus.
+
+        Args:
+            corpus: Loaded ``HexagramCorpus``
+        """
+        self._corpus = corpus
+        self._fragments: Dict[int, InterpretationFragments] = {}
+        for hexagram in corpus.hexagrams:
+            if hexagram.number not in self._fragments:
+                self._fragments[hexagram.number] = compile_fragments(hexagram)
+
+    def fragments(self, hexagram: Any) -> Optional[InterpretationFragments]:
+        """
+        Get the compiled fragments of a hexagram record.
+
+        Args:
+            hexagram: ``LazyHexagram`` record
+
+        Returns:
+            The cached fragments, or None if the record is not part of this corpus
+        """
+        if self._corpus.by_number.get(hexagram.number) is not hexagram:
+            return None
+        return self._fragments.get(hexagram.number)
@@ -0,0 +1,231 @@
+"""
+Lazily hydrated hexagram records.
+
+A loaded corpus keeps only the summary of every hexagram resident (number,
+names, symbol, trigrams and 卦辞). The heavy fields (象辞, 爻辞 with their
+images and changes, every interpretation school, and the fortune/career/...
+texts) are decoded from the corpus source the first time they are read and
+kept in a bounded LRU cache shared by the whole corpus, so rarely used
+sections are dropped again instead of staying in every worker forever.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+from models.schemas import Hexagram
+from .corpus_bundle import SECTION_FIELDS, SUMMARY_FIELDS, construct_hexagram, construct_section, construct_text
+
+
+# 默认缓存的分段数：约相当于 20 个完整卦，足以覆盖常用卦的并发请求
+DEFAULT_SECTION_CACHE_SIZE = 192
+
+_SECTION_SET = frozenset(SECTION_FIELDS)
+
+
+class SectionSource(Protocol):
+    """Anything that can decode the heavy fields of a corpus."""
+
+    def section(self, index: int, field: str) -> Any:
+        ...
+
+
+class MemorySections:
+    """
+    Section source for corpora validated from JSON.
+
+    The sections are already in memory, so only the hydrated model objects
+    are bounded; used when no current bundle exists.
+    """
+
+    def __init__(self, sections: List[Dict[str, Any]]):
+        self._sections = sections
+
+    def section(self, index: int, field: str) -> Any:
+        return self._sections[index][field]
+
+
+class SectionCache:
+    """
+    Bounded, thread-safe LRU cache of decoded hexagram sections.
+
+    Each entry holds the raw ``model_dump()`` value of a section and, once
+    an attribute is read, its hydrated model value.
+    """
+
+    def __init__(self, source: SectionSource, max_sections: Optional[int] = DEFAULT_SECTION_CACHE_SIZE):
+        """
+        Create a cache over a section source.
+
+        Args:
+            source: Decoder of the raw section data (mapped bundle or memory)
+            max_sections: Maximum number of sections kept (None for unbounded)
+        """
+        self._source = source
+        self._max_sections = max_sections
+        self._entries: "OrderedDict[Tuple[int, str], List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, index: int, field: str) -> List[Any]:
+        """Get the [raw, model] entry of a section; the caller holds the lock."""
+        key = (index, field)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = [self._source.section(index, field), None]
+        self._entries[key] = entry
+        if self._max_sections is not None and len(self._entries) > self._max_sections:
+            self._entries.popitem(last=False)
+        return entry
+
+    def raw(self, index: int, field: str) -> Any:
+        """
+        Get the serialized value of one section.
+
+        Args:
+            index: Position of the hexagram in the corpus
+            field: One of ``SECTION_FIELDS``
+
+        Returns:
+            The field's value as in ``Hexagram.model_dump()``
+        """
+        with self._lock:
+            return self._entry(index, field)[0]
+
+    def raw_many(self, index: int, fields: Tuple[str, ...]) -> List[Any]:
+        """
+        Get the serialized values of several sections of one hexagram.
+
+        Args:
+            index: Position of the hexagram in the corpus
+            fields: Section field names
+
+        Returns:
+            Values in the order of ``fields``
+        """
+        with self._lock:
+            return [self._entry(index, field)[0] for field in fields]
+
+    def model(self, index: int, field: str) -> Any:
+        """
+        Get the hydrated model value of one section.
+
+        Args:
+            index: Position of the hexagram in the corpus
+            field: One of ``SECTION_FIELDS``
+
+        Returns:
+            The value a validated ``Hexagram`` holds for the field
+        """
+        with self._lock:
+            entry = self._entry(index, field)
+            if entry[1] is None:
+                entry[1] = construct_section(field, entry[0])
+            return entry[1]
+
+    def info(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with size, capacity, hits and misses
+        """
+        return {
+            "size": len(self._entries),
+            "max_sections": self._max_sections,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class LazyHexagram:
+    """
+    Read-only hexagram record with a resident summary.
+
+    Summary fields are plain attributes. Reading any other ``Hexagram``
+    field (``lines``, ``image``, ``interpretations``, ``fortune``, ...)
+    returns the same model value a ``Hexagram`` would, hydrated through the
+    corpus' ``SectionCache``.
+    """
+
+    __slots__ = SUMMARY_FIELDS + ("_summary", "_index", "_sections")
+
+    def __init__(self, index: int, summary: Dict[str, Any], sections: SectionCache):
+        """
+        Create a record.
+
+        Args:
+            index: Position of the hexagram in its corpus
+            summary: Summary fields as in ``Hexagram.model_dump()``
+            sections: Section cache of the corpus
+        """
+        for field in SUMMARY_FIELDS:
+            setattr(self, field, summary[field])
+        self.kingWen = construct_text(summary["kingWen"])
+        self._summary = summary
+        self._index = index
+        self._sections = sections
+
+    def __getattr__(self, name: str) -> Any:
+        if name in _SECTION_SET:
+            return self._sections.model(self._index, name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __repr__(self) -> str:
+        return f"LazyHexagram(number={self.number}, chineseName={self.chineseName!r})"
+
+    def section(self, field: str) -> Any:
+        """
+        Get the serialized value of a heavy field.
+
+        Args:
+            field: One of ``SECTION_FIELDS``
+
+        Returns:
+            The field's value as in ``Hexagram.model_dump()`` (shared, do not modify)
+        """
+        return self._sections.raw(self._index, field)
+
+    def field_value(self, field: str) -> Any:
+        """
+        Get the serialized value of any Hexagram field, summary or section.
+
+        Args:
+            field: Hexagram field name
+
+        Returns:
+            The field's value as in ``Hexagram.model_dump()`` (shared, do not modify)
+        """
+        if field in self._summary:
+            return self._summary[field]
+        return self._sections.raw(self._index, field)
+
+    def model_dump(self) -> Dict[str, Any]:
+        """
+        Serialize the hexagram like ``Hexagram.model_dump()``.
+
+        Only the top-level dictionary is new; nested values are shared with
+        the corpus and must not be modified.
+
+        Returns:
+            Dictionary with every Hexagram field in schema order
+        """
+        # 模型中摘要字段在前、分段字段在后，拼接即为 Hexagram.model_dump() 的字段顺序
+        data = dict(self._summary)
+        data.update(zip(SECTION_FIELDS, self._sections.raw_many(self._index, SECTION_FIELDS)))
+        return data
+
+    def to_model(self) -> Hexagram:
+        """
+        Build a full ``Hexagram`` model (without re-validation).
+
+        Returns:
+            Hexagram sharing its values with the corpus
+        """
+        return construct_hexagram(self.model_dump())
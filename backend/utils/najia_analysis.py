@@ -0,0 +1,463 @@
+"""
+Table-driven analysis of a najia chart: 旺衰, 生克 and 动变.
+
+A chart (``NajiaChart``) is analysed against the 月建 (month branch) and the
+日辰 (day pillar) of the moment it was cast:
+
+- 旺衰 of every line by the 月建 (旺相休囚死), 月破 and 月合
+- 生克 of the 日辰 on every line, 日冲 (暗动 for a strong resting line, 日破
+  for a weak one) and 日合
+- 旬空 of the day's 旬
+- every moving line against the line it changes into: 回头生 / 回头克,
+  化进神 / 化退神, 化冲, 化合, 化空 and 化破
+- 伏神 under their 飞神 and the 生克 between the two
+- 世应 生克 and 冲合, and the 用神 with its 原神 and 忌神
+
+Everything is computed on integer codes: the static data of every
+hexagram comes from ``NAJIA_TABLE``, and the relations from matrices over
+the 12 branches that are built once at import (月建 × 爻, 日辰 × 爻, 本爻 ×
+变爻), so analysing one chart is a few dozen tuple lookups. Strings are only
+produced by the ``describe_*`` functions.
+"""
+
+from enum import IntEnum, IntFlag
+from functools import lru_cache, partial
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .ganzhi import (
+    JIAZI, JIAZI_INDEX, LIUQIN, SHENG_KE, WUXING, ZHI_INDEX, ZHI_RELATIONS, ZHI_WUXING, ShengKe, ZhiRelation,
+    xunkong_zhis,
+)
+from .najia_oracle import NAJIA_BIAN_TABLE, NAJIA_TABLE, NajiaChart, najia_codes, qin6_codes
+
+
+class WangShuai(IntEnum):
+    """爻在月令的旺衰"""
+    WANG = 0   # 旺：与月建同五行
+    XIANG = 1  # 相：月建生爻
+    XIU = 2    # 休：爻生月建
+    QIU = 3    # 囚：爻克月建
+    SI = 4     # 死：月建克爻
+
+
+WANGSHUAI = '旺相休囚死'
+
+
+class LineState(IntFlag):
+    """爻的状态"""
+    NONE = 0
+    MOVING = 1        # 动爻
+    SHI = 2           # 世爻
+    YING = 4          # 应爻
+    KONG = 8          # 旬空
+    YUE_PO = 16       # 月破：月建冲爻
+    YUE_HE = 32       # 月合
+    RI_CHONG = 64     # 日辰冲爻
+    RI_HE = 128       # 日合
+    AN_DONG = 256     # 暗动：静爻旺相逢日冲
+    RI_PO = 512       # 日破：静爻休囚逢日冲
+    HUA_JIN = 1024    # 化进神
+    HUA_TUI = 2048    # 化退神
+    HUA_CHONG = 4096  # 变爻冲本爻
+    HUA_HE = 8192     # 变爻合本爻
+    HUA_KONG = 16384  # 化空
+    HUA_PO = 32768    # 化破：变爻逢月破
+
+
+class LineAnalysis(NamedTuple):
+    """一爻的分析，缺少的项为 -1"""
+    position: int     # 爻位 1-6
+    najia: int        # 纳甲的六十甲子序号
+    qin: int          # 六亲（LiuQin）
+    month: int        # 月令旺衰（WangShuai）
+    day: int          # 日辰对爻的生克（ShengKe）
+    state: int        # LineState
+    changed: int      # 变爻纳甲
+    changed_qin: int  # 变爻六亲
+    change: int       # 变爻对本爻的生克（ShengKe），即回头生克
+    fushen: int       # 伏于此爻下的伏神纳甲
+    fushen_qin: int   # 伏神六亲
+    fei_fu: int       # 飞神（本爻）对伏神的生克（ShengKe）
+
+
+class NajiaAnalysis(NamedTuple):
+    """一卦的分析"""
+    lines: Tuple[LineAnalysis, ...]  # 初爻至上爻
+    shi: int          # 世爻位 1-6
+    ying: int         # 应爻位 1-6
+    shi_ying: int     # 世对应的生克（ShengKe）
+    shi_ying_zhi: int  # 世支对应支的冲合（ZhiRelation）
+    kong: int         # 旬空地支，第 z 位对应地支 z
+    yongshen: int     # 用神六亲（LiuQin），未指定为 -1
+
+
+# 进神：同五行地支顺行（亥化子、寅化卯、巳化午、申化酉，丑辰未戌依次）
+_JIN_PAIRS = ((11, 0), (2, 3), (5, 6), (8, 9), (1, 4), (4, 7), (7, 10), (10, 1))
+
+
+def _wangshuai(month: int, zhi: int) -> WangShuai:
+    relation = SHENG_KE[ZHI_WUXING[month]][ZHI_WUXING[zhi]]
+    return {
+        ShengKe.BIHE: WangShuai.WANG,
+        ShengKe.SHENG: WangShuai.XIANG,
+        ShengKe.BEI_SHENG: WangShuai.XIU,
+        ShengKe.BEI_KE: WangShuai.QIU,
+        ShengKe.KE: WangShuai.SI,
+    }[relation]
+
+
+def _month_state(month: int, zhi: int) -> Tuple[int, int]:
+    relation = ZHI_RELATIONS[month][zhi]
+    state = LineState.NONE
+    if relation & ZhiRelation.CHONG:
+        state |= LineState.YUE_PO
+    if relation & ZhiRelation.HE:
+        state |= LineState.YUE_HE
+    return int(_wangshuai(month, zhi)), int(state)
+
+
+def _day_state(day: int, zhi: int) -> Tuple[int, int]:
+    relation = ZHI_RELATIONS[day][zhi]
+    state = LineState.NONE
+    if relation & ZhiRelation.CHONG:
+        state |= LineState.RI_CHONG
+    if relation & ZhiRelation.HE:
+        state |= LineState.RI_HE
+    return int(SHENG_KE[ZHI_WUXING[day]][ZHI_WUXING[zhi]]), int(state)
+
+
+def _change_state(zhi: int, changed: int) -> Tuple[int, int]:
+    relation = ZHI_RELATIONS[changed][zhi]
+    state = LineState.NONE
+    if (zhi, changed) in _JIN_PAIRS:
+        state |= LineState.HUA_JIN
+    elif (changed, zhi) in _JIN_PAIRS:
+        state |= LineState.HUA_TUI
+    if relation & ZhiRelation.CHONG:
+        state |= LineState.HUA_CHONG
+    if relation & ZhiRelation.HE:
+        state |= LineState.HUA_HE
+    return int(SHENG_KE[ZHI_WUXING[changed]][ZHI_WUXING[zhi]]), int(state)
+
+
+# [月建][爻支] -> (旺衰, 月破/月合)；[日支][爻支] -> (生克, 日冲/日合)；[本爻支][变爻支] -> (回头生克, 化进退冲合)
+MONTH_STATE = tuple(tuple(_month_state(m, z) for z in range(12)) for m in range(12))
+DAY_STATE = tuple(tuple(_day_state(d, z) for z in range(12)) for d in range(12))
+CHANGE_STATE = tuple(tuple(_change_state(z, c) for c in range(12)) for z in range(12))
+# [日柱序号] -> 旬空地支掩码
+KONG_MASK = tuple(sum(1 << z for z in xunkong_zhis(day)) for day in range(60))
+# [世支][应支] 的冲合
+_SHI_YING_ZHI = tuple(tuple(int(ZHI_RELATIONS[a][b] & (ZhiRelation.CHONG | ZhiRelation.HE)) for b in range(12))
+                      for a in range(12))
+_SHENG_KE = tuple(tuple(int(relation) for relation in row) for row in SHENG_KE)
+_ZHI_WUXING = tuple(int(element) for element in ZHI_WUXING)
+# 热路径上按 int 运算，不构造 IntFlag 对象
+(_MOVING, _SHI, _YING, _KONG, _YUE_PO, _YUE_HE, _RI_CHONG, _RI_HE, _AN_DONG, _RI_PO, _HUA_KONG, _HUA_PO) = (
+    int(flag) for flag in (LineState.MOVING, LineState.SHI, LineState.YING, LineState.KONG, LineState.YUE_PO,
+                           LineState.YUE_HE, LineState.RI_CHONG, LineState.RI_HE, LineState.AN_DONG,
+                           LineState.RI_PO, LineState.HUA_KONG, LineState.HUA_PO)
+)
+_STRONG = (int(WangShuai.WANG), int(WangShuai.XIANG))
+_CHONG, _HE = int(ZhiRelation.CHONG), int(ZhiRelation.HE)
+
+
+def _fushen_table() -> Tuple[Tuple[Optional[Tuple[int, int, int]], ...], ...]:
+    """[六爻编码][爻] -> (伏神纳甲, 伏神六亲, 飞神对伏神的生克)，无伏神为 None"""
+    table = []
+    for gua in NAJIA_TABLE:
+        row: List[Optional[Tuple[int, int, int]]] = [None] * 6
+        if gua.hide:
+            # 伏神取自本宫纯卦
+            pure = najia_codes(sum(int(bit) << i for i, bit in enumerate(gua.hide.mark)))
+            qins = qin6_codes(gua.gong, pure)
+            for seat in gua.hide.seat:
+                fei, fu = gua.najia_codes[seat] % 12, pure[seat] % 12
+                row[seat] = (pure[seat], int(qins[seat]), _SHENG_KE[_ZHI_WUXING[fei]][_ZHI_WUXING[fu]])
+        table.append(tuple(row))
+    return tuple(table)
+
+
+FUSHEN_TABLE = _fushen_table()
+
+
+@lru_cache(maxsize=None)
+def _chart_lines(index: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    [六爻编码 | 变爻 << 6] -> 各爻与日期无关的部分
+    
+    (爻位, 纳甲, 地支, 六亲, 变爻纳甲, 变爻地支, 变爻六亲, 回头生克, 状态, 伏神纳甲, 伏神六亲, 飞伏生克)，
+    状态含动爻、世应与化进退冲合；静爻的变爻各项为 -1。
+    """
+    code, mask = index & 63, index >> 6
+    gua, changed_gua = NAJIA_TABLE[code], NAJIA_TABLE[code ^ mask]
+    bian = NAJIA_BIAN_TABLE[index]
+    shi, ying = gua.shiy
+    lines = []
+    for i in range(6):
+        najia, zhi = gua.najia_codes[i], gua.najia_codes[i] % 12
+        state = _SHI if i + 1 == shi else _YING if i + 1 == ying else 0
+        changed = changed_zhi = changed_qin = change = -1
+        if mask >> i & 1:
+            changed = changed_gua.najia_codes[i]
+            changed_zhi, changed_qin = changed % 12, int(bian.qin6_codes[i])
+            change, change_state = CHANGE_STATE[zhi][changed_zhi]
+            state |= _MOVING | change_state
+        lines.append((i + 1, najia, zhi, int(gua.qin6_codes[i]), changed, changed_zhi, changed_qin, change, state,
+                      *(FUSHEN_TABLE[code][i] or (-1, -1, -1))))
+    return tuple(lines)
+
+
+_new_line = partial(tuple.__new__, LineAnalysis)
+
+
+def analyze_chart(chart: NajiaChart, month: int, day: int, yongshen: int = -1) -> NajiaAnalysis:
+    """
+    Analyse a chart against the 月建 and 日辰 of its moment.
+
+    Args:
+        chart: Integer-coded chart (``NajiaOracle.chart``)
+        month: Branch of the month pillar (0 = 子)
+        day: Sexagenary index of the day pillar (0 = 甲子)
+        yongshen: LiuQin of the 用神, -1 if none was chosen
+
+    Returns:
+        The analysis of every line, 世应 and 旬空
+    """
+    static = _chart_lines(chart.code | chart.mask << 6)
+    month_row, day_row = MONTH_STATE[month], DAY_STATE[day % 12]
+    kong = KONG_MASK[day]
+    lines = []
+    for (position, najia, zhi, qin, changed, changed_zhi, changed_qin, change, state,
+         fushen, fushen_qin, fei_fu) in static:
+        wangshuai, month_state = month_row[zhi]
+        relation, day_state = day_row[zhi]
+        state |= month_state | day_state
+        if kong >> zhi & 1:
+            state |= _KONG
+        if changed >= 0:
+            if kong >> changed_zhi & 1:
+                state |= _HUA_KONG
+            if month_row[changed_zhi][1] & _YUE_PO:
+                state |= _HUA_PO
+        elif day_state & _RI_CHONG:
+            # 静爻逢日冲：旺相为暗动，休囚为日破
+            state |= _AN_DONG if wangshuai in _STRONG else _RI_PO
+        lines.append(_new_line((position, najia, qin, wangshuai, relation, state, changed, changed_qin, change,
+                                fushen, fushen_qin, fei_fu)))
+    shi, ying = NAJIA_TABLE[chart.code].shiy
+    shi_zhi, ying_zhi = static[shi - 1][2], static[ying - 1][2]
+    return NajiaAnalysis(
+        lines=tuple(lines),
+        shi=shi,
+        ying=ying,
+        shi_ying=_SHENG_KE[_ZHI_WUXING[shi_zhi]][_ZHI_WUXING[ying_zhi]],
+        shi_ying_zhi=_SHI_YING_ZHI[shi_zhi][ying_zhi],
+        kong=kong,
+        yongshen=yongshen,
+    )
+
+
+# 旺衰评分：月令 [WangShuai]、日辰 [ShengKe]、回头生克 [ShengKe]，正为有力
+_MONTH_SCORE = (2, 1, -1, -1, -2)
+_DAY_SCORE = (1, 1, -1, 0, 0)
+_CHANGE_SCORE = (0, 1, -2, 0, -1)
+_STATE_SCORE = tuple((int(flag), value) for flag, value in (
+    (LineState.YUE_PO, -3), (LineState.RI_PO, -1), (LineState.HUA_JIN, 1), (LineState.HUA_TUI, -1),
+    (LineState.HUA_PO, -1), (LineState.HUA_KONG, -1),
+))
+
+
+def line_strength(line: LineAnalysis) -> int:
+    """
+    Score how strong a line is by 月令, 日辰, 破, 空 and its change.
+
+    Args:
+        line: Analysed line
+
+    Returns:
+        Positive for a strong (旺相有力) line, negative for a weak one
+    """
+    state = line.state
+    score = _MONTH_SCORE[line.month] + _DAY_SCORE[line.day]
+    if line.change >= 0:
+        score += _CHANGE_SCORE[line.change]
+    elif state & _KONG:
+        # 动不为空，静而逢空为无力
+        score -= 1
+    for flag, value in _STATE_SCORE:
+        if state & flag:
+            score += value
+    return score
+
+
+def yuanshen(yongshen: int) -> int:
+    """用神六亲 -> 原神（生用神者）六亲"""
+    return (yongshen + 1) % 5
+
+
+def jishen(yongshen: int) -> int:
+    """用神六亲 -> 忌神（克用神者）六亲"""
+    return (yongshen + 2) % 5
+
+
+def chart_of_result(najia_result: Dict[str, Any]) -> Optional[NajiaChart]:
+    """
+    Recover the integer-coded chart of a ``get_najia_result`` dict.
+
+    Args:
+        najia_result: Najia result
+
+    Returns:
+        The chart (六神 offset 0), or None if the result has no valid mark
+    """
+    mark = najia_result.get('original_hexagram', {}).get('mark', '')
+    if len(mark) != 6 or mark.strip('01'):
+        return None
+    code = sum(int(bit) << i for i, bit in enumerate(mark))
+    mask = sum(1 << i for i, line in enumerate(najia_result.get('lines', [])[:6]) if line.get('changing'))
+    return NajiaChart(code, mask, 0)
+
+
+def analyze_result(najia_result: Dict[str, Any], chart: Optional[NajiaChart] = None,
+                   yongshen: int = -1) -> Optional[NajiaAnalysis]:
+    """
+    Analyse a najia result against the four pillars it carries.
+
+    Args:
+        najia_result: Najia result (``NajiaOracle.get_najia_result``)
+        chart: Its integer-coded chart, recovered from the result if omitted
+        yongshen: LiuQin of the 用神, -1 if none was chosen
+
+    Returns:
+        The analysis, or None if the chart or the month/day pillars cannot be read
+    """
+    gz = najia_result.get('lunar_info', {}).get('gz', {})
+    month = ZHI_INDEX.get(gz.get('month', '')[1:2])
+    day = JIAZI_INDEX.get(gz.get('day', ''))
+    if chart is None:
+        chart = chart_of_result(najia_result)
+    if chart is None or month is None or day is None:
+        return None
+    return analyze_chart(chart, month, day, yongshen)
+
+
+# ==================== 输出 ====================
+
+_POSITIONS = '初二三四五上'
+# 日辰对爻、变爻对本爻、飞神对伏神、世对应的生克（按 ShengKe 取）
+_DAY_TEXT = ('日辰比和', '得日生', '受日克', '克日辰', '泄于日辰')
+_CHANGE_TEXT = ('化比和', '回头生', '回头克', '化出克', '化泄')
+_FEI_FU_TEXT = ('飞伏比和', '飞生伏', '飞克伏', '伏克飞', '伏生飞')
+_SHI_YING_TEXT = ('世应比和', '世生应', '世克应', '应克世', '应生世')
+_CHANGE_STATE_TEXT = tuple((int(flag), text) for flag, text in (
+    (LineState.HUA_JIN, '化进神'), (LineState.HUA_TUI, '化退神'), (LineState.HUA_CHONG, '化冲'),
+    (LineState.HUA_HE, '化合'), (LineState.HUA_KONG, '化空'), (LineState.HUA_PO, '化破'),
+))
+
+
+# 六十甲子带五行，如 甲子水
+_GZ5X = tuple(JIAZI[n] + WUXING[ZHI_WUXING[n % 12]] for n in range(60))
+
+
+def strength_text(score: int) -> str:
+    """旺衰评分 -> 有力 / 平和 / 无力"""
+    return '有力' if score > 0 else '无力' if score < 0 else '平和'
+
+
+def fushen_text(line: LineAnalysis) -> Optional[str]:
+    """伏于此爻下的伏神，如 妻财甲寅木；无伏神为 None"""
+    if line.fushen < 0:
+        return None
+    return LIUQIN[line.fushen_qin] + _GZ5X[line.fushen]
+
+
+def describe_line(line: LineAnalysis) -> str:
+    """
+    Describe the 旺衰 and changes of a line.
+
+    Args:
+        line: Analysed line
+
+    Returns:
+        One line of text, e.g. ``初爻 妻财甲寅木：月相，得日生，旬空``
+    """
+    state = line.state
+    parts = [f"月{WANGSHUAI[line.month]}"]
+    if state & _YUE_PO:
+        parts.append('月破')
+    if state & _YUE_HE:
+        parts.append('月合')
+    parts.append(_DAY_TEXT[line.day])
+    if state & _AN_DONG:
+        parts.append('日冲暗动')
+    elif state & _RI_PO:
+        parts.append('日破')
+    elif state & _RI_CHONG:
+        parts.append('日冲')
+    if state & _RI_HE:
+        parts.append('日合')
+    if state & _KONG:
+        parts.append('旬空')
+    if line.changed >= 0:
+        parts.append(f"动化{LIUQIN[line.changed_qin]}{_GZ5X[line.changed]}{_CHANGE_TEXT[line.change]}")
+        parts.extend(text for flag, text in _CHANGE_STATE_TEXT if state & flag)
+    fushen = fushen_text(line)
+    if fushen:
+        parts.append(f"伏{fushen}，{_FEI_FU_TEXT[line.fei_fu]}")
+    mark = '世' if state & _SHI else '应' if state & _YING else ''
+    return (f"{_POSITIONS[line.position - 1]}爻{mark} {LIUQIN[line.qin]}{_GZ5X[line.najia]}："
+            f"{'，'.join(parts)}（{strength_text(line_strength(line))}）")
+
+
+def describe_shi_ying(analysis: NajiaAnalysis) -> str:
+    """世应的生克冲合"""
+    text = _SHI_YING_TEXT[analysis.shi_ying]
+    if analysis.shi_ying_zhi & _CHONG:
+        text += '，世应相冲'
+    if analysis.shi_ying_zhi & _HE:
+        text += '，世应相合'
+    shi = analysis.lines[analysis.shi - 1]
+    ying = analysis.lines[analysis.ying - 1]
+    return (f"🤝 世爻{LIUQIN[shi.qin]}{strength_text(line_strength(shi))}，"
+            f"应爻{LIUQIN[ying.qin]}{strength_text(line_strength(ying))}：{text}")
+
+
+def describe_yongshen(analysis: NajiaAnalysis) -> List[str]:
+    """
+    Describe the 用神 (the 世爻 if none was chosen), its 原神 and 忌神.
+
+    Args:
+        analysis: Chart analysis
+
+    Returns:
+        Lines of text
+    """
+    yongshen = analysis.yongshen
+    if yongshen < 0:
+        shi = analysis.lines[analysis.shi - 1]
+        return [f"🎯 以世爻为用：{LIUQIN[shi.qin]}{_GZ5X[shi.najia]}，{strength_text(line_strength(shi))}"]
+    name = LIUQIN[yongshen]
+    parts = []
+    for line in analysis.lines:
+        if line.qin == yongshen:
+            notes = [strength_text(line_strength(line))]
+            if line.state & _YUE_PO:
+                notes.append('月破')
+            if line.state & _KONG and line.changed < 0:
+                notes.append('旬空')
+            if line.changed >= 0:
+                notes.append('发动')
+            parts.append(f"🎯 用神{name}在{_POSITIONS[line.position - 1]}爻（{_GZ5X[line.najia]}），{'，'.join(notes)}")
+    if not parts:
+        hidden = [line for line in analysis.lines if line.fushen_qin == yongshen]
+        if hidden:
+            line = hidden[0]
+            parts.append(f"🎯 用神{name}不上卦，伏于{_POSITIONS[line.position - 1]}爻下，{_FEI_FU_TEXT[line.fei_fu]}")
+        else:
+            parts.append(f"🎯 用神{name}不上卦")
+    moving = {line.qin for line in analysis.lines if line.changed >= 0}
+    if yuanshen(yongshen) in moving:
+        parts.append(f"🌱 原神{LIUQIN[yuanshen(yongshen)]}发动，生扶用神")
+    if jishen(yongshen) in moving:
+        parts.append(f"⚠️ 忌神{LIUQIN[jishen(yongshen)]}发动，克制用神")
+    return parts
@@ -0,0 +1,158 @@
+"""
+Batch najia charting, fanned out to a process pool.
+
+A batch is planned in the calling process: the four pillars and 旬空 are
+computed once per 时辰 of the batch and attached to every item of that
+时辰. Planning keeps its own per-batch table and does not go through the
+process-wide ``ganzhi_cache``, so historical dates neither evict the live
+时辰 nor start background prefetches. Items are then charted in tasks of
+``NAJIA_BATCH_TASK_SIZE``; a task compiles the najia chart, writes the najia
+interpretation and encodes one JSON line per item, so the CPU work and the
+encoding both happen in the worker. Large batches go to a process pool,
+smaller ones to a thread, and ``stream_najia_batch`` yields the encoded tasks
+in request order without blocking the event loop.
+
+The pool is created on first use and shut down with the application.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from .catalogue_cache import encode_json
+from .divination_logic import generate_najia_interpretation
+from .najia_oracle import NajiaOracle, compute_daily, shichen_bounds, shichen_index
+
+
+# 每个任务排盘的条数：过小时进程间传输占比高，过大时首行返回慢
+NAJIA_BATCH_TASK_SIZE = 250
+# 少于该条数的批次在线程中排盘，不值得分发到进程池
+NAJIA_BATCH_POOL_MIN = 1000
+
+# (序号, 摇卦参数, 起卦时间, 问题, 四柱与旬空)
+NajiaBatchTask = List[Tuple[int, List[int], datetime, str, Dict[str, Any]]]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def plan_najia_batch(items: List[Tuple[List[int], datetime, str]],
+                     task_size: int = NAJIA_BATCH_TASK_SIZE) -> List[NajiaBatchTask]:
+    """
+    Look up the calendar of every 时辰 once and split the batch into tasks.
+
+    Args:
+        items: (params, date, question) per chart, in request order
+        task_size: Charts per task
+
+    Returns:
+        Tasks in request order
+
+    Raises:
+        ValueError: If the four pillars of a date cannot be computed
+    """
+    # (日期, 时辰序号) -> 整个时辰共用的四柱与旬空，时辰内交节时为 None
+    by_slot: Dict[Any, Optional[Dict[str, Any]]] = {}
+    planned = []
+    for index, (params, date, question) in enumerate(items):
+        key = (date.date(), shichen_index(date))
+        if key not in by_slot:
+            start, end = shichen_bounds(date)
+            first = compute_daily(start)
+            by_slot[key] = first if first == compute_daily(end - timedelta(seconds=1)) else None
+        lunar = by_slot[key]
+        if lunar is None:
+            # 时辰内交节，按具体时间计算
+            lunar = compute_daily(date)
+        planned.append((index, params, date, question, lunar))
+    return [planned[start:start + task_size] for start in range(0, len(planned), task_size)]
+
+
+def chart_najia_task(task: NajiaBatchTask) -> bytes:
+    """
+    Chart every item of a task and encode one JSON line per chart.
+
+    Runs in the worker processes, so it only takes and returns picklable data.
+
+    Args:
+        task: Planned items
+
+    Returns:
+        NDJSON lines, each terminated by a newline
+    """
+    lines = []
+    for index, params, date, question, lunar in task:
+        oracle = NajiaOracle().compile(params=params, date=date, title=question, lunar=lunar)
+        najia = oracle.get_najia_result()
+        lines.append(encode_json({
+            "index": index,
+            "question": question,
+            "date": date.isoformat(),
+            "najia": najia,
+            "interpretation": generate_najia_interpretation(najia, question, oracle.chart),
+        }))
+    return b"\n".join(lines) + b"\n"
+
+
+def get_pool(workers: int = 0) -> ProcessPoolExecutor:
+    """
+    Get the process pool of batch charting, creating it on first use.
+
+    Workers are spawned rather than forked, so they do not inherit the
+    threads and event loop of the server.
+
+    Args:
+        workers: Number of processes, 0 for the number of CPUs
+
+    Returns:
+        The shared pool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """
+    Shut the process pool down, if it was started.
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def stream_najia_batch(tasks: List[NajiaBatchTask], workers: int = 0,
+                             pool_min: int = NAJIA_BATCH_POOL_MIN) -> AsyncIterator[bytes]:
+    """
+    Chart planned tasks off the event loop and yield them in order.
+
+    Args:
+        tasks: Tasks from ``plan_najia_batch``
+        workers: Size of the process pool, 0 for the number of CPUs
+        pool_min: Batches with fewer charts are charted in a thread
+
+    Yields:
+        NDJSON lines of one task at a time
+    """
+    loop = asyncio.get_running_loop()
+    count = sum(len(task) for task in tasks)
+    executor: Optional[Executor] = None
+    if count >= pool_min and (workers or os.cpu_count() or 1) > 1:
+        executor = get_pool(workers)
+    futures = [loop.run_in_executor(executor, chart_najia_task, task) for task in tasks]
+    try:
+        for future in futures:
+            yield await future
+    finally:
+        # 客户端断开时取消尚未开始的任务
+        for future in futures:
+            future.cancel()
@@ -16,11 +16,18 @@
 
 import math
 import logging
-from typing import Dict, List, Tuple, Optional, Any
-from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Tuple, Optional, Any
+import threading
+from collections import OrderedDict
+from datetime import date as date_type, datetime, timedelta
 from pathlib import Path
 import pickle
 
+from . import ganzhi
+from .ganzhi import (
+    GAN_INDEX, JIAZI, JIAZI_INDEX, LIUQIN, LIUQIN_OF, WUXING, ZHI_INDEX, ZHI_WUXING, jiazi, xunkong,
+)
+
 logging.basicConfig(level='INFO')
 logger = logging.getLogger(__name__)
 
@@ -88,6 +95,8 @@ GUA64 = {
 # 旬空
 KONG = ('子丑', '寅卯', '辰巳', '午未', '申酉', '戌亥')
 
+_XING5_INDEX = {xing: i for i, xing in enumerate(XING5)}
+
 # ==================== 工具函数 ====================
 
 def GZ5X(gz: str = '') -> str:
@@ -102,11 +111,7 @@ def GZ5X(gz: str = '') -> str:
     """
     if len(gz) < 2:
         return gz
-    
-    _, z = gz[0], gz[1]
-    zm = ZHIS.index(z) if z in ZHIS else 0
-    
-    return gz + XING5[ZHI5[zm]]
+    return gz + WUXING[ZHI_WUXING[ZHI_INDEX.get(gz[1], 0)]]
 
 
 def xkong(gz: str = '甲子') -> str:
@@ -117,26 +122,10 @@ def xkong(gz: str = '甲子') -> str:
         gz: 干支组合
         
     Returns:
-        旬空地支
+        所在旬的旬空地支，如甲子旬空戌亥；不是六十甲子时为空字符串
     """
-    if len(gz) < 2:
-        return ''
-    
-    gm, zm = gz[0], gz[1]
-    
-    if gm in GANS and zm in ZHIS:
-        gm_idx = GANS.index(gm)
-        zm_idx = ZHIS.index(zm)
-        
-        if gm_idx == zm_idx or zm_idx < gm_idx:
-            zm_idx += 12
-        
-        xk = (gm_idx - zm_idx + 12) % 12
-        kong_pair = KONG[xk // 2]
-        
-        return kong_pair
-    
-    return ''
+    n = JIAZI_INDEX.get(gz[:2])
+    return xunkong(n) if n is not None else ''
 
 
 def get_god6(gz: str = None) -> List[str]:
@@ -150,28 +139,25 @@ def get_god6(gz: str = None) -> List[str]:
     Returns:
         六神列表，从上到下（六爻到初爻）
     """
-    if not gz or len(gz) < 1:
-        return list(SHEN6)
-    
-    gm = gz[0]
-    
-    if gm in GANS:
-        gm_idx = GANS.index(gm)
-    else:
-        return list(SHEN6)
-    
-    # 六神配置计算
-    num = math.ceil((gm_idx + 1) / 2) - 7
-    
-    if gm_idx == 4:  # 戊
+    gan = GAN_INDEX.get(gz[:1]) if gz else None
+    return list(_GOD6_ORDERS[_GOD6_OFFSETS[gan] if gan is not None else 0])
+
+
+def _god6_offset(gan: int) -> int:
+    """日干序号 -> 六神轮转偏移（SHEN6[偏移:] + SHEN6[:偏移]）"""
+    num = math.ceil((gan + 1) / 2) - 7
+    if gan == 4:  # 戊
         num = -4
-    elif gm_idx == 5:  # 己
+    elif gan == 5:  # 己
         num = -3
-    elif gm_idx > 5:
+    elif gan > 5:
         num += 1
-    
-    # 重新排列六神顺序
-    return list(SHEN6[num:] + SHEN6[:num])
+    return num % len(SHEN6)
+
+
+# 各日干的六神偏移，与各偏移对应的六神顺序（六爻到初爻）
+_GOD6_OFFSETS = tuple(_god6_offset(gan) for gan in range(10))
+_GOD6_ORDERS = tuple(SHEN6[num:] + SHEN6[:num] for num in range(len(SHEN6)))
 
 
 def set_shi_yao(symbol: str = None) -> Tuple[int, int]:
@@ -357,13 +343,63 @@ def get_qin6(w1: str, w2: str) -> str:
     Returns:
         六亲关系
     """
-    w1_idx = XING5.index(w1) if w1 in XING5 else 0
-    w2_idx = XING5.index(w2) if w2 in XING5 else 0
+    return LIUQIN[LIUQIN_OF[_XING5_INDEX.get(w1, 0)][_XING5_INDEX.get(w2, 0)]]
+
+
+def lunar_daily(date: datetime) -> Dict[str, Any]:
+    """
+    用 lunar_python 计算日期的四柱干支和旬空
+    
+    Args:
+        date: 指定时间
+        
+    Returns:
+        包含干支和旬空信息的字典
+        
+    Raises:
+        ImportError: 未安装 lunar_python
+    """
+    from lunar_python import Solar
+    
+    solar = Solar.fromYmdHms(date.year, date.month, date.day, 
+                           date.hour, date.minute or 0, date.second or 0)
+    lunar = solar.getLunar()
+    ganzi = lunar.getBaZi()
+    
+    return {
+        'xkong': lunar.getDayXunKong(),
+        'gz': {
+            'year': ganzi[0],
+            'month': ganzi[1],
+            'day': ganzi[2],
+            'hour': ganzi[3],
+        }
+    }
+
+
+def compute_daily(date: datetime) -> Dict[str, Any]:
+    """
+    计算日期的四柱干支和旬空（不经缓存）
     
-    ws = w1_idx - w2_idx
-    ws = ws + 5 if ws < 0 else ws
+    1900-2100 年由内置的节气表计算（``utils.ganzhi``），超出范围时
+    使用 lunar_python。
     
-    return QING6[ws]
+    Args:
+        date: 指定时间
+        
+    Returns:
+        包含干支和旬空信息的字典
+        
+    Raises:
+        ValueError: 超出节气表范围且未安装 lunar_python
+    """
+    try:
+        return ganzhi.daily(date)
+    except ValueError as e:
+        try:
+            return lunar_daily(date)
+        except ImportError:
+            raise ValueError(f"{e}，且未安装 lunar_python") from None
 
 
 # ==================== 纳甲主类 ====================
@@ -385,45 +421,17 @@ class NajiaOracle:
         """
         计算日期干支和旬空
         
+        同一时辰的结果取自进程内的时辰缓存（``ganzhi_cache``）。
+        
         Args:
             date: 指定日期，默认当前时间
             
         Returns:
             包含干支和旬空信息的字典
         """
-        try:
-            from lunar_python import Solar
-            
-            if date is None:
-                date = datetime.now()
-            
-            solar = Solar.fromYmdHms(date.year, date.month, date.day, 
-                                   date.hour, date.minute or 0, date.second or 0)
-            lunar = solar.getLunar()
-            ganzi = lunar.getBaZi()
-            
-            return {
-                'xkong': lunar.getDayXunKong(),
-                'gz': {
-                    'year': ganzi[0],
-                    'month': ganzi[1],
-                    'day': ganzi[2],
-                    'hour': ganzi[3],
-                }
-            }
-        except ImportError:
-            # 如果没有lunar_python，使用简化计算
-            if date is None:
-                date = datetime.now()
-            return {
-                'xkong': '戌亥',
-                'gz': {
-                    'year': '甲子',
-                    'month': '甲子',
-                    'day': '甲子',
-                    'hour': '甲子',
-                }
-            }
+        if date is None:
+            date = datetime.now()
+        return ganzhi_cache.daily(date)
     
     def _hidden(self, gong: int = None, qins: List[str] = None) -> Optional[Dict[str, Any]]:
         """
@@ -456,12 +464,9 @@ class NajiaOracle:
                     qin6.append(qin)
                     qinx.append(GZ5X(gz))
             
-            # 找出缺失的六亲对应的位置
-            missing_qins = list(set(qin6).difference(set(qins)))
-            seat = []
-            for missing in missing_qins:
-                if missing in qin6:
-                    seat.append(qin6.index(missing))
+            # 找出缺失的六亲对应的位置，按爻位从下到上排列；
+            # 不能按集合的遍历顺序，否则随字符串哈希种子变化，各进程排盘结果不一致
+            seat = [i for i, qin in enumerate(qin6) if qin not in qins and qin6.index(qin) == i]
             
             return {
                 'name': GUA64.get(mark, '未知卦'),
@@ -520,29 +525,16 @@ class NajiaOracle:
         
         return None
     
-    def compile(self, params: List[int] = None, gender: str = None, 
-                date: datetime = None, title: str = None, 
-                guaci: bool = False, **kwargs) -> 'NajiaOracle':
+    def _static_rules(self, params: List[int]) -> Dict[str, Any]:
         """
-        根据参数编译卦象
+        按口诀计算排盘中与时间无关的部分
         
         Args:
-            params: 摇卦参数 [1-4] * 6，1老阳，2少阴，3少阳，4老阴
-            gender: 性别
-            date: 起卦时间
-            title: 所测事项
-            guaci: 是否显示卦辞
+            params: 摇卦参数 [1-4] * 6
             
         Returns:
-            自身实例
+            动爻、卦名、卦码、卦宫、世应、六亲、干支五行、变卦与伏神
         """
-        title = title or ''
-        if date is None:
-            date = datetime.now()
-        
-        lunar = self._daily(date)
-        gender = gender or ''
-        
         # 生成卦码（二进制）
         mark = ''.join([str(int(p) % 2) for p in params])
         
@@ -567,9 +559,6 @@ class NajiaOracle:
                 qin6.append(qin)
                 qinx.append(GZ5X(gz))
         
-        # 计算六神
-        god6 = get_god6(lunar['gz']['day'])
-        
         # 动爻位置
         dong = [i for i, x in enumerate(params) if x > 2]
         
@@ -579,14 +568,7 @@ class NajiaOracle:
         # 计算变卦
         bian = self._transform(params=params, gong=gong)
         
-        self.data = {
-            'params': params,
-            'gender': gender,
-            'title': title,
-            'guaci': guaci,
-            'date': date,
-            'lunar': lunar,
-            'god6': god6,
+        return {
             'dong': dong,
             'name': name,
             'mark': mark,
@@ -597,6 +579,77 @@ class NajiaOracle:
             'bian': bian,
             'hide': hide,
         }
+    
+    def _static_table(self, params: List[int]) -> Dict[str, Any]:
+        """
+        查表得到排盘中与时间无关的部分，结果与 ``_static_rules`` 相同
+        
+        Args:
+            params: 六个取值 1-4 的摇卦参数
+            
+        Returns:
+            与 ``_static_rules`` 相同的字典（列表与字典均为新建）
+        """
+        code, mask = _params_code(params)
+        gua = NAJIA_TABLE[code]
+        bian = NAJIA_BIAN_TABLE[code | mask << 6] if mask else None
+        return {
+            'dong': [i for i in range(6) if mask >> i & 1],
+            'name': gua.name,
+            'mark': gua.mark,
+            'gong': GUAS[gua.gong],
+            'shiy': gua.shiy,
+            'qin6': list(gua.qin6),
+            'qinx': list(gua.qinx),
+            'bian': bian.to_dict() if bian else None,
+            'hide': gua.hide.to_dict() if gua.hide else None,
+        }
+    
+    def compile(self, params: List[int] = None, gender: str = None, 
+                date: datetime = None, title: str = None, 
+                guaci: bool = False, lunar: Dict[str, Any] = None,
+                **kwargs) -> 'NajiaOracle':
+        """
+        根据参数编译卦象
+        
+        Args:
+            params: 摇卦参数 [1-4] * 6，1少阳，2少阴，3老阳，4老阴
+            gender: 性别
+            date: 起卦时间
+            title: 所测事项
+            guaci: 是否显示卦辞
+            lunar: 已算好的起卦时间四柱与旬空（批量排盘时同一时辰共用），默认按 date 计算
+            
+        Returns:
+            自身实例
+        """
+        title = title or ''
+        if date is None:
+            date = datetime.now()
+        
+        if lunar is None:
+            lunar = self._daily(date)
+        gender = gender or ''
+        
+        # 卦码、世应、卦宫、六亲、伏神与变卦只取决于六爻，查预计算表只记录整数编码；
+        # 非常规参数按口诀计算
+        if _is_table_params(params):
+            day = GAN_INDEX.get(lunar['gz']['day'][:1])
+            static = {'chart': NajiaChart(*_params_code(params), _GOD6_OFFSETS[day] if day is not None else 0)}
+        else:
+            static = self._static_rules(params)
+            # 计算六神
+            static['god6'] = get_god6(lunar['gz']['day'])
+        
+        self.data = {
+            'params': params,
+            'gender': gender,
+            'title': title,
+            'guaci': guaci,
+            'date': date,
+            'lunar': lunar,
+            **static,
+        }
         
         return self
     
@@ -609,12 +662,40 @@ class NajiaOracle:
         """
         if not self.data:
             return {}
+        chart = self.data.get('chart')
+        if chart is not None:
+            result = render_chart(chart)
+        else:
+            result = self._rules_result()
+        lunar = self.data['lunar']
+        result.update({
+            'lunar_info': lunar,
+            'time_info': {
+                'year_gz': lunar['gz']['year'],
+                'month_gz': lunar['gz']['month'],
+                'day_gz': lunar['gz']['day'],
+                'hour_gz': lunar['gz']['hour'],
+                'xunkong': lunar['xkong'],
+            },
+            'title': self.data['title'],
+            'gender': self.data['gender'],
+            'date': self.data['date'].isoformat() if self.data['date'] else '',
+        })
+        return result
+    
+    @property
+    def chart(self) -> Optional['NajiaChart']:
+        """查表排盘的整数编码，未编译或按口诀排盘时为 None"""
+        return self.data.get('chart') if self.data else None
+    
+    def _rules_result(self) -> Dict[str, Any]:
+        """按口诀排盘时 ``get_najia_result`` 中与时间无关的部分"""
         return {
             'original_hexagram': {
                 'name': self.data['name'],
                 'mark': self.data['mark'],
                 'gong': self.data['gong'],
-                'type': get_type(self.data['mark']),
+                'type': _type_of(self.data['mark']),
                 'shiy': self.data['shiy'],  # (世爻, 应爻)
             },
             'changed_hexagram': self.data['bian'],
@@ -629,15 +710,426 @@ class NajiaOracle:
                 for i in range(6)
             ],
             'hidden': self.data['hide'],
-            'lunar_info': self.data['lunar'],
-            'time_info': {
-                'year_gz': self.data['lunar']['gz']['year'],
-                'month_gz': self.data['lunar']['gz']['month'],
-                'day_gz': self.data['lunar']['gz']['day'],
-                'hour_gz': self.data['lunar']['gz']['hour'],
-                'xunkong': self.data['lunar']['xkong'],
-            },
-            'title': self.data['title'],
-            'gender': self.data['gender'],
-            'date': self.data['date'].isoformat() if self.data['date'] else '',
         }
+
+
+# ==================== 预计算查找表 ====================
+
+class NajiaHidden(NamedTuple):
+    """伏神卦（取决于本卦六亲与卦宫）"""
+    name: str
+    mark: str
+    qin6: Tuple[str, ...]
+    qinx: Tuple[str, ...]
+    seat: Tuple[int, ...]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """与 ``NajiaOracle._hidden`` 相同结构的新字典"""
+        return {'name': self.name, 'mark': self.mark, 'qin6': list(self.qin6),
+                'qinx': list(self.qinx), 'seat': list(self.seat)}
+
+
+class NajiaBian(NamedTuple):
+    """变卦（取决于本卦卦宫与变爻）"""
+    name: str
+    mark: str
+    qin6: Tuple[str, ...]
+    qinx: Tuple[str, ...]
+    gong: str
+    qin6_codes: Tuple[int, ...]  # 六亲（LiuQin），按本卦卦宫五行
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """与 ``NajiaOracle._transform`` 相同结构的新字典"""
+        return {'name': self.name, 'mark': self.mark, 'qin6': list(self.qin6),
+                'qinx': list(self.qinx), 'gong': self.gong}
+
+
+class NajiaGua(NamedTuple):
+    """单卦的纳甲排盘中与时间无关的部分"""
+    mark: str
+    name: str
+    shiy: Tuple[int, int]
+    gong: int
+    type: str
+    najia: Tuple[str, ...]
+    qin6: Tuple[str, ...]
+    qinx: Tuple[str, ...]
+    hide: Optional[NajiaHidden]
+    najia_codes: Tuple[int, ...]  # 纳甲的六十甲子序号
+    qin6_codes: Tuple[int, ...]  # 六亲（LiuQin）
+    qin6_mask: int  # 卦中出现的六亲，第 q 位对应 LiuQin(q)
+
+
+# 三爻编码（第 i 位为第 i+1 爻）-> 八卦索引
+_TRIGRAMS = {sum(int(bit) << i for i, bit in enumerate(yao)): index for index, yao in enumerate(YAOS)}
+# 八卦内卦、外卦所纳干支的六十甲子序号
+_NAJIA_CODES = tuple(
+    tuple(tuple(jiazi(GAN_INDEX[gz[0]], ZHI_INDEX[zhi]) for zhi in gz[1:]) for gz in pair)
+    for pair in NAJIA
+)
+
+
+def najia_codes(code: int) -> Tuple[int, ...]:
+    """六爻编码 -> 初爻至上爻所纳干支的六十甲子序号"""
+    return _NAJIA_CODES[_TRIGRAMS[code & 7]][0] + _NAJIA_CODES[_TRIGRAMS[code >> 3]][1]
+
+
+def qin6_codes(gong: int, najia: Tuple[int, ...]) -> Tuple[int, ...]:
+    """卦宫索引与纳甲序号 -> 各爻六亲（LiuQin）"""
+    element = GUA5[gong]
+    return tuple(LIUQIN_OF[element][ZHI_WUXING[n % 12]] for n in najia)
+
+
+def _qinx(najia: Tuple[int, ...]) -> Tuple[str, ...]:
+    """纳甲序号 -> 干支五行字符串，如 甲子水"""
+    return tuple(JIAZI[n] + WUXING[ZHI_WUXING[n % 12]] for n in najia)
+
+
+def _code_params(code: int, mask: int = 0) -> List[int]:
+    """六爻编码与变爻掩码 -> 摇卦参数（1少阳，2少阴，3老阳，4老阴）"""
+    return [(1 if code >> i & 1 else 2) + (2 if mask >> i & 1 else 0) for i in range(6)]
+
+
+def _build_tables() -> Tuple[Tuple[NajiaGua, ...], Tuple[Optional[NajiaBian], ...]]:
+    """
+    由口诀函数生成 64 卦与 4096 种变化的查找表
+    
+    变卦的卦名、干支五行、卦宫只取决于变卦本身，六亲另取决于本卦卦宫，
+    因此 4096 项共享 64 个变卦与 8×64 组六亲。
+    
+    Returns:
+        (按六爻编码索引的卦表, 按 编码 | 变爻 << 6 索引的变卦表，无变爻处为 None)
+    """
+    oracle = NajiaOracle()
+    guas = []
+    for code in range(64):
+        # 世应、卦宫与伏神按口诀，纳甲与六亲按整数编码计算，字符串由编码生成
+        data = oracle._static_rules(_code_params(code))
+        hide = data['hide']
+        gong = GUAS.index(data['gong'])
+        najia = najia_codes(code)
+        qins = qin6_codes(gong, najia)
+        guas.append(NajiaGua(
+            mark=data['mark'],
+            name=data['name'],
+            shiy=data['shiy'],
+            gong=gong,
+            type=get_type(data['mark']),
+            najia=tuple(JIAZI[n] for n in najia),
+            qin6=tuple(LIUQIN[q] for q in qins),
+            qinx=_qinx(najia),
+            hide=NajiaHidden(hide['name'], hide['mark'], tuple(hide['qin6']), tuple(hide['qinx']),
+                             tuple(hide['seat'])) if hide else None,
+            najia_codes=najia,
+            qin6_codes=qins,
+            qin6_mask=sum(1 << q for q in set(qins)),
+        ))
+    
+    # 按 (本卦卦宫, 变卦编码) 计算一次变卦：卦名、纳甲取自变卦，六亲按本卦卦宫五行
+    bian_by_gong: Dict[Tuple[int, int], NajiaBian] = {}
+    for gong in range(len(GUAS)):
+        for changed in range(64):
+            gua = guas[changed]
+            qins = qin6_codes(gong, gua.najia_codes)
+            bian_by_gong[gong, changed] = NajiaBian(gua.name, gua.mark, tuple(LIUQIN[q] for q in qins),
+                                                    gua.qinx, GUAS[gua.gong], qins)
+    bians: List[Optional[NajiaBian]] = [None] * 4096
+    for code in range(64):
+        for mask in range(1, 64):
+            bians[code | mask << 6] = bian_by_gong[guas[code].gong, code ^ mask]
+    return tuple(guas), tuple(bians)
+
+
+NAJIA_TABLE, NAJIA_BIAN_TABLE = _build_tables()
+_TYPE_BY_MARK: Dict[str, str] = {gua.mark: gua.type for gua in NAJIA_TABLE}
+
+
+def _is_table_params(params: List[int]) -> bool:
+    """六个取值 1-4 的参数可以查表"""
+    return len(params) == 6 and all(p in (1, 2, 3, 4) for p in params)
+
+
+def _params_code(params: List[int]) -> Tuple[int, int]:
+    """摇卦参数 -> (六爻编码, 变爻掩码)，第 i 位对应第 i+1 爻"""
+    code = mask = 0
+    for i, p in enumerate(params):
+        code |= (p & 1) << i
+        mask |= (p > 2) << i
+    return code, mask
+
+
+class NajiaChart(NamedTuple):
+    """
+    查表排盘的整数编码
+    
+    本卦、变卦取自 ``NAJIA_TABLE[code]`` 与 ``NAJIA_BIAN_TABLE[code | mask << 6]``，
+    字符串在 ``render_chart`` 输出时生成。
+    """
+    code: int  # 六爻编码，第 i 位为第 i+1 爻，1 为阳
+    mask: int  # 变爻掩码
+    god6: int  # 六神轮转偏移，由日干决定
+
+
+def render_chart(chart: NajiaChart) -> Dict[str, Any]:
+    """
+    整数编码排盘 -> ``get_najia_result`` 中与时间无关的部分
+    
+    Args:
+        chart: 整数编码排盘
+        
+    Returns:
+        本卦、变卦、六爻与伏神（列表与字典均为新建）
+    """
+    gua = NAJIA_TABLE[chart.code]
+    mask = chart.mask
+    bian = NAJIA_BIAN_TABLE[chart.code | mask << 6] if mask else None
+    god6 = _GOD6_ORDERS[chart.god6]
+    return {
+        'original_hexagram': {
+            'name': gua.name,
+            'mark': gua.mark,
+            'gong': GUAS[gua.gong],
+            'type': gua.type,
+            'shiy': gua.shiy,
+        },
+        'changed_hexagram': bian.to_dict() if bian else None,
+        'lines': [
+            {
+                'position': i + 1,
+                'najia': gua.qinx[i],
+                'qin6': gua.qin6[i],
+                'god6': god6[5 - i],
+                'changing': bool(mask >> i & 1),
+            }
+            for i in range(6)
+        ],
+        'hidden': gua.hide.to_dict() if gua.hide else None,
+    }
+
+
+def _type_of(mark: str) -> str:
+    kind = _TYPE_BY_MARK.get(mark)
+    return get_type(mark) if kind is None else kind
+
+
+def verify_tables() -> int:
+    """
+    穷举校验查找表：全部 4096 组摇卦参数的查表结果与口诀计算逐项相同
+    
+    Returns:
+        校验的参数组数
+        
+    Raises:
+        AssertionError: 查表结果与口诀计算不一致
+    """
+    oracle = NajiaOracle()
+    checked = 0
+    for code in range(64):
+        gua = NAJIA_TABLE[code]
+        assert gua.type == get_type(gua.mark), gua.mark
+        assert list(gua.najia) == get_najia(gua.mark), gua.mark
+        for mask in range(64):
+            params = _code_params(code, mask)
+            expected = oracle._static_rules(params)
+            actual = oracle._static_table(params)
+            assert actual == expected, (params, actual, expected)
+            assert list(actual) == list(expected), params
+            for key in ('bian', 'hide'):
+                if expected[key] is not None:
+                    assert list(actual[key]) == list(expected[key]), (params, key)
+            checked += 1
+    return checked
+
+
+def shichen_bounds(date: datetime) -> Tuple[datetime, datetime]:
+    """
+    计算日期所在时辰的起止时间
+    
+    日柱在零点更替，因此子时按零点分为两段（23:00-24:00 与 00:00-01:00），
+    其余时辰为奇数点开始的两个小时。
+    
+    Args:
+        date: 起卦时间
+        
+    Returns:
+        (开始时间, 结束时间)，结束时间不含在该时辰内
+    """
+    start = date.replace(minute=0, second=0, microsecond=0)
+    if date.hour in (0, 23):
+        return start, start + timedelta(hours=1)
+    start = start.replace(hour=date.hour - (date.hour + 1) % 2)
+    return start, start + timedelta(hours=2)
+
+
+# 时辰干支缓存容量：每天 13 段，约十天
+DEFAULT_GANZHI_CACHE_SIZE = 128
+# 距时辰结束不足该秒数时，后台预取下一个时辰
+GANZHI_PREFETCH_SECONDS = 60.0
+
+
+def shichen_index(date: datetime) -> int:
+    """时辰序号：0 为零点后的子时，1-11 为丑时至亥时，12 为 23 点后的子时"""
+    return (date.hour + 1) // 2
+
+
+# 各时辰序号的结束时刻（当日零点起的秒数）
+_SHICHEN_END = tuple(min(2 * index + 1, 24) * 3600 for index in range(13))
+
+
+class GanZhiCache:
+    """
+    按时辰缓存四柱与旬空的 LRU 缓存（线程安全）
+    
+    键为 (日期, 时辰序号)。同一时辰内四柱只会在交节时改变：首次访问某个
+    时辰时计算其首尾两个时刻，相同则缓存该结果；时辰内交节的，记为
+    不缓存，之后按具体时间逐次计算。距时辰结束不足 ``prefetch_seconds``
+    秒时，在后台线程中预先计算下一个时辰。
+    """
+    
+    def __init__(self, compute: Callable[[datetime], Dict[str, Any]] = None,
+                 max_entries: int = DEFAULT_GANZHI_CACHE_SIZE,
+                 prefetch_seconds: float = GANZHI_PREFETCH_SECONDS):
+        """
+        创建空缓存
+        
+        Args:
+            compute: 计算四柱与旬空的函数，默认 ``compute_daily``
+            max_entries: 最多缓存的时辰数
+            prefetch_seconds: 时辰结束前多少秒开始预取下一个时辰，0 为不预取
+        """
+        self._compute = compute or compute_daily
+        self._max_entries = max_entries
+        self._prefetch_seconds = prefetch_seconds
+        # 值为 None 表示该时辰内交节
+        self._entries: "OrderedDict[Tuple[date_type, int], Optional[Dict[str, Any]]]" = OrderedDict()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.prefetches = 0
+    
+    def slot(self, date: datetime) -> Tuple[Tuple[date_type, int], Optional[Dict[str, Any]]]:
+        """
+        获取日期所在时辰的缓存结果（未缓存时计算并缓存）
+        
+        Args:
+            date: 起卦时间
+            
+        Returns:
+            (时辰键, 四柱与旬空)；时辰内交节时后者为 None
+        """
+        index = shichen_index(date)
+        key = (date.date(), index)
+        with self._lock:
+            cached = key in self._entries
+            if cached:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                value = self._entries[key]
+            else:
+                self.misses += 1
+        if not cached:
+            value = self._load(key, *shichen_bounds(date))
+        if self._prefetch_seconds:
+            remaining = _SHICHEN_END[index] - (date.hour * 3600 + date.minute * 60 + date.second)
+            if remaining <= self._prefetch_seconds:
+                self._prefetch(shichen_bounds(date)[1])
+        return key, value
+    
+    def daily(self, date: datetime) -> Dict[str, Any]:
+        """
+        计算日期的四柱与旬空，没有交节的时辰取自缓存
+        
+        Args:
+            date: 起卦时间
+            
+        Returns:
+            包含干支和旬空信息的新字典
+        """
+        if not self.enabled:
+            return self._compute(date)
+        _, value = self.slot(date)
+        if value is None:
+            return self._compute(date)
+        return {'xkong': value['xkong'], 'gz': dict(value['gz'])}
+    
+    def clear(self) -> None:
+        """清空缓存（保留统计）"""
+        with self._lock:
+            self._entries.clear()
+    
+    def info(self) -> Dict[str, Any]:
+        """
+        获取缓存统计
+        
+        Returns:
+            包含容量、命中、未命中、命中率、淘汰与预取次数的字典
+        """
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'size': len(self._entries),
+            'max_entries': self._max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'prefetches': self.prefetches,
+        }
+    
+    def _load(self, key: Tuple[date_type, int], start: datetime,
+              end: datetime) -> Optional[Dict[str, Any]]:
+        """计算时辰首尾的四柱并存入缓存，首尾不同（交节）时存 None"""
+        first = self._compute(start)
+        value = first if first == self._compute(end - timedelta(seconds=1)) else None
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+    
+    def _prefetch(self, start: datetime) -> None:
+        """在后台线程中计算从 ``start`` 开始的时辰"""
+        _, end = shichen_bounds(start)
+        key = (start.date(), shichen_index(start))
+        with self._lock:
+            if key in self._entries or key in self._pending:
+                return
+            self._pending.add(key)
+        
+        def load() -> None:
+            try:
+                self._load(key, start, end)
+                self.prefetches += 1
+            except Exception as e:
+                logger.warning(f"预取时辰干支失败: {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+        
+        threading.Thread(target=load, name="ganzhi-prefetch", daemon=True).start()
+
+
+# 进程内共用的时辰干支缓存
+ganzhi_cache = GanZhiCache()
+
+
+def ganzhi_hour_key(date: datetime) -> Optional[Tuple[date_type, int]]:
+    """
+    获取可代表日期四柱与旬空的时辰键
+    
+    同一时辰内年、月、日、时四柱只会在交节时改变；没有交节的时辰内
+    排盘所用的干支与旬空完全相同，可按时辰缓存排盘结果。
+    
+    Args:
+        date: 起卦时间
+        
+    Returns:
+        时辰键 (日期, 时辰序号)；时辰内交节（四柱不唯一）时为 None
+    """
+    key, value = ganzhi_cache.slot(date)
+    return key if value is not None else None
@@ -0,0 +1,125 @@
+"""
+Whole-response cache of divination readings.
+
+Apart from the question and the timestamp, the body of a ``/divination`` or
+``/divination/manual`` response only depends on the cast, the field
+projection and, with ``include_najia``, on the 时辰 of the reading and on
+which 用神 keywords the question contains. The cache keeps the encoded body
+of such a key with the question-dependent parts cut out; a hit is served by
+splicing the question and timestamp back in (see
+``reading_view.splice_divination_body``).
+
+Each corpus owns its cache, so a reload drops it together with the corpus.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+
+
+# 每个语料缓存的响应数与字节数上限：完整响应约 10-20 KB
+DEFAULT_READING_CACHE_SIZE = 2048
+DEFAULT_READING_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class CachedReading(NamedTuple):
+    """
+    Encoded response of one reading without its question and timestamp.
+    """
+    # 响应开头到 lines 为止的 JSON（不含结尾的 ``}``）
+    head: bytes
+    # 解读中问题行之后的部分，已按 JSON 字符串转义，不含引号
+    interpretation: bytes
+
+
+class ReadingCache:
+    """
+    Bounded, thread-safe LRU cache of encoded readings.
+
+    Entries are evicted oldest first when either the number of entries or
+    their total size exceeds its limit.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_READING_CACHE_SIZE,
+                 max_bytes: int = DEFAULT_READING_CACHE_BYTES):
+        """
+        Create an empty cache.
+
+        Args:
+            max_entries: Maximum number of readings kept
+            max_bytes: Maximum total size of the kept readings
+        """
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CachedReading]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[CachedReading]:
+        """
+        Look up a reading and mark it as recently used.
+
+        Args:
+            key: Reading key built by the caller
+
+        Returns:
+            The cached reading, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, entry: CachedReading) -> None:
+        """
+        Store a reading, evicting the least recently used ones over the limits.
+
+        Args:
+            key: Reading key built by the caller
+            entry: Encoded reading
+        """
+        size = len(entry.head) + len(entry.interpretation)
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.head) + len(previous.interpretation)
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.head) + len(evicted.interpretation)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Drop every entry (the counters are kept).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def info(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with size, bytes, limits, hits, misses and evictions
+        """
+        return {
+            "size": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self._max_entries,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
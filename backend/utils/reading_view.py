@@ -0,0 +1,365 @@
+"""
+Read-only per-reading views over cached hexagram data.
+
+The hexagrams held by ``HexagramDataManager`` are shared by every request and
+must never be modified. A reading only differs from the cached hexagram in
+which lines are yang/yin and which of them are changing, so the views below
+keep a reference to the cached objects and overlay just those bits.
+
+Responses are encoded from the catalogue's pre-serialized fragments: only
+the trigrams and the position/type/changing head of each line are encoded
+per reading.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from models.schemas import Line
+from .casting import cast_lines_json, cast_values_json
+from .catalogue_cache import PROJECTABLE_FIELDS, CatalogueCache, HexagramFragments, encode_json
+from .interpretation_templates import QUESTION_PREFIX
+from .lazy_hexagram import LazyHexagram
+from .reading_cache import CachedReading
+
+
+# 语料中缺少爻辞时使用的空爻模板（仅在序列化时浅拷贝）
+_EMPTY_LINE_PAYLOAD: Dict[str, Any] = Line(position=1, type='yang').model_dump()
+_EMPTY_LINE_TAIL: bytes = encode_json(
+    {key: value for key, value in _EMPTY_LINE_PAYLOAD.items()
+     if key not in ('position', 'type', 'changing')}
+)[1:-1]
+
+
+class LineView:
+    """
+    Read-only view of one line of a reading.
+
+    ``position``, ``type`` and ``changing`` come from the reading; every other
+    attribute (text, explanation, image, ...) is read from the cached line,
+    which is only hydrated into models when such an attribute is accessed.
+    """
+
+    __slots__ = ('position', 'type', 'changing', '_hexagram', '_payload')
+
+    def __init__(self, position: int, yang: bool, changing: bool,
+                 hexagram: Optional[LazyHexagram], payload: Optional[Dict[str, Any]]):
+        self.position = position
+        self.type = 'yang' if yang else 'yin'
+        self.changing = changing
+        self._hexagram = hexagram
+        self._payload = payload
+
+    def __getattr__(self, name: str) -> Any:
+        hexagram = self._hexagram
+        if hexagram is None:
+            return _EMPTY_LINE_PAYLOAD.get(name, "")
+        return getattr(hexagram.lines[self.position - 1], name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the line, sharing the cached text objects.
+
+        Returns:
+            Dictionary in the shape of ``Line.model_dump()``
+        """
+        data = dict(self._payload if self._payload is not None else _EMPTY_LINE_PAYLOAD)
+        data['position'] = self.position
+        data['type'] = self.type
+        data['changing'] = self.changing
+        return data
+
+    def to_json(self, fragments: HexagramFragments) -> bytes:
+        """
+        Encode the line, reusing the cached encoding of its texts.
+
+        Args:
+            fragments: Encoded fragments of the reading's hexagram
+
+        Returns:
+            JSON bytes equal to encoding ``to_dict()``
+        """
+        tail = _EMPTY_LINE_TAIL if self._payload is None else fragments.line_tail(self.position)
+        if tail is None:
+            return encode_json(self.to_dict())
+        head = b'{"position":%d,"type":"%s","changing":%s' % (
+            self.position, self.type.encode('ascii'), b'true' if self.changing else b'false'
+        )
+        return b''.join((head, b',', tail, b'}')) if tail else head + b'}'
+
+
+class HexagramReading:
+    """
+    Read-only view of a hexagram as it appears in one reading.
+
+    Attribute access falls through to the cached ``LazyHexagram``; the
+    trigrams and lines are derived from the 6-bit line code and the changing
+    mask.
+    """
+
+    __slots__ = ('hexagram', 'code', 'changing_mask', '_lines')
+
+    def __init__(self, hexagram: LazyHexagram, code: int, changing_mask: int = 0):
+        """
+        Create a reading view.
+
+        Args:
+            hexagram: Cached hexagram record (never modified)
+            code: 6-bit line code, bit ``i`` set when line ``i + 1`` is yang
+            changing_mask: 6-bit mask, bit ``i`` set when line ``i + 1`` changes
+        """
+        self.hexagram = hexagram
+        self.code = code
+        self.changing_mask = changing_mask
+        self._lines: Optional[Tuple[LineView, ...]] = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.hexagram, name)
+
+    @property
+    def upperTrigram(self) -> str:
+        return ''.join('1' if self.code >> i & 1 else '0' for i in range(3, 6))
+
+    @property
+    def lowerTrigram(self) -> str:
+        return ''.join('1' if self.code >> i & 1 else '0' for i in range(3))
+
+    @property
+    def lines(self) -> Tuple[LineView, ...]:
+        if self._lines is None:
+            line_payloads = self.hexagram.section('lines')
+            hexagram = self.hexagram if len(line_payloads) == 6 else None
+            self._lines = tuple(
+                LineView(
+                    position=i + 1,
+                    yang=bool(self.code >> i & 1),
+                    changing=bool(self.changing_mask >> i & 1),
+                    hexagram=hexagram,
+                    payload=line_payloads[i] if hexagram else None,
+                )
+                for i in range(6)
+            )
+        return self._lines
+
+    @property
+    def changing_positions(self) -> List[int]:
+        return [i + 1 for i in range(6) if self.changing_mask >> i & 1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the reading by overlaying the per-reading fields on the
+        cached record. Only the top-level and line dictionaries are new;
+        every text value is shared with the cache.
+
+        Returns:
+            Dictionary in the shape of ``Hexagram.model_dump()``
+        """
+        data = self.hexagram.model_dump()
+        data['upperTrigram'] = self.upperTrigram
+        data['lowerTrigram'] = self.lowerTrigram
+        data['lines'] = [line.to_dict() for line in self.lines]
+        return data
+
+    def to_json(self, fragments: HexagramFragments, mask: Optional[int] = None) -> bytes:
+        """
+        Encode the reading from the cached fragments of its hexagram.
+
+        Args:
+            fragments: Encoded fragments of ``self.hexagram``
+            mask: Field projection from ``projection_mask`` (None for every field)
+
+        Returns:
+            JSON bytes equal to encoding ``to_dict()`` restricted to the mask
+        """
+        parts = []
+        for index, field in enumerate(PROJECTABLE_FIELDS):
+            if mask is not None and not mask >> index & 1:
+                continue
+            if field == 'upperTrigram' or field == 'lowerTrigram':
+                parts.append(b'"%s":"%s"' % (field.encode('ascii'), getattr(self, field).encode('ascii')))
+            elif field == 'lines':
+                parts.append(b'"lines":[' + b','.join(line.to_json(fragments) for line in self.lines) + b']')
+            else:
+                fragment = fragments.field(index)
+                if fragment is not None:
+                    parts.append(fragment)
+        return b'{' + b','.join(parts) + b'}'
+
+
+def encode_reading_head(
+    original: HexagramReading,
+    changed: Optional[HexagramReading],
+    cast: int,
+    catalogue: CatalogueCache,
+    mask: Optional[int] = None
+) -> bytes:
+    """
+    Encode the question-independent start of a ``DivinationResult`` body.
+
+    Args:
+        original: Primary hexagram reading
+        changed: Changed hexagram reading (if any)
+        cast: 12-bit cast of the six lines (see ``utils.casting``)
+        catalogue: Catalogue of the corpus the readings come from
+        mask: Field projection of both hexagrams (None for every field)
+
+    Returns:
+        JSON bytes from the opening brace through ``lines`` (unterminated)
+    """
+    return b''.join((
+        b'{"originalHexagram":',
+        original.to_json(catalogue.fragments(original.hexagram), mask),
+        b',"changedHexagram":',
+        changed.to_json(catalogue.fragments(changed.hexagram), mask) if changed is not None else b'null',
+        b',"lines":',
+        cast_lines_json(cast),
+    ))
+
+
+def _encode_tail(tail: Dict[str, Any]) -> bytes:
+    """Encode a dict as the members of an enclosing object, with a leading comma."""
+    return b',' + encode_json(tail)[1:-1]
+
+
+def build_divination_body(
+    original: HexagramReading,
+    changed: Optional[HexagramReading],
+    cast: int,
+    question: str,
+    timestamp: datetime,
+    interpretation: str,
+    catalogue: CatalogueCache,
+    mask: Optional[int] = None,
+    method: Optional[str] = None,
+    rng: Optional[str] = None,
+    seed: Optional[int] = None
+) -> bytes:
+    """
+    Encode a response body in the shape of ``DivinationResult``.
+
+    The hexagrams are assembled from the catalogue's pre-serialized
+    fragments, optionally projected to the fields of ``mask``.
+
+    Args:
+        original: Primary hexagram reading
+        changed: Changed hexagram reading (if any)
+        cast: 12-bit cast of the six lines (see ``utils.casting``)
+        question: Original question
+        timestamp: Divination timestamp
+        interpretation: Complete interpretation
+        catalogue: Catalogue of the corpus the readings come from
+        mask: Field projection of both hexagrams (None for every field)
+        method: Casting method (None for manual readings, which omit method/rng/seed)
+        rng: Random generator of the cast (None for deterministic methods)
+        seed: Seed that replays the cast
+
+    Returns:
+        JSON bytes ready for a ``Response``
+    """
+    tail: Dict[str, Any] = {
+        'question': question,
+        'timestamp': timestamp.isoformat(),
+        'interpretation': interpretation,
+    }
+    if method is not None:
+        tail['method'] = method
+        tail['rng'] = rng
+        tail['seed'] = seed
+    return b''.join((encode_reading_head(original, changed, cast, catalogue, mask), _encode_tail(tail), b'}'))
+
+
+def splice_divination_body(
+    reading: CachedReading,
+    question: str,
+    timestamp: datetime,
+    method: Optional[str] = None,
+    rng: Optional[str] = None,
+    seed: Optional[int] = None
+) -> bytes:
+    """
+    Complete a cached reading into a ``DivinationResult`` body.
+
+    Produces the same bytes as ``build_divination_body`` for the reading's
+    hexagrams and an interpretation starting with the question line.
+
+    Args:
+        reading: Cached head and question-independent interpretation
+        question: Original question
+        timestamp: Divination timestamp
+        method: Casting method (None for manual readings, which omit method/rng/seed)
+        rng: Random generator of the cast (None for deterministic methods)
+        seed: Seed that replays the cast
+
+    Returns:
+        JSON bytes ready for a ``Response``
+    """
+    parts = [
+        reading.head,
+        _encode_tail({'question': question, 'timestamp': timestamp.isoformat()}),
+        b',"interpretation":"',
+        encode_json(QUESTION_PREFIX + question)[1:-1],
+        reading.interpretation,
+        b'"',
+    ]
+    if method is not None:
+        parts.append(_encode_tail({'method': method, 'rng': rng, 'seed': seed}))
+    parts.append(b'}')
+    return b''.join(parts)
+
+
+def iter_batch_readings(
+    casts: Sequence[int],
+    questions: Optional[Sequence[str]],
+    catalogue: CatalogueCache
+) -> Iterator[bytes]:
+    """
+    Encode batch readings one by one in the shape of ``BatchDivinationReading``.
+
+    The hexagram part of every reading comes from the catalogue's per-cast
+    summaries, so a reading only encodes its question.
+
+    Args:
+        casts: 12-bit casts
+        questions: Question of each cast (None for anonymous casts)
+        catalogue: Catalogue of the corpus the readings come from
+
+    Yields:
+        JSON object bytes, one per cast
+    """
+    summary = catalogue.reading_summary
+    if questions is None:
+        for cast in casts:
+            yield b''.join((b'{"lines":', cast_values_json(cast), b',', summary(cast)))
+        return
+    for cast, question in zip(casts, questions):
+        yield b''.join((
+            b'{"question":', encode_json(question),
+            b',"lines":', cast_values_json(cast), b',', summary(cast),
+        ))
+
+
+def build_batch_body(
+    casts: Sequence[int],
+    questions: Optional[Sequence[str]],
+    catalogue: CatalogueCache,
+    rng: str,
+    seed: Optional[int] = None
+) -> bytes:
+    """
+    Encode a response body in the shape of ``BatchDivinationResponse``.
+
+    Args:
+        casts: 12-bit casts
+        questions: Question of each cast (None for anonymous casts)
+        catalogue: Catalogue of the corpus the readings come from
+        rng: Random generator of the casts
+        seed: Seed that replays the batch
+
+    Returns:
+        JSON bytes ready for a ``Response``
+    """
+    return b''.join((
+        b'{"readings":[',
+        b','.join(iter_batch_readings(casts, questions, catalogue)),
+        b'],',
+        encode_json({'total': len(casts), 'rng': rng, 'seed': seed})[1:],
+    ))
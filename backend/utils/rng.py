@@ -0,0 +1,183 @@
+"""
+Per-request random generators for casting.
+
+Every reading draws from its own generator instead of the module-level
+``random`` state shared with every other request:
+
+- ``seeded``: a fresh (or client supplied) seed. A single reading draws
+  from a ``SplitMix64`` over the seed, which is set up by storing one
+  integer; a batch draws from a Mersenne Twister seeded once for the whole
+  batch. The seed is returned with the reading; casting again with the same
+  seed reproduces the reading exactly.
+- ``secure``: ``secrets.SystemRandom`` (the operating system CSPRNG). Not
+  replayable.
+"""
+
+import random
+import secrets
+from typing import Optional, Tuple
+
+from .casting_engines import DEFAULT_METHOD, get_engine
+
+
+RNG_MODES: Tuple[str, ...] = ("seeded", "secure")
+DEFAULT_RNG = "seeded"
+
+# 种子不超过 2^53，前端（JavaScript Number）可以原样传回
+SEED_BITS = 53
+MAX_SEED = (1 << SEED_BITS) - 1
+
+# SystemRandom 没有内部状态，所有请求共用一个实例即可
+_SECURE = secrets.SystemRandom()
+
+_MASK64 = (1 << 64) - 1
+
+
+class SplitMix64(random.Random):
+    """
+    SplitMix64 generator for single seeded readings.
+
+    Seeding a Mersenne Twister expands the seed into 624 words, several
+    times the cost of the few random bits a reading needs. SplitMix64 keeps
+    a 64-bit counter and mixes it on every draw, so seeding only stores the
+    seed. Only ``getrandbits`` and ``random`` are native; the other
+    ``random.Random`` methods are built on them.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        # 不经 random.Random.__init__，避免初始化梅森旋转的状态
+        self.seed(seed)
+
+    def seed(self, a: Optional[int] = None, version: int = 2) -> None:
+        self._state = (new_seed() if a is None else a) & _MASK64
+        self.gauss_next = None
+
+    def _next(self) -> int:
+        self._state = z = (self._state + 0x9E3779B97F4A7C15) & _MASK64
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+        return z ^ (z >> 31)
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("位数不能为负")
+        if k <= 64:
+            return self._next() >> (64 - k)
+        # 超过 64 位时按小端拼接多个输出，不足 64 位的最高一段取输出的高位
+        words, rest = divmod(k, 64)
+        bits = 0
+        for shift in range(0, 64 * words, 64):
+            bits |= self._next() << shift
+        if rest:
+            bits |= (self._next() >> (64 - rest)) << (64 * words)
+        return bits
+
+    def random(self) -> float:
+        return (self._next() >> 11) * (1.0 / (1 << 53))
+
+    def getstate(self) -> Tuple[int, int]:
+        return (self._state, self.gauss_next)
+
+    def setstate(self, state: Tuple[int, int]) -> None:
+        self._state, self.gauss_next = state
+
+
+def new_seed() -> int:
+    """
+    Draw a fresh seed from the operating system CSPRNG.
+
+    Returns:
+        Seed in ``[0, MAX_SEED]``
+    """
+    return secrets.randbits(SEED_BITS)
+
+
+def _replay_seed(seed: Optional[int]) -> int:
+    if seed is None:
+        return new_seed()
+    if not 0 <= seed <= MAX_SEED:
+        raise ValueError(f"种子必须在 0 到 {MAX_SEED} 之间")
+    return seed
+
+
+def reading_rng(mode: str = DEFAULT_RNG, seed: Optional[int] = None) -> Tuple[random.Random, Optional[int]]:
+    """
+    Create the generator of one request.
+
+    Args:
+        mode: ``seeded`` or ``secure``
+        seed: Seed to replay (seeded mode only; a fresh one is drawn if None)
+
+    Returns:
+        (generator, seed), with seed None in secure mode
+
+    Raises:
+        ValueError: If the mode is unknown, the seed is out of range or a
+            seed is given in secure mode
+    """
+    if mode == "seeded":
+        seed = _replay_seed(seed)
+        return SplitMix64(seed), seed
+    if mode != "secure":
+        raise ValueError(f"未知的随机数生成器: {mode}，可选值: {', '.join(RNG_MODES)}")
+    if seed is not None:
+        raise ValueError("secure 模式不可重放，不能指定种子")
+    return _SECURE, None
+
+
+def _random_engine(method: str):
+    engine = get_engine(method)
+    if not engine.uses_rng:
+        raise ValueError(f"起卦方法 {engine.name} 不使用随机数")
+    return engine
+
+
+def cast_reading(mode: str = DEFAULT_RNG, seed: Optional[int] = None,
+                 method: str = DEFAULT_METHOD) -> Tuple[int, Optional[int]]:
+    """
+    Cast one reading with a random casting engine.
+
+    Args:
+        mode: ``seeded`` or ``secure``
+        seed: Seed to replay (seeded mode only)
+        method: Name of a random casting engine (three coins by default)
+
+    Returns:
+        (12-bit cast, seed), with seed None in secure mode
+
+    Raises:
+        ValueError: If the mode, the seed or the method is invalid
+    """
+    if mode == "seeded":
+        seed = _replay_seed(seed)
+        # SplitMix64 播种只需保存种子，重放与新读数的开销相同，无需缓存
+        return _random_engine(method).cast(SplitMix64(seed)), seed
+    engine = _random_engine(method)
+    rng, _ = reading_rng(mode, seed)
+    return engine.cast(rng), None
+
+
+def cast_readings(count: int, mode: str = DEFAULT_RNG, seed: Optional[int] = None,
+                  method: str = DEFAULT_METHOD) -> Tuple[Tuple[int, ...], Optional[int]]:
+    """
+    Cast many readings from one generator.
+
+    Args:
+        count: Number of readings
+        mode: ``seeded`` or ``secure``
+        seed: Seed to replay (seeded mode only)
+        method: Name of a random casting engine (three coins by default)
+
+    Returns:
+        (casts, seed), with seed None in secure mode
+
+    Raises:
+        ValueError: If the mode, the seed or the method is invalid
+    """
+    engine = _random_engine(method)
+    if mode == "seeded":
+        seed = _replay_seed(seed)
+        # 批量起卦一次生成全部随机位，梅森旋转的播种开销由整批分摊
+        return tuple(engine.cast_batch(count, random.Random(seed))), seed
+    rng, _ = reading_rng(mode, seed)
+    return tuple(engine.cast_batch(count, rng)), None
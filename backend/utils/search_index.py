@@ -0,0 +1,320 @@
+"""
+Character n-gram inverted index for full-text hexagram search.
+
+Every searchable text of a corpus (names, 卦辞, 象辞, line texts,
+interpretations, fortune/career/... fields) is folded with ``fold_text`` and
+split into character unigrams and bigrams. Each n-gram maps to a 64-bit mask
+of the hexagrams containing it, so a query is answered by AND-ing a few
+small integers and then confirming the phrase in the candidates' folded text.
+
+Only the folded text is kept; snippets are cut from the original text, which
+is re-read from the corpus (one field per hit) for the hits of a page.
+"""
+
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .zh_fold import fold_text
+
+
+# 字段权重：卦名命中最重要，其次卦辞、象辞、白话解释，最后是各家解读
+FIELD_WEIGHTS: Dict[str, int] = {
+    "name": 10,
+    "chineseName": 10,
+    "kingWen": 5,
+    "image": 4,
+    "description": 3,
+    "fortune": 2,
+    "love": 2,
+    "career": 2,
+    "health": 2,
+    "advice": 2,
+    "lines": 2,
+    "interpretations": 1,
+}
+
+NAME_FIELDS: Tuple[str, ...] = ("name", "chineseName")
+
+# 字段之间的分隔符，保证短语匹配不会跨字段
+_FIELD_SEPARATOR = "\x00"
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """A ranked search result with a highlighted snippet."""
+    number: int
+    score: int
+    field: str
+    snippet: str
+
+
+class _Entry(NamedTuple):
+    """One searchable text of one hexagram, as a span of its folded document."""
+    field: str
+    weight: int
+    start: int
+    end: int
+
+
+def _iter_strings(value: Any, path: str) -> Iterator[Tuple[str, str]]:
+    """Yield (path, text) for every non-empty string nested in ``value``."""
+    if isinstance(value, str):
+        if value:
+            yield path, value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from _iter_strings(item, f"{path}.{key}")
+    elif isinstance(value, list):
+        for item in value:
+            yield from _iter_strings(item, path)
+
+
+def extract_texts(payload: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """
+    Collect the searchable texts of one serialized hexagram.
+
+    Args:
+        payload: ``Hexagram.model_dump()`` output
+
+    Returns:
+        (field, text) pairs in a stable order
+    """
+    texts: List[Tuple[str, str]] = []
+    for field in ("name", "chineseName", "description", "fortune", "love",
+                  "career", "health", "advice"):
+        value = payload.get(field)
+        if value:
+            texts.append((field, value))
+    for field in ("kingWen", "image"):
+        texts.extend((field, text) for _, text in _iter_strings(payload.get(field), field))
+    for i, line in enumerate(payload.get("lines") or [], 1):
+        for key in ("text", "explanation"):
+            if line.get(key):
+                texts.append((f"lines.{i}", line[key]))
+        texts.extend((f"lines.{i}", text) for _, text in _iter_strings(line.get("image"), ""))
+    texts.extend(_iter_strings(payload.get("interpretations"), "interpretations"))
+    return texts
+
+
+def _fold_document(texts: List[Tuple[str, str]]) -> Tuple[str, List[_Entry]]:
+    """Fold the texts of one hexagram into one document and its field spans."""
+    parts = []
+    entries = []
+    position = 0
+    for field, text in texts:
+        folded = fold_text(text)
+        weight = FIELD_WEIGHTS.get(field.split(".", 1)[0], 1)
+        entries.append(_Entry(sys.intern(field), weight, position, position + len(folded)))
+        parts.append(folded)
+        position += len(folded) + len(_FIELD_SEPARATOR)
+    return _FIELD_SEPARATOR.join(parts), entries
+
+
+def _ngrams(folded: str) -> Iterator[str]:
+    """Yield the unigrams and bigrams of a folded text, skipping whitespace."""
+    previous = ""
+    for char in folded:
+        if char.isspace() or char == _FIELD_SEPARATOR:
+            previous = ""
+            continue
+        yield char
+        if previous:
+            yield previous + char
+        previous = char
+
+
+def _gram_code(gram: str) -> int:
+    """Encode a unigram or bigram as an integer (bigrams never collide with unigrams)."""
+    if len(gram) == 1:
+        return ord(gram)
+    return ord(gram[0]) << 21 | ord(gram[1])
+
+
+def _query_grams(term: str) -> List[str]:
+    """N-grams a document must contain to possibly match ``term``."""
+    grams = list(_ngrams(term))
+    bigrams = [gram for gram in grams if len(gram) == 2]
+    return bigrams or grams
+
+
+def _snippet(text: str, start: int, length: int, context: int) -> str:
+    """Cut a window around a match and wrap the match in <mark>."""
+    end = start + length
+    left = max(0, start - context)
+    right = min(len(text), end + context * 2)
+    return "".join((
+        "…" if left > 0 else "",
+        text[left:start],
+        "<mark>", text[start:end], "</mark>",
+        text[end:right],
+        "…" if right < len(text) else "",
+    ))
+
+
+class HexagramSearchIndex:
+    """
+    Inverted index over the texts of one corpus.
+    """
+
+    def __init__(self, numbers: Sequence[int], payloads: Sequence[Dict[str, Any]],
+                 field_of: Callable[[int, str], Any], snippet_context: int = 16):
+        """
+        Build the index.
+
+        Args:
+            numbers: Hexagram numbers in corpus order
+            payloads: Serialized hexagrams (``model_dump()``) in the same order
+            field_of: Returns the serialized value of a top-level field of
+                the hexagram at a position, used to cut snippets from the
+                original text
+            snippet_context: Characters of context kept before a match in snippets
+        """
+        self._numbers = list(numbers)
+        self._field_of = field_of
+        self._snippet_context = snippet_context
+        self._folded_docs: List[str] = []
+        self._entries: List[List[_Entry]] = []
+        self._starts: List[List[int]] = []
+
+        postings: Dict[str, int] = {}
+        for doc, payload in enumerate(payloads):
+            folded, entries = _fold_document(extract_texts(payload))
+            self._folded_docs.append(folded)
+            self._entries.append(entries)
+            self._starts.append([entry.start for entry in entries])
+            bit = 1 << doc
+            for gram in set(_ngrams(folded)):
+                postings[gram] = postings.get(gram, 0) | bit
+        # 倒排表压缩为两个有序数组（n-gram 编码、文档掩码），比字典少占一个数量级的内存
+        keys = sorted(postings, key=_gram_code)
+        self._gram_codes = array("Q", (_gram_code(gram) for gram in keys))
+        masks = [postings[gram] for gram in keys]
+        self._gram_masks = array("Q", masks) if len(self._numbers) <= 64 else masks
+        self._all_docs = (1 << len(self._numbers)) - 1
+
+    def _posting(self, gram: str) -> int:
+        """Bit mask of the documents containing an n-gram."""
+        code = _gram_code(gram)
+        i = bisect_left(self._gram_codes, code)
+        if i < len(self._gram_codes) and self._gram_codes[i] == code:
+            return self._gram_masks[i]
+        return 0
+
+    @staticmethod
+    def _terms(query: str) -> List[str]:
+        return [term for term in fold_text(query).split() if term]
+
+    def _candidates(self, terms: List[str]) -> int:
+        """Bit mask of documents containing every n-gram of every term."""
+        mask = self._all_docs
+        for term in terms:
+            for gram in _query_grams(term):
+                mask &= self._posting(gram)
+                if not mask:
+                    return 0
+        return mask
+
+    def _iter_docs(self, mask: int) -> Iterator[int]:
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def search(self, query: str, limit: Optional[int] = 10, offset: int = 0,
+               fields: Optional[Sequence[str]] = None) -> Tuple[int, List[SearchHit]]:
+        """
+        Run a ranked full-text query.
+
+        Whitespace separates terms; every term must occur in a hexagram for it
+        to match. Matching folds Traditional/Simplified and ASCII case.
+
+        Args:
+            query: Search text
+            limit: Maximum number of hits to return (None for all)
+            offset: Number of ranked hits to skip
+            fields: Restrict matching to these top-level fields (optional)
+
+        Returns:
+            (total number of matching hexagrams, ranked hits of the page)
+        """
+        terms = self._terms(query)
+        if not terms:
+            return 0, []
+
+        scored: List[Tuple[int, int, int]] = []
+        for doc in self._iter_docs(self._candidates(terms)):
+            folded_doc = self._folded_docs[doc]
+            if not all(term in folded_doc for term in terms):
+                continue
+
+            # 逐个定位命中位置并归入所在字段，无需遍历文档的全部字段
+            entries = self._entries[doc]
+            starts = self._starts[doc]
+            entry_scores: Dict[int, int] = {}
+            matched_all = True
+            for term in terms:
+                matched = False
+                found = folded_doc.find(term)
+                while found >= 0:
+                    position = bisect_right(starts, found) - 1
+                    entry = entries[position]
+                    if fields is None or entry.field.split(".", 1)[0] in fields:
+                        matched = True
+                        entry_scores[position] = entry_scores.get(position, 0) + entry.weight
+                    found = folded_doc.find(term, found + len(term))
+                if not matched:
+                    matched_all = False
+                    break
+            if matched_all:
+                best = min(entry_scores, key=lambda position: (-entry_scores[position], position))
+                scored.append((sum(entry_scores.values()), doc, best))
+
+        scored.sort(key=lambda item: (-item[0], self._numbers[item[1]]))
+        page = scored[offset:] if limit is None else scored[offset:offset + limit]
+        return len(scored), [self._hit(score, doc, position, terms)
+                             for score, doc, position in page]
+
+    def _hit(self, score: int, doc: int, position: int, terms: List[str]) -> SearchHit:
+        """Build a hit, cutting the snippet from the original text."""
+        entry = self._entries[doc][position]
+        folded_doc = self._folded_docs[doc]
+        for term in terms:
+            start = folded_doc.find(term, entry.start, entry.end)
+            if start >= 0:
+                break
+        # 只重新读取命中的顶层字段；同一字段的文本按相同顺序抽取
+        top = entry.field.split(".", 1)[0]
+        ordinal = sum(1 for other in self._entries[doc][:position]
+                      if other.field.split(".", 1)[0] == top)
+        text = extract_texts({top: self._field_of(doc, top)})[ordinal][1]
+        # 折叠不改变长度，折叠文本中的位置即原文中的位置
+        return SearchHit(
+            number=self._numbers[doc],
+            score=score,
+            field=entry.field,
+            snippet=_snippet(text, start - entry.start, len(term), self._snippet_context),
+        )
+
+    def match_docs(self, query: str, fields: Sequence[str]) -> List[int]:
+        """
+        Positions of the hexagrams whose ``fields`` contain the query.
+
+        Args:
+            query: Text to look for (folded as a whole, not split into terms)
+            fields: Top-level fields to match against
+
+        Returns:
+            Matching positions in corpus order
+        """
+        term = fold_text(query)
+        if not term.strip():
+            return []
+        return [
+            doc for doc in self._iter_docs(self._candidates([term]))
+            if any(entry.field in fields
+                   and self._folded_docs[doc].find(term, entry.start, entry.end) >= 0
+                   for entry in self._entries[doc])
+        ]
@@ -0,0 +1,349 @@
+"""
+Vectorized Monte Carlo statistics of the casting engines.
+
+Casts are drawn with NumPy over the same bit-packed representation the
+engines use: every reading is ``2 * half_bits`` uniform random bits resolved
+by two lookups in the engine's ``half_table`` into a 12-bit cast. The
+simulation only keeps the 4096-bin histogram of the casts; every reported
+distribution (line values, number of changing lines, hexagram, changed
+hexagram, palace, palace type) is aggregated from it and compared, with a
+chi-square test, with the exact probabilities implied by the engine's
+theoretical line odds (``line_odds``: six independent lines), not by the
+table being sampled. ``check_half_table`` verifies the table itself against
+those odds exactly, and ``check_cast_batch`` tests the engine's own
+``cast_batch`` against them.
+
+NumPy is an optional dependency: without it ``simulate`` raises
+``RuntimeError``.
+"""
+
+import math
+import random
+import time
+from collections import Counter
+from fractions import Fraction
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # 统计模拟需要 NumPy，其余功能不受影响
+    np = None
+
+from .casting_engines import CastingEngine, get_engine
+from .hexagram_data import hexagram_manager
+from .najia_oracle import GUAS, get_type, palace, set_shi_yao
+from .rng import new_seed
+
+
+DEFAULT_CASTS = 1_000_000
+MAX_CASTS = 100_000_000
+# 每批抽样的卦数，限制内存占用（约 6 字节/卦）
+CHUNK_CASTS = 1 << 22
+
+LINE_VALUES = (6, 7, 8, 9)
+# 按 (是否阳爻 | 是否变爻 << 1) 索引的爻值序号（LINE_VALUES 中的位置）：少阴、少阳、老阴、老阳
+_LINE_KIND_TO_VALUE_INDEX = (2, 1, 0, 3)
+PALACE_TYPES = ("本宫", "一世", "二世", "三世", "四世", "五世", "游魂", "归魂")
+
+
+def _chi_square_sf(statistic: float, dof: int) -> float:
+    """
+    Survival function of the chi-square distribution (p-value of a test).
+
+    Regularized upper incomplete gamma ``Q(dof / 2, statistic / 2)``: series
+    expansion below ``a + 1``, continued fraction (Lentz) above.
+    """
+    if dof <= 0:
+        return 1.0
+    a, x = dof / 2.0, statistic / 2.0
+    if x <= 0:
+        return 1.0
+    log_prefix = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1:
+        term = total = 1.0 / a
+        n = a
+        while abs(term) > abs(total) * 1e-15:
+            n += 1
+            term *= x / n
+            total += term
+        return max(0.0, 1.0 - total * math.exp(log_prefix))
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1.0 / tiny
+    d = 1.0 / b
+    h = d
+    for i in range(1, 10000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return min(1.0, h * math.exp(log_prefix))
+
+
+def chi_square(observed: Sequence[float], probabilities: Sequence[float]) -> Tuple[float, int, float]:
+    """
+    Pearson chi-square goodness-of-fit test.
+
+    Args:
+        observed: Observed count of every bin
+        probabilities: Theoretical probability of every bin
+
+    Returns:
+        (statistic, degrees of freedom, p-value); bins with probability 0 are
+        left out of the test
+    """
+    total = float(sum(observed))
+    statistic = 0.0
+    bins = 0
+    for count, p in zip(observed, probabilities):
+        if p <= 0:
+            continue
+        expected = total * p
+        statistic += (count - expected) ** 2 / expected
+        bins += 1
+    dof = bins - 1
+    return statistic, dof, _chi_square_sf(statistic, dof)
+
+
+def _line_odds(engine: CastingEngine) -> Tuple[Fraction, ...]:
+    if engine.line_odds is None:
+        raise ValueError(f"起卦方法 {engine.name} 没有理论爻值概率")
+    return engine.line_odds
+
+
+def _kind_odds(engine: CastingEngine) -> List[Fraction]:
+    """Odds of a line by kind (是否阳爻 | 是否变爻 << 1)."""
+    odds = _line_odds(engine)
+    return [odds[_LINE_KIND_TO_VALUE_INDEX[kind]] for kind in range(4)]
+
+
+def cast_probabilities(engine: CastingEngine) -> List[float]:
+    """
+    Exact probability of every 12-bit cast from the engine's line odds.
+
+    Args:
+        engine: Engine with ``line_odds``
+
+    Returns:
+        4096 probabilities indexed by cast
+
+    Raises:
+        ValueError: If the engine has no line odds
+    """
+    kind_odds = [float(p) for p in _kind_odds(engine)]
+    probabilities = []
+    for cast in range(4096):
+        p = 1.0
+        for i in range(6):
+            p *= kind_odds[(cast >> i & 1) | (cast >> (6 + i) & 1) << 1]
+        probabilities.append(p)
+    return probabilities
+
+
+def check_half_table(engine: CastingEngine) -> None:
+    """
+    Check exactly that the engine's ``half_table`` reproduces its line odds.
+
+    Every entry of the table is equally likely, so each of the 64 values of
+    three lines must occur in the fraction of the entries given by the
+    product of the odds of its lines.
+
+    Args:
+        engine: Table-driven engine with ``line_odds``
+
+    Raises:
+        ValueError: If the table has no line odds or its frequencies differ
+    """
+    kind_odds = _kind_odds(engine)
+    counts = Counter(engine.half_table)
+    size = len(engine.half_table)
+    if size != 1 << engine.half_bits:
+        raise ValueError(f"起卦方法 {engine.name} 的查表长度不是 2^{engine.half_bits}")
+    for value in set(counts) | {code | mask << 6 for code in range(8) for mask in range(8)}:
+        expected = Fraction(1)
+        for i in range(3):
+            expected *= kind_odds[(value >> i & 1) | (value >> (6 + i) & 1) << 1]
+        if Fraction(counts.get(value, 0), size) != expected:
+            raise ValueError(f"起卦方法 {engine.name} 的查表中 {value:#x} 的频率为 "
+                             f"{Fraction(counts.get(value, 0), size)}，理论为 {expected}")
+
+
+def check_cast_batch(engine: CastingEngine, casts: int = 100_000, seed: int = 0) -> Tuple[float, int, float]:
+    """
+    Chi-square test of the line values drawn by the engine's ``cast_batch``.
+
+    Args:
+        engine: Random engine with ``line_odds``
+        casts: Number of readings
+        seed: Seed of the ``random.Random`` passed to ``cast_batch``
+
+    Returns:
+        (statistic, degrees of freedom, p-value) against the line odds
+
+    Raises:
+        ValueError: If the engine has no line odds
+    """
+    odds = _line_odds(engine)
+    observed = [0] * len(LINE_VALUES)
+    counts = Counter(engine.cast_batch(casts, random.Random(seed)))
+    for cast, count in counts.items():
+        for i in range(6):
+            observed[_LINE_KIND_TO_VALUE_INDEX[(cast >> i & 1) | (cast >> (6 + i) & 1) << 1]] += count
+    return chi_square(observed, [float(p) for p in odds])
+
+
+def _vectorizable(method: Optional[str]) -> CastingEngine:
+    engine = get_engine(method)
+    if not engine.uses_rng:
+        raise ValueError(f"起卦方法 {engine.name} 不使用随机数，无法模拟")
+    if engine.half_table is None or engine.line_odds is None:
+        raise ValueError(f"起卦方法 {engine.name} 没有查表定义或理论爻值概率，无法向量化模拟")
+    return engine
+
+
+def simulate_casts(engine: CastingEngine, casts: int, seed: int) -> "np.ndarray":
+    """
+    Draw casts with NumPy and count them.
+
+    Args:
+        engine: Table-driven random engine
+        casts: Number of readings
+        seed: Seed of the NumPy generator
+
+    Returns:
+        4096-bin histogram of the casts (int64)
+
+    Raises:
+        RuntimeError: If NumPy is not installed
+    """
+    if np is None:
+        raise RuntimeError("统计模拟需要安装 NumPy")
+    generator = np.random.default_rng(seed)
+    low = np.asarray(engine.half_table, dtype=np.uint16)
+    high = low << np.uint16(3)
+    half_mask = (1 << engine.half_bits) - 1
+    counts = np.zeros(4096, dtype=np.int64)
+    remaining = casts
+    while remaining > 0:
+        size = min(remaining, CHUNK_CASTS)
+        bits = generator.integers(0, 1 << (2 * engine.half_bits), size=size, dtype=np.uint32)
+        drawn = low[bits & half_mask] | high[bits >> engine.half_bits]
+        counts += np.bincount(drawn, minlength=4096)
+        remaining -= size
+    return counts
+
+
+def _palace_tables() -> Tuple[List[int], List[int]]:
+    """Palace index (GUAS) and palace type index (PALACE_TYPES) of every line code."""
+    palaces, types = [], []
+    for code in range(64):
+        mark = "".join(str(code >> i & 1) for i in range(6))
+        shi = set_shi_yao(mark)[0]
+        palaces.append(palace(mark, shi))
+        kind = get_type(mark)
+        if kind in ("游魂", "归魂"):
+            types.append(PALACE_TYPES.index(kind))
+        else:
+            # 本宫卦世在六爻，一世至五世卦世爻即世数
+            types.append(0 if shi == 6 else shi)
+    return palaces, types
+
+
+_PALACES, _PALACE_TYPE_INDEX = _palace_tables()
+
+
+def _histogram_keys(number_by_code: Sequence[int]) -> Dict[str, Tuple[List[Any], List[List[int]]]]:
+    """
+    Bin labels and, for every cast, the bin(s) it falls into per distribution.
+
+    Line values are counted six times per cast (once per line); every other
+    distribution once.
+    """
+    numbers = sorted({n for n in number_by_code if n})
+    number_bin = {n: i for i, n in enumerate(numbers)}
+    casts = range(4096)
+    line_bins = [
+        [_LINE_KIND_TO_VALUE_INDEX[(cast >> i & 1) | (cast >> (6 + i) & 1) << 1] for cast in casts]
+        for i in range(6)
+    ]
+    return {
+        "lineValues": (list(LINE_VALUES), line_bins),
+        "changingLines": (list(range(7)), [[bin(cast >> 6).count("1") for cast in casts]]),
+        "hexagram": (numbers, [[number_bin[number_by_code[cast & 63]] for cast in casts]]),
+        "changedHexagram": (numbers, [[number_bin[number_by_code[(cast ^ cast >> 6) & 63]] for cast in casts]]),
+        "palace": (list(GUAS), [[_PALACES[cast & 63] for cast in casts]]),
+        "palaceType": (list(PALACE_TYPES), [[_PALACE_TYPE_INDEX[cast & 63] for cast in casts]]),
+    }
+
+
+def _aggregate(weights: Sequence[float], keys: List[List[int]], bins: int) -> List[float]:
+    totals = [0.0] * bins
+    for key in keys:
+        for cast, weight in enumerate(weights):
+            if weight:
+                totals[key[cast]] += weight
+    return totals
+
+
+def simulate(method: Optional[str] = None, casts: int = DEFAULT_CASTS, seed: Optional[int] = None,
+             number_by_code: Optional[Sequence[int]] = None) -> Dict[str, Any]:
+    """
+    Run a Monte Carlo simulation of a casting method.
+
+    Args:
+        method: Casting engine name (three coins by default)
+        casts: Number of readings (1 to ``MAX_CASTS``)
+        seed: Seed of the NumPy generator (a fresh one is drawn if None)
+        number_by_code: Hexagram number of every line code (King Wen order
+            from the loaded corpus by default)
+
+    Returns:
+        ``SimulationResult``-shaped dict: observed and expected counts,
+        chi-square statistic, degrees of freedom and p-value per distribution
+
+    Raises:
+        ValueError: If the method cannot be simulated or ``casts`` is out of range
+        RuntimeError: If NumPy is not installed
+    """
+    engine = _vectorizable(method)
+    if not 1 <= casts <= MAX_CASTS:
+        raise ValueError(f"模拟次数必须在 1 到 {MAX_CASTS} 之间")
+    if seed is None:
+        seed = new_seed()
+    if number_by_code is None:
+        number_by_code = [h.number if h is not None else 0 for h in hexagram_manager.get_corpus().by_code]
+
+    started = time.perf_counter()
+    counts = simulate_casts(engine, casts, seed).tolist()
+    elapsed = time.perf_counter() - started
+    probabilities = cast_probabilities(engine)
+
+    histograms = {}
+    for name, (labels, keys) in _histogram_keys(number_by_code).items():
+        observed = _aggregate(counts, keys, len(labels))
+        expected = [p / len(keys) for p in _aggregate(probabilities, keys, len(labels))]
+        statistic, dof, p_value = chi_square(observed, expected)
+        samples = casts * len(keys)
+        histograms[name] = {
+            "bins": labels,
+            "observed": [int(count) for count in observed],
+            "expected": [p * samples for p in expected],
+            "chiSquare": statistic,
+            "dof": dof,
+            "pValue": p_value,
+        }
+    return {
+        "method": engine.name,
+        "casts": casts,
+        "seed": seed,
+        "elapsedMs": elapsed * 1000,
+        "castsPerSecond": casts / elapsed if elapsed else None,
+        "histograms": histograms,
+    }
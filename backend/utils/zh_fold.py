@@ -0,0 +1,80 @@
+"""
+Traditional/Simplified Chinese folding for text matching.
+
+The hexagram corpus is written in Traditional characters while other parts
+of the app (for example ``najia_oracle.GUA64``) and most users write
+Simplified. Folding maps every Traditional character that occurs in the
+corpus to its Simplified form, one character to one character, so folded
+text keeps the offsets of the original. ASCII letters are lower-cased the
+same way.
+
+The table was generated from the corpus with OpenCC's ``t2s`` character
+mapping. 乾 is left unmapped because it is also the Simplified name of the
+first hexagram.
+"""
+
+from typing import Dict
+
+TRADITIONAL_CHARS = (
+    "丟並亂來侶係倉個們倖側偽備傳傷傾僅僕僥價儀億儉儘償優儲兇兌兒內兩冊凍凜凱別剄則剋"
+    "剛剝創劇劑勁動務勝勞勢勵勸勻匯匱區協卻厭厲參叢員問啞啟喪單嗎嘆嘗嚇嚮嚴國圍園圓圖"
+    "團執堅報場塗墊墜墾壓壘壞壯壽夠夥夾奪奮妝婦孫學宮實寧審寬寵寶將專尋對導屆屍屢層屨"
+    "屬崗帥師帶幣幫幹幾廚廟廢廣廬弔張強彎後徑從徠復徵徹恆恥悅悶惡惱惻愛態慍慘慮慶慾憂"
+    "憊憑懇應懲懶懷懸懼戀戔戰戲戶拋挾捨捲掃採揚揮損搖搗搶撐撓撝撥撫擁擇擊擔據擱擲擴擺"
+    "擾攏攜攣敗敵數斂斃斬斷於時晉晝暉暢暫曆曬書會東條棄棟棲楊業極榮構槍樁樂樑樓標樣樸"
+    "樹橈機橫檢權歡歲歷歸殘殞殺殼毀氣決沒沖況浹涼淚淨淵淺渙減測渾準溝溫滅滌滯滲滾滿漁"
+    "漣漲漸潑潔潛潤澆澗澤濁濕濟濫瀆瀉瀾灑災為無煩熱燒營燦爛爭爾牆牽犧狀狹狽猶獄獎獨獲"
+    "獵獸獻現瑣環產畢畫異當疇疊療癒癥發盜盡監盤盪眾矇矚碩確磚礎礙祿禍禦禮禱種稱穀積穎"
+    "穢穩穫窮窺竄競筆節範築篤簣籠籬糧糾紀約紅紋納純級紛紜紮細紱紳紹終組絆結絕絡給統絲"
+    "綁經綜綢維網綴綸緊緒緘線緣編緩練縛縫縮縱總績繆織繩繫繻繼纆續纏罰罷羅羨義習聖聞聯"
+    "聰聲聳職聽肅脅脈脫脹腎腦腫腳膚膽臉臘臥臨與興舉舊艱茲莧華萬蒞蓆蓋蔭蕩薦藍藥蘇蘊處"
+    "虛虜號虧蝕蝦蟲蠱蠻衛衝補裝裡褲見規視親覲覺覽覿觀觸訂計訊討訓託記訟設許訴診詐詛試"
+    "話該詳誇誌認誘語誠誡誤誥誨說誰調談請論諧諸謀謂謅謙講謝謬謹證譏識議譴護譽變讌讒讓"
+    "讚豈豐豬豶貝貞負財貢貧貨貪貫責貳貴買費貿賀賁資賓賜賞賢賣賤質賴賺贊贏趕趨跡踐蹌躊"
+    "躋躍車軌軍軟較載輔輕輛輝輩輪輻輿轉轟辦辭辯農迴這連週進遊運過達違遙遜遠適遲遷選遺"
+    "遼邁還邊鄭鄰醜醫釀釁釋針鉉鉺銅銳銷鋒鋤鋪錢錫錯鍊鍛鍥鍵鎮鏇鑄鑽長門閃閉開閒間闃闊"
+    "闖關闡陣陰陸陽隊階隕際隨險隱隸隻雖雙雜雞離難雲電靈靜鞏韜響頂頃項順須預頑頒頓領頤"
+    "頭頰頹頻題額顎顏顒願顛類顧顯顴風飛飪飯飲飽飾養餒餗餘館餬饈饋馬馮馳馴駐駑駕駛騖騙"
+    "騰驅驕驗驚體髮鬆鬍鬚鬥鬧鬱魚魯鮒鮮鳥鳴鴻鵜鶘鶴鷹鹹麗麵麼黃點黨齊齎齡龍龜"
+)
+
+SIMPLIFIED_CHARS = (
+    "丢并乱来侣系仓个们幸侧伪备传伤倾仅仆侥价仪亿俭尽偿优储凶兑儿内两册冻凛凯别刭则克"
+    "刚剥创剧剂劲动务胜劳势励劝匀汇匮区协却厌厉参丛员问哑启丧单吗叹尝吓向严国围园圆图"
+    "团执坚报场涂垫坠垦压垒坏壮寿够伙夹夺奋妆妇孙学宫实宁审宽宠宝将专寻对导届尸屡层屦"
+    "属岗帅师带币帮干几厨庙废广庐吊张强弯后径从徕复征彻恒耻悦闷恶恼恻爱态愠惨虑庆欲忧"
+    "惫凭恳应惩懒怀悬惧恋戋战戏户抛挟舍卷扫采扬挥损摇捣抢撑挠㧑拨抚拥择击担据搁掷扩摆"
+    "扰拢携挛败敌数敛毙斩断于时晋昼晖畅暂历晒书会东条弃栋栖杨业极荣构枪桩乐梁楼标样朴"
+    "树桡机横检权欢岁历归残殒杀壳毁气决没冲况浃凉泪净渊浅涣减测浑准沟温灭涤滞渗滚满渔"
+    "涟涨渐泼洁潜润浇涧泽浊湿济滥渎泻澜洒灾为无烦热烧营灿烂争尔墙牵牺状狭狈犹狱奖独获"
+    "猎兽献现琐环产毕画异当畴叠疗愈症发盗尽监盘荡众蒙瞩硕确砖础碍禄祸御礼祷种称谷积颖"
+    "秽稳获穷窥窜竞笔节范筑笃篑笼篱粮纠纪约红纹纳纯级纷纭扎细绂绅绍终组绊结绝络给统丝"
+    "绑经综绸维网缀纶紧绪缄线缘编缓练缚缝缩纵总绩缪织绳系𦈡继𬙊续缠罚罢罗羡义习圣闻联"
+    "聪声耸职听肃胁脉脱胀肾脑肿脚肤胆脸腊卧临与兴举旧艰兹苋华万莅席盖荫荡荐蓝药苏蕴处"
+    "虚虏号亏蚀虾虫蛊蛮卫冲补装里裤见规视亲觐觉览觌观触订计讯讨训托记讼设许诉诊诈诅试"
+    "话该详夸志认诱语诚诫误诰诲说谁调谈请论谐诸谋谓诌谦讲谢谬谨证讥识议谴护誉变䜩谗让"
+    "赞岂丰猪豮贝贞负财贡贫货贪贯责贰贵买费贸贺贲资宾赐赏贤卖贱质赖赚赞赢赶趋迹践跄踌"
+    "跻跃车轨军软较载辅轻辆辉辈轮辐舆转轰办辞辩农回这连周进游运过达违遥逊远适迟迁选遗"
+    "辽迈还边郑邻丑医酿衅释针铉铒铜锐销锋锄铺钱锡错炼锻锲键镇旋铸钻长门闪闭开闲间阒阔"
+    "闯关阐阵阴陆阳队阶陨际随险隐隶只虽双杂鸡离难云电灵静巩韬响顶顷项顺须预顽颁顿领颐"
+    "头颊颓频题额颚颜颙愿颠类顾显颧风飞饪饭饮饱饰养馁𫗧余馆糊馐馈马冯驰驯驻驽驾驶骛骗"
+    "腾驱骄验惊体发松胡须斗闹郁鱼鲁鲋鲜鸟鸣鸿鹈鹕鹤鹰咸丽面么黄点党齐赍龄龙龟"
+)
+
+_FOLD_TABLE: Dict[int, int] = str.maketrans(
+    TRADITIONAL_CHARS + "ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    SIMPLIFIED_CHARS + "abcdefghijklmnopqrstuvwxyz",
+)
+
+
+def fold_text(text: str) -> str:
+    """
+    Fold text for matching: Traditional to Simplified, ASCII to lower case.
+
+    Args:
+        text: Original text
+
+    Returns:
+        Folded text of the same length
+    """
+    return text.translate(_FOLD_TABLE)
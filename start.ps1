@@ -53,6 +53,13 @@ if ($LASTEXITCODE -ne 0) {
 }
 Write-Host "后端依赖安装完成" -ForegroundColor Green
 
+# 编译卦象数据包，加快后端冷启动（失败时后端会自动回退到JSON）
+Write-Host "正在编译卦象数据包..." -ForegroundColor Yellow
+python build_corpus_bundle.py
+if ($LASTEXITCODE -ne 0) {
+    Write-Host "卦象数据包编译失败，将直接加载JSON数据" -ForegroundColor Yellow
+}
+
 Pop-Location
 
 # 检查前端依赖